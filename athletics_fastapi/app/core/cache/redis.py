@@ -6,7 +6,27 @@
 
 # importaciones de Redis
 from redis.asyncio import Redis
-from typing import AsyncGenerator
+from redis.asyncio.client import Pipeline
+from typing import AsyncGenerator, Optional
+
+from app.core.tracing.tracer import REDIS, span
+
+
+# Cliente con spans de trazado por comando y por pipeline
+class TracedRedis(Redis):
+    async def execute_command(self, *args, **options):
+        with span(REDIS, str(args[0]), **{"db.system": "redis"}):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Pipeline:
+        return TracedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class TracedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        with span(REDIS, "PIPELINE", **{"db.system": "redis", "db.redis.commands": len(self.command_stack)}):
+            return await super().execute(raise_on_error)
+
 
 # Clase singleton para el cliente Redis
 class RedisClient:
@@ -21,7 +41,8 @@ class RedisClient:
     def get_client(self) -> Redis:
         if self._client is None:
             from app.core.config.enviroment import _SETTINGS
-            self._client = Redis.from_url(
+            client_class = TracedRedis if _SETTINGS.tracing_enabled else Redis
+            self._client = client_class.from_url(
                 _SETTINGS.redis_url, 
                 decode_responses=True,
                 encoding="utf-8",
@@ -32,6 +32,14 @@ class Settings(BaseSettings):
     database_max_overflow: int = Field(5, alias="DATABASE_MAX_OVERFLOW")
     database_pool_timeout: int = Field(30, alias="DATABASE_POOL_TIMEOUT")
     database_pool_recycle: int = Field(3600, alias="DATABASE_POOL_RECYCLE")
+    # Verificación en segundo plano de las conexiones ociosas (0 = pool_pre_ping en cada checkout)
+    database_pool_health_interval: float = Field(30.0, alias="DATABASE_POOL_HEALTH_INTERVAL")
+    database_pool_health_timeout: float = Field(5.0, alias="DATABASE_POOL_HEALTH_TIMEOUT")
+
+    # Réplica de lectura opcional (mismas credenciales y base; vacío = sin réplica)
+    database_replica_host: str = Field("", alias="DATABASE_REPLICA_HOST")
+    database_replica_port: int = Field(5432, alias="DATABASE_REPLICA_PORT")
+    database_replica_retry_interval: float = Field(30.0, alias="DATABASE_REPLICA_RETRY_INTERVAL")
 
     # Redis
     redis_url: str = Field(..., alias="REDIS_URL", required=True)
@@ -55,12 +63,94 @@ class Settings(BaseSettings):
     email_host_user: str = Field(..., alias="EMAIL_HOST_USER", required=True)
     email_host_password: str = Field(..., alias="EMAIL_HOST_PASSWORD", required=True)
 
+    # Despachador de correos (cola en segundo plano)
+    email_dispatcher_workers: int = Field(2, alias="EMAIL_DISPATCHER_WORKERS")
+    email_queue_max_size: int = Field(1000, alias="EMAIL_QUEUE_MAX_SIZE")
+    email_batch_size: int = Field(20, alias="EMAIL_BATCH_SIZE")
+    email_max_retries: int = Field(3, alias="EMAIL_MAX_RETRIES")
+    email_retry_backoff: float = Field(2.0, alias="EMAIL_RETRY_BACKOFF")
+    email_idle_timeout: float = Field(60.0, alias="EMAIL_IDLE_TIMEOUT")
+
 
 
     # Users API
     users_api_url: str = Field(..., alias="USERS_API_URL", required=True)
     users_api_email: str = Field(..., alias="USERS_API_EMAIL", required=True)
     users_api_password: str = Field(..., alias="USERS_API_PASSWORD", required=True)
+    # Token de la API de usuarios: vida asumida si no trae `exp` y margen de renovación anticipada
+    users_api_token_ttl: int = Field(3600, alias="USERS_API_TOKEN_TTL")
+    users_api_token_refresh_ahead: int = Field(120, alias="USERS_API_TOKEN_REFRESH_AHEAD")
+
+    # Clientes HTTP salientes (httpx)
+    http_client_timeout: float = Field(10.0, alias="HTTP_CLIENT_TIMEOUT")
+    http_client_max_connections_per_host: int = Field(20, alias="HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST")
+    http_client_max_keepalive: int = Field(10, alias="HTTP_CLIENT_MAX_KEEPALIVE")
+    http_client_keepalive_expiry: float = Field(30.0, alias="HTTP_CLIENT_KEEPALIVE_EXPIRY")
+
+    # Circuit breaker de APIs externas
+    circuit_breaker_failure_threshold: int = Field(5, alias="CIRCUIT_BREAKER_FAILURE_THRESHOLD")
+    circuit_breaker_failure_window: float = Field(30.0, alias="CIRCUIT_BREAKER_FAILURE_WINDOW")
+    circuit_breaker_recovery_timeout: float = Field(30.0, alias="CIRCUIT_BREAKER_RECOVERY_TIMEOUT")
+    circuit_breaker_sync_interval: float = Field(1.0, alias="CIRCUIT_BREAKER_SYNC_INTERVAL")
+
+    # Principal cache (get_current_user)
+    principal_cache_enabled: bool = Field(True, alias="PRINCIPAL_CACHE_ENABLED")
+    principal_cache_max_entries: int = Field(1024, alias="PRINCIPAL_CACHE_MAX_ENTRIES")
+    principal_cache_local_ttl: int = Field(30, alias="PRINCIPAL_CACHE_LOCAL_TTL")
+
+    # Pool de hashing Argon2
+    password_hashing_workers: int = Field(4, alias="PASSWORD_HASHING_WORKERS")
+    password_hashing_max_pending: int = Field(64, alias="PASSWORD_HASHING_MAX_PENDING")
+
+    # Caché de baremos (clasificación automática de resultados)
+    baremo_cache_enabled: bool = Field(True, alias="BAREMO_CACHE_ENABLED")
+    baremo_cache_ttl: int = Field(3600, alias="BAREMO_CACHE_TTL")
+    baremo_cache_version_check_interval: float = Field(5.0, alias="BAREMO_CACHE_VERSION_CHECK_INTERVAL")
+
+    # Paginación keyset de listados
+    pagination_default_limit: int = Field(50, alias="PAGINATION_DEFAULT_LIMIT")
+    pagination_max_limit: int = Field(200, alias="PAGINATION_MAX_LIMIT")
+
+    # Exportaciones en streaming (filas por lote del cursor del servidor)
+    export_yield_per: int = Field(1000, alias="EXPORT_YIELD_PER")
+
+    # Reportes PDF en segundo plano (pool de procesos)
+    report_jobs_max_workers: int = Field(2, alias="REPORT_JOBS_MAX_WORKERS")
+    report_jobs_max_pending: int = Field(10, alias="REPORT_JOBS_MAX_PENDING")
+    report_jobs_ttl: int = Field(86400, alias="REPORT_JOBS_TTL")
+
+    # Rate limiting compartido entre workers (GCRA en Redis, token bucket local si Redis cae)
+    rate_limit_enabled: bool = Field(True, alias="RATE_LIMIT_ENABLED")
+    rate_limit_redis_timeout: float = Field(0.25, alias="RATE_LIMIT_REDIS_TIMEOUT")
+    rate_limit_retry_interval: float = Field(10.0, alias="RATE_LIMIT_RETRY_INTERVAL")
+    rate_limit_local_max_keys: int = Field(10000, alias="RATE_LIMIT_LOCAL_MAX_KEYS")
+
+    # Conteo de consultas SQL por petición (Prometheus y cabecera Server-Timing)
+    query_stats_enabled: bool = Field(True, alias="QUERY_STATS_ENABLED")
+    server_timing_enabled: bool = Field(False, alias="SERVER_TIMING_ENABLED")
+    query_stats_duplicate_warning: int = Field(5, alias="QUERY_STATS_DUPLICATE_WARNING")
+
+    # Trazas por petición (desglose db/redis/argon2/http); exportación OTLP/JSON opcional
+    tracing_enabled: bool = Field(True, alias="TRACING_ENABLED")
+    tracing_export_path: str = Field("", alias="TRACING_EXPORT_PATH")
+    tracing_service_name: str = Field("athletics_fastapi", alias="TRACING_SERVICE_NAME")
+
+    # Filtro local de tokens revocados (Bloom + pub/sub); tolera caídas de Redis de hasta N segundos
+    revocation_filter_enabled: bool = Field(True, alias="REVOCATION_FILTER_ENABLED")
+    revocation_filter_capacity: int = Field(100000, alias="REVOCATION_FILTER_CAPACITY")
+    revocation_filter_error_rate: float = Field(0.001, alias="REVOCATION_FILTER_ERROR_RATE")
+    revocation_filter_rebuild_interval: float = Field(3600.0, alias="REVOCATION_FILTER_REBUILD_INTERVAL")
+    revocation_max_staleness: float = Field(30.0, alias="REVOCATION_MAX_STALENESS")
+
+    # Mantenimiento periódico coordinado entre workers (lock en Redis)
+    maintenance_poll_interval: float = Field(60.0, alias="MAINTENANCE_POLL_INTERVAL")
+    # Limpieza de sesiones: expiradas por lotes. La purga de inactivas tras N días es opcional
+    # (0 = conservar, por defecto); con SESSION_RETENTION_ARCHIVE se mueven a auth_users_sessions_archive
+    session_cleanup_interval: float = Field(3600.0, alias="SESSION_CLEANUP_INTERVAL")
+    session_cleanup_batch_size: int = Field(1000, alias="SESSION_CLEANUP_BATCH_SIZE")
+    session_cleanup_batch_pause: float = Field(0.05, alias="SESSION_CLEANUP_BATCH_PAUSE")
+    session_retention_days: int = Field(0, alias="SESSION_RETENTION_DAYS")
+    session_retention_archive: bool = Field(False, alias="SESSION_RETENTION_ARCHIVE")
 
     debug: bool = Field(False, alias="DEBUG", required=True)
     
@@ -71,6 +161,15 @@ class Settings(BaseSettings):
             f"postgresql+asyncpg://{self.database_user}:{self.database_password}"
             f"@{self.database_host}:{self.database_port}/{self.database_name}"
         )
+
+    @property
+    def database_replica_url_async(self) -> str | None:
+        if not self.database_replica_host:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.database_user}:{self.database_password}"
+            f"@{self.database_replica_host}:{self.database_replica_port}/{self.database_name}"
+        )
     
 
 
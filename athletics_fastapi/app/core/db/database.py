@@ -1,17 +1,99 @@
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from app.core.config.enviroment import _SETTINGS
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import event
+from sqlalchemy.orm import DeclarativeBase, Session
+from prometheus_client import Counter
+from app.core.db import query_stats
+from app.core.db.pool_metrics import InstrumentedAsyncQueuePool, register_pool_metrics
+from app.core.db.pool_health import register_disconnect_handler, register_idle_tracking
+from app.core.tracing import tracer
+import time
+
+# Claves de `Session.info` para el ruteo a la réplica de lectura
+USE_REPLICA = "use_replica"
+WROTE = "wrote"
+
+REPLICA_FALLBACKS = Counter(
+    "db_replica_fallbacks_total",
+    "Lecturas enviadas al primario porque la réplica falló",
+)
 
 
 #Clase base para los modelos de la base de datos
 class Base(DeclarativeBase):
     pass
+
+
+# Sesión que envía a la réplica las lecturas marcadas (ver app.core.db.replica)
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get(USE_REPLICA) and not self._flushing:
+            replica = _db.get_replica_engine()
+            if replica is not None:
+                return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+# Una sesión que ya escribió se queda en el primario el resto de su vida:
+# la réplica podría no tener aún esos cambios (leer lo propio escrito)
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_wrote_on_flush(session, flush_context):
+    session.info[WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_wrote_on_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE] = True
+
+
+def _build_engine(url: str, name: str) -> AsyncEngine:
+    # Configuración de conexión con soporte para Azure (SSL)
+    connect_args = {
+        "server_settings": {
+            "application_name": "athletics_fastapi",
+            "jit": "off"  # Desactivar JIT para consultas rápidas
+        },
+        "command_timeout": 60,  # Timeout de comandos SQL
+        "timeout": 15,  # Aumentado para Azure
+    }
+
+    # Si el host es de Azure, forzar SSL
+    if "azure.com" in url.lower():
+        connect_args["ssl"] = "require"
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=name,
+        pool_size=_SETTINGS.database_pool_size,
+        max_overflow=_SETTINGS.database_max_overflow,
+        # Sin verificación periódica se vuelve al ping en cada checkout
+        pool_pre_ping=_SETTINGS.database_pool_health_interval <= 0,
+        pool_recycle=_SETTINGS.database_pool_recycle,
+        pool_timeout=_SETTINGS.database_pool_timeout,
+        pool_use_lifo=True,
+        echo=False,
+        connect_args=connect_args,
+    )
+    register_pool_metrics(engine, name)
+    register_disconnect_handler(engine, name)
+    register_idle_tracking(engine)
+    if _SETTINGS.query_stats_enabled:
+        query_stats.instrument_engine(engine)
+    if _SETTINGS.tracing_enabled:
+        tracer.instrument_engine(engine)
+    return engine
+
+
 #Clase que gestiona la conexión a la base de datos y la creación de sesiones
 # Implementa el patrón singleton para asegurar una única instancia
 class DatabaseBase:
     _instance = None
     _engine: AsyncEngine | None = None
+    _replica_engine: AsyncEngine | None = None
+    _replica_down_until: float = 0.0
     _session_factory: async_sessionmaker[AsyncSession] | None = None
 
     #metodo para implementar el patrón singleton
@@ -19,46 +101,52 @@ class DatabaseBase:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            # Inicializar engine y session factory AQUÍ, una sola vez
-            # Configuración de conexión con soporte para Azure (SSL)
-            connect_args = {
-                "server_settings": {
-                    "application_name": "athletics_fastapi",
-                    "jit": "off"  # Desactivar JIT para consultas rápidas
-                },
-                "command_timeout": 60,  # Timeout de comandos SQL
-                "timeout": 15,  # Aumentado para Azure
-            }
-
-            # Si el host es de Azure, forzar SSL
-            if "azure.com" in _SETTINGS.database_host.lower():
-                connect_args["ssl"] = "require"
-
-            cls._instance._engine = create_async_engine(
-                _SETTINGS.database_url_async,
-                pool_size=_SETTINGS.database_pool_size,
-                max_overflow=_SETTINGS.database_max_overflow,
-                pool_pre_ping=True,
-                pool_recycle=_SETTINGS.database_pool_recycle,
-                pool_timeout=_SETTINGS.database_pool_timeout,
-                pool_use_lifo=True,
-                echo=False,
-                connect_args=connect_args,
-            )
+            # Inicializar engines y session factory AQUÍ, una sola vez
+            cls._instance._engine = _build_engine(_SETTINGS.database_url_async, "primary")
+            if _SETTINGS.database_replica_url_async:
+                cls._instance._replica_engine = _build_engine(_SETTINGS.database_replica_url_async, "replica")
             cls._instance._session_factory = async_sessionmaker(
-                cls._instance._engine, 
-                expire_on_commit=False
+                cls._instance._engine,
+                expire_on_commit=False,
+                sync_session_class=RoutingSession,
             )
         return cls._instance
-    
+
     #metodo para obtener el engine de la base de datos
     def get_engine(self) -> AsyncEngine:
         return self._engine
-    
+
+    #metodo para obtener el engine de la réplica (None si no hay o está marcada caída)
+    def get_replica_engine(self) -> Optional[AsyncEngine]:
+        if self._replica_engine is None or time.monotonic() < self._replica_down_until:
+            return None
+        return self._replica_engine
+
+    #metodo para sacar la réplica de servicio durante DATABASE_REPLICA_RETRY_INTERVAL segundos
+    def mark_replica_down(self, error: BaseException) -> None:
+        from app.core.logging.logger import logger
+        REPLICA_FALLBACKS.inc()
+        if time.monotonic() >= self._replica_down_until:
+            logger.warning(f"⚠️ Réplica de lectura no disponible, usando el primario: {error}")
+        self._replica_down_until = time.monotonic() + _SETTINGS.database_replica_retry_interval
+
+    #metodo para obtener todos los engines configurados por nombre de pool
+    def get_engines(self) -> dict[str, AsyncEngine]:
+        engines = {"primary": self._engine}
+        if self._replica_engine is not None:
+            engines["replica"] = self._replica_engine
+        return engines
+
     #metodo para obtener la fábrica de sesiones
     def get_session_factory(self) -> async_sessionmaker[AsyncSession]:
         return self._session_factory
 
+    #metodo para cerrar los engines
+    async def dispose(self) -> None:
+        await self._engine.dispose()
+        if self._replica_engine is not None:
+            await self._replica_engine.dispose()
+
 
 # Instancia global
 _db = DatabaseBase()
@@ -72,4 +160,4 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -0,0 +1,212 @@
+"""
+Paginación keyset (por cursor) para los listados.
+
+En lugar de `OFFSET n` (que obliga a PostgreSQL a recorrer y descartar `n`
+filas) cada página se pide a partir de la última fila de la anterior:
+
+    WHERE (sort_key, id) > (:ultimo_sort_key, :ultimo_id)
+    ORDER BY sort_key, id
+    LIMIT :limit + 1
+
+Con un índice sobre `(sort_key, id)` el coste de una página no depende de
+su profundidad. El `id` desempata filas con el mismo `sort_key`, así que el
+orden es estable aunque se inserten filas entre peticiones.
+
+El cursor es opaco para el cliente: JSON en base64 url-safe con los valores
+de la última fila. El total es opcional; sin filtros se estima con
+`pg_class.reltuples` (actualizado por ANALYZE/autovacuum) en vez de un
+`COUNT(*)` sobre toda la tabla.
+
+Compatibilidad: si el cliente no envía ni `limit` ni `cursor` se devuelve el
+listado completo (en el mismo orden y sin `next_cursor`), como antes de la
+paginación; los clientes que quieran páginas deben enviar `limit`.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config.enviroment import _SETTINGS
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    # True si `total` sale de `pg_class.reltuples` (estimación)
+    total_aproximado: bool = False
+    # None: listado completo (sin `limit` ni `cursor`)
+    limit: Optional[int] = field(default=_SETTINGS.pagination_default_limit)
+
+    def set_headers(self, response: Response) -> None:
+        """Para endpoints que devuelven una lista plana: los metadatos van en cabeceras."""
+        if self.next_cursor:
+            response.headers["X-Next-Cursor"] = self.next_cursor
+        if self.total is not None:
+            response.headers["X-Total-Count"] = str(self.total)
+            response.headers["X-Total-Count-Aproximado"] = "true" if self.total_aproximado else "false"
+
+    def meta(self) -> dict:
+        """Metadatos de paginación para incluir junto a `items` en la respuesta."""
+        return {
+            "next_cursor": self.next_cursor,
+            "limit": self.limit,
+            "total": self.total,
+            "total_aproximado": self.total_aproximado,
+        }
+
+
+# ============================
+# Cursor
+# ============================
+def _dump_value(value: Any) -> list:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    return ["v", value]
+
+
+def _load_value(raw: list) -> Any:
+    tag, value = raw
+    if tag == "dt":
+        return datetime.fromisoformat(value)
+    if tag == "d":
+        return date.fromisoformat(value)
+    if tag == "v":
+        return value
+    raise ValueError(tag)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_dump_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Raises:
+        HTTPException 400: si el cursor no es válido o no corresponde a este listado.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = [_load_value(v) for v in json.loads(base64.urlsafe_b64decode(padded))]
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        values = None
+    if not values or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido",
+        )
+    return values
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return _SETTINGS.pagination_default_limit
+    return min(limit, _SETTINGS.pagination_max_limit)
+
+
+# ============================
+# Totales
+# ============================
+async def approximate_count(session: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Filas estimadas de `table_name` según `pg_class.reltuples`.
+    Devuelve None si la tabla nunca se analizó (reltuples = -1).
+    """
+    result = await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:tabla)"),
+        {"tabla": table_name},
+    )
+    estimate = result.scalar_one_or_none()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def exact_count(session: AsyncSession, stmt: Select) -> int:
+    result = await session.execute(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
+    )
+    return int(result.scalar_one())
+
+
+# ============================
+# Paginación
+# ============================
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    sort_col,
+    id_col,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    include_total: bool = False,
+    estimate_table: Optional[str] = None,
+) -> Page:
+    """
+    Ejecuta `stmt` (un `select(Modelo)` con sus filtros y `options`) como una
+    página keyset ordenada por `(sort_col, id_col)`.
+
+    Sin `limit` ni `cursor` devuelve todas las filas (sin `LIMIT`).
+    Si `sort_col` es el propio `id_col` el cursor solo guarda el id.
+    `estimate_table` solo debe indicarse cuando `stmt` no filtra filas: el
+    total se estima con `pg_class`; en otro caso, si se pide el total, se
+    cuenta con `COUNT(*)` sobre la consulta filtrada.
+    """
+    unbounded = limit is None and not cursor
+    limit = None if unbounded else clamp_limit(limit)
+    single_key = sort_col is id_col
+    keys = (id_col,) if single_key else (sort_col, id_col)
+
+    total = None
+    aproximado = False
+    if include_total:
+        if estimate_table is not None:
+            total = await approximate_count(session, estimate_table)
+            aproximado = total is not None
+        if total is None:
+            total = await exact_count(session, stmt)
+
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        if single_key:
+            after = id_col < values[0] if descending else id_col > values[0]
+        else:
+            after = (
+                tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+            )
+        stmt = stmt.where(after)
+
+    order = [k.desc() for k in keys] if descending else list(keys)
+    stmt = stmt.order_by(None).order_by(*order)
+    if not unbounded:
+        stmt = stmt.limit(limit + 1)
+    result = await session.execute(stmt)
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if not unbounded and len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, k.key) for k in keys])
+
+    return Page(
+        items=items,
+        next_cursor=next_cursor,
+        total=total,
+        total_aproximado=aproximado,
+        limit=limit,
+    )
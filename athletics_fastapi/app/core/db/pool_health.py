@@ -0,0 +1,145 @@
+"""
+Salud de las conexiones del pool sin `pool_pre_ping`.
+
+`pool_pre_ping` hace un `SELECT 1` extra en cada checkout, es decir, en cada
+petición. En su lugar:
+
+- `check_pool` (tarea periódica del lifespan) hace ping a las conexiones que
+  llevan ociosas al menos un intervalo (`register_idle_tracking` anota cuándo
+  volvió cada una al pool) y devuelve cada una en cuanto responde. Una
+  conexión muerta se invalida y, como es una desconexión, SQLAlchemy invalida
+  todo el pool: las demás conexiones antiguas se reabren en su próximo checkout.
+- `register_disconnect_handler` engancha `handle_error`: cualquier error de
+  desconexión en una petición (incluidos `ConnectionError` del socket que el
+  dialecto no reconoce) invalida el pool y queda contado en métricas.
+
+Entre dos verificaciones una petición todavía puede recibir una conexión rota;
+esa petición falla y el pool se invalida para las siguientes.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logging.logger import logger
+
+
+# Instante (monotonic) en que la conexión volvió al pool, en `ConnectionRecord.info`
+CHECKIN_KEY = "pool_health_checkin"
+
+# ============================
+# Métricas
+# ============================
+POOL_DISCONNECTS = Counter(
+    "db_pool_disconnects_total",
+    "Errores de desconexión que invalidaron el pool",
+    ["pool"],
+)
+POOL_HEALTH_CHECKS = Counter(
+    "db_pool_health_checks_total",
+    "Conexiones ociosas verificadas en segundo plano",
+    ["pool", "result"],
+)
+
+
+@dataclass
+class PoolHealthReport:
+    checked: int = 0
+    failed: int = 0
+    skipped: int = 0  # usadas hace menos de `min_idle`
+
+
+# ============================
+# Handler de desconexiones
+# ============================
+def register_disconnect_handler(engine: Engine | AsyncEngine, name: str) -> None:
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context):
+        if not exception_context.is_disconnect and isinstance(
+            exception_context.original_exception, ConnectionError
+        ):
+            exception_context.is_disconnect = True
+        if exception_context.is_disconnect:
+            exception_context.invalidate_pool_on_disconnect = True
+            POOL_DISCONNECTS.labels(name).inc()
+            logger.warning(
+                f"🔌 Conexión perdida en el pool {name}, se invalida: {exception_context.original_exception}"
+            )
+
+
+def register_idle_tracking(engine: Engine | AsyncEngine) -> None:
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine.pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info[CHECKIN_KEY] = time.monotonic()
+
+
+# ============================
+# Verificación periódica
+# ============================
+async def _ping(conn, name: str, timeout: float, report: PoolHealthReport) -> None:
+    try:
+        await asyncio.wait_for(conn.exec_driver_sql("SELECT 1"), timeout)
+    except Exception as e:
+        report.failed += 1
+        POOL_HEALTH_CHECKS.labels(name, "failed").inc()
+        logger.warning(f"🔌 Pool {name}: conexión ociosa descartada: {e}")
+        await conn.invalidate()
+    else:
+        report.checked += 1
+        POOL_HEALTH_CHECKS.labels(name, "ok").inc()
+    finally:
+        await conn.close()
+
+
+async def check_pool(
+    engine: AsyncEngine, name: str, timeout: float, min_idle: float = 0.0
+) -> PoolHealthReport:
+    """
+    Hace ping a las conexiones que llevan al menos `min_idle` segundos ociosas.
+
+    Con `pool_use_lifo` la conexión devuelta es la siguiente en prestarse, así
+    que las ociosas se prestan todas seguidas (sin E/S: no hay pre-ping) para
+    llegar a las del fondo. Las usadas hace poco se devuelven de inmediato y
+    las demás se verifican en paralelo, volviendo cada una al pool en cuanto
+    responde: la espera de una conexión muerta no retiene al resto. Se detiene
+    si el pool se queda sin ociosas (nunca abre conexiones extra).
+    """
+    pool = engine.sync_engine.pool
+    report = PoolHealthReport()
+    now = time.monotonic()
+    recent, stale = [], []
+    try:
+        for _ in range(pool.checkedin()):
+            if pool.checkedin() == 0:
+                break
+            try:
+                conn = await engine.connect()
+            except Exception as e:
+                # Ni siquiera se pudo reconectar: la base de datos no responde
+                report.failed += 1
+                POOL_HEALTH_CHECKS.labels(name, "failed").inc()
+                logger.error(f"❌ Pool {name}: no se pudo obtener conexión: {e}")
+                break
+            checked_in_at = conn.info.get(CHECKIN_KEY)
+            if checked_in_at is not None and now - checked_in_at < min_idle:
+                recent.append(conn)
+            else:
+                stale.append(conn)
+    except BaseException:
+        await asyncio.gather(*(conn.close() for conn in recent + stale), return_exceptions=True)
+        raise
+
+    report.skipped = len(recent)
+    await asyncio.gather(
+        *(conn.close() for conn in recent),
+        *(_ping(conn, name, timeout, report) for conn in stale),
+    )
+    return report
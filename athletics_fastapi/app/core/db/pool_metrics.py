@@ -0,0 +1,96 @@
+"""
+Métricas del pool de conexiones de SQLAlchemy.
+
+`InstrumentedAsyncQueuePool` mide cuánto espera cada checkout (incluye abrir
+una conexión nueva si hace falta) y cuenta los timeouts por pool lleno. La
+etiqueta `pool` es el `pool_logging_name` del engine (`primary`, `replica`),
+que SQLAlchemy conserva cuando recrea el pool tras un `dispose()`.
+
+`register_pool_metrics` añade por engine:
+- `db_pool_checked_out`, `db_pool_overflow`, `db_pool_size` (gauges leídos al
+  exportar /metrics).
+- `db_pool_connection_age_seconds`: edad de la conexión en cada checkout.
+"""
+import time
+from contextvars import ContextVar
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+# ============================
+# Métricas
+# ============================
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera para obtener una conexión del pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts que agotaron DATABASE_POOL_TIMEOUT con el pool lleno",
+    ["pool"],
+)
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Conexiones prestadas en este momento", ["pool"])
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Conexiones abiertas por encima de pool_size", ["pool"])
+POOL_SIZE = Gauge("db_pool_size", "Tamaño configurado del pool", ["pool"])
+POOL_CONNECTION_AGE = Histogram(
+    "db_pool_connection_age_seconds",
+    "Edad de la conexión al prestarse",
+    ["pool"],
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200),
+)
+
+# `_do_get` se llama a sí mismo en carreras; solo se mide la llamada externa
+_timing: ContextVar[bool] = ContextVar("pool_checkout_timing", default=False)
+
+
+class _InstrumentedPoolMixin:
+    @property
+    def metrics_name(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def _do_get(self):
+        if _timing.get():
+            return super()._do_get()
+        token = _timing.set(True)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.labels(self.metrics_name).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.metrics_name).observe(time.perf_counter() - start)
+            _timing.reset(token)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def register_pool_metrics(engine: Engine | AsyncEngine, name: str) -> None:
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["created_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        created_at = connection_record.info.get("created_at")
+        if created_at is not None:
+            POOL_CONNECTION_AGE.labels(name).observe(time.monotonic() - created_at)
+
+    # Se lee `sync_engine.pool` en cada scrape: dispose() lo reemplaza
+    POOL_CHECKED_OUT.labels(name).set_function(lambda: sync_engine.pool.checkedout())
+    POOL_OVERFLOW.labels(name).set_function(lambda: max(0, sync_engine.pool.overflow()))
+    POOL_SIZE.labels(name).set_function(lambda: sync_engine.pool.size())
@@ -0,0 +1,167 @@
+"""
+Conteo de consultas SQL por petición.
+
+`instrument_engine` engancha `before/after_cursor_execute` del engine: mientras
+haya un `track_queries()` activo en el contexto (contextvar, que SQLAlchemy
+propaga al greenlet del driver) cada sentencia suma al conteo, al tiempo total
+de base de datos y a su propio contador por texto SQL. Un mismo SQL repetido
+muchas veces en una petición es la firma de un N+1.
+
+`QueryStatsMiddleware` abre un `track_queries()` por petición HTTP y:
+- observa los histogramas de Prometheus por método y ruta (junto a los del
+  `Instrumentator`),
+- opcionalmente añade la cabecera `Server-Timing` (útil en desarrollo desde
+  las devtools del navegador),
+- registra un warning cuando una sentencia se repite `duplicate_warning` veces.
+
+Los `track_queries()` se anidan: una prueba que envuelve una petición ve las
+consultas del endpoint aunque el middleware abra su propio contador.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from prometheus_client import Counter as PromCounter, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logging.logger import logger
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0  # segundos
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.statements[statement] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Ejecuciones que repiten un SQL ya ejecutado en la misma petición."""
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def repeated(self, min_times: int = 2) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= min_times]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries, {self.duplicates} duplicated"'
+
+
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats_active", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Cuenta las consultas ejecutadas dentro del bloque (en esta tarea)."""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+# ============================
+# Eventos del engine
+# ============================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active.get():
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_stats_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    for stats in _active.get():
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # La sentencia falló: no habrá after_cursor_execute para su inicio
+    conn = exception_context.connection
+    starts = conn.info.get("query_stats_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine | AsyncEngine) -> None:
+    """Registra los eventos de conteo en el engine (idempotente)."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# ============================
+# Métricas
+# ============================
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "Consultas SQL por petición",
+    ["method", "handler"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Tiempo total en base de datos por petición",
+    ["method", "handler"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_DUPLICATE_QUERIES = PromCounter(
+    "http_request_db_duplicate_queries_total",
+    "Consultas SQL repetidas dentro de una misma petición (posibles N+1)",
+    ["method", "handler"],
+)
+
+
+class QueryStatsMiddleware:
+    """Middleware ASGI: una ventana de conteo de consultas por petición HTTP."""
+
+    def __init__(self, app, server_timing: bool = False, duplicate_warning: int = 5):
+        self.app = app
+        self.server_timing = server_timing
+        self.duplicate_warning = duplicate_warning
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start" and self.server_timing:
+                    # Cuerpos en streaming: solo cuenta lo ejecutado antes de la primera línea
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._observe(scope, stats)
+
+    def _observe(self, scope, stats: QueryStats) -> None:
+        route = scope.get("route")
+        # Plantilla de la ruta (no la URL) para no disparar la cardinalidad
+        handler = getattr(route, "path", None) or "unmatched"
+        method = scope.get("method", "")
+        DB_QUERIES_PER_REQUEST.labels(method, handler).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(method, handler).observe(stats.duration)
+        if stats.duplicates:
+            DB_DUPLICATE_QUERIES.labels(method, handler).inc(stats.duplicates)
+        for sql, n in stats.repeated(self.duplicate_warning):
+            logger.warning(f"🔁 Posible N+1 en {method} {handler}: {n}x {sql[:200]}")
+
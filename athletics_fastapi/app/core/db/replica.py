@@ -0,0 +1,65 @@
+"""
+Ruteo de lecturas a la réplica (DATABASE_REPLICA_HOST).
+
+`@read_only` marca un método de repositorio que solo lee: se ejecuta sobre una
+copia del repositorio con una sesión propia y corta, marcada para que
+`RoutingSession.get_bind` envíe sus consultas al engine de la réplica. Los
+objetos devueltos quedan desligados de la sesión de la petición (el método
+debe cargar con antelación lo que se vaya a serializar).
+
+Si la réplica falla por conexión (caída, timeout) se marca fuera de servicio
+durante `DATABASE_REPLICA_RETRY_INTERVAL` segundos, se descarta solo la sesión
+de la réplica y el método se repite en el primario con la sesión de la
+petición, cuya unidad de trabajo (objetos cargados, cambios pendientes) no
+se toca.
+
+Se queda en el primario cuando:
+- no hay réplica configurada o está marcada caída,
+- la sesión ya escribió (no vería sus propios cambios en la réplica),
+- hay un flush en curso.
+"""
+import asyncio
+import copy
+import functools
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.database import USE_REPLICA, WROTE, _db
+
+
+T = TypeVar("T")
+
+# Errores de conexión con la réplica (no de la consulta en sí)
+REPLICA_ERRORS = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+
+
+def _session_attr(repository) -> str:
+    # Los repositorios guardan la sesión como `session` o `db`
+    return "session" if getattr(repository, "session", None) is not None else "db"
+
+
+def read_only(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs) -> T:
+        attr = _session_attr(self)
+        session: AsyncSession = getattr(self, attr)
+        if (
+            session.info.get(USE_REPLICA)
+            or session.info.get(WROTE)
+            or _db.get_replica_engine() is None
+        ):
+            return await method(self, *args, **kwargs)
+
+        replica_repo = copy.copy(self)
+        async with _db.get_session_factory()() as replica_session:
+            replica_session.info[USE_REPLICA] = True
+            setattr(replica_repo, attr, replica_session)
+            try:
+                return await method(replica_repo, *args, **kwargs)
+            except REPLICA_ERRORS as e:
+                _db.mark_replica_down(e)
+        return await method(self, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,124 @@
+"""
+Exportaciones en streaming (NDJSON / CSV) directamente desde la base de datos.
+
+Las filas se leen con un cursor del lado del servidor
+(`AsyncSession.stream` + `yield_per`) y se envían al cliente en bloques de
+`EXPORT_YIELD_PER` filas mediante un `StreamingResponse`; en memoria solo
+vive el bloque actual, sin importar cuántas filas tenga la exportación.
+
+El generador abre su propia sesión: el cuerpo de un `StreamingResponse`
+se consume después de que el endpoint retorna, así que no puede depender
+de la sesión de la petición (`get_session`).
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Iterable, Optional, Sequence
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.core.config.enviroment import _SETTINGS
+from app.core.db.database import USE_REPLICA, _db
+from app.core.db.replica import REPLICA_ERRORS
+from app.core.logging.logger import logger
+
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    CSV: "text/csv; charset=utf-8",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Convierte un valor de la base de datos a un tipo serializable."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+# ============================
+# Lectura por lotes
+# ============================
+async def stream_rows(stmt: Select, yield_per: Optional[int] = None) -> AsyncIterator[Sequence[dict]]:
+    """
+    Ejecuta `stmt` con un cursor del servidor y produce bloques de filas
+    (como dicts columna -> valor) de tamaño `yield_per`.
+    """
+    yield_per = yield_per or _SETTINGS.export_yield_per
+    stmt = stmt.execution_options(yield_per=yield_per)
+    async with _db.get_session_factory()() as session:
+        # Las exportaciones solo leen: van a la réplica si hay una disponible
+        if _db.get_replica_engine() is not None:
+            session.info[USE_REPLICA] = True
+        try:
+            result = await session.stream(stmt)
+        except REPLICA_ERRORS as e:
+            if not session.info.pop(USE_REPLICA, None):
+                raise
+            _db.mark_replica_down(e)
+            await session.rollback()
+            result = await session.stream(stmt)
+        async for partition in result.mappings().partitions(yield_per):
+            yield partition
+
+
+# ============================
+# Codificación
+# ============================
+def encode_ndjson(rows: Iterable[dict]) -> str:
+    return "".join(
+        json.dumps({k: _plain(v) for k, v in row.items()}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: Iterable[dict], columns: Sequence[str], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else _plain(row[c]) for c in columns])
+    return buffer.getvalue()
+
+
+async def _encode(stmt: Select, fmt: str, yield_per: Optional[int]) -> AsyncIterator[str]:
+    columns = [c.key for c in stmt.selected_columns]
+    total = 0
+    if fmt == CSV:
+        yield encode_csv((), columns, header=True)
+    async for rows in stream_rows(stmt, yield_per):
+        total += len(rows)
+        yield encode_ndjson(rows) if fmt == NDJSON else encode_csv(rows, columns)
+    logger.info(f"📤 Exportación completada: {total} filas ({fmt})")
+
+
+def streaming_export(
+    stmt: Select,
+    fmt: str,
+    filename: str,
+    yield_per: Optional[int] = None,
+) -> StreamingResponse:
+    """
+    Respuesta de descarga `filename.{fmt}` con las filas de `stmt`.
+
+    `stmt` debe seleccionar columnas con nombre (`select(Modelo.col, ...)`
+    o `.label(...)`); esos nombres son las claves NDJSON y la cabecera CSV.
+    """
+    return StreamingResponse(
+        _encode(stmt, fmt, yield_per),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -0,0 +1,274 @@
+"""Circuit breaker para dependencias HTTP externas.
+    Tras `failure_threshold` fallos dentro de `failure_window` segundos el
+    circuito se abre y las llamadas fallan de inmediato con `CircuitOpenError`
+    (sin esperar timeouts). Pasados `recovery_timeout` segundos se permite una
+    única llamada de prueba (half-open): si tiene éxito se cierra, si falla se
+    vuelve a abrir.
+
+    El estado se comparte entre workers mediante Redis; cada proceso guarda
+    una copia local que sincroniza como mucho cada `sync_interval` segundos,
+    de modo que el camino rápido (circuito cerrado o abierto) no consulta
+    Redis en cada llamada. Si Redis no responde, el breaker funciona solo con
+    el estado local.
+"""
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge, Histogram
+from redis.exceptions import RedisError
+
+from app.core.cache.redis import _redis
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_KEY = "circuit:{name}"
+# ZSET de instantes de fallo (ventana deslizante, como el deque local)
+CIRCUIT_FAILURES_KEY = "circuit:{name}:failure_times"
+CIRCUIT_PROBE_KEY = "circuit:{name}:probe"
+
+
+# ============================
+# Métricas
+# ============================
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_state",
+    "Estado del circuit breaker (0=cerrado, 1=half-open, 2=abierto)",
+    ["name"],
+)
+CIRCUIT_SHORT_CIRCUITS = Counter(
+    "circuit_breaker_short_circuits_total",
+    "Llamadas rechazadas sin contactar al servicio por circuito abierto",
+    ["name"],
+)
+CIRCUIT_FAILURES = Counter(
+    "circuit_breaker_failures_total",
+    "Fallos registrados por el circuit breaker (errores, timeouts, 5xx)",
+    ["name", "endpoint"],
+)
+EXTERNAL_REQUEST_SECONDS = Histogram(
+    "external_api_request_seconds",
+    "Latencia de llamadas a APIs externas por endpoint",
+    ["name", "endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0),
+)
+
+
+class CircuitOpenError(HTTPException):
+    """El circuito está abierto: el servicio externo se considera caído."""
+
+    def __init__(self, name: str):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Servicio externo no disponible ({name})",
+        )
+        self.name = name
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = _SETTINGS.circuit_breaker_failure_threshold,
+        failure_window: float = _SETTINGS.circuit_breaker_failure_window,
+        recovery_timeout: float = _SETTINGS.circuit_breaker_recovery_timeout,
+        sync_interval: float = _SETTINGS.circuit_breaker_sync_interval,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.recovery_timeout = recovery_timeout
+        self.sync_interval = sync_interval
+
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._synced_at = 0.0
+        self._probe_in_flight = False
+        # Fallos recientes cuando Redis no está disponible
+        self._local_failures: deque[float] = deque()
+        CIRCUIT_STATE.labels(name).set(0)
+
+    # ============================
+    # Estado
+    # ============================
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _set_state(self, state: str, opened_at: Optional[float] = None) -> None:
+        if state != self._state:
+            logger.warning(f"⚡ Circuit breaker '{self.name}': {self._state} -> {state}")
+        self._state = state
+        if opened_at is not None:
+            self._opened_at = opened_at
+        CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+    def _key(self, template: str) -> str:
+        return template.format(name=self.name)
+
+    async def _sync(self, now: float) -> None:
+        """Trae el estado compartido de Redis (como mucho cada `sync_interval`)."""
+        if now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        try:
+            shared = await _redis.get_client().hgetall(self._key(CIRCUIT_KEY))
+        except RedisError:
+            return
+
+        shared_state = shared.get("state", CLOSED)
+        if self._state == HALF_OPEN and shared_state == OPEN:
+            # Este worker está haciendo la llamada de prueba
+            return
+        if shared_state == OPEN:
+            self._set_state(OPEN, float(shared.get("opened_at", now)))
+        elif self._state != CLOSED and shared_state == CLOSED:
+            self._set_state(CLOSED)
+
+    async def _publish(self, state: str, opened_at: float = 0.0) -> None:
+        try:
+            pipe = _redis.get_client().pipeline()
+            pipe.hset(self._key(CIRCUIT_KEY), mapping={"state": state, "opened_at": opened_at})
+            pipe.delete(self._key(CIRCUIT_PROBE_KEY))
+            if state == CLOSED:
+                pipe.delete(self._key(CIRCUIT_FAILURES_KEY))
+            await pipe.execute()
+        except RedisError as e:
+            logger.debug(f"Circuit breaker '{self.name}': no se pudo publicar estado: {e}")
+
+    async def _acquire_probe(self) -> bool:
+        """Solo un worker (y una corrutina) hace la llamada de prueba."""
+        if self._probe_in_flight:
+            return False
+        try:
+            acquired = await _redis.get_client().set(
+                self._key(CIRCUIT_PROBE_KEY), "1", nx=True, ex=max(1, int(self.recovery_timeout))
+            )
+        except RedisError:
+            acquired = True
+        if acquired:
+            self._probe_in_flight = True
+        return bool(acquired)
+
+    async def _abort_probe(self) -> None:
+        """La prueba se canceló sin resultado: vuelve a OPEN para que otra llamada la repita."""
+        self._probe_in_flight = False
+        if self._state != HALF_OPEN:
+            return
+        self._set_state(OPEN)
+        try:
+            await _redis.get_client().delete(self._key(CIRCUIT_PROBE_KEY))
+        except RedisError as e:
+            logger.debug(f"Circuit breaker '{self.name}': no se pudo liberar la prueba: {e}")
+
+    async def _count_failure(self, now: float) -> int:
+        """Fallos dentro de los últimos `failure_window` segundos, incluido este."""
+        key = self._key(CIRCUIT_FAILURES_KEY)
+        try:
+            pipe = _redis.get_client().pipeline()
+            pipe.zadd(key, {f"{now}:{uuid.uuid4().hex[:8]}": now})
+            pipe.zremrangebyscore(key, "-inf", now - self.failure_window)
+            pipe.zcard(key)
+            # Solo limpia la clave si deja de haber fallos; la ventana la marca ZREMRANGEBYSCORE
+            pipe.expire(key, max(1, int(self.failure_window)))
+            _, _, count, _ = await pipe.execute()
+            return int(count)
+        except RedisError:
+            self._local_failures.append(now)
+            while self._local_failures and now - self._local_failures[0] > self.failure_window:
+                self._local_failures.popleft()
+            return len(self._local_failures)
+
+    # ============================
+    # API
+    # ============================
+    async def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: si el circuito está abierto (o hay otra prueba en curso).
+        """
+        now = time.time()
+        await self._sync(now)
+
+        if self._state == CLOSED:
+            return
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            if await self._acquire_probe():
+                self._set_state(HALF_OPEN)
+                return
+
+        CIRCUIT_SHORT_CIRCUITS.labels(self.name).inc()
+        raise CircuitOpenError(self.name)
+
+    async def record_success(self) -> None:
+        self._probe_in_flight = False
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+            self._local_failures.clear()
+            await self._publish(CLOSED)
+
+    async def record_failure(self, endpoint: str) -> None:
+        CIRCUIT_FAILURES.labels(self.name, endpoint).inc()
+        now = time.time()
+        self._probe_in_flight = False
+
+        if self._state == HALF_OPEN or await self._count_failure(now) >= self.failure_threshold:
+            self._set_state(OPEN, now)
+            await self._publish(OPEN, now)
+
+    async def call(
+        self,
+        endpoint: str,
+        fn: Callable[[], Awaitable[T]],
+        budget: float,
+        is_failure: Callable[[T], bool] = lambda _: False,
+    ) -> T:
+        """
+        Ejecuta `fn()` protegida por el breaker y con un presupuesto de latencia.
+
+        Excepciones y timeouts cuentan como fallo y se propagan; además
+        `is_failure(resultado)` permite contar respuestas (p. ej. 5xx) como fallo.
+        """
+        await self.before_call()
+        # Solo la llamada de prueba pasa en HALF_OPEN
+        probe = self._state == HALF_OPEN
+
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(fn(), timeout=budget)
+        except asyncio.CancelledError:
+            # Cliente desconectado o apagado: sin esto el circuito quedaría en HALF_OPEN para siempre
+            if probe:
+                await self._abort_probe()
+            raise
+        except Exception:
+            await self.record_failure(endpoint)
+            raise
+        finally:
+            EXTERNAL_REQUEST_SECONDS.labels(self.name, endpoint).observe(time.perf_counter() - start)
+
+        if is_failure(result):
+            await self.record_failure(endpoint)
+        else:
+            await self.record_success()
+        return result
+
+    def reset(self) -> None:
+        """Vuelve al estado inicial (solo memoria local)."""
+        self._set_state(CLOSED)
+        self._opened_at = 0.0
+        self._synced_at = 0.0
+        self._probe_in_flight = False
+        self._local_failures.clear()
@@ -0,0 +1,88 @@
+"""Módulo para la gestión de clientes HTTP salientes (httpx).
+    Mantiene un `httpx.AsyncClient` por host durante el ciclo de vida de la
+    aplicación, de modo que las llamadas reutilizan conexiones keep-alive en
+    lugar de pagar TCP + TLS en cada petición. Cada host tiene su propio
+    límite de conexiones concurrentes. HTTP/2 se habilita si el paquete `h2`
+    está instalado.
+"""
+import asyncio
+import importlib.util
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config.enviroment import _SETTINGS
+from app.core.tracing.tracer import HTTP, current_traceparent, span
+
+
+# HTTP/2 requiere el extra opcional `httpx[http2]`
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class TracedTransport(httpx.AsyncHTTPTransport):
+    """Transporte con un span `http` por petición y propagación de `traceparent`."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with span(
+            HTTP,
+            f"{request.method} {request.url.host}",
+            **{"http.request.method": request.method, "server.address": request.url.host,
+               "url.path": request.url.path},
+        ) as s:
+            traceparent = current_traceparent()
+            if traceparent:
+                request.headers["traceparent"] = traceparent
+            response = await super().handle_async_request(request)
+            if s is not None:
+                s.attributes["http.response.status_code"] = response.status_code
+            return response
+
+
+# Clase singleton para los clientes HTTP
+class HttpClientManager:
+    _instance = None
+    _clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]]
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._clients = {}
+        return cls._instance
+
+    # Método para obtener el cliente compartido de un host
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        origin = _origin(url)
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(origin)
+        # Las conexiones del pool pertenecen al event loop que las abrió
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+
+        limits = httpx.Limits(
+            max_connections=_SETTINGS.http_client_max_connections_per_host,
+            max_keepalive_connections=_SETTINGS.http_client_max_keepalive,
+            keepalive_expiry=_SETTINGS.http_client_keepalive_expiry,
+        )
+        transport_class = TracedTransport if _SETTINGS.tracing_enabled else httpx.AsyncHTTPTransport
+        client = httpx.AsyncClient(
+            timeout=_SETTINGS.http_client_timeout,
+            # Con `transport` explícito los límites y HTTP/2 se configuran en él
+            transport=transport_class(limits=limits, http2=HTTP2_AVAILABLE),
+        )
+        self._clients[origin] = (loop, client)
+        return client
+
+    # Método para cerrar todos los clientes
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for _, client in clients.values():
+            await client.aclose()
+
+
+# Instancia global
+_http = HttpClientManager()
@@ -0,0 +1,140 @@
+"""
+Pool acotado para operaciones Argon2 (hash / verify).
+
+Argon2 tarda decenas de milisegundos por llamada; ejecutado dentro de un
+handler async bloquea el event loop y detiene todas las demás peticiones del
+worker. Aquí se ejecuta en un ThreadPoolExecutor dedicado (argon2-cffi libera
+el GIL durante el cálculo) con un límite de trabajos en espera: si la cola se
+llena se responde 503 en lugar de acumular latencia sin límite.
+
+Métricas expuestas en /metrics (registro por defecto de Prometheus):
+- `password_hashing_queue_depth`: trabajos esperando un hilo libre.
+- `password_hashing_in_flight`: trabajos ejecutándose.
+- `password_hashing_rejected_total`: trabajos rechazados por cola llena.
+- `password_hashing_wait_seconds`: tiempo en cola antes de ejecutarse.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.config.enviroment import _SETTINGS
+from app.core.tracing.tracer import ARGON2, span
+
+
+T = TypeVar("T")
+
+ERROR_HASHING_BUSY = "Servidor ocupado, intente nuevamente"
+
+
+# ============================
+# Métricas
+# ============================
+HASHING_QUEUE_DEPTH = Gauge(
+    "password_hashing_queue_depth",
+    "Operaciones Argon2 esperando un hilo del pool",
+)
+HASHING_IN_FLIGHT = Gauge(
+    "password_hashing_in_flight",
+    "Operaciones Argon2 en ejecución",
+)
+HASHING_REJECTED = Counter(
+    "password_hashing_rejected_total",
+    "Operaciones Argon2 rechazadas por cola llena",
+)
+HASHING_WAIT_SECONDS = Histogram(
+    "password_hashing_wait_seconds",
+    "Tiempo de espera en cola antes de ejecutar Argon2",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class HashingPool:
+    """Ejecuta funciones bloqueantes de hashing en un pool de hilos acotado."""
+
+    def __init__(
+        self,
+        max_workers: int = _SETTINGS.password_hashing_workers,
+        max_pending: int = _SETTINGS.password_hashing_max_pending,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._running = 0
+        # Los contadores se modifican desde el event loop y desde los hilos del pool
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="argon2",
+            )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Trabajos enviados que aún no tienen hilo asignado."""
+        return self._pending
+
+    @property
+    def in_flight(self) -> int:
+        return self._running
+
+    def _run_job(self, submitted_at: float, fn: Callable[..., T], args: tuple) -> T:
+        # Se ejecuta en el hilo del pool
+        HASHING_WAIT_SECONDS.observe(time.perf_counter() - submitted_at)
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+            HASHING_QUEUE_DEPTH.set(self._pending)
+            HASHING_IN_FLIGHT.set(self._running)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                HASHING_IN_FLIGHT.set(self._running)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Ejecuta `fn(*args)` en el pool y espera su resultado.
+
+        Raises:
+            HTTPException 503: si ya hay `max_pending` trabajos en cola.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                HASHING_REJECTED.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=ERROR_HASHING_BUSY,
+                )
+            self._pending += 1
+            HASHING_QUEUE_DEPTH.set(self._pending)
+
+        job = self._get_executor().submit(self._run_job, time.perf_counter(), fn, args)
+        try:
+            with span(ARGON2, getattr(fn, "__name__", "argon2")):
+                return await asyncio.wrap_future(job)
+        except asyncio.CancelledError:
+            # Si el trabajo no llegó a arrancar, liberar su lugar en la cola
+            if job.cancel():
+                with self._lock:
+                    self._pending -= 1
+                    HASHING_QUEUE_DEPTH.set(self._pending)
+            raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instancia global
+_hashing_pool = HashingPool()
@@ -1,8 +1,10 @@
+import asyncio
 import time
 import uuid
 import jwt
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Awaitable, Optional
 
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -17,6 +19,9 @@ from app.core.cache.redis import _redis
 from app.core.db.database import get_session
 from app.modules.auth.domain.models import AuthUserModel
 from app.core.jwt.secret_rotation import JWTSecretRotation
+from app.core.jwt.principal_cache import _principal_cache, restore_principal
+from app.core.jwt.revocation import REVOCATION_CHANNEL, REVOCATION_CHECKS, REVOCATION_KEY, _revocation_filter
+from app.core.jwt.hashing_pool import _hashing_pool
 
 
 # ============================
@@ -41,10 +46,36 @@ class PasswordHasher:
     def verify(self, password: str, password_hash: str) -> bool:
         return pwd_ctx.verify(password, password_hash)
 
+    # Variantes async: ejecutan Argon2 en el pool acotado para no bloquear el event loop
+    async def hash_async(self, password: str) -> str:
+        return await _hashing_pool.run(self.hash, password)
+
+    async def verify_async(self, password: str, password_hash: str) -> bool:
+        return await _hashing_pool.run(self.verify, password, password_hash)
+
 
 # ============================
 # JWT Manager
 # ============================
+@dataclass(frozen=True)
+class IssuedToken:
+    """Token firmado junto a los claims con los que se firmó (sin volver a decodificar)."""
+    token: str
+    claims: dict[str, Any]
+
+    @property
+    def jti(self) -> str:
+        return self.claims["jti"]
+
+    @property
+    def exp(self) -> int:
+        return self.claims["exp"]
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self.exp, tz=timezone.utc)
+
+
 class JWTManager:
     def __init__(self):
         self.algorithm = _SETTINGS.jwt_algorithm
@@ -62,8 +93,14 @@ class JWTManager:
     def _now(self) -> datetime:
         return datetime.now(timezone.utc)
 
-    def _encode(self, payload: dict, exp_delta: timedelta) -> str:
-        iat = self._now()
+    def _issue(
+        self,
+        payload: dict,
+        exp_delta: timedelta,
+        key: Optional[tuple[str, str]] = None,
+        now: Optional[datetime] = None,
+    ) -> IssuedToken:
+        iat = now or self._now()
         exp = iat + exp_delta
 
         to_encode = payload | {
@@ -72,43 +109,82 @@ class JWTManager:
             "jti": str(uuid.uuid4()),
         }
 
-        current_secret = self.secret_rotation.get_current_secret()
-        return jwt.encode(to_encode, current_secret, algorithm=self.algorithm)
+        kid, current_secret = key or self.secret_rotation.get_current_key()
+        token = jwt.encode(
+            to_encode, current_secret, algorithm=self.algorithm, headers={"kid": kid}
+        )
+        return IssuedToken(token=token, claims=to_encode)
+
+    def _encode(self, payload: dict, exp_delta: timedelta) -> str:
+        return self._issue(payload, exp_delta).token
+
+    @staticmethod
+    def _user_claims(sub: str, token_type: str, role: str, email: str, name: str) -> dict:
+        return {
+            "sub": str(sub),
+            "type": token_type,
+            "role": role,
+            "email": email,
+            "name": name,
+        }
 
     # ============================
     # Token creation
     # ============================
+    def issue_access_token(
+        self, sub: str, role: str, email: str, name: str,
+        key: Optional[tuple[str, str]] = None, now: Optional[datetime] = None,
+    ) -> IssuedToken:
+        return self._issue(self._user_claims(sub, "access", role, email, name), self.access_exp, key, now)
+
+    def issue_refresh_token(
+        self, sub: str, role: str, email: str, name: str,
+        key: Optional[tuple[str, str]] = None, now: Optional[datetime] = None,
+    ) -> IssuedToken:
+        return self._issue(self._user_claims(sub, "refresh", role, email, name), self.refresh_exp, key, now)
+
     def create_access_token(self, sub: str, role: str, email: str, name: str) -> str:
-        return self._encode(
-            {
-                "sub": str(sub),
-                "type": "access",
-                "role": role,
-                "email": email,
-                "name": name,
-            },
-            self.access_exp,
-        )
+        return self.issue_access_token(sub, role, email, name).token
 
     def create_refresh_token(self, sub: str, role: str, email: str, name: str) -> str:
-        return self._encode(
-            {
-                "sub": str(sub),
-                "type": "refresh",
-                "role": role,
-                "email": email,
-                "name": name,
-            },
-            self.refresh_exp,
-        )
+        return self.issue_refresh_token(sub, role, email, name).token
 
     # ============================
     # Decode
     # ============================
     def decode(self, token: str) -> dict[str, Any]:
-        valid_secrets = self.secret_rotation.get_all_valid_secrets()
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.PyJWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=ERROR_INVALID_OR_EXPIRED_TOKEN,
+            )
+
+        if kid is None:
+            return self._decode_legacy(token)
+
+        secret = None
+        if isinstance(kid, str):
+            secret = self.secret_rotation.get_valid_secret(kid)
+            # kid desconocido: puede que otro worker acabe de rotar
+            if secret is None and self.secret_rotation.refresh():
+                secret = self.secret_rotation.get_valid_secret(kid)
+
+        if secret is not None:
+            try:
+                return jwt.decode(token, secret, algorithms=[self.algorithm])
+            except jwt.PyJWTError:
+                pass
+
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERROR_INVALID_OR_EXPIRED_TOKEN,
+        )
 
-        for secret in valid_secrets:
+    def _decode_legacy(self, token: str) -> dict[str, Any]:
+        """Tokens emitidos antes de usar `kid`: se prueba con cada secret válido."""
+        for secret in self.secret_rotation.get_all_valid_secrets():
             try:
                 return jwt.decode(token, secret, algorithms=[self.algorithm])
             except jwt.PyJWTError:
@@ -123,19 +199,30 @@ class JWTManager:
     # Redis helpers (SEGUROS)
     # ============================
     async def is_revoked(self, jti: str) -> bool:
+        # Sin red si el filtro local descarta el jti (ver app.core.jwt.revocation)
+        local = _revocation_filter.check(jti)
+        if local is not None:
+            return local
         if not self.redis:
             return True
+        REVOCATION_CHECKS.labels("redis").inc()
         try:
-            return bool(await self.redis.exists(f"bl:{jti}"))
+            return bool(await self.redis.exists(REVOCATION_KEY.format(jti=jti)))
         except RedisError:
             return True
 
     async def revoke_until(self, jti: str, exp_ts: int) -> None:
+        ttl = exp_ts - int(time.time())
+        if ttl <= 0:
+            return
+        _revocation_filter.add(jti)
         if not self.redis:
             return
-        ttl = max(0, exp_ts - int(time.time()))
         try:
-            await self.redis.setex(f"bl:{jti}", ttl, "1")
+            pipe = self.redis.pipeline()
+            pipe.setex(REVOCATION_KEY.format(jti=jti), ttl, "1")
+            pipe.publish(REVOCATION_CHANNEL, jti)
+            await pipe.execute()
         except RedisError:
             pass
 
@@ -170,13 +257,54 @@ class JWTManager:
 
 
 # ============================
-# Get current user
+# Emisión de pares de tokens
 # ============================
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_session),
-) -> AuthUserModel:
+@dataclass(frozen=True)
+class IssuedTokenPair:
+    access: IssuedToken
+    refresh: IssuedToken
+
+
+class TokenPairIssuer:
+    """
+    Emite el par access/refresh de un login o refresh.
+
+    Los claims (`jti`, `exp`) salen de la propia emisión: no hace falta volver
+    a decodificar (y verificar) los tokens recién firmados. Ambos se firman
+    con la misma clave activa y el mismo `iat`.
+    """
+
+    def __init__(self, jwtm: JWTManager):
+        self.jwtm = jwtm
+
+    def issue(self, sub: str, role: str, email: str, name: str) -> IssuedTokenPair:
+        key = self.jwtm.secret_rotation.get_current_key()
+        now = self.jwtm._now()
+        return IssuedTokenPair(
+            access=self.jwtm.issue_access_token(sub, role, email, name, key=key, now=now),
+            refresh=self.jwtm.issue_refresh_token(sub, role, email, name, key=key, now=now),
+        )
+
+    async def persist(self, pair: IssuedTokenPair, session_write: Awaitable[Any]) -> None:
+        """
+        Guarda el refresh en Redis y, a la vez, ejecuta `session_write` (la
+        escritura de la sesión en la base de datos). Espera a ambas antes de
+        propagar el primer error.
+        """
+        results = await asyncio.gather(
+            self.jwtm.store_refresh(pair.refresh.jti, pair.refresh.claims["sub"], pair.refresh.exp),
+            session_write,
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
 
+# ============================
+# Get current user
+# ============================
+async def _validate_access_token(token: str) -> dict[str, Any]:
     jwtm = JWTManager()
     payload = jwtm.decode(token)
 
@@ -187,17 +315,19 @@ async def get_current_user(
     if not jti or await jwtm.is_revoked(jti):
         raise HTTPException(status_code=401, detail=ERROR_SESSION_EXPIRED)
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(status_code=401, detail=ERROR_INVALID_TOKEN)
 
-    # ⚠️ user_id se guarda como string → convertir a int
+    return payload
+
+
+async def _load_user(session: AsyncSession, user_id: int) -> Optional[AuthUserModel]:
     # Importar UserModel aquí para evitar ciclos si es necesario, o asegura que está arriba
     from app.modules.auth.domain.models.user_model import UserModel
 
     result = await session.execute(
         select(AuthUserModel)
-        .where(AuthUserModel.id == int(user_id))
+        .where(AuthUserModel.id == user_id)
         .options(
             selectinload(AuthUserModel.profile).options(
                 selectinload(UserModel.atleta),
@@ -206,9 +336,33 @@ async def get_current_user(
             )
         )
     )
-    user = result.scalar_one_or_none()
+    return result.scalar_one_or_none()
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_session),
+) -> AuthUserModel:
+    """
+    Usuario autenticado a partir del access token.
+
+    El usuario se sirve desde el principal cache (por `jti`) cuando es posible;
+    en ese caso las columnas de credenciales no vienen cargadas
+    (ver `AuthUsersRepository.load_credentials`).
+    """
+    payload = await _validate_access_token(token)
+    jti = payload["jti"]
+
+    snapshot = await _principal_cache.get(jti)
+    if snapshot is not None:
+        return await restore_principal(session, snapshot)
+
+    # ⚠️ user_id se guarda como string → convertir a int
+    user = await _load_user(session, int(payload["sub"]))
 
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail=ERROR_UNAUTHORIZED_USER)
 
+    await _principal_cache.set(jti, user, payload["exp"])
     return user
+
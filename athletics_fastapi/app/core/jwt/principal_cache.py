@@ -0,0 +1,354 @@
+"""
+Caché de principales autenticados para `get_current_user`.
+
+Guarda una instantánea compacta (usuario + perfil + sub-entidad de rol) indexada
+por el `jti` del access token. Tiene dos niveles:
+
+- LRU en memoria del proceso, con TTL corto y acotado por el `exp` del token.
+- Redis, compartido entre workers, con TTL igual al tiempo de vida restante del token.
+
+Las invalidaciones borran la entrada de Redis y se publican en
+`PRINCIPAL_INVALIDATION_CHANNEL`; `listen_principal_invalidations` (tarea del
+lifespan) las aplica al LRU de cada worker. El LRU local solo se usa mientras
+esa suscripción está activa: si se pierde, se vacía y se lee de Redis hasta
+reconectar, para no servir un rol o un usuario desactivado ya invalidados.
+
+Las credenciales (hash de contraseña, secreto TOTP y códigos de respaldo) nunca
+se guardan en la instantánea; las rutas que las necesitan deben cargarlas con
+`AuthUsersRepository.load_credentials`.
+"""
+import asyncio
+import enum
+import json
+import time
+import uuid
+import datetime
+from collections import OrderedDict
+from typing import Any, Optional
+
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache.redis import _redis
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+from app.modules.auth.domain.models import AuthUserModel, UserModel
+
+
+# Columnas de AuthUserModel que NO deben salir del proceso
+CREDENTIAL_COLUMNS = frozenset({"hashed_password", "totp_secret", "totp_backup_codes"})
+
+# Sub-entidades de rol cargadas junto al perfil
+ROLE_RELATIONSHIPS = ("atleta", "entrenador", "representante")
+
+PRINCIPAL_KEY = "principal:{jti}"
+PRINCIPAL_USER_INDEX_KEY = "principal:user:{user_id}"
+PRINCIPAL_INVALIDATION_CHANNEL = "principal:invalidate"
+
+PRINCIPAL_INVALIDATION_FAILURES = Counter(
+    "principal_cache_invalidation_failures_total",
+    "Invalidaciones que no llegaron a Redis (la instantánea puede seguir en caché)",
+)
+
+
+# ============================
+# Serialización
+# ============================
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _from_json(value: Any, python_type: type) -> Any:
+    if value is None:
+        return None
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    if isinstance(python_type, type) and issubclass(python_type, enum.Enum):
+        return python_type(value)
+    return value
+
+
+def _dump_columns(instance: Any, exclude: frozenset = frozenset()) -> dict:
+    mapper = sa_inspect(type(instance))
+    return {
+        attr.key: _to_json(getattr(instance, attr.key))
+        for attr in mapper.column_attrs
+        if attr.key not in exclude
+    }
+
+
+def _load_columns(model: type, data: dict) -> Any:
+    mapper = sa_inspect(model)
+    instance = model()
+    for attr in mapper.column_attrs:
+        if attr.key not in data:
+            continue
+        python_type = attr.columns[0].type.python_type
+        setattr(instance, attr.key, _from_json(data[attr.key], python_type))
+    return instance
+
+
+def snapshot_principal(user: AuthUserModel) -> dict:
+    """
+    Construye la instantánea serializable de un usuario autenticado.
+
+    Requiere que `profile` y sus sub-entidades de rol estén cargados.
+    """
+    profile = user.profile
+    snapshot = {
+        "user": _dump_columns(user, exclude=CREDENTIAL_COLUMNS),
+        "profile": None,
+    }
+    if profile is not None:
+        snapshot["profile"] = _dump_columns(profile)
+        for rel in ROLE_RELATIONSHIPS:
+            related = getattr(profile, rel)
+            snapshot[rel] = _dump_columns(related) if related is not None else None
+    return snapshot
+
+
+async def restore_principal(session: AsyncSession, snapshot: dict) -> AuthUserModel:
+    """
+    Reconstruye el usuario desde la instantánea y lo asocia a la sesión sin
+    consultar la base de datos (`merge(load=False)`).
+
+    El objeto devuelto es persistente: los cambios que hagan las rutas se
+    emiten como UPDATE al hacer commit, igual que con el objeto cargado.
+    """
+    from app.modules.atleta.domain.models.atleta_model import Atleta
+    from app.modules.entrenador.domain.models.entrenador_model import Entrenador
+    from app.modules.representante.domain.models.representante_model import Representante
+
+    role_models = {"atleta": Atleta, "entrenador": Entrenador, "representante": Representante}
+
+    user = _load_columns(AuthUserModel, snapshot["user"])
+    detached = [user]
+
+    if snapshot.get("profile") is not None:
+        profile = _load_columns(UserModel, snapshot["profile"])
+        for rel, model in role_models.items():
+            data = snapshot.get(rel)
+            related = _load_columns(model, data) if data is not None else None
+            setattr(profile, rel, related)
+            if related is not None:
+                detached.append(related)
+        user.profile = profile
+        detached.append(profile)
+    else:
+        user.profile = None
+
+    for instance in detached:
+        make_transient_to_detached(instance)
+
+    return await session.merge(user, load=False)
+
+
+# ============================
+# LRU local con TTL
+# ============================
+class _LocalLRU:
+    """LRU mínimo con expiración por entrada (reloj monotónico)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, int, dict]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, user_id: int, value: dict, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, user_id, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def pop_user(self, user_id: int) -> None:
+        stale = [k for k, (_, uid, _) in self._data.items() if uid == user_id]
+        for key in stale:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ============================
+# Principal cache
+# ============================
+class PrincipalCache:
+    """
+    Caché de dos niveles (memoria + Redis) de principales por `jti`.
+
+    Los errores de Redis al leer o escribir se ignoran: en el peor caso se
+    vuelve a consultar la base de datos. Los de las invalidaciones se
+    registran como warning.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = _SETTINGS.principal_cache_max_entries,
+        local_ttl: int = _SETTINGS.principal_cache_local_ttl,
+        enabled: bool = _SETTINGS.principal_cache_enabled,
+    ):
+        self.enabled = enabled
+        self.local_ttl = local_ttl
+        self._local = _LocalLRU(max_entries)
+        # True mientras este worker recibe las invalidaciones de los demás
+        self._local_synced = False
+
+    def _redis(self):
+        return _redis.get_client()
+
+    async def get(self, jti: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        snapshot = self._local.get(jti) if self._local_synced else None
+        if snapshot is not None:
+            return snapshot
+
+        try:
+            raw = await self._redis().get(PRINCIPAL_KEY.format(jti=jti))
+        except RedisError:
+            return None
+        if not raw:
+            return None
+
+        envelope = json.loads(raw)
+        ttl = min(self.local_ttl, envelope["exp"] - time.time())
+        if ttl > 0 and self._local_synced:
+            self._local.set(jti, envelope["user_id"], envelope["snapshot"], ttl)
+        return envelope["snapshot"]
+
+    async def set(self, jti: str, user: AuthUserModel, exp_ts: int) -> None:
+        if not self.enabled:
+            return
+
+        ttl = int(exp_ts - time.time())
+        if ttl <= 0:
+            return
+
+        snapshot = snapshot_principal(user)
+        if self._local_synced:
+            self._local.set(jti, user.id, snapshot, min(self.local_ttl, ttl))
+
+        envelope = json.dumps({"user_id": user.id, "exp": exp_ts, "snapshot": snapshot})
+        index_key = PRINCIPAL_USER_INDEX_KEY.format(user_id=user.id)
+        try:
+            pipe = self._redis().pipeline()
+            pipe.setex(PRINCIPAL_KEY.format(jti=jti), ttl, envelope)
+            pipe.sadd(index_key, jti)
+            # El índice debe sobrevivir a cualquier access token del usuario
+            pipe.expire(index_key, _SETTINGS.access_token_expires_minutes * 60)
+            await pipe.execute()
+        except RedisError as e:
+            logger.debug(f"Principal cache: no se pudo escribir en Redis: {e}")
+
+    async def invalidate_jti(self, jti: str) -> None:
+        """Elimina la instantánea de un token concreto (en todos los workers)."""
+        self._local.pop(jti)
+        try:
+            pipe = self._redis().pipeline()
+            pipe.delete(PRINCIPAL_KEY.format(jti=jti))
+            pipe.publish(PRINCIPAL_INVALIDATION_CHANNEL, json.dumps({"jti": jti}))
+            await pipe.execute()
+        except RedisError as e:
+            PRINCIPAL_INVALIDATION_FAILURES.inc()
+            logger.warning(f"⚠️ Principal cache: no se pudo invalidar {jti}: {e}")
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Elimina las instantáneas de todos los tokens de un usuario (auth_users.id) en todos los workers."""
+        self._local.pop_user(user_id)
+        index_key = PRINCIPAL_USER_INDEX_KEY.format(user_id=user_id)
+        try:
+            client = self._redis()
+            jtis = await client.smembers(index_key)
+            pipe = client.pipeline()
+            pipe.delete(index_key, *[PRINCIPAL_KEY.format(jti=jti) for jti in jtis])
+            pipe.publish(PRINCIPAL_INVALIDATION_CHANNEL, json.dumps({"user_id": user_id}))
+            await pipe.execute()
+        except RedisError as e:
+            PRINCIPAL_INVALIDATION_FAILURES.inc()
+            logger.warning(f"⚠️ Principal cache: no se pudo invalidar usuario {user_id}: {e}")
+
+    def apply_invalidation(self, data: str) -> None:
+        """Aplica al LRU local una invalidación publicada por otro worker."""
+        message = json.loads(data)
+        if "jti" in message:
+            self._local.pop(message["jti"])
+        if "user_id" in message:
+            self._local.pop_user(message["user_id"])
+
+    def mark_synced(self) -> None:
+        self._local_synced = True
+
+    def mark_disconnected(self) -> None:
+        # Las invalidaciones perdidas mientras tanto no llegarán: se descarta el LRU
+        self._local_synced = False
+        self._local.clear()
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+# Instancia global
+_principal_cache = PrincipalCache()
+
+
+async def listen_principal_invalidations(logger, retry_seconds: float = 5.0):
+    """Aplica al LRU local las invalidaciones de los demás workers (tarea del lifespan)."""
+    if not _principal_cache.enabled:
+        return
+    try:
+        while True:
+            pubsub = None
+            try:
+                pubsub = _redis.get_client().pubsub()
+                await pubsub.subscribe(PRINCIPAL_INVALIDATION_CHANNEL)
+                _principal_cache.mark_synced()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "message":
+                        _principal_cache.apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _principal_cache.mark_disconnected()
+                logger.warning(f"⚠️ Listener de invalidaciones del principal cache desconectado: {e}")
+                await asyncio.sleep(retry_seconds)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+    except asyncio.CancelledError:
+        _principal_cache.mark_disconnected()
+        logger.info("🛑 Principal cache listener cancelled")
+        return
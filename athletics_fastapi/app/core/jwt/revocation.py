@@ -0,0 +1,193 @@
+"""
+Filtro local de tokens revocados para `JWTManager.is_revoked`.
+
+Cada worker mantiene un filtro de Bloom con los `jti` de la lista negra de
+Redis (`bl:{jti}`):
+
+- Al arrancar `listen_revocations` se suscribe a `REVOCATION_CHANNEL` y
+  después recorre `bl:*` con SCAN (suscribirse primero evita perder las
+  revocaciones hechas durante el recorrido).
+- `JWTManager.revoke_until` escribe la clave y publica el `jti` en la misma
+  pipeline; cada worker lo añade al recibirlo.
+- Cada `REVOCATION_FILTER_REBUILD_INTERVAL` segundos (y tras cada
+  reconexión) el filtro se reconstruye, lo que descarta los `jti` ya
+  expirados.
+
+`check(jti)` responde sin red cuando el filtro dice "no está" (el caso de
+casi todas las peticiones). Un positivo (revocado o falso positivo, tasa
+`REVOCATION_FILTER_ERROR_RATE`) se confirma en Redis.
+
+Staleness acotada: si se pierde la suscripción, el filtro se sigue usando
+durante `REVOCATION_MAX_STALENESS` segundos (una caída corta de Redis no
+cierra todas las sesiones). Pasado ese tiempo, o antes de la primera carga,
+se vuelve a consultar Redis en cada petición y se falla cerrado si no
+responde. Las revocaciones hechas mientras la suscripción está caída pueden
+tardar hasta ese tiempo en verse en los demás workers.
+"""
+import asyncio
+import hashlib
+import math
+import time
+from typing import Iterable, Optional
+
+from prometheus_client import Counter, Gauge
+
+from app.core.cache.redis import _redis
+from app.core.config.enviroment import _SETTINGS
+
+
+REVOCATION_CHANNEL = "jwt:revoked"
+REVOCATION_KEY = "bl:{jti}"
+
+
+# ============================
+# Métricas
+# ============================
+REVOCATION_CHECKS = Counter(
+    "jwt_revocation_checks_total",
+    "Consultas de revocación por origen de la respuesta",
+    ["source"],  # local | redis
+)
+REVOCATION_FILTER_ENTRIES = Gauge(
+    "jwt_revocation_filter_entries",
+    "jti añadidos al filtro local desde la última reconstrucción",
+)
+REVOCATION_FILTER_SYNCED = Gauge(
+    "jwt_revocation_filter_synced",
+    "1 si el filtro local está suscrito a las revocaciones",
+)
+
+
+# ============================
+# Filtro de Bloom
+# ============================
+class BloomFilter:
+    """Filtro de Bloom de tamaño fijo (doble hash sobre blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationFilter:
+    def __init__(
+        self,
+        enabled: bool = _SETTINGS.revocation_filter_enabled,
+        capacity: int = _SETTINGS.revocation_filter_capacity,
+        error_rate: float = _SETTINGS.revocation_filter_error_rate,
+        max_staleness: float = _SETTINGS.revocation_max_staleness,
+    ):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_staleness = max_staleness
+        self._filter: Optional[BloomFilter] = None
+        self._synced = False
+        self._disconnected_at = 0.0
+
+    def _fresh(self) -> bool:
+        if self._filter is None:
+            return False
+        return self._synced or time.monotonic() - self._disconnected_at <= self.max_staleness
+
+    def check(self, jti: str) -> Optional[bool]:
+        """False si seguro no está revocado; None si hay que consultar Redis."""
+        if not self.enabled or not self._fresh() or jti in self._filter:
+            return None
+        REVOCATION_CHECKS.labels("local").inc()
+        return False
+
+    def add(self, jti: str) -> None:
+        if self._filter is not None:
+            self._filter.add(jti)
+            REVOCATION_FILTER_ENTRIES.set(self._filter.count)
+
+    def load(self, jtis: Iterable[str]) -> None:
+        """Sustituye el filtro por uno nuevo con `jtis`."""
+        jtis = list(jtis)
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        REVOCATION_FILTER_ENTRIES.set(bloom.count)
+
+    def mark_synced(self) -> None:
+        self._synced = True
+        REVOCATION_FILTER_SYNCED.set(1)
+
+    def mark_disconnected(self) -> None:
+        if self._synced:
+            self._disconnected_at = time.monotonic()
+        self._synced = False
+        REVOCATION_FILTER_SYNCED.set(0)
+
+    def reset(self) -> None:
+        self._filter = None
+        self._synced = False
+        REVOCATION_FILTER_SYNCED.set(0)
+
+
+# Instancia global
+_revocation_filter = RevocationFilter()
+
+
+async def _scan_revoked(client) -> list[str]:
+    prefix = REVOCATION_KEY.format(jti="")
+    return [key[len(prefix):] async for key in client.scan_iter(match=f"{prefix}*", count=1000)]
+
+
+async def listen_revocations(logger, retry_seconds: float = 5.0):
+    """Mantiene `_revocation_filter` sincronizado con Redis (tarea del lifespan)."""
+    if not _revocation_filter.enabled:
+        return
+    try:
+        while True:
+            pubsub = None
+            try:
+                client = _redis.get_client()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                _revocation_filter.load(await _scan_revoked(client))
+                _revocation_filter.mark_synced()
+                rebuild_at = time.monotonic() + _SETTINGS.revocation_filter_rebuild_interval
+                logger.info(f"🛡️ Filtro de revocaciones cargado ({_revocation_filter._filter.count} jti)")
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "message":
+                        _revocation_filter.add(message["data"])
+                    if time.monotonic() >= rebuild_at:
+                        _revocation_filter.load(await _scan_revoked(client))
+                        rebuild_at = time.monotonic() + _SETTINGS.revocation_filter_rebuild_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _revocation_filter.mark_disconnected()
+                logger.warning(f"⚠️ Listener de revocaciones desconectado: {e}")
+                await asyncio.sleep(retry_seconds)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+    except asyncio.CancelledError:
+        _revocation_filter.reset()
+        logger.info("🛑 Revocation listener cancelled")
+        return
@@ -1,12 +1,240 @@
 """
 Sistema de rotación de JWT secrets para mayor seguridad.
 Permite mantener múltiples secrets activos durante el período de transición.
+
+Los secrets se leen una sola vez por proceso (`JWTKeyring`) y se recargan
+cuando cambia el mtime de `jwt_secrets.json` o cuando otro worker publica
+una rotación en Redis.
 """
+import asyncio
+import hashlib
+import os
 import secrets
 import json
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional
+
+ROTATION_CHANNEL = "jwt:secrets:rotated"
+
+
+def secret_kid(secret: str) -> str:
+    """Identificador público (`kid`) de un secret: no permite recuperarlo."""
+    return hashlib.sha256(secret.encode()).hexdigest()[:16]
+
+
+class SecretEntry(NamedTuple):
+    """Secret ya parseado, con sus fechas y kid precalculados."""
+    kid: str
+    secret: str
+    created_at: datetime
+    active: bool
+    valid_until: datetime
+
+
+class JWTKeyring:
+    """
+    Copia en memoria de un archivo de secrets, compartida por todo el proceso.
+
+    El archivo solo se vuelve a leer si su mtime cambió (comprobado como mucho
+    cada `check_interval` segundos) o si se invalida explícitamente.
+    """
+
+    def __init__(
+        self,
+        secrets_file: Path,
+        rotation_days: int,
+        grace_period_days: int,
+        check_interval: float = 5.0,
+    ):
+        self.secrets_file = secrets_file
+        self.rotation_days = rotation_days
+        self.grace_period_days = grace_period_days
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._mtime: Optional[int] = None
+        self._checked_at = 0.0
+        self._raw: List[Dict] = []
+        self._entries: List[SecretEntry] = []
+        self._current: Optional[SecretEntry] = None
+        self._valid: List[str] = []
+        self._valid_by_kid: Dict[str, str] = {}
+        self._valid_recompute_at: Optional[datetime] = None
+
+    # ---------- carga ----------
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.secrets_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _read_file(self) -> List[Dict]:
+        if not self.secrets_file.exists():
+            return []
+        try:
+            with open(self.secrets_file, 'r') as f:
+                return json.load(f).get('secrets', [])
+        except Exception:
+            return []
+
+    def _build(self, raw: List[Dict]) -> None:
+        # El secret vive mientras su antigüedad en días completos no supere
+        # rotation_days + grace_period_days (mismo criterio que antes).
+        lifetime = timedelta(days=self.rotation_days + self.grace_period_days + 1)
+        entries = []
+        for data in raw:
+            created_at = datetime.fromisoformat(data['created_at'])
+            entries.append(SecretEntry(
+                kid=secret_kid(data['secret']),
+                secret=data['secret'],
+                created_at=created_at,
+                active=bool(data.get('active', False)),
+                valid_until=created_at + lifetime,
+            ))
+
+        active = sorted((e for e in entries if e.active), key=lambda e: e.created_at, reverse=True)
+
+        self._raw = raw
+        self._entries = entries
+        self._current = active[0] if active else None
+        self._valid_recompute_at = None
+
+    def _recompute_valid(self, now: datetime) -> None:
+        valid = [e for e in self._entries if e.active or now < e.valid_until]
+        # Próximo instante en que algún secret de gracia deja de ser válido
+        upcoming = [e.valid_until for e in valid if not e.active]
+        self._valid = [e.secret for e in valid]
+        self._valid_by_kid = {e.kid: e.secret for e in valid}
+        self._valid_recompute_at = min(upcoming) if upcoming else datetime.max.replace(tzinfo=timezone.utc)
+
+    def refresh(self, check_now: bool = False) -> bool:
+        """
+        Recarga el archivo si su mtime cambió. Retorna True si se recargó.
+        
+        Sin `check_now`, el mtime se consulta como mucho cada `check_interval` segundos.
+        """
+        now = time.monotonic()
+        if not check_now and now - self._checked_at < self.check_interval:
+            return False
+
+        with self._lock:
+            self._checked_at = now
+            mtime = self._stat_mtime()
+            if mtime == self._mtime:
+                return False
+            self._mtime = mtime
+            self._build(self._read_file())
+            return True
+
+    def reload(self) -> None:
+        """Relee el archivo sin comparar mtime (tras escribirlo este mismo proceso)."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            self._mtime = self._stat_mtime()
+            self._build(self._read_file())
+
+    def invalidate(self) -> None:
+        """Fuerza la relectura del archivo en el próximo acceso."""
+        self._checked_at = 0.0
+        self._mtime = -1
+
+    # ---------- lectura ----------
+    def raw(self) -> List[Dict]:
+        self.refresh()
+        return [dict(s) for s in self._raw]
+
+    def current(self) -> Optional[SecretEntry]:
+        self.refresh()
+        return self._current
+
+    def current_secret(self) -> Optional[str]:
+        current = self.current()
+        return current.secret if current else None
+
+    def _ensure_valid(self) -> None:
+        self.refresh()
+        now = datetime.now(timezone.utc)
+        if self._valid_recompute_at is None or now >= self._valid_recompute_at:
+            self._recompute_valid(now)
+
+    def valid_secrets(self) -> List[str]:
+        self._ensure_valid()
+        return self._valid
+
+    def valid_secret_for(self, kid: str) -> Optional[str]:
+        self._ensure_valid()
+        return self._valid_by_kid.get(kid)
+
+    def entries(self) -> List[SecretEntry]:
+        self.refresh()
+        return self._entries
+
+
+_keyrings: Dict[Path, JWTKeyring] = {}
+_keyrings_lock = threading.Lock()
+
+
+def get_keyring(secrets_file: Path, rotation_days: int, grace_period_days: int) -> JWTKeyring:
+    """Retorna el keyring del proceso para el archivo dado (uno por ruta)."""
+    key = secrets_file.resolve()
+    keyring = _keyrings.get(key)
+    if keyring is None:
+        with _keyrings_lock:
+            keyring = _keyrings.setdefault(
+                key, JWTKeyring(secrets_file, rotation_days, grace_period_days)
+            )
+    return keyring
+
+
+def invalidate_keyrings() -> None:
+    """Invalida todos los keyrings del proceso (p. ej. tras una rotación remota)."""
+    for keyring in list(_keyrings.values()):
+        keyring.invalidate()
+
+
+async def publish_rotation() -> None:
+    """Avisa al resto de workers que los secrets se rotaron."""
+    from redis.exceptions import RedisError
+    from app.core.cache.redis import _redis
+    from app.core.logging.logger import logger
+
+    try:
+        await _redis.get_client().publish(ROTATION_CHANNEL, datetime.now(timezone.utc).isoformat())
+    except RedisError as e:
+        logger.warning(f"⚠️ No se pudo publicar la rotación de JWT secrets: {e}")
+
+
+async def listen_secret_rotations(logger, retry_seconds: float = 30.0):
+    """Escucha rotaciones publicadas por otros workers e invalida los keyrings."""
+    from app.core.cache.redis import _redis
+
+    try:
+        while True:
+            pubsub = None
+            try:
+                pubsub = _redis.get_client().pubsub()
+                await pubsub.subscribe(ROTATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        invalidate_keyrings()
+                        logger.info("🔐 JWT secrets recargados tras rotación remota")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Listener de rotación JWT desconectado: {e}")
+                await asyncio.sleep(retry_seconds)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+    except asyncio.CancelledError:
+        logger.info("🛑 JWT rotation listener cancelled")
+        return
 
 
 class JWTSecretRotation:
@@ -16,22 +244,15 @@ class JWTSecretRotation:
         self.secrets_file = Path(secrets_file)
         self.rotation_days = 90
         self.grace_period_days = 30  # Período de gracia para tokens antiguos
+        self.keyring = get_keyring(self.secrets_file, self.rotation_days, self.grace_period_days)
         
     def _generate_secret(self) -> str:
         """Genera un secret aleatorio criptográficamente seguro."""
         return secrets.token_urlsafe(64)
     
     def _load_secrets(self) -> List[Dict]:
-        """Carga los secrets del archivo."""
-        if not self.secrets_file.exists():
-            return []
-        
-        try:
-            with open(self.secrets_file, 'r') as f:
-                data = json.load(f)
-                return data.get('secrets', [])
-        except Exception:
-            return []
+        """Carga los secrets (copia desde el keyring en memoria)."""
+        return self.keyring.raw()
     
     def _save_secrets(self, secrets_list: List[Dict]) -> None:
         """Guarda los secrets en el archivo."""
@@ -40,8 +261,12 @@ class JWTSecretRotation:
             'last_updated': datetime.now(timezone.utc).isoformat()
         }
         
-        with open(self.secrets_file, 'w') as f:
+        # Escritura atómica: otros workers nunca leen un archivo a medias
+        tmp_file = self.secrets_file.with_name(self.secrets_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_file, self.secrets_file)
+        self.keyring.reload()
     
     def initialize(self) -> str:
         """
@@ -67,39 +292,39 @@ class JWTSecretRotation:
     
     def get_current_secret(self) -> str:
         """Obtiene el secret actualmente activo para FIRMAR nuevos tokens."""
-        secrets_list = self._load_secrets()
-        
-        if not secrets_list:
-            return self.initialize()
+        current = self.keyring.current_secret()
         
-        # Buscar el secret activo más reciente
-        active_secrets = [s for s in secrets_list if s.get('active', False)]
-        
-        if not active_secrets:
+        if current is None:
             return self.initialize()
         
-        # Retornar el más reciente
-        active_secrets.sort(key=lambda x: x['created_at'], reverse=True)
-        return active_secrets[0]['secret']
+        return current
     
     def get_all_valid_secrets(self) -> List[str]:
         """
         Obtiene TODOS los secrets válidos para VERIFICAR tokens.
         Incluye el activo y los que están en período de gracia.
         """
-        secrets_list = self._load_secrets()
-        valid_secrets = []
-        now = datetime.now(timezone.utc)
+        valid_secrets = self.keyring.valid_secrets()
         
-        for secret_data in secrets_list:
-            created_at = datetime.fromisoformat(secret_data['created_at'])
-            age_days = (now - created_at).days
-            
-            # Incluir si está activo O dentro del período de gracia
-            if secret_data.get('active') or age_days <= (self.rotation_days + self.grace_period_days):
-                valid_secrets.append(secret_data['secret'])
-        
-        return valid_secrets if valid_secrets else [self.get_current_secret()]
+        return list(valid_secrets) if valid_secrets else [self.get_current_secret()]
+
+    def get_current_key(self) -> tuple[str, str]:
+        """Retorna `(kid, secret)` del secret activo para firmar."""
+        current = self.keyring.current()
+        
+        if current is None:
+            secret = self.initialize()
+            return secret_kid(secret), secret
+        
+        return current.kid, current.secret
+
+    def get_valid_secret(self, kid: str) -> Optional[str]:
+        """Retorna el secret válido con ese `kid`, o None si no existe o expiró."""
+        return self.keyring.valid_secret_for(kid)
+
+    def refresh(self) -> bool:
+        """Comprueba ya mismo si el archivo cambió. Retorna True si se recargó."""
+        return self.keyring.refresh(check_now=True)
     
     def should_rotate(self) -> bool:
         """Verifica si es momento de rotar el secret."""
@@ -0,0 +1,205 @@
+"""
+Tareas de mantenimiento periódicas coordinadas entre workers.
+
+Todos los workers corren el mismo `MaintenanceScheduler`, pero cada tarea
+solo se ejecuta en el worker que consigue su lock en Redis
+(`maintenance:<nombre>`, `SET NX` con token). El lock dura `interval`
+segundos y no se libera al terminar: sirve también de marca de "última
+ejecución", de modo que en todo el clúster (y entre reinicios) la tarea corre
+como mucho una vez por intervalo.
+
+Las tareas trabajan por lotes y llaman a `run.checkpoint()` entre lote y
+lote: renueva el lock si hace falta y lanza `MaintenanceLockLost` si otro
+worker se lo quedó (p. ej. tras una caída de Redis), para no duplicar
+trabajo. Si Redis no responde al intentar el lock, la tarea no se ejecuta en
+esa vuelta.
+
+Uso:
+
+    _maintenance.register("sessions_cleanup", 3600, cleanup_sessions)
+    _maintenance.start()
+    ...
+    await _maintenance.stop()
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from redis.exceptions import LockError, RedisError
+
+from app.core.cache.redis import _redis
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+
+
+LOCK_KEY = "maintenance:{name}"
+
+
+# ============================
+# Métricas
+# ============================
+MAINTENANCE_RUNS = Counter(
+    "maintenance_runs_total",
+    "Ejecuciones de tareas de mantenimiento en este worker",
+    ["job", "result"],
+)
+MAINTENANCE_ROWS = Counter(
+    "maintenance_rows_total",
+    "Filas procesadas por las tareas de mantenimiento",
+    ["job", "action"],
+)
+MAINTENANCE_BATCHES = Counter(
+    "maintenance_batches_total",
+    "Lotes confirmados por las tareas de mantenimiento",
+    ["job", "action"],
+)
+MAINTENANCE_RUNNING = Gauge(
+    "maintenance_running",
+    "1 mientras este worker ejecuta la tarea (tiene el lock)",
+    ["job"],
+)
+MAINTENANCE_LAST_SUCCESS = Gauge(
+    "maintenance_last_success_timestamp_seconds",
+    "Fin de la última ejecución correcta en este worker (epoch)",
+    ["job"],
+)
+MAINTENANCE_DURATION = Histogram(
+    "maintenance_run_seconds",
+    "Duración de las ejecuciones de mantenimiento",
+    ["job"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600),
+)
+
+
+class MaintenanceLockLost(Exception):
+    """El lock de la tarea expiró o lo tiene otro worker."""
+
+
+@dataclass
+class MaintenanceJob:
+    name: str
+    interval: float  # segundos; también TTL del lock
+    func: Callable[["MaintenanceRun"], Awaitable[None]]
+
+
+@dataclass
+class MaintenanceRun:
+    """Contexto de una ejecución: renovación del lock y progreso."""
+    job: MaintenanceJob
+    lock: object
+    renewed_at: float = field(default_factory=time.monotonic)
+    rows: dict[str, int] = field(default_factory=dict)
+
+    async def checkpoint(self) -> None:
+        """
+        Llamar entre lotes. Renueva el lock cada tercio de su TTL.
+
+        Raises:
+            MaintenanceLockLost: si el lock ya no es de este worker.
+        """
+        if time.monotonic() - self.renewed_at < self.job.interval / 3:
+            return
+        try:
+            await self.lock.reacquire()
+        except (LockError, RedisError) as e:
+            raise MaintenanceLockLost(str(e)) from e
+        self.renewed_at = time.monotonic()
+
+    def progress(self, action: str, rows: int) -> None:
+        """Registra un lote confirmado de `rows` filas."""
+        self.rows[action] = self.rows.get(action, 0) + rows
+        MAINTENANCE_BATCHES.labels(self.job.name, action).inc()
+        MAINTENANCE_ROWS.labels(self.job.name, action).inc(rows)
+
+
+class MaintenanceScheduler:
+    def __init__(self, poll_interval: Optional[float] = None):
+        self.poll_interval = poll_interval or _SETTINGS.maintenance_poll_interval
+        self._jobs: dict[str, MaintenanceJob] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[MaintenanceRun], Awaitable[None]],
+    ) -> None:
+        self._jobs[name] = MaintenanceJob(name, interval, func)
+
+    async def _acquire(self, job: MaintenanceJob):
+        """Devuelve el lock si este worker ganó la elección, o None."""
+        lock = _redis.get_client().lock(
+            LOCK_KEY.format(name=job.name),
+            timeout=job.interval,
+            blocking=False,
+            thread_local=False,
+        )
+        try:
+            if await lock.acquire():
+                return lock
+        except RedisError as e:
+            logger.warning(f"⚠️ Mantenimiento '{job.name}' omitido, Redis no responde: {e}")
+        return None
+
+    async def run_job(self, name: str) -> bool:
+        """
+        Ejecuta la tarea si este worker consigue el lock.
+
+        Returns:
+            bool: True si la tarea se ejecutó aquí (con o sin errores).
+        """
+        job = self._jobs[name]
+        lock = await self._acquire(job)
+        if lock is None:
+            return False
+
+        run = MaintenanceRun(job, lock)
+        MAINTENANCE_RUNNING.labels(job.name).set(1)
+        start = time.perf_counter()
+        try:
+            await job.func(run)
+            MAINTENANCE_RUNS.labels(job.name, "ok").inc()
+            MAINTENANCE_LAST_SUCCESS.labels(job.name).set(time.time())
+            if any(run.rows.values()):
+                logger.info(f"🧹 Mantenimiento '{job.name}': {run.rows}")
+        except MaintenanceLockLost as e:
+            MAINTENANCE_RUNS.labels(job.name, "lock_lost").inc()
+            logger.warning(f"⚠️ Mantenimiento '{job.name}' interrumpido, lock perdido: {e} ({run.rows})")
+        except Exception as e:
+            MAINTENANCE_RUNS.labels(job.name, "error").inc()
+            logger.error(f"❌ Error en mantenimiento '{job.name}': {e} ({run.rows})")
+        finally:
+            MAINTENANCE_DURATION.labels(job.name).observe(time.perf_counter() - start)
+            MAINTENANCE_RUNNING.labels(job.name).set(0)
+        return True
+
+    async def run_pending(self) -> list[str]:
+        """Una vuelta: intenta cada tarea. Devuelve las que corrieron aquí."""
+        return [name for name in list(self._jobs) if await self.run_job(name)]
+
+    async def _loop(self) -> None:
+        try:
+            while True:
+                await self.run_pending()
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            logger.info("🛑 Maintenance scheduler cancelled")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Instancia global
+_maintenance = MaintenanceScheduler()
@@ -0,0 +1,262 @@
+"""
+Rate limiting distribuido (compartido entre workers) sobre Redis.
+
+Cada límite es un GCRA (Generic Cell Rate Algorithm) evaluado en un script
+Lua atómico: por clave se guarda un único entero (el "theoretical arrival
+time") con TTL, usando el reloj de Redis para que todos los workers vean el
+mismo tiempo. `"5/minute"` admite una ráfaga de 5 y después una petición
+cada 12 s (ventana deslizante, sin el doble pico en el borde de una ventana
+fija).
+
+Claves (`key_func`):
+- `by_ip`: IP del cliente.
+- `by_user`: `sub` de un access token válido (firma verificada); sin token
+  válido cae en la IP.
+- `by_email`: campo `email` del cuerpo JSON; sin email cae en la IP.
+
+Si Redis no responde (error o `RATE_LIMIT_REDIS_TIMEOUT`) el límite se
+evalúa con un token bucket local del proceso y Redis no se vuelve a intentar
+durante `RATE_LIMIT_RETRY_INTERVAL` segundos. Con N workers el límite
+efectivo durante la caída es N veces el configurado.
+
+Uso en un endpoint:
+
+    @router.post("/login", dependencies=[
+        Depends(rate_limit("5/minute")),
+        Depends(rate_limit("10/hour", key_func=by_email)),
+    ])
+"""
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, Union
+
+from fastapi import HTTPException, Request, status
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+
+from app.core.cache.redis import _redis
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+
+
+ERROR_RATE_LIMITED = "Demasiadas solicitudes. Intenta nuevamente más tarde"
+
+KEY_PREFIX = "rl"
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: float  # segundos
+
+    @classmethod
+    def parse(cls, value: Union[str, "Rate"]) -> "Rate":
+        """`"5/minute"`, `"10/hour"`, ..."""
+        if isinstance(value, Rate):
+            return value
+        match = _RATE_RE.match(value)
+        if not match or int(match.group(1)) <= 0:
+            raise ValueError(f"Límite inválido: {value!r}")
+        return cls(int(match.group(1)), _PERIODS[match.group(2)])
+
+    @property
+    def emission_ms(self) -> int:
+        """Intervalo entre peticiones una vez agotada la ráfaga."""
+        return max(1, int(self.period * 1000 / self.limit))
+
+    def __str__(self) -> str:
+        return f"{self.limit}/{self.period:g}s"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    retry_after: float  # segundos; 0 si se permitió
+
+
+# ============================
+# GCRA en Redis
+# ============================
+# KEYS[1] clave; ARGV[1] intervalo de emisión (ms); ARGV[2] ráfaga
+# Devuelve {permitido, restantes, reintentar_en_ms}
+GCRA_LUA = """
+local emission = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + emission
+local allow_at = new_tat - burst * emission
+if now < allow_at then
+    return {0, 0, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((now - allow_at) / emission), 0}
+"""
+
+
+# ============================
+# Token bucket local (fallback)
+# ============================
+class LocalTokenBucket:
+    """Token buckets por clave en memoria, acotados con LRU."""
+
+    def __init__(self, max_keys: int = 10_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()  # clave -> (tokens, último)
+
+    def hit(self, key: str, rate: Rate) -> RateLimitResult:
+        now = time.monotonic()
+        refill = rate.limit / rate.period  # tokens por segundo
+        tokens, last = self._buckets.pop(key, (float(rate.limit), now))
+        tokens = min(float(rate.limit), tokens + (now - last) * refill)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        if allowed:
+            return RateLimitResult(True, int(tokens), 0.0)
+        return RateLimitResult(False, 0, (1 - tokens) / refill)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+# ============================
+# Métricas
+# ============================
+RATE_LIMIT_HITS = Counter(
+    "rate_limit_requests_total",
+    "Peticiones evaluadas por el rate limiter",
+    ["scope", "result"],
+)
+RATE_LIMIT_FALLBACKS = Counter(
+    "rate_limit_local_fallbacks_total",
+    "Evaluaciones hechas con el token bucket local porque Redis no respondió",
+)
+
+
+class RateLimiter:
+    def __init__(self):
+        self._script = None  # (cliente, script): RedisClient.close() crea un cliente nuevo
+        self._local = LocalTokenBucket(_SETTINGS.rate_limit_local_max_keys)
+        self._redis_down_until = 0.0
+
+    def _get_script(self):
+        client = _redis.get_client()
+        if self._script is None or self._script[0] is not client:
+            self._script = (client, client.register_script(GCRA_LUA))
+        return self._script[1]
+
+    async def hit(self, scope: str, identity: str, rate: Union[str, Rate]) -> RateLimitResult:
+        """Consume una petición del límite `rate` para `identity` en `scope`."""
+        rate = Rate.parse(rate)
+        key = f"{KEY_PREFIX}:{scope}:{identity}"
+
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                allowed, remaining, retry_ms = await asyncio.wait_for(
+                    self._get_script()(keys=[key], args=[rate.emission_ms, rate.limit]),
+                    _SETTINGS.rate_limit_redis_timeout,
+                )
+                return RateLimitResult(bool(allowed), int(remaining), int(retry_ms) / 1000)
+            except (RedisError, OSError, asyncio.TimeoutError) as e:
+                logger.warning(f"⚠️ Rate limiter sin Redis, usando límites locales: {e}")
+                self._redis_down_until = time.monotonic() + _SETTINGS.rate_limit_retry_interval
+
+        RATE_LIMIT_FALLBACKS.inc()
+        return self._local.hit(key, rate)
+
+    async def check(self, scope: str, identity: str, rate: Union[str, Rate]) -> RateLimitResult:
+        """Como `hit`, pero lanza 429 (con `Retry-After`) si se superó el límite."""
+        result = await self.hit(scope, identity, rate)
+        RATE_LIMIT_HITS.labels(scope, "allowed" if result.allowed else "limited").inc()
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=ERROR_RATE_LIMITED,
+                headers={"Retry-After": str(max(1, round(result.retry_after)))},
+            )
+        return result
+
+    async def clear(self) -> None:
+        """Borra todos los contadores (locales y de Redis)."""
+        self._local.clear()
+        self._redis_down_until = 0.0
+        try:
+            client = _redis.get_client()
+            keys = [key async for key in client.scan_iter(match=f"{KEY_PREFIX}:*", count=500)]
+            if keys:
+                await client.delete(*keys)
+        except (RedisError, OSError) as e:
+            logger.warning(f"⚠️ No se pudieron borrar los contadores de Redis: {e}")
+
+
+# Instancia global
+_rate_limiter = RateLimiter()
+
+
+# ============================
+# Claves
+# ============================
+KeyFunc = Callable[[Request], Union[Optional[str], Awaitable[Optional[str]]]]
+
+
+def by_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def by_user(request: Request) -> str:
+    from app.core.jwt.jwt import JWTManager
+
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = JWTManager().decode(token)
+            if payload.get("type") == "access" and payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except HTTPException:
+            pass
+    return by_ip(request)
+
+
+async def by_email(request: Request) -> str:
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    email = body.get("email") if isinstance(body, dict) else None
+    if isinstance(email, str) and email.strip():
+        return f"email:{email.strip().lower()}"
+    return by_ip(request)
+
+
+def rate_limit(rate: Union[str, Rate], key_func: KeyFunc = by_ip, scope: Optional[str] = None):
+    """
+    Dependencia de FastAPI que aplica `rate` por `key_func`. `scope` separa
+    los contadores entre límites; por defecto método + plantilla de la ruta.
+    """
+    rate = Rate.parse(rate)
+
+    async def dependency(request: Request) -> None:
+        if not _SETTINGS.rate_limit_enabled:
+            return
+        identity = key_func(request)
+        if asyncio.iscoroutine(identity):
+            identity = await identity
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        name = scope or f"{request.method}:{route}:{key_func.__name__}"
+        await _rate_limiter.check(name, identity or "unknown", rate)
+
+    return dependency
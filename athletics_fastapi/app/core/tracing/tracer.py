@@ -0,0 +1,419 @@
+"""
+Trazas por petición y desglose de latencia por dependencia.
+
+`TracingMiddleware` abre una traza por petición HTTP (respetando la cabecera
+W3C `traceparent` si llega) y la deja en un contextvar. Las dependencias
+instrumentadas abren spans hijos dentro de esa traza:
+
+- `db`: sentencias del engine asyncpg (eventos `before/after_cursor_execute`).
+- `redis`: comandos y pipelines del cliente de `RedisClient.get_client`.
+- `argon2`: trabajos de `HashingPool.run` (incluye la espera en cola).
+- `http`: llamadas salientes de los clientes httpx de `HttpClientManager`.
+
+Al terminar la petición se observa `http_request_dependency_seconds` por
+método, ruta y dependencia (más `app`: el tiempo que no se pasó en ninguna
+dependencia), y los spans se entregan al exportador configurado.
+
+El exportador de archivo escribe OTLP/JSON (un `ExportTraceServiceRequest`
+por línea), el formato que lee el receptor `otlpjsonfile` del OpenTelemetry
+Collector; no requiere el SDK de OpenTelemetry ni red. Escribe desde un hilo
+propio, de modo que exportar no bloquea el event loop.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Protocol, Sequence
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+
+
+DB = "db"
+REDIS = "redis"
+ARGON2 = "argon2"
+HTTP = "http"
+APP = "app"
+
+# SpanKind / StatusCode de OTLP
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+@dataclass
+class Span:
+    trace_id: str
+    span_id: str
+    parent_span_id: str
+    name: str
+    dependency: Optional[str]
+    kind: int
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict = field(default_factory=dict)
+    status: int = STATUS_OK
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+@dataclass
+class RequestTrace:
+    trace_id: str
+    root: Span
+    spans: list[Span] = field(default_factory=list)
+
+    def dependency_seconds(self) -> dict[str, float]:
+        totals: dict[str, float] = {}
+        for s in self.spans:
+            if s.dependency:
+                totals[s.dependency] = totals.get(s.dependency, 0.0) + s.duration
+        return totals
+
+
+_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+_parent: ContextVar[Optional[str]] = ContextVar("trace_parent_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def _parse_traceparent(value: Optional[str]) -> tuple[Optional[str], str]:
+    """`00-<trace_id>-<span_id>-<flags>` -> (trace_id, span padre)."""
+    parts = (value or "").split("-")
+    if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16 and parts[1] != "0" * 32:
+        return parts[1], parts[2]
+    return None, ""
+
+
+def current_traceparent() -> Optional[str]:
+    """Cabecera `traceparent` para propagar la traza actual a otro servicio."""
+    trace = _trace.get()
+    if trace is None:
+        return None
+    return f"00-{trace.trace_id}-{_parent.get() or trace.root.span_id}-01"
+
+
+# ============================
+# Spans de dependencias
+# ============================
+def start_span(dependency: str, name: str, **attributes) -> Optional[Span]:
+    """Abre un span hijo de la petición actual; None si no hay traza activa."""
+    trace = _trace.get()
+    if trace is None:
+        return None
+    return Span(
+        trace_id=trace.trace_id,
+        span_id=_new_id(8),
+        parent_span_id=_parent.get() or trace.root.span_id,
+        name=name,
+        dependency=dependency,
+        kind=KIND_CLIENT,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+
+
+def end_span(span: Optional[Span], error: Optional[BaseException] = None) -> None:
+    if span is None:
+        return
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.status = STATUS_ERROR
+        span.attributes["error.type"] = type(error).__name__
+    trace = _trace.get()
+    if trace is not None and trace.trace_id == span.trace_id:
+        trace.spans.append(span)
+
+
+@contextmanager
+def span(dependency: str, name: str, **attributes) -> Iterator[Optional[Span]]:
+    """Span alrededor de un bloque (puede contener `await`)."""
+    s = start_span(dependency, name, **attributes)
+    token = _parent.set(s.span_id) if s is not None else None
+    try:
+        yield s
+    except BaseException as e:
+        end_span(s, e)
+        raise
+    else:
+        end_span(s)
+    finally:
+        if token is not None:
+            _parent.reset(token)
+
+
+# ============================
+# Engine de base de datos
+# ============================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    s = start_span(DB, statement.split(None, 1)[0].upper() if statement else "SQL",
+                   **{"db.system": "postgresql", "db.statement": statement[:500]})
+    if s is not None:
+        conn.info.setdefault("trace_spans", []).append(s)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        end_span(spans.pop())
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    spans = conn.info.get("trace_spans") if conn is not None else None
+    if spans:
+        end_span(spans.pop(), exception_context.original_exception)
+
+
+def instrument_engine(engine: Engine | AsyncEngine) -> None:
+    """Registra los spans `db` en el engine (idempotente)."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# ============================
+# Exportadores
+# ============================
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def to_otlp(spans: Sequence[Span], service_name: str) -> dict:
+    """Codifica los spans como un `ExportTraceServiceRequest` OTLP/JSON."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [
+                    {
+                        "traceId": s.trace_id,
+                        "spanId": s.span_id,
+                        "parentSpanId": s.parent_span_id,
+                        "name": s.name,
+                        "kind": s.kind,
+                        "startTimeUnixNano": str(s.start_ns),
+                        "endTimeUnixNano": str(s.end_ns),
+                        "attributes": [_attribute(k, v) for k, v in s.attributes.items()],
+                        "status": {"code": s.status},
+                    }
+                    for s in spans
+                ],
+            }],
+        }]
+    }
+
+
+class InMemorySpanExporter:
+    """Guarda los spans en memoria (pruebas y depuración)."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class OtlpJsonFileExporter:
+    """
+    Añade una línea OTLP/JSON por petición al archivo indicado.
+
+    `export` solo encola los spans; un hilo escritor los codifica y escribe
+    con el archivo abierto todo el tiempo, así el event loop no hace E/S de
+    disco. Si la cola (`max_queue` peticiones) está llena, la traza se
+    descarta. `shutdown` vacía la cola, hace flush y cierra el archivo.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path: str,
+        service_name: str = _SETTINGS.tracing_service_name,
+        max_queue: int = 10_000,
+    ):
+        self.path = path
+        self.service_name = service_name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="otlp-json-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            while True:
+                spans = self._queue.get()
+                if spans is self._STOP:
+                    file.flush()
+                    return
+                try:
+                    file.write(json.dumps(to_otlp(spans, self.service_name), separators=(",", ":")) + "\n")
+                except Exception as e:
+                    logger.warning(f"🛰️ No se pudieron exportar las trazas: {e}")
+                # Un flush por ráfaga, no por línea
+                if self._queue.empty():
+                    file.flush()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(list(spans))
+        except queue.Full:
+            TRACES_DROPPED.inc()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+
+
+# ============================
+# Métricas
+# ============================
+DEPENDENCY_SECONDS = Histogram(
+    "http_request_dependency_seconds",
+    "Tiempo de cada petición desglosado por dependencia (db, redis, argon2, http, app)",
+    ["method", "handler", "dependency"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DEPENDENCY_CALLS = Counter(
+    "http_request_dependency_calls_total",
+    "Llamadas a cada dependencia por ruta",
+    ["method", "handler", "dependency"],
+)
+TRACES_DROPPED = Counter(
+    "tracing_traces_dropped_total",
+    "Trazas descartadas porque la cola del exportador estaba llena",
+)
+
+
+class Tracer:
+    def __init__(self):
+        self._exporter: Optional[SpanExporter] = None
+
+    def get_exporter(self) -> Optional[SpanExporter]:
+        if self._exporter is None and _SETTINGS.tracing_export_path:
+            self._exporter = OtlpJsonFileExporter(_SETTINGS.tracing_export_path)
+        return self._exporter
+
+    def set_exporter(self, exporter: Optional[SpanExporter]) -> None:
+        self._exporter = exporter
+
+    def finish(self, trace: RequestTrace, method: str, handler: str) -> None:
+        """Observa el desglose por dependencia y exporta los spans de la petición."""
+        total = trace.root.duration
+        per_dependency = trace.dependency_seconds()
+        for dependency, seconds in per_dependency.items():
+            DEPENDENCY_SECONDS.labels(method, handler, dependency).observe(seconds)
+        for s in trace.spans:
+            DEPENDENCY_CALLS.labels(method, handler, s.dependency).inc()
+        # Dependencias concurrentes (gather) pueden sumar más que el total
+        DEPENDENCY_SECONDS.labels(method, handler, APP).observe(max(0.0, total - sum(per_dependency.values())))
+
+        exporter = self.get_exporter()
+        if exporter is None:
+            return
+        try:
+            exporter.export([trace.root, *trace.spans])
+        except Exception as e:
+            logger.warning(f"🛰️ No se pudieron exportar las trazas: {e}")
+
+    def shutdown(self) -> None:
+        if self._exporter is not None:
+            self._exporter.shutdown()
+
+
+# Instancia global
+_tracer = Tracer()
+
+
+class TracingMiddleware:
+    """Middleware ASGI: una traza (span raíz SERVER) por petición HTTP."""
+
+    def __init__(self, app, tracer: Tracer = _tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        trace_id, parent = _parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        method = scope.get("method", "")
+        root = Span(
+            trace_id=trace_id or _new_id(16),
+            span_id=_new_id(8),
+            parent_span_id=parent,
+            name=method,
+            dependency=None,
+            kind=KIND_SERVER,
+            start_ns=time.time_ns(),
+            attributes={"http.request.method": method, "url.path": scope.get("path", "")},
+        )
+        trace = RequestTrace(trace_id=root.trace_id, root=root)
+        token = _trace.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.attributes["http.response.status_code"] = message["status"]
+                if message["status"] >= 500:
+                    root.status = STATUS_ERROR
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.status = STATUS_ERROR
+            root.attributes["error.type"] = type(e).__name__
+            raise
+        finally:
+            _trace.reset(token)
+            root.end_ns = time.time_ns()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            root.name = f"{method} {route}"
+            root.attributes["http.route"] = route
+            self.tracer.finish(trace, method, route)
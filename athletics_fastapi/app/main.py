@@ -2,9 +2,6 @@ from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 from app.core.config.enviroment import _SETTINGS
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
@@ -19,25 +16,28 @@ from pathlib import Path
 
 
 
-async def cleanup_sessions_periodically(logger):
-    """Limpia sesiones expiradas cada hora."""
+async def check_pool_health_periodically(logger):
+    """Verifica las conexiones ociosas de los pools (sustituye a pool_pre_ping)."""
     from app.core.db.database import _db
-    from app.modules.auth.repositories.sessions_repository import SessionsRepository
+    from app.core.db.pool_health import check_pool
     try:
         while True:
-            await asyncio.sleep(3600)  # Cada hora
-            try:
-                async with _db.get_session_factory()() as session:
-                    repo = SessionsRepository(session)
-                    count = await repo.cleanup_expired_sessions()
-                    await session.commit()
-                    if count > 0:
-                        logger.info(f"🧹 Cleaned up {count} expired sessions")
-            except Exception as e:
-                logger.error(f"❌ Error cleaning sessions: {e}")
+            await asyncio.sleep(_SETTINGS.database_pool_health_interval)
+            for name, engine in _db.get_engines().items():
+                try:
+                    report = await check_pool(
+                        engine,
+                        name,
+                        _SETTINGS.database_pool_health_timeout,
+                        min_idle=_SETTINGS.database_pool_health_interval,
+                    )
+                    if report.failed:
+                        logger.warning(f"🩺 Pool {name}: {report.failed} conexiones descartadas, {report.checked} sanas")
+                except Exception as e:
+                    logger.error(f"❌ Error checking pool {name}: {e}")
     except asyncio.CancelledError:
-         logger.info("🛑 Cleanup task cancelled")
-         return
+        logger.info("🛑 Pool health task cancelled")
+        return
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -46,8 +46,7 @@ async def lifespan(app: FastAPI):
     
     from app.core.db.database import _db
     from app.core.cache.redis import _redis
-    from app.core.jwt.secret_rotation import JWTSecretRotation
-    from app.modules.auth.repositories.sessions_repository import SessionsRepository
+    from app.core.jwt.secret_rotation import JWTSecretRotation, publish_rotation, listen_secret_rotations
 
 
     
@@ -82,6 +81,7 @@ async def lifespan(app: FastAPI):
         if rotation.should_rotate():
             logger.warning("🔄 Rotating JWT secrets automatically...")
             result = rotation.rotate()
+            await publish_rotation()
             logger.info(f"✅ JWT secret rotated successfully at {result['rotated_at']}")
         else:
             info = rotation.get_rotation_info()
@@ -89,9 +89,38 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ JWT rotation check failed: {e}")
     
-    # Iniciar tarea de limpieza
-    cleanup_task = asyncio.create_task(cleanup_sessions_periodically(logger))
-    logger.info("🧹 Session cleanup task started")
+    # Tareas de mantenimiento (una sola ejecución por intervalo en todo el clúster)
+    from app.core.maintenance.scheduler import _maintenance
+    from app.modules.auth.services import session_maintenance_service
+    _maintenance.register(
+        session_maintenance_service.JOB_NAME,
+        _SETTINGS.session_cleanup_interval,
+        session_maintenance_service.cleanup_sessions,
+    )
+    _maintenance.start()
+    logger.info("🧹 Maintenance scheduler started")
+
+    # Verificación de conexiones del pool en segundo plano
+    pool_health_task = None
+    if _SETTINGS.database_pool_health_interval > 0:
+        pool_health_task = asyncio.create_task(check_pool_health_periodically(logger))
+        logger.info("🩺 Pool health task started")
+
+    # Escuchar rotaciones de JWT secrets hechas por otros workers
+    rotation_listener_task = asyncio.create_task(listen_secret_rotations(logger))
+
+    # Filtro local de tokens revocados (SCAN inicial + pub/sub)
+    from app.core.jwt.revocation import listen_revocations
+    revocation_listener_task = asyncio.create_task(listen_revocations(logger))
+
+    # Invalidaciones del principal cache hechas por otros workers (LRU local)
+    from app.core.jwt.principal_cache import listen_principal_invalidations
+    principal_listener_task = asyncio.create_task(listen_principal_invalidations(logger))
+
+    # Workers de envío de correos
+    from app.providers.email.email_dispatcher import _email_dispatcher
+    _email_dispatcher.start()
+    logger.info("📧 Email dispatcher started")
     
     logger.info("✨ Application startup complete")
     
@@ -100,13 +129,53 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down application...")
     
-    # Cancelar tarea de limpieza
-    cleanup_task.cancel()
+    # Detener el mantenimiento (el lote en curso se revierte)
+    await _maintenance.stop()
+
+    if pool_health_task is not None:
+        pool_health_task.cancel()
+        try:
+            await pool_health_task
+        except asyncio.CancelledError:
+            pass
+
+    rotation_listener_task.cancel()
     try:
-        await cleanup_task
+        await rotation_listener_task
     except asyncio.CancelledError:
-        logger.info("✅ Session cleanup task cancelled")
-    
+        pass
+
+    revocation_listener_task.cancel()
+    try:
+        await revocation_listener_task
+    except asyncio.CancelledError:
+        pass
+
+    principal_listener_task.cancel()
+    try:
+        await principal_listener_task
+    except asyncio.CancelledError:
+        pass
+
+    # Enviar correos pendientes antes de cerrar
+    await _email_dispatcher.stop()
+
+    # Detener el pool de hashing Argon2
+    from app.core.jwt.hashing_pool import _hashing_pool
+    _hashing_pool.shutdown()
+
+    # Detener el pool de reportes PDF (los jobs en cola se cancelan)
+    from app.modules.admin.services.report_jobs import _report_jobs
+    _report_jobs.shutdown()
+
+    # Vacía y cierra el exportador de trazas
+    from app.core.tracing.tracer import _tracer
+    _tracer.shutdown()
+
+    # Cierra los clientes HTTP salientes
+    from app.core.http.http_client import _http
+    await _http.close()
+
     # Cierra Redis
     logger.info("🔴 Closing Redis connection...")
     await _redis.close()
@@ -114,16 +183,12 @@ async def lifespan(app: FastAPI):
     
     # Cierra base de datos
     logger.info("📊 Closing database connection...")
-    await db_engine.dispose()
+    await _db.dispose()
     logger.info("✅ Database connection closed")
     
     logger.info("👋 Application shutdown complete")
 
 
-# Inicializar rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
-
 _APP = FastAPI(
     title='API Modulo de Atletismo',
     description=(
@@ -143,6 +208,20 @@ _APP = FastAPI(
 # Instrumentar Prometheus para métricas de rendimiento
 Instrumentator().instrument(_APP).expose(_APP, endpoint="/metrics", include_in_schema=True)
 
+# Consultas SQL por petición (histogramas y Server-Timing)
+if _SETTINGS.query_stats_enabled:
+    from app.core.db.query_stats import QueryStatsMiddleware
+    _APP.add_middleware(
+        QueryStatsMiddleware,
+        server_timing=_SETTINGS.server_timing_enabled or _SETTINGS.debug,
+        duplicate_warning=_SETTINGS.query_stats_duplicate_warning,
+    )
+
+# Trazas por petición y desglose de latencia por dependencia
+if _SETTINGS.tracing_enabled:
+    from app.core.tracing.tracer import TracingMiddleware
+    _APP.add_middleware(TracingMiddleware)
+
 # ✅ 2. LUEGO MONTAS STATIC FILES
 # Crear directorio data si no existe (necesario para CI/CD)
 data_dir = Path("data")
@@ -162,9 +241,6 @@ async def health_check():
         "version": _SETTINGS.application_version
     }
 
-# Agregar el state del limiter a la app
-_APP.state.limiter = limiter
-
 # Handler Global para Exception (500)
 @_APP.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -212,7 +288,8 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         
     return JSONResponse(
         status_code=exc.status_code,
-        content=response_data
+        content=response_data,
+        headers=exc.headers,  # Retry-After (429), WWW-Authenticate (401), ...
     )
 
 # Handler Global para RequestValidationError (422)
@@ -236,9 +313,6 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content=response_data
     )
 
-# Agregar handler para rate limit exceeded
-_APP.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Configurar CORS
 # Configurar CORS
 # Nota: allow_origins=["*"] no funciona con allow_credentials=True.
@@ -2,13 +2,20 @@
 Endpoints administrativos para gestión del sistema.
 Solo accesibles por administradores.
 """
-from fastapi import APIRouter, Depends, status
+from datetime import date
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app.core.jwt.jwt import get_current_user
-from app.core.jwt.secret_rotation import JWTSecretRotation
+from app.core.jwt.secret_rotation import JWTSecretRotation, publish_rotation
 from app.modules.auth.domain.models.auth_user_model import AuthUserModel
 from app.modules.auth.dependencies import get_current_admin_user
 from app.core.logging.logger import logger
-from pydantic import BaseModel
+from app.core.db.streaming import CSV, NDJSON, streaming_export
+from app.modules.admin.services import export_service
+from app.modules.admin.services.report_jobs import _report_jobs
+from pydantic import BaseModel, model_validator
 from app.public.schemas.base_response import BaseResponse
 from app.utils.response_handler import ResponseHandler
 
@@ -97,6 +104,7 @@ async def rotate_jwt_secret(
         
         # Realizar rotación
         result = rotation.rotate()
+        await publish_rotation()
         
         logger.warning(f"🔄 JWT Secret rotado manualmente por usuario: {current_user.email}")
         
@@ -118,3 +126,153 @@ async def rotate_jwt_secret(
             message=str(e),
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+# ============================
+# Exportaciones (streaming)
+# ============================
+FORMATO_EXPORTACION = Query(NDJSON, pattern=f"^({NDJSON}|{CSV})$", description="ndjson o csv")
+
+
+@admin_router.get("/export/usuarios", summary="Exportar usuarios (NDJSON/CSV)")
+async def export_usuarios(
+    formato: str = FORMATO_EXPORTACION,
+    current_user: AuthUserModel = Depends(get_current_admin_user)
+):
+    """
+    Descarga todos los usuarios (sin credenciales) en streaming.
+    Solo accesible por administradores.
+    """
+    logger.info(f"Usuario {current_user.email} exportó usuarios ({formato})")
+    return streaming_export(export_service.usuarios_stmt(), formato, "usuarios")
+
+
+@admin_router.get("/export/resultados-competencia", summary="Exportar resultados de competencia (NDJSON/CSV)")
+async def export_resultados_competencia(
+    formato: str = FORMATO_EXPORTACION,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    current_user: AuthUserModel = Depends(get_current_admin_user)
+):
+    """
+    Descarga el historial de resultados de competencia, opcionalmente
+    acotado por `fecha_registro`. Solo accesible por administradores.
+    """
+    logger.info(f"Usuario {current_user.email} exportó resultados de competencia ({formato})")
+    return streaming_export(
+        export_service.resultados_competencia_stmt(desde, hasta), formato, "resultados_competencia"
+    )
+
+
+@admin_router.get("/export/resultados-prueba", summary="Exportar resultados de pruebas (NDJSON/CSV)")
+async def export_resultados_prueba(
+    formato: str = FORMATO_EXPORTACION,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    current_user: AuthUserModel = Depends(get_current_admin_user)
+):
+    """
+    Descarga el historial de resultados de pruebas (tests), opcionalmente
+    acotado por fecha. Solo accesible por administradores.
+    """
+    logger.info(f"Usuario {current_user.email} exportó resultados de pruebas ({formato})")
+    return streaming_export(
+        export_service.resultados_prueba_stmt(desde, hasta), formato, "resultados_prueba"
+    )
+
+
+@admin_router.get("/export/asistencias", summary="Exportar asistencias (NDJSON/CSV)")
+async def export_asistencias(
+    formato: str = FORMATO_EXPORTACION,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    current_user: AuthUserModel = Depends(get_current_admin_user)
+):
+    """
+    Descarga las asistencias a entrenamientos, opcionalmente acotadas por
+    `fecha_asistencia`. Solo accesible por administradores.
+    """
+    logger.info(f"Usuario {current_user.email} exportó asistencias ({formato})")
+    return streaming_export(export_service.asistencias_stmt(desde, hasta), formato, "asistencias")
+
+
+# ============================
+# Reportes PDF (jobs en segundo plano)
+# ============================
+class ReportJobCreate(BaseModel):
+    """Solicitud de reporte. `atleta_id` / `competencia_id` son external_id (UUID)."""
+    tipo: Literal["usuarios", "historial_atleta", "resultados_competencia"]
+    atleta_id: Optional[UUID] = None
+    competencia_id: Optional[UUID] = None
+
+    @model_validator(mode="after")
+    def validar_parametros(self):
+        if self.tipo == "historial_atleta" and not self.atleta_id:
+            raise ValueError("atleta_id es obligatorio para historial_atleta")
+        if self.tipo == "resultados_competencia" and not self.competencia_id:
+            raise ValueError("competencia_id es obligatorio para resultados_competencia")
+        return self
+
+    def params(self) -> dict:
+        return {
+            k: str(v) for k, v in
+            (("atleta_id", self.atleta_id), ("competencia_id", self.competencia_id)) if v
+        }
+
+
+@admin_router.post("/reports", response_model=BaseResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_report_job(
+    data: ReportJobCreate,
+    current_user: AuthUserModel = Depends(get_current_admin_user)
+):
+    """
+    Encola la generación de un reporte PDF y retorna de inmediato con el id
+    del job. El progreso se consulta en `GET /admin/reports/{job_id}`.
+    Solo accesible por administradores.
+    """
+    job = await _report_jobs.enqueue(data.tipo, data.params(), current_user.email)
+    return ResponseHandler.success_response(
+        summary="Reporte encolado",
+        message="El reporte se está generando",
+        data=job,
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@admin_router.get("/reports/{job_id}", response_model=BaseResponse)
+async def get_report_job(
+    job_id: str,
+    current_user: AuthUserModel = Depends(get_current_admin_user)
+):
+    """
+    Estado y progreso de un reporte; cuando `status` es `done`, `url`
+    apunta al PDF. Solo accesible por administradores.
+    """
+    job = await _report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reporte no encontrado")
+    return ResponseHandler.success_response(
+        summary="Estado del reporte",
+        message=f"Reporte {job['status']}",
+        data=job,
+    )
+
+
+@admin_router.delete("/reports/{job_id}", response_model=BaseResponse)
+async def cancel_report_job(
+    job_id: str,
+    current_user: AuthUserModel = Depends(get_current_admin_user)
+):
+    """
+    Cancela un reporte en cola o en ejecución (se detiene al terminar la
+    página en curso). Solo accesible por administradores.
+    """
+    job = await _report_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reporte no encontrado")
+    logger.info(f"Usuario {current_user.email} canceló el reporte {job_id}")
+    return ResponseHandler.success_response(
+        summary="Reporte cancelado",
+        message="Cancelación solicitada",
+        data=job,
+    )
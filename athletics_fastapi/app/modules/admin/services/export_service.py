@@ -0,0 +1,163 @@
+"""
+Consultas de las exportaciones administrativas (usuarios, resultados y asistencias).
+
+Cada función devuelve un `select` de columnas planas (sin entidades ORM ni
+relaciones) listo para `app.core.db.streaming.streaming_export`; los nombres
+de las columnas son las claves NDJSON y la cabecera CSV. Nunca se exportan
+credenciales (hash de contraseña, secretos TOTP, códigos de respaldo).
+"""
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Select, or_, select
+from sqlalchemy.orm import aliased
+
+from app.modules.atleta.domain.models.atleta_model import Atleta
+from app.modules.auth.domain.models.auth_user_model import AuthUserModel
+from app.modules.auth.domain.models.user_model import UserModel
+from app.modules.competencia.domain.models.competencia_model import Competencia
+from app.modules.competencia.domain.models.prueba_model import Prueba
+from app.modules.competencia.domain.models.resultado_competencia_model import ResultadoCompetencia
+from app.modules.competencia.domain.models.resultado_prueba_model import ResultadoPrueba
+from app.modules.entrenador.domain.models.asistencia_model import Asistencia
+from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
+from app.modules.entrenador.domain.models.horario_model import Horario
+from app.modules.entrenador.domain.models.registro_asistencias_model import RegistroAsistencias
+
+
+def usuarios_stmt() -> Select:
+    return (
+        select(
+            UserModel.id,
+            UserModel.external_id,
+            AuthUserModel.email,
+            UserModel.username,
+            UserModel.first_name,
+            UserModel.last_name,
+            UserModel.tipo_identificacion,
+            UserModel.identificacion,
+            UserModel.role,
+            UserModel.tipo_estamento,
+            UserModel.sexo,
+            UserModel.fecha_nacimiento,
+            UserModel.phone,
+            AuthUserModel.is_active,
+            AuthUserModel.created_at,
+        )
+        .join(AuthUserModel, AuthUserModel.id == UserModel.auth_user_id)
+        .order_by(UserModel.id)
+    )
+
+
+def resultados_competencia_stmt(
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    competencia_external_id: Optional[UUID] = None,
+    atleta_external_id: Optional[UUID] = None,
+) -> Select:
+    """`atleta_external_id` acepta el UUID del atleta o el de su usuario."""
+    atleta = aliased(UserModel)
+    stmt = (
+        select(
+            ResultadoCompetencia.id,
+            ResultadoCompetencia.external_id,
+            Competencia.nombre.label("competencia"),
+            Competencia.fecha.label("fecha_competencia"),
+            Prueba.nombre.label("prueba"),
+            atleta.external_id.label("atleta_external_id"),
+            atleta.first_name.label("atleta_nombre"),
+            atleta.last_name.label("atleta_apellido"),
+            ResultadoCompetencia.resultado,
+            ResultadoCompetencia.unidad_medida,
+            ResultadoCompetencia.posicion_final,
+            ResultadoCompetencia.puesto_obtenido,
+            ResultadoCompetencia.estado,
+            ResultadoCompetencia.fecha_registro,
+        )
+        .join(Competencia, Competencia.id == ResultadoCompetencia.competencia_id)
+        .join(Prueba, Prueba.id == ResultadoCompetencia.prueba_id)
+        .join(atleta, atleta.id == ResultadoCompetencia.atleta_id)
+        .order_by(ResultadoCompetencia.id)
+    )
+    if desde:
+        stmt = stmt.where(ResultadoCompetencia.fecha_registro >= desde)
+    if hasta:
+        stmt = stmt.where(ResultadoCompetencia.fecha_registro <= hasta)
+    if competencia_external_id:
+        stmt = stmt.where(Competencia.external_id == competencia_external_id)
+    if atleta_external_id:
+        stmt = stmt.where(or_(
+            atleta.external_id == atleta_external_id,
+            atleta.id.in_(select(Atleta.user_id).where(Atleta.external_id == atleta_external_id)),
+        ))
+    return stmt
+
+
+def resultados_prueba_stmt(
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    atleta_external_id: Optional[UUID] = None,
+) -> Select:
+    """`atleta_external_id` acepta el UUID del atleta o el de su usuario."""
+    stmt = (
+        select(
+            ResultadoPrueba.id,
+            ResultadoPrueba.external_id,
+            Prueba.nombre.label("prueba"),
+            Atleta.external_id.label("atleta_external_id"),
+            UserModel.first_name.label("atleta_nombre"),
+            UserModel.last_name.label("atleta_apellido"),
+            ResultadoPrueba.marca_obtenida,
+            ResultadoPrueba.clasificacion_final,
+            ResultadoPrueba.estado,
+            ResultadoPrueba.fecha,
+        )
+        .join(Prueba, Prueba.id == ResultadoPrueba.prueba_id)
+        .join(Atleta, Atleta.id == ResultadoPrueba.atleta_id)
+        .join(UserModel, UserModel.id == Atleta.user_id)
+        .order_by(ResultadoPrueba.id)
+    )
+    if desde:
+        stmt = stmt.where(ResultadoPrueba.fecha >= desde)
+    if hasta:
+        stmt = stmt.where(ResultadoPrueba.fecha < hasta + date.resolution)
+    if atleta_external_id:
+        stmt = stmt.where(or_(
+            Atleta.external_id == atleta_external_id,
+            UserModel.external_id == atleta_external_id,
+        ))
+    return stmt
+
+
+def asistencias_stmt(
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+) -> Select:
+    stmt = (
+        select(
+            Asistencia.id,
+            Asistencia.external_id,
+            Asistencia.fecha_asistencia,
+            Asistencia.hora_llegada,
+            Asistencia.asistio,
+            Asistencia.atleta_confirmo,
+            Asistencia.descripcion,
+            Entrenamiento.tipo_entrenamiento.label("entrenamiento"),
+            Horario.name.label("horario"),
+            Atleta.external_id.label("atleta_external_id"),
+            UserModel.first_name.label("atleta_nombre"),
+            UserModel.last_name.label("atleta_apellido"),
+        )
+        .join(RegistroAsistencias, RegistroAsistencias.id == Asistencia.registro_asistencias_id)
+        .join(Horario, Horario.id == RegistroAsistencias.horario_id)
+        .join(Entrenamiento, Entrenamiento.id == Horario.entrenamiento_id)
+        .join(Atleta, Atleta.id == RegistroAsistencias.atleta_id)
+        .join(UserModel, UserModel.id == Atleta.user_id)
+        .order_by(Asistencia.id)
+    )
+    if desde:
+        stmt = stmt.where(Asistencia.fecha_asistencia >= desde)
+    if hasta:
+        stmt = stmt.where(Asistencia.fecha_asistencia <= hasta)
+    return stmt
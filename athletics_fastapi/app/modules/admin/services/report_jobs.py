@@ -0,0 +1,238 @@
+"""
+Jobs de reportes PDF en segundo plano.
+
+Una petición solo encola el job (`enqueue`) y recibe su id; el PDF se
+genera en un `ProcessPoolExecutor` (reportlab es CPU puro y bloquearía el
+event loop) con `report_renderer.render_report`. El estado y el progreso
+viven en Redis bajo `report:job:{id}`, así cualquier worker web puede
+consultarlos o cancelar el job. El archivo terminado queda en
+`data/reports/{id}.pdf` y se sirve por el montaje estático `/data`.
+
+Límites:
+- `REPORT_JOBS_MAX_WORKERS`: reportes renderizándose a la vez (procesos).
+- `REPORT_JOBS_MAX_PENDING`: jobs aceptados por este worker (en cola o en
+  ejecución); por encima se responde 429.
+
+Estados: queued -> running -> done | failed | cancelled.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge
+from redis.exceptions import RedisError
+
+from app.core.cache.redis import _redis
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+from app.modules.admin.services.report_renderer import (
+    HISTORIAL_ATLETA,
+    REPORT_CANCEL_KEY,
+    REPORT_JOB_KEY,
+    RESULTADOS_COMPETENCIA,
+    USUARIOS,
+    render_report,
+)
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+TITULOS = {
+    USUARIOS: "Listado de usuarios registrados",
+    HISTORIAL_ATLETA: "Historial del atleta",
+    RESULTADOS_COMPETENCIA: "Resultados de competencia",
+}
+
+REPORTS_DIR = Path("data") / "reports"
+REPORTS_URL = "/data/reports"
+
+
+# ============================
+# Métricas
+# ============================
+REPORT_JOBS_PENDING = Gauge("report_jobs_pending", "Reportes aceptados por este worker sin terminar")
+REPORT_JOBS_FINISHED = Counter("report_jobs_finished_total", "Reportes terminados por estado", ["status"])
+
+
+class ReportJobRunner:
+    def __init__(
+        self,
+        max_workers: int = _SETTINGS.report_jobs_max_workers,
+        max_pending: int = _SETTINGS.report_jobs_max_pending,
+        ttl: int = _SETTINGS.report_jobs_ttl,
+        output_dir: Path = REPORTS_DIR,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.output_dir = output_dir
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: dict[str, Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: no heredar del padre el event loop, conexiones ni hilos
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        return len(self._futures)
+
+    # ============================
+    # Estado en Redis
+    # ============================
+    def _key(self, job_id: str) -> str:
+        return REPORT_JOB_KEY.format(job_id=job_id)
+
+    async def _save(self, job_id: str, **fields) -> None:
+        pipe = _redis.get_client().pipeline()
+        pipe.hset(self._key(job_id), mapping={k: v for k, v in fields.items() if v is not None})
+        pipe.expire(self._key(job_id), self.ttl)
+        await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        try:
+            job = await _redis.get_client().hgetall(self._key(job_id))
+        except RedisError as e:
+            logger.warning(f"📄 Reportes: no se pudo leer el job {job_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Estado de reportes no disponible",
+            )
+        if not job:
+            return None
+        return {"id": job_id, **job}
+
+    # ============================
+    # API
+    # ============================
+    async def enqueue(self, tipo: str, params: dict, requested_by: str) -> dict:
+        """
+        Registra el job en Redis y lo envía al pool de procesos.
+
+        Raises:
+            HTTPException 429: si este worker ya tiene `max_pending` reportes sin terminar.
+            HTTPException 503: si Redis no está disponible (no habría progreso ni cancelación).
+        """
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Demasiados reportes en curso, intente más tarde",
+            )
+
+        job_id = uuid.uuid4().hex
+        try:
+            await self._save(
+                job_id,
+                status=QUEUED,
+                tipo=tipo,
+                requested_by=requested_by,
+                created_at=datetime.utcnow().isoformat(),
+                progress=0,
+            )
+        except RedisError as e:
+            logger.error(f"📄 Reportes: no se pudo registrar el job: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio de reportes no disponible",
+            )
+
+        self._purge_expired_files()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = self.output_dir / f"{job_id}.pdf"
+        future = self._get_executor().submit(
+            render_report, job_id, tipo, params, str(output_path), TITULOS[tipo]
+        )
+        self._futures[job_id] = future
+        REPORT_JOBS_PENDING.set(self.pending)
+
+        task = asyncio.create_task(self._watch(job_id, future, output_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"📄 Reporte {tipo} encolado ({job_id}) por {requested_by}")
+        return {"id": job_id, "status": QUEUED, "tipo": tipo}
+
+    async def _watch(self, job_id: str, future: Future, output_path: Path) -> None:
+        """Espera al proceso y publica el estado final."""
+        try:
+            result = await asyncio.wrap_future(future)
+            final = {"status": result["status"], "rows": result["rows"], "pages": result["pages"]}
+            if result["status"] == DONE:
+                final.update(progress=100, url=f"{REPORTS_URL}/{output_path.name}")
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                # Se canceló el propio watcher (apagado de la aplicación)
+                raise
+            final = {"status": CANCELLED}
+        except Exception as e:
+            logger.error(f"📄 Reporte {job_id} falló: {e}")
+            final = {"status": FAILED, "error": str(e)}
+        finally:
+            self._futures.pop(job_id, None)
+            REPORT_JOBS_PENDING.set(self.pending)
+
+        REPORT_JOBS_FINISHED.labels(final["status"]).inc()
+        try:
+            await self._save(job_id, finished_at=datetime.utcnow().isoformat(), **final)
+        except RedisError as e:
+            logger.warning(f"📄 Reportes: no se pudo guardar el estado final de {job_id}: {e}")
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Cancela un job. Si aún no empezó en este worker se retira del pool;
+        si está corriendo (aquí o en otro worker) el proceso lo detecta al
+        terminar la página actual.
+        """
+        job = await self.get(job_id)
+        if job is None or job.get("status") in FINAL_STATES:
+            return job
+
+        try:
+            await _redis.get_client().set(REPORT_CANCEL_KEY.format(job_id=job_id), "1", ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"📄 Reportes: no se pudo marcar la cancelación de {job_id}: {e}")
+
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            # `_watch` publicará el estado final
+            return {**job, "status": CANCELLED}
+        return {**job, "cancel_requested": True}
+
+    def _purge_expired_files(self) -> None:
+        """Borra los PDF más antiguos que el TTL de su job (su estado ya expiró)."""
+        if not self.output_dir.exists():
+            return
+        limite = time.time() - self.ttl
+        for entry in os.scandir(self.output_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < limite:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def shutdown(self) -> None:
+        """Cancela los jobs en cola y detiene el pool sin esperar a los que están corriendo."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Instancia global
+_report_jobs = ReportJobRunner()
@@ -0,0 +1,230 @@
+"""
+Renderizado de reportes PDF dentro de un proceso del pool de reportes.
+
+`render_report` es el punto de entrada que ejecuta `ProcessPoolExecutor`
+(debe ser una función de módulo, serializable con pickle). El proceso hijo
+abre su propio engine (NullPool) y su propio cliente Redis: nada se comparte
+con el event loop del worker web.
+
+Las filas se leen con un cursor del servidor y se dibujan una página a la
+vez (`partitions(filas_por_pagina)`): en memoria solo vive la página actual.
+Tras cada página se publica el progreso en Redis y se comprueba si el job
+fue cancelado. El PDF se escribe en `<destino>.part` y se renombra al
+terminar, así nunca se sirve un archivo a medias.
+"""
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.pdfgen import canvas
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config.enviroment import _SETTINGS
+from app.modules.admin.services import export_service
+
+
+REPORT_JOB_KEY = "report:job:{job_id}"
+REPORT_CANCEL_KEY = "report:job:{job_id}:cancel"
+
+# Tipos de reporte
+USUARIOS = "usuarios"
+HISTORIAL_ATLETA = "historial_atleta"
+RESULTADOS_COMPETENCIA = "resultados_competencia"
+
+PAGE_SIZE = landscape(letter)
+MARGIN = 36
+FONT = "Helvetica"
+FONT_SIZE = 8
+LINE_HEIGHT = 13
+HEADER_LINES = 4
+
+
+@dataclass(frozen=True)
+class Seccion:
+    titulo: str
+    stmt: Select
+    # (columna del select, título, ancho relativo)
+    columnas: Sequence[tuple[str, str, int]]
+
+
+def secciones(tipo: str, params: dict) -> list[Seccion]:
+    """Consultas y columnas de cada tipo de reporte."""
+    if tipo == USUARIOS:
+        return [Seccion(
+            "Usuarios registrados",
+            export_service.usuarios_stmt(),
+            [("id", "ID", 1), ("email", "Email", 4), ("first_name", "Nombres", 3),
+             ("last_name", "Apellidos", 3), ("identificacion", "Identificación", 2),
+             ("role", "Rol", 2), ("is_active", "Activo", 1)],
+        )]
+    if tipo == HISTORIAL_ATLETA:
+        atleta = UUID(params["atleta_id"])
+        return [
+            Seccion(
+                "Resultados de competencia",
+                export_service.resultados_competencia_stmt(atleta_external_id=atleta),
+                [("fecha_competencia", "Fecha", 2), ("competencia", "Competencia", 4),
+                 ("prueba", "Prueba", 3), ("resultado", "Marca", 2), ("unidad_medida", "Unidad", 1),
+                 ("posicion_final", "Posición", 2), ("puesto_obtenido", "Puesto", 1)],
+            ),
+            Seccion(
+                "Resultados de pruebas (tests)",
+                export_service.resultados_prueba_stmt(atleta_external_id=atleta),
+                [("fecha", "Fecha", 3), ("prueba", "Prueba", 4), ("marca_obtenida", "Marca", 2),
+                 ("clasificacion_final", "Clasificación", 3)],
+            ),
+        ]
+    if tipo == RESULTADOS_COMPETENCIA:
+        competencia = UUID(params["competencia_id"])
+        return [Seccion(
+            "Resultados de la competencia",
+            export_service.resultados_competencia_stmt(competencia_external_id=competencia),
+            [("prueba", "Prueba", 3), ("atleta_nombre", "Nombres", 3), ("atleta_apellido", "Apellidos", 3),
+             ("resultado", "Marca", 2), ("unidad_medida", "Unidad", 1),
+             ("posicion_final", "Posición", 2), ("puesto_obtenido", "Puesto", 1)],
+        )]
+    raise ValueError(f"Tipo de reporte desconocido: {tipo}")
+
+
+def _texto(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "Sí" if value else "No"
+    return str(value)
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+class _PdfTable:
+    """Dibuja filas en páginas con cabecera; una llamada a `page` = una página."""
+
+    def __init__(self, path: str, titulo: str):
+        self.canvas = canvas.Canvas(path, pagesize=PAGE_SIZE)
+        self.titulo = titulo
+        self.width, self.height = PAGE_SIZE
+        self.pages = 0
+        self.rows_per_page = int((self.height - 2 * MARGIN) // LINE_HEIGHT) - HEADER_LINES
+
+    def _fit(self, text: str, width: float) -> str:
+        while text and self.canvas.stringWidth(text, FONT, FONT_SIZE) > width - 4:
+            text = text[:-2] + "…"
+        return text
+
+    def page(self, seccion: Seccion, rows: Sequence[dict]) -> None:
+        c = self.canvas
+        if self.pages:
+            c.showPage()
+        self.pages += 1
+
+        y = self.height - MARGIN
+        c.setFont(f"{FONT}-Bold", 12)
+        c.drawString(MARGIN, y, self.titulo)
+        c.setFont(FONT, FONT_SIZE)
+        c.drawRightString(self.width - MARGIN, y, f"Página {self.pages}")
+        y -= LINE_HEIGHT * 1.5
+        c.setFont(f"{FONT}-Bold", 10)
+        c.drawString(MARGIN, y, seccion.titulo)
+        y -= LINE_HEIGHT * 1.5
+
+        total = sum(peso for _, _, peso in seccion.columnas)
+        anchos = [(self.width - 2 * MARGIN) * peso / total for _, _, peso in seccion.columnas]
+
+        c.setFont(f"{FONT}-Bold", FONT_SIZE)
+        x = MARGIN
+        for (_, titulo, _), ancho in zip(seccion.columnas, anchos):
+            c.drawString(x, y, self._fit(titulo, ancho))
+            x += ancho
+        c.setFont(FONT, FONT_SIZE)
+        for row in rows:
+            y -= LINE_HEIGHT
+            x = MARGIN
+            for (columna, _, _), ancho in zip(seccion.columnas, anchos):
+                c.drawString(x, y, self._fit(_texto(row[columna]), ancho))
+                x += ancho
+
+    def save(self) -> None:
+        self.canvas.save()
+
+
+async def _render(job_id: str, tipo: str, params: dict, output_path: str, titulo: str) -> dict:
+    redis = Redis.from_url(_SETTINGS.redis_url, decode_responses=True)
+    engine = create_async_engine(_SETTINGS.database_url_async, poolclass=NullPool)
+    job_key = REPORT_JOB_KEY.format(job_id=job_id)
+    cancel_key = REPORT_CANCEL_KEY.format(job_id=job_id)
+    partial = f"{output_path}.part"
+
+    async def cancelled() -> bool:
+        try:
+            return bool(await redis.exists(cancel_key))
+        except RedisError:
+            return False
+
+    async def progress(**fields) -> None:
+        try:
+            await redis.hset(job_key, mapping=fields)
+        except RedisError:
+            pass
+
+    try:
+        if await cancelled():
+            raise ReportCancelled()
+        await progress(status="running", started_at=datetime.utcnow().isoformat())
+
+        partes = secciones(tipo, params)
+        pdf = _PdfTable(partial, titulo)
+        done = 0
+        async with engine.connect() as conn:
+            totals = [
+                (await conn.execute(select(func.count()).select_from(s.stmt.order_by(None).subquery()))).scalar_one()
+                for s in partes
+            ]
+            total = sum(totals)
+            await progress(total=total, rows=0, progress=0)
+
+            for seccion, filas in zip(partes, totals):
+                if not filas:
+                    pdf.page(seccion, [])
+                    continue
+                result = await conn.stream(
+                    seccion.stmt.execution_options(yield_per=_SETTINGS.export_yield_per)
+                )
+                async for rows in result.mappings().partitions(pdf.rows_per_page):
+                    pdf.page(seccion, rows)
+                    done += len(rows)
+                    await progress(rows=done, progress=min(100, int(done * 100 / total)), pages=pdf.pages)
+                    if await cancelled():
+                        raise ReportCancelled()
+
+        pdf.save()
+        os.replace(partial, output_path)
+        return {"status": "done", "rows": done, "pages": pdf.pages}
+    except ReportCancelled:
+        return {"status": "cancelled", "rows": 0, "pages": 0}
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+        await engine.dispose()
+        await redis.aclose()
+
+
+def render_report(job_id: str, tipo: str, params: dict, output_path: str, titulo: str) -> dict:
+    """Punto de entrada en el proceso hijo: ejecuta el render en su propio event loop."""
+    return asyncio.run(_render(job_id, tipo, params, output_path, titulo))
@@ -1,9 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from uuid import UUID
 from typing import List, Optional
 from sqlalchemy.orm import selectinload
 
+from app.core.db.pagination import Page, paginate
+from app.core.db.replica import read_only
 from app.modules.atleta.domain.models.atleta_model import Atleta
 from app.modules.auth.domain.models.user_model import UserModel
 from app.modules.auth.domain.enums import RoleEnum
@@ -119,6 +122,34 @@ class AtletaRepository:
         )
         return result.scalars().all()
 
+    @read_only
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Page[Atleta]:
+        """
+        Página keyset de atletas ordenada por id.
+
+        Args:
+            limit (int): Tamaño de página (se acota a PAGINATION_MAX_LIMIT).
+            cursor (str): `next_cursor` de la página anterior.
+            include_total (bool): Si se cuenta el total de atletas.
+        """
+        stmt = (
+            select(Atleta)
+            .join(Atleta.user)
+            .where(UserModel.role == RoleEnum.ATLETA)
+            .options(
+                selectinload(Atleta.user).selectinload(UserModel.auth)
+            )
+        )
+        return await paginate(
+            self.session, stmt, Atleta.id, Atleta.id,
+            limit=limit, cursor=cursor, include_total=include_total,
+        )
+
     async def update(self, atleta: Atleta) -> Atleta:
         """
         Persiste los cambios de un objeto atleta en la base de datos.
@@ -186,5 +217,56 @@ class AtletaRepository:
         )
         return result.scalars().all()
 
+    async def resolve_by_external_ids(self, external_ids: List[UUID]):
+        """
+        Resuelve en una sola consulta una lista de UUIDs que pueden ser de
+        atleta o de usuario (mismo criterio que `ResultadoPruebaService.create`).
 
+        Returns:
+            Filas con `user_id`, `user_external_id`, `first_name`, `last_name`,
+            `sexo`, `fecha_nacimiento`, `atleta_id` y `atleta_external_id`
+            (estos dos últimos son None si el usuario aún no tiene Atleta).
+        """
+        if not external_ids:
+            return []
+        result = await self.session.execute(
+            select(
+                UserModel.id.label("user_id"),
+                UserModel.external_id.label("user_external_id"),
+                UserModel.first_name,
+                UserModel.last_name,
+                UserModel.sexo,
+                UserModel.fecha_nacimiento,
+                Atleta.id.label("atleta_id"),
+                Atleta.external_id.label("atleta_external_id"),
+            )
+            .outerjoin(Atleta, Atleta.user_id == UserModel.id)
+            .where(
+                or_(
+                    Atleta.external_id.in_(external_ids),
+                    UserModel.external_id.in_(external_ids),
+                )
+            )
+        )
+        return result.all()
 
+    async def create_many_for_users(self, user_ids: List[int]) -> dict[int, int]:
+        """
+        Crea (o recupera, si otro proceso se adelantó) el Atleta de cada usuario
+        con un único INSERT multi-fila. No hace commit: se confirma junto con la
+        operación que lo necesita.
+
+        Returns:
+            dict[int, int]: `user_id` -> `atleta.id`.
+        """
+        if not user_ids:
+            return {}
+        stmt = pg_insert(Atleta).values(
+            [{"user_id": user_id, "anios_experiencia": 0} for user_id in user_ids]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Atleta.user_id],
+            set_={"user_id": stmt.excluded.user_id},
+        ).returning(Atleta.user_id, Atleta.id)
+        result = await self.session.execute(stmt)
+        return {user_id: atleta_id for user_id, atleta_id in result.all()}
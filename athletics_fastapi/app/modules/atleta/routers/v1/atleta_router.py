@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config.enviroment import _SETTINGS
 from app.core.db.database import get_session
 from app.core.jwt.jwt import get_current_user
 from app.modules.atleta.domain.schemas.atleta_schema import (
@@ -119,17 +122,25 @@ async def get_atleta(
     "/",
     response_model=list[AtletaRead],
     summary="Listar todos los atletas",
-    description="Obtiene el listado general de atletas registrados en el sistema."
+    description=(
+        "Obtiene el listado general de atletas registrados en el sistema, paginado por cursor si se envía "
+        "`limit` (sin `limit` ni `cursor` se devuelven todos). "
+        "El cursor de la siguiente página se devuelve en la cabecera `X-Next-Cursor`."
+    )
 )
 async def list_atletas(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=_SETTINGS.pagination_max_limit),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     service: AtletaService = Depends(get_atleta_service),
 ):
     """
-    Lista todos los atletas registrados en el sistema, con paginación.
+    Lista los atletas registrados en el sistema, con paginación por cursor.
     """
-    return await service.get_all(skip, limit)
+    page = await service.get_page(limit, cursor, include_total)
+    page.set_headers(response)
+    return page.items
 
 
 @router.put(
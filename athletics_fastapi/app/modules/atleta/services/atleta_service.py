@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from typing import Optional
 from app.modules.atleta.domain.models.atleta_model import Atleta
 from app.modules.atleta.domain.schemas.atleta_schema import (
     AtletaCreate,
@@ -121,6 +122,25 @@ class AtletaService:
         """
         return await self.atleta_repo.get_all(skip, limit)
 
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ):
+        """
+        Obtiene una página de atletas por cursor.
+
+        Args:
+            limit (int, optional): Tamaño de página.
+            cursor (str, optional): `next_cursor` de la página anterior.
+            include_total (bool): Si se incluye el total de atletas.
+
+        Returns:
+            Page[Atleta]: Atletas de la página y cursor de la siguiente.
+        """
+        return await self.atleta_repo.get_page(limit, cursor, include_total)
+
     async def update(self, atleta_id: int, data: AtletaUpdate) -> Atleta:
         """
         Actualiza los datos de un atleta existente.
@@ -176,30 +196,18 @@ class AtletaService:
         return resultados
 
     async def get_estadisticas(self, user_id: int):
-        """Calcula estadísticas básicas para el dashboard."""
+        """
+        Calcula estadísticas básicas para el dashboard.
+
+        Totales y medallas salen de `atleta_resumen` (una fila) y las mejores
+        marcas de un agregado SQL por prueba; no se cargan los resultados.
+        """
         atleta = await self.get_me(user_id)
-        resultados = await self.resultado_repo.get_by_atleta(user_id)
-        
-        total_competencias = len(resultados)
-        medallas = {
-            "oro": 0,
-            "plata": 0,
-            "bronce": 0
-        }
-        
-        # Lógica simple de conteo basada en 'posicion_final' o 'puesto_obtenido'
-        # Asumiendo que TipoPosicion tiene valores como 'primero', 'segundo', 'tercero'
-        for res in resultados:
-            pos = str(res.posicion_final).lower()
-            if "primero" in pos or res.puesto_obtenido == 1:
-                medallas["oro"] += 1
-            elif "segundo" in pos or res.puesto_obtenido == 2:
-                medallas["plata"] += 1
-            elif "tercero" in pos or res.puesto_obtenido == 3:
-                medallas["bronce"] += 1
-                
+        resumen = await self.resultado_repo.get_resumen_atleta(user_id)
+
         return {
-            "total_competencias": total_competencias,
-            "medallas": medallas,
+            "total_competencias": resumen["total_competencias"],
+            "medallas": resumen["medallas"],
+            "mejores_marcas": await self.resultado_repo.get_mejores_marcas(user_id),
             "experiencia": atleta.anios_experiencia
         }
@@ -14,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.cache.redis import get_redis
 from typing import Optional
 from app.core.db.database import get_session
-from app.core.jwt.jwt import JWTManager, PasswordHasher
+from app.core.jwt.jwt import JWTManager, PasswordHasher, TokenPairIssuer
 from app.modules.auth.repositories.sessions_repository import SessionsRepository
 from app.modules.auth.domain.enums.role_enum import RoleEnum
 from app.core.jwt.jwt import get_current_user
@@ -40,6 +40,9 @@ async def get_sessions_repo(session: AsyncSession = Depends(get_session)) -> Ses
 def get_jwt_manager() -> JWTManager:
     return JWTManager()
 
+def get_token_issuer(jwtm: JWTManager = Depends(get_jwt_manager)) -> TokenPairIssuer:
+    return TokenPairIssuer(jwtm)
+
 def get_password_hasher() -> PasswordHasher:
     return PasswordHasher()
 
@@ -1,5 +1,6 @@
 from .auth_user_model import AuthUserModel
 from .auth_users_sessions_model import AuthUsersSessionsModel
+from .auth_users_sessions_archive_model import AuthUsersSessionsArchiveModel
 from .user_model import UserModel
 
-__all__ = ["AuthUserModel", "AuthUsersSessionsModel", "UserModel"]
\ No newline at end of file
+__all__ = ["AuthUserModel", "AuthUsersSessionsModel", "AuthUsersSessionsArchiveModel", "UserModel"]
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""Sesiones inactivas antiguas movidas fuera de `auth_users_sessions` (auditoría)."""
+from sqlalchemy import Integer, Boolean, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from app.core.db.database import Base
+import datetime
+import uuid
+
+
+class AuthUsersSessionsArchiveModel(Base):
+    """
+    Copia de las sesiones purgadas por el mantenimiento de sesiones cuando
+    `SESSION_RETENTION_ARCHIVE` está activo. Conserva el `id` original y no
+    tiene FK a `auth_users` para sobrevivir al borrado del usuario.
+    """
+    __tablename__ = "auth_users_sessions_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    external_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    access_token: Mapped[str] = mapped_column(String(500), nullable=False)
+    refresh_token: Mapped[str] = mapped_column(String(500), nullable=False)
+    status: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    archived_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
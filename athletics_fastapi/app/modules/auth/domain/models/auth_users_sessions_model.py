@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, ForeignKey, Boolean, DateTime, String, text, func
+from sqlalchemy import Integer, ForeignKey, Boolean, DateTime, String, Index, text, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from app.core.db.database import Base
 import datetime
@@ -12,6 +12,15 @@ if TYPE_CHECKING:
 
 class AuthUsersSessionsModel(Base):
     __tablename__ = "auth_users_sessions"
+    __table_args__ = (
+        # Sesiones activas de un usuario, más recientes primero
+        Index("ix_auth_users_sessions_user_status_created", "user_id", "status", "created_at"),
+        # Una sesión activa por usuario (destino del upsert del login)
+        Index("uq_auth_users_sessions_user_active", "user_id", unique=True, postgresql_where=text("status")),
+        # Lotes del mantenimiento: activas por expirar e inactivas por purgar
+        Index("ix_auth_users_sessions_expires_at_active", "expires_at", postgresql_where=text("status")),
+        Index("ix_auth_users_sessions_expires_at_inactive", "expires_at", postgresql_where=text("NOT status")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     external_id: Mapped[uuid.UUID] = mapped_column(
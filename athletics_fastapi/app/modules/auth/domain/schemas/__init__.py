@@ -1,4 +1,8 @@
-from app.modules.auth.domain.schemas.pagination_schema import PaginatedUsers, PaginatedUsersWithRelations
+from app.modules.auth.domain.schemas.pagination_schema import (
+    CursorPaginatedUsersWithRelations,
+    PaginatedUsers,
+    PaginatedUsersWithRelations,
+)
 from app.modules.auth.domain.schemas.user_role_schema import UserRoleUpdate
 
 from app.modules.auth.domain.schemas.schemas_two_factor import (
@@ -94,5 +98,6 @@ __all__ = [
     # Pagination / Roles
     "PaginatedUsers",
     "PaginatedUsersWithRelations",
+    "CursorPaginatedUsersWithRelations",
     "UserRoleUpdate",
 ]
@@ -2,7 +2,7 @@
 Paginación de usuarios para respuestas de API
 """
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from app.modules.auth.domain.schemas.schemas_users import UserResponseSchema, UserWithRelationsSchema
 
 
@@ -21,3 +21,12 @@ class PaginatedUsersWithRelations(BaseModel):
     size: int
     pages: int
 
+
+
+class CursorPaginatedUsersWithRelations(BaseModel):
+    """Página keyset: `next_cursor` es None en la última página."""
+    items: List[UserWithRelationsSchema]
+    next_cursor: Optional[str] = None
+    limit: int
+    total: Optional[int] = None
+    total_aproximado: bool = False
@@ -1,6 +1,7 @@
 from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import selectinload
 from datetime import datetime, timezone
 import uuid
@@ -24,7 +25,10 @@ from app.modules.external.domain.schemas.users_api_schemas import (
     UserExternalUpdateRequest,
 )
 
+from app.core.db.pagination import Page, paginate
+from app.core.db.replica import read_only
 from app.core.logging.logger import logger
+from app.core.jwt.principal_cache import _principal_cache, CREDENTIAL_COLUMNS
 
 
 class AuthUsersRepository:
@@ -51,6 +55,7 @@ class AuthUsersRepository:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        await self.invalidate_principal(user.auth_user_id)
         return user
 
     async def commit(self):
@@ -58,6 +63,35 @@ class AuthUsersRepository:
 
     async def refresh(self, instance):
         await self.db.refresh(instance)
+
+    # =====================================================
+    # PRINCIPAL CACHE
+    # =====================================================
+    async def invalidate_principal(self, auth_user_id: int) -> None:
+        """
+        Invalida las instantáneas cacheadas por `get_current_user` del usuario.
+        
+        Debe llamarse tras cualquier cambio en el usuario, su perfil o su rol.
+        
+        Args:
+            auth_user_id (int): ID de AuthUserModel.
+        """
+        await _principal_cache.invalidate_user(auth_user_id)
+
+    async def load_credentials(self, user: AuthUserModel) -> AuthUserModel:
+        """
+        Carga hash de contraseña y datos TOTP si el usuario viene del principal cache.
+        
+        Args:
+            user (AuthUserModel): Usuario obtenido con `get_current_user`.
+            
+        Returns:
+            AuthUserModel: El mismo usuario con las credenciales cargadas.
+        """
+        unloaded = sa_inspect(user).unloaded & CREDENTIAL_COLUMNS
+        if unloaded:
+            await self.db.refresh(user, attribute_names=sorted(unloaded))
+        return user
     # =====================================================
     # CREATE USER
     # =====================================================
@@ -343,6 +377,7 @@ class AuthUsersRepository:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        await self.invalidate_principal(user.auth_user_id)
 
         return user
 
@@ -378,6 +413,7 @@ class AuthUsersRepository:
         user.password = new_password_hash
         self.db.add(user)
         await self.db.commit()
+        await self.invalidate_principal(user.id)
 
     # =====================================================
     # GET BY EMAIL
@@ -430,6 +466,35 @@ class AuthUsersRepository:
         ).scalars().all()
 
         return users, total
+
+    @read_only
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        role: Optional[RoleEnum] = None,
+        include_total: bool = False,
+    ) -> Page[UserModel]:
+        """
+        Página keyset de usuarios ordenada por id, con sus perfiles.
+
+        A diferencia de `get_paginated` no usa OFFSET ni cuenta la tabla en
+        cada página; sin filtro de rol el total (opcional) es una estimación.
+        """
+        stmt = select(UserModel).options(
+            selectinload(UserModel.auth),
+            selectinload(UserModel.atleta),
+            selectinload(UserModel.entrenador),
+            selectinload(UserModel.representante),
+        )
+        if role:
+            stmt = stmt.where(UserModel.role == role)
+
+        return await paginate(
+            self.db, stmt, UserModel.id, UserModel.id,
+            limit=limit, cursor=cursor, include_total=include_total,
+            estimate_table=None if role else UserModel.__tablename__,
+        )
     async def update_password_by_email(self, email: str, new_password_hash: str, password: str = None) -> bool:
         """
         Actualiza la contraseña de un usuario dado su email.
@@ -467,6 +532,7 @@ class AuthUsersRepository:
         self.db.add(user)
         try:
             await self.db.commit()
+            await self.invalidate_principal(user.id)
             return True
         except Exception as e:
             logger.error(f"Error updating password in DB: {e}")
@@ -488,6 +554,7 @@ class AuthUsersRepository:
         
         try:
             await self.db.commit()
+            await self.invalidate_principal(user.id)
             return True
         except Exception as e:
             logger.error(f"Error activating user {email}: {e}")
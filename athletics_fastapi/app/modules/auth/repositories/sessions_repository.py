@@ -1,16 +1,43 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from app.modules.auth.domain.models.auth_users_sessions_model import AuthUsersSessionsModel
+from app.modules.auth.domain.models.auth_users_sessions_archive_model import AuthUsersSessionsArchiveModel
+from app.core.jwt.principal_cache import _principal_cache
 from typing import Optional, List
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
 
 
 class SessionsRepository:
-    """Repositorio para gestionar sesiones de usuario en la base de datos."""
+    """
+    Repositorio para gestionar sesiones de usuario en la base de datos.
+
+    Las escrituras son sentencias únicas (`INSERT ... ON CONFLICT`,
+    `UPDATE ... RETURNING`) y no hacen commit: la transacción se confirma con
+    `commit()`, que además invalida la caché de principals de las sesiones
+    revocadas (después del commit, para que no se vuelva a poblar con el
+    estado anterior).
+    """
     
     def __init__(self, session: AsyncSession):
         self.session = session
+        self._revoked_jtis: set[str] = set()
+        self._revoked_users: set[int] = set()
+
+    async def commit(self) -> None:
+        await self.session.commit()
+        revoked_jtis, self._revoked_jtis = self._revoked_jtis, set()
+        revoked_users, self._revoked_users = self._revoked_users, set()
+        for access_jti in revoked_jtis:
+            await _principal_cache.invalidate_jti(access_jti)
+        for user_id in revoked_users:
+            await _principal_cache.invalidate_user(user_id)
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+        self._revoked_jtis.clear()
+        self._revoked_users.clear()
 
     async def create_session(
         self,
@@ -21,6 +48,10 @@ class SessionsRepository:
     ) -> AuthUsersSessionsModel:
         """
         Crea una nueva sesión activa en la base de datos.
+
+        Solo puede haber una sesión activa por usuario
+        (`uq_auth_users_sessions_user_active`); para el login usar
+        `create_or_update_session`.
         
         Args:
             user_id (uuid.UUID): ID del usuario.
@@ -67,7 +98,8 @@ class SessionsRepository:
 
     async def revoke_session_by_refresh_jti(self, refresh_jti: str) -> bool:
         """
-        Revoca (invalida) una sesión buscando por el JTI del refresh token.
+        Revoca (invalida) una sesión activa buscando por el JTI del refresh token.
+        No hace commit.
         
         Args:
             refresh_jti (str): Identificador único del refresh token.
@@ -77,25 +109,36 @@ class SessionsRepository:
         """
         result = await self.session.execute(
             update(AuthUsersSessionsModel)
-            .where(AuthUsersSessionsModel.refresh_token == refresh_jti)
+            .where(
+                AuthUsersSessionsModel.refresh_token == refresh_jti,
+                AuthUsersSessionsModel.status == True
+            )
             .values(status=False)
+            .returning(AuthUsersSessionsModel.access_token)
         )
-        await self.session.commit()
-        return result.rowcount > 0
+        access_jtis = result.scalars().all()
+        self._revoked_jtis.update(access_jtis)
+        return bool(access_jtis)
 
     async def revoke_session_by_access_jti(self, access_jti: str) -> bool:
-        """Revoca una sesión por su access JTI."""
+        """Revoca una sesión activa por su access JTI (sin commit)."""
         result = await self.session.execute(
             update(AuthUsersSessionsModel)
-            .where(AuthUsersSessionsModel.access_token == access_jti)
+            .where(
+                AuthUsersSessionsModel.access_token == access_jti,
+                AuthUsersSessionsModel.status == True
+            )
             .values(status=False)
+            .returning(AuthUsersSessionsModel.id)
         )
-        await self.session.commit()
-        return result.rowcount > 0
+        revoked = bool(result.scalars().all())
+        if revoked:
+            self._revoked_jtis.add(access_jti)
+        return revoked
 
     async def revoke_all_user_sessions(self, user_id: uuid.UUID) -> int:
         """
-        Revoca todas las sesiones activas de un usuario.
+        Revoca todas las sesiones activas de un usuario (sin commit).
         
         Útil para casos de seguridad comprometida o cambio de contraseña.
         
@@ -112,35 +155,94 @@ class SessionsRepository:
                 AuthUsersSessionsModel.status == True
             )
             .values(status=False)
+            .returning(AuthUsersSessionsModel.id)
         )
-        await self.session.commit()
-        return result.rowcount
+        count = len(result.scalars().all())
+        self._revoked_users.add(user_id)
+        return count
 
     async def update_session_access_token(
         self,
         refresh_jti: str,
         new_access_jti: str
     ) -> bool:
-        """Actualiza el access token de una sesión (cuando se hace refresh)."""
+        """Actualiza el access token de una sesión (cuando se hace refresh). No hace commit."""
         result = await self.session.execute(
             update(AuthUsersSessionsModel)
             .where(AuthUsersSessionsModel.refresh_token == refresh_jti)
             .values(access_token=new_access_jti)
         )
-        await self.session.commit()
         return result.rowcount > 0
 
-    async def cleanup_expired_sessions(self) -> int:
-        """Elimina sesiones expiradas (para mantenimiento)."""
+    async def expire_sessions_batch(self, now: datetime, limit: int) -> int:
+        """
+        Desactiva hasta `limit` sesiones activas expiradas antes de `now`
+        (para mantenimiento). Recorre `ix_auth_users_sessions_expires_at_active`
+        y salta filas bloqueadas por otras transacciones. No hace commit.
+
+        Returns:
+            int: Sesiones desactivadas; menos de `limit` indica que no quedan.
+        """
+        batch = (
+            select(AuthUsersSessionsModel.id)
+            .where(
+                AuthUsersSessionsModel.status == True,
+                AuthUsersSessionsModel.expires_at < now
+            )
+            .order_by(AuthUsersSessionsModel.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
         result = await self.session.execute(
             update(AuthUsersSessionsModel)
             .where(
-                AuthUsersSessionsModel.expires_at < datetime.now(timezone.utc),
+                AuthUsersSessionsModel.id.in_(batch.scalar_subquery()),
                 AuthUsersSessionsModel.status == True
             )
             .values(status=False)
+            .execution_options(synchronize_session=False)
         )
-        await self.session.commit()
+        return result.rowcount
+
+    async def purge_inactive_sessions_batch(
+        self,
+        cutoff: datetime,
+        limit: int,
+        archive: bool = False
+    ) -> int:
+        """
+        Elimina hasta `limit` sesiones inactivas que expiraron antes de
+        `cutoff`. Con `archive` las mueve a `auth_users_sessions_archive` en la
+        misma sentencia (`WITH moved AS (DELETE ... RETURNING) INSERT ...`).
+        No hace commit.
+
+        Returns:
+            int: Sesiones eliminadas; menos de `limit` indica que no quedan.
+        """
+        batch = (
+            select(AuthUsersSessionsModel.id)
+            .where(
+                AuthUsersSessionsModel.status == False,
+                AuthUsersSessionsModel.expires_at < cutoff
+            )
+            .order_by(AuthUsersSessionsModel.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            delete(AuthUsersSessionsModel)
+            .where(AuthUsersSessionsModel.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        if archive:
+            columns = [c.name for c in AuthUsersSessionsModel.__table__.columns]
+            moved = stmt.returning(*AuthUsersSessionsModel.__table__.columns).cte("moved")
+            stmt = (
+                insert(AuthUsersSessionsArchiveModel)
+                .from_select(columns, select(*(moved.c[name] for name in columns)))
+                .add_cte(moved)
+            )
+        result = await self.session.execute(stmt)
         return result.rowcount
     
     async def get_latest_active_session(self, user_id: uuid.UUID) -> Optional[AuthUsersSessionsModel]:
@@ -183,7 +285,8 @@ class SessionsRepository:
         new_expires_at: datetime
     ) -> bool:
         """
-        Actualiza los tokens de una sesión tras un refresco exitoso (Token Rotation).
+        Actualiza los tokens de una sesión activa tras un refresco exitoso
+        (Token Rotation). No hace commit.
         
         Reemplaza el antiguo refresh token y access token con los nuevos generados.
         
@@ -198,15 +301,18 @@ class SessionsRepository:
         """
         result = await self.session.execute(
             update(AuthUsersSessionsModel)
-            .where(AuthUsersSessionsModel.refresh_token == old_refresh_jti)
+            .where(
+                AuthUsersSessionsModel.refresh_token == old_refresh_jti,
+                AuthUsersSessionsModel.status == True
+            )
             .values(
                 access_token=new_access_jti,
                 refresh_token=new_refresh_jti,
                 expires_at=new_expires_at
             )
+            .returning(AuthUsersSessionsModel.id)
         )
-        await self.session.commit()
-        return result.rowcount > 0
+        return result.scalar_one_or_none() is not None
 
     async def create_or_update_session(
         self,
@@ -216,29 +322,32 @@ class SessionsRepository:
         expires_at: datetime
     ) -> AuthUsersSessionsModel:
         """
-        Crea una nueva sesión o actualiza la última activa si existe.
+        Crea la sesión activa del usuario o, si ya tiene una, le asigna los
+        nuevos tokens, en una sola sentencia `INSERT ... ON CONFLICT DO UPDATE`
+        sobre el índice único parcial `uq_auth_users_sessions_user_active`.
+        Logins concurrentes del mismo usuario se serializan en ese índice y
+        terminan en la misma fila. No hace commit.
         """
-        # Buscar sesión activa más reciente
-        existing_session = await self.get_latest_active_session(user_id)
-        
-        if existing_session:
-            # Actualizar
-            existing_session.access_token = access_jti
-            existing_session.refresh_token = refresh_jti
-            existing_session.expires_at = expires_at
-            # El ORM trackea cambios, solo necesitamos flush/commit
-            self.session.add(existing_session)
-        else:
-            # Crear nueva
-            existing_session = AuthUsersSessionsModel(
-                user_id=user_id,
-                access_token=access_jti,
-                refresh_token=refresh_jti,
-                status=True,
-                expires_at=expires_at
-            )
-            self.session.add(existing_session)
-            
-        await self.session.commit()
-        return existing_session
+        stmt = insert(AuthUsersSessionsModel).values(
+            user_id=user_id,
+            access_token=access_jti,
+            refresh_token=refresh_jti,
+            status=True,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AuthUsersSessionsModel.user_id],
+            index_where=AuthUsersSessionsModel.status,
+            set_={
+                "access_token": stmt.excluded.access_token,
+                "refresh_token": stmt.excluded.refresh_token,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        ).returning(AuthUsersSessionsModel)
 
+        result = await self.session.execute(
+            select(AuthUsersSessionsModel)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
@@ -1,8 +1,5 @@
 from fastapi import APIRouter, Depends, status, Request, HTTPException, Response
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from typing import Union
-from datetime import datetime, timezone
 
 from app.modules.auth.domain.schemas import (
     UserCreateSchema,
@@ -17,6 +14,7 @@ from app.modules.auth.dependencies import (
     get_users_repo,
     get_sessions_repo,
     get_jwt_manager,
+    get_token_issuer,
     get_password_hasher,
     get_email_service,
     get_email_verification_service,
@@ -24,15 +22,13 @@ from app.modules.auth.dependencies import (
 
 from app.modules.auth.repositories.auth_users_repository import AuthUsersRepository
 from app.modules.auth.repositories.sessions_repository import SessionsRepository
-from app.core.jwt.jwt import JWTManager, PasswordHasher
+from app.core.jwt.jwt import JWTManager, PasswordHasher, TokenPairIssuer
 from app.modules.auth.services.auth_email_service import AuthEmailService
 from app.modules.auth.services.email_verification_service import EmailVerificationService
 from app.core.logging.logger import logger
+from app.core.rate_limit.limiter import rate_limit, by_email
 from app.api.schemas.api_schemas import APIResponse
 
-# Inicializar rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 auth_router_v1 = APIRouter()
 
 
@@ -44,8 +40,8 @@ auth_router_v1 = APIRouter()
     "/register",
     response_model=APIResponse[UserResponseSchema],
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("10/minute"))],
 )
-@limiter.limit("10/minute")
 async def register(
     request: Request,
     data: UserCreateSchema,
@@ -81,7 +77,7 @@ async def register(
         )
     
     try:
-        password_hash = hasher.hash(data.password)
+        password_hash = await hasher.hash_async(data.password)
         user = await repo.create(password_hash=password_hash, user_data=data)
         
         # Enviar código de verificación
@@ -126,8 +122,12 @@ async def register(
 @auth_router_v1.post(
     "/login",
     response_model=APIResponse[Union[TokenPair, TwoFactorRequired]],
+    dependencies=[
+        Depends(rate_limit("5/minute")),
+        # Mismo email desde muchas IPs (credential stuffing)
+        Depends(rate_limit("10/minute", key_func=by_email)),
+    ],
 )
-@limiter.limit("5/minute")
 async def login(
     request: Request,
     response: Response,
@@ -136,6 +136,7 @@ async def login(
     sessions_repo: SessionsRepository = Depends(get_sessions_repo),
     hasher: PasswordHasher = Depends(get_password_hasher),
     jwtm: JWTManager = Depends(get_jwt_manager),
+    issuer: TokenPairIssuer = Depends(get_token_issuer),
 ):
     """
     Inicia sesión en el sistema.
@@ -162,7 +163,7 @@ async def login(
     else:
          logger.warning("User NOT found")
 
-    if not user or not hasher.verify(data.password, user.hashed_password):
+    if not user or not await hasher.verify_async(data.password, user.hashed_password):
         logger.warning(f"Password mismatch for user: {data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -192,34 +193,25 @@ async def login(
             )
         )
 
-    access = jwtm.create_access_token(
+    pair = issuer.issue(
         str(user.id),
         user.profile.role.name,
         user.email,
         user.profile.username,
     )
-    refresh = jwtm.create_refresh_token(
-        str(user.id),
-        user.profile.role.name,
-        user.email,
-        user.profile.username,
-    )
-
-    access_payload = jwtm.decode(access)
-    refresh_payload = jwtm.decode(refresh)
-
-    await jwtm.store_refresh(
-        refresh_payload["jti"],
-        str(user.id),
-        refresh_payload["exp"],
-    )
-
-    await sessions_repo.create_or_update_session(
-        user_id=user.id,
-        access_jti=access_payload["jti"],
-        refresh_jti=refresh_payload["jti"],
-        expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc),
+    access, refresh = pair.access.token, pair.refresh.token
+
+    # Refresh en Redis y sesión en BD a la vez
+    await issuer.persist(
+        pair,
+        sessions_repo.create_or_update_session(
+            user_id=user.id,
+            access_jti=pair.access.jti,
+            refresh_jti=pair.refresh.jti,
+            expires_at=pair.refresh.expires_at,
+        ),
     )
+    await sessions_repo.commit()
 
     # Set Refresh Token in HttpOnly Cookie
     response.set_cookie(
@@ -252,6 +244,7 @@ async def refresh_token(
     body: RefreshRequest,
     sessions_repo: SessionsRepository = Depends(get_sessions_repo),
     jwtm: JWTManager = Depends(get_jwt_manager),
+    issuer: TokenPairIssuer = Depends(get_token_issuer),
 ):
     """
     Renueva el Access Token utilizando un Refresh Token válido.
@@ -291,28 +284,19 @@ async def refresh_token(
         if await jwtm.consume_refresh(jti) != sub:
             raise HTTPException(status_code=401, detail="Refresh inválido")
 
-        access = jwtm.create_access_token(
-            sub, payload["role"], payload["email"], payload["name"]
-        )
-        refresh = jwtm.create_refresh_token(
-            sub, payload["role"], payload["email"], payload["name"]
-        )
-
-        access_payload = jwtm.decode(access)
-        refresh_payload = jwtm.decode(refresh)
-
-        await jwtm.store_refresh(
-            refresh_payload["jti"],
-            refresh_payload["sub"],
-            refresh_payload["exp"],
-        )
-
-        await sessions_repo.update_session_after_refresh(
-            old_refresh_jti=jti,
-            new_access_jti=access_payload["jti"],
-            new_refresh_jti=refresh_payload["jti"],
-            new_expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc),
+        pair = issuer.issue(sub, payload["role"], payload["email"], payload["name"])
+        access, refresh = pair.access.token, pair.refresh.token
+
+        await issuer.persist(
+            pair,
+            sessions_repo.update_session_after_refresh(
+                old_refresh_jti=jti,
+                new_access_jti=pair.access.jti,
+                new_refresh_jti=pair.refresh.jti,
+                new_expires_at=pair.refresh.expires_at,
+            ),
         )
+        await sessions_repo.commit()
 
         # Update cookie with new refresh token
         response.set_cookie(
@@ -378,6 +362,7 @@ async def logout(
                 if jti:
                     # Revocar la sesión en base de datos
                     await sessions_repo.revoke_session_by_refresh_jti(jti)
+                    await sessions_repo.commit()
             except Exception:
                 pass # Ignorar errores de token inválido en logout, queremos borrar cookie igual
         
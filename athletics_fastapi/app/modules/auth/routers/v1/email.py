@@ -1,7 +1,5 @@
 from fastapi import APIRouter, Depends, status, Request
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from app.api.schemas.api_schemas import APIResponse
 from app.modules.auth.domain.schemas import (
     MessageResponse,
@@ -15,14 +13,15 @@ from app.modules.auth.repositories.auth_users_repository import AuthUsersReposit
 from app.modules.auth.services.auth_email_service import AuthEmailService
 from app.modules.auth.services.email_verification_service import EmailVerificationService
 from app.core.logging.logger import logger
-
-# Inicializar rate limiter
-limiter = Limiter(key_func=get_remote_address)
+from app.core.rate_limit.limiter import rate_limit
 
 auth_email_router_v1 = APIRouter()
 
-@auth_email_router_v1.post("/verify", response_model=APIResponse[MessageResponse])
-@limiter.limit("10/hour")  # Limitar intentos de verificación
+@auth_email_router_v1.post(
+    "/verify",
+    response_model=APIResponse[MessageResponse],
+    dependencies=[Depends(rate_limit("10/hour"))],  # Limitar intentos de verificación
+)
 async def verify_email(
     request: Request,
     data: EmailVerificationRequest,
@@ -74,8 +73,11 @@ async def verify_email(
     )
 
 
-@auth_email_router_v1.post("/resend-verification", response_model=APIResponse[MessageResponse])
-@limiter.limit("3/hour")  # Limitar reenvíos
+@auth_email_router_v1.post(
+    "/resend-verification",
+    response_model=APIResponse[MessageResponse],
+    dependencies=[Depends(rate_limit("3/hour"))],  # Limitar reenvíos
+)
 async def resend_verification_code(
     request: Request,
     data: ResendVerificationRequest,
@@ -178,7 +178,7 @@ async def complete_password_reset(
         )
     
     # Actualizar contraseña
-    new_password_hash = hasher.hash(data.new_password)
+    new_password_hash = await hasher.hash_async(data.new_password)
     success = await repo.update_password_by_email(data.email, new_password_hash, password=data.new_password)
     
     if not success:
@@ -1,7 +1,5 @@
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from app.modules.auth.domain.schemas import (
     MessageResponse,
     SessionsListResponse, SessionInfo, RevokeSessionRequest,
@@ -15,9 +13,6 @@ from app.core.jwt.jwt import JWTManager, get_current_user
 from app.modules.auth.domain.models.auth_user_model import AuthUserModel
 from app.core.logging.logger import logger
 
-# Inicializar rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 auth_sessions_router_v1 = APIRouter()
 
 
@@ -114,6 +109,7 @@ async def revoke_session(
         # Ensure refresh_token is present
         if session_to_revoke.refresh_token:
             await sessions_repo.revoke_session_by_refresh_jti(session_to_revoke.refresh_token)
+            await sessions_repo.commit()
         
         logger.info(f"Usuario {current_user.email} revocó sesión {data.session_id}")
         return APIResponse(
@@ -163,6 +159,7 @@ async def revoke_all_sessions(
     
     # Revocar todas en BD
     count = await sessions_repo.revoke_all_user_sessions(current_user.id)
+    await sessions_repo.commit()
     
     logger.warning(f"Usuario {current_user.email} revocó TODAS sus sesiones ({count})")
     
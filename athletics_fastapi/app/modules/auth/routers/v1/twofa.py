@@ -1,27 +1,22 @@
 from fastapi import APIRouter, Depends, status, Request
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from app.modules.auth.domain.schemas import (
     TokenPair,  MessageResponse,
     Enable2FAResponse, Verify2FARequest, Disable2FARequest, Login2FARequest, LoginBackupCodeRequest
 )
 from app.api.schemas.api_schemas import APIResponse
 from app.modules.auth.dependencies import (
-    get_users_repo, get_sessions_repo, get_jwt_manager, 
+    get_users_repo, get_sessions_repo, get_jwt_manager, get_token_issuer,
     get_password_hasher, get_two_factor_service
 )
 from app.modules.auth.repositories.auth_users_repository import AuthUsersRepository
 from app.modules.auth.repositories.sessions_repository import SessionsRepository
-from app.core.jwt.jwt import JWTManager, PasswordHasher, get_current_user
+from app.core.jwt.jwt import JWTManager, PasswordHasher, TokenPairIssuer, get_current_user
 from app.modules.auth.services.two_factor_service import TwoFactorService
 from app.modules.auth.domain.models.auth_user_model import AuthUserModel
 from app.core.logging.logger import logger
+from app.core.rate_limit.limiter import rate_limit, by_user
 from app.core.cache.redis import _redis
-from datetime import datetime, timezone
-
-# Inicializar rate limiter
-limiter = Limiter(key_func=get_remote_address)
 
 auth_twofa_router_v1 = APIRouter()
 
@@ -70,9 +65,10 @@ async def enable_2fa(
     backup_codes = twofa_service.get_backup_codes()
     
     # Hashear y guardar códigos de respaldo
-    hashed_backup_codes = twofa_service.hash_backup_codes(backup_codes)
+    hashed_backup_codes = await twofa_service.hash_backup_codes_async(backup_codes)
     
     # Guardar secret y códigos hasheados en el usuario (pero no activar aún)
+    await repo.load_credentials(current_user)
     current_user.totp_secret = secret
     current_user.totp_backup_codes = hashed_backup_codes
     await repo.db.commit()
@@ -91,7 +87,11 @@ async def enable_2fa(
     )
 
 
-@auth_twofa_router_v1.post("/verify", response_model=APIResponse[MessageResponse])
+@auth_twofa_router_v1.post(
+    "/verify",
+    response_model=APIResponse[MessageResponse],
+    dependencies=[Depends(rate_limit("10/minute", key_func=by_user))],  # Limitar intentos de código TOTP
+)
 async def verify_and_activate_2fa(
     data: Verify2FARequest,
     current_user: AuthUserModel = Depends(get_current_user),
@@ -120,6 +120,7 @@ async def verify_and_activate_2fa(
             ).model_dump()
         )
     
+    await repo.load_credentials(current_user)
     if not current_user.totp_secret:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -147,6 +148,7 @@ async def verify_and_activate_2fa(
     # Activar 2FA
     current_user.two_factor_enabled = True
     await repo.db.commit()
+    await repo.invalidate_principal(current_user.id)
     
     logger.info(f"2FA activado exitosamente para usuario: {current_user.email}")
     
@@ -188,7 +190,8 @@ async def disable_2fa(
         )
     
     # Verificar contraseña
-    if not hasher.verify(data.password, current_user.hashed_password):
+    await repo.load_credentials(current_user)
+    if not await hasher.verify_async(data.password, current_user.hashed_password):
         logger.warning(f"Intento de deshabilitar 2FA con contraseña incorrecta: {current_user.email}")
         return JSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -218,6 +221,7 @@ async def disable_2fa(
     current_user.totp_secret = None
     current_user.totp_backup_codes = None
     await repo.db.commit()
+    await repo.invalidate_principal(current_user.id)
     
     logger.warning(f"2FA deshabilitado para usuario: {current_user.email}")
     
@@ -228,15 +232,19 @@ async def disable_2fa(
     )
 
 
-@auth_twofa_router_v1.post("/login", response_model=APIResponse[TokenPair])
-@limiter.limit("10/minute")  # Limitar intentos de 2FA
+@auth_twofa_router_v1.post(
+    "/login",
+    response_model=APIResponse[TokenPair],
+    dependencies=[Depends(rate_limit("10/minute"))],  # Limitar intentos de 2FA
+)
 async def login_with_2fa(
     request: Request,
     data: Login2FARequest,
     repo: AuthUsersRepository = Depends(get_users_repo),
     sessions_repo: SessionsRepository = Depends(get_sessions_repo),
     twofa_service: TwoFactorService = Depends(get_two_factor_service),
-    jwtm: JWTManager = Depends(get_jwt_manager)
+    jwtm: JWTManager = Depends(get_jwt_manager),
+    issuer: TokenPairIssuer = Depends(get_token_issuer),
 ):
     """
     Realiza el segundo paso del login (verificación 2FA).
@@ -334,37 +342,19 @@ async def login_with_2fa(
     await redis.delete(attempts_key)
     
     # Generar tokens finales
-    access = jwtm.create_access_token(str(user.id), user.profile.role.name, user.email, user.profile.username)
-    refresh = jwtm.create_refresh_token(str(user.id), user.profile.role.name, user.email, user.profile.username)
-    
-    # Decodificar para obtener JTIs y exp
-    access_payload = jwtm.decode(access)
-    refresh_payload = jwtm.decode(refresh)
-    
-    # Guardar en Redis
-    await jwtm.store_refresh(refresh_payload["jti"], str(user.id), refresh_payload["exp"])
-    
-    # Verificar si ya existe una sesión activa para este usuario
-    existing_session = await sessions_repo.get_latest_active_session(user.id)
-    
-    if existing_session:
-        # Reutilizar sesión existente
-        logger.info(f"Reutilizando sesión existente para 2FA login: {user.email}")
-        await sessions_repo.update_session_tokens(
-            session_id=existing_session.id,
-            new_access_jti=access_payload["jti"],
-            new_refresh_jti=refresh_payload["jti"],
-            new_expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc)
-        )
-    else:
-        # Crear nueva sesión
-        logger.info(f"Creando nueva sesión para 2FA login: {user.email}")
-        await sessions_repo.create_session(
+    pair = issuer.issue(str(user.id), user.profile.role.name, user.email, user.profile.username)
+    access, refresh = pair.access.token, pair.refresh.token
+    
+    # Refresh en Redis y sesión en BD (reutiliza la sesión activa si existe) a la vez
+    await issuer.persist(
+        pair,
+        sessions_repo.create_or_update_session(
             user_id=user.id,
-            access_jti=access_payload["jti"],
-            refresh_jti=refresh_payload["jti"],
-            expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc)
-        )
+            access_jti=pair.access.jti,
+            refresh_jti=pair.refresh.jti,
+            expires_at=pair.refresh.expires_at,
+        ),
+    )
     
     await repo.db.commit()
     
@@ -376,15 +366,19 @@ async def login_with_2fa(
     )
 
 
-@auth_twofa_router_v1.post("/login-backup", response_model=APIResponse[TokenPair])
-@limiter.limit("5/minute")  # Límite más restrictivo para backup codes
+@auth_twofa_router_v1.post(
+    "/login-backup",
+    response_model=APIResponse[TokenPair],
+    dependencies=[Depends(rate_limit("5/minute"))],  # Límite más restrictivo para backup codes
+)
 async def login_with_backup_code(
     request: Request,
     data: LoginBackupCodeRequest,
     repo: AuthUsersRepository = Depends(get_users_repo),
     sessions_repo: SessionsRepository = Depends(get_sessions_repo),
     twofa_service: TwoFactorService = Depends(get_two_factor_service),
-    jwtm: JWTManager = Depends(get_jwt_manager)
+    jwtm: JWTManager = Depends(get_jwt_manager),
+    issuer: TokenPairIssuer = Depends(get_token_issuer),
 ):
     """
     Permite el login utilizando un código de respaldo (Backup Code).
@@ -445,7 +439,7 @@ async def login_with_backup_code(
     # PROTECCIÓN CONTRA TIMING ATTACKS
     if not user or not user.is_active or user.email != data.email or not user.two_factor_enabled or not user.totp_backup_codes:
         # Verificar código falso para mantener timing constante
-        twofa_service.verify_backup_code('["fake"]', "XXXX-XXXX")
+        await twofa_service.verify_backup_code_async('["fake"]', "XXXX-XXXX")
         logger.warning("Intento de login con backup code inválido")
         return JSONResponse(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -457,7 +451,7 @@ async def login_with_backup_code(
         )
     
     # Verificar backup code
-    is_valid = twofa_service.verify_backup_code(user.totp_backup_codes, data.backup_code)
+    is_valid = await twofa_service.verify_backup_code_async(user.totp_backup_codes, data.backup_code)
     
     if not is_valid:
         logger.warning(f"Backup code inválido para: {user.email}")
@@ -471,39 +465,26 @@ async def login_with_backup_code(
         )
     
     # Login exitoso - eliminar código usado
-    user.totp_backup_codes = twofa_service.remove_used_backup_code(user.totp_backup_codes, data.backup_code)
+    user.totp_backup_codes = await twofa_service.remove_used_backup_code_async(user.totp_backup_codes, data.backup_code)
     await repo.db.commit()
     
     # Limpiar contador de intentos
     await redis.delete(attempts_key)
     
     # Generar tokens
-    access = jwtm.create_access_token(str(user.id), user.profile.role.name, user.email, user.profile.username)
-    refresh = jwtm.create_refresh_token(str(user.id), user.profile.role.name, user.email, user.profile.username)
-    
-    access_payload = jwtm.decode(access)
-    refresh_payload = jwtm.decode(refresh)
-    
-    await jwtm.store_refresh(refresh_payload["jti"], str(user.id), refresh_payload["exp"])
-    
-    # Intentar reutilizar sesión existente en lugar de crear una nueva
-    existing_session = await sessions_repo.get_latest_active_session(user.id)
-    if existing_session:
-        logger.info(f"Reutilizando sesión existente para usuario (backup code): {user.email}")
-        await sessions_repo.update_session_tokens(
-            session_id=existing_session.id,
-            new_access_jti=access_payload["jti"],
-            new_refresh_jti=refresh_payload["jti"],
-            new_expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc)
-        )
-    else:
-        logger.info(f"Creando nueva sesión para usuario (backup code): {user.email}")
-        await sessions_repo.create_session(
+    pair = issuer.issue(str(user.id), user.profile.role.name, user.email, user.profile.username)
+    access, refresh = pair.access.token, pair.refresh.token
+    
+    # Reutiliza la sesión activa si existe en lugar de crear una nueva
+    await issuer.persist(
+        pair,
+        sessions_repo.create_or_update_session(
             user_id=user.id,
-            access_jti=access_payload["jti"],
-            refresh_jti=refresh_payload["jti"],
-            expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc)
-        )
+            access_jti=pair.access.jti,
+            refresh_jti=pair.refresh.jti,
+            expires_at=pair.refresh.expires_at,
+        ),
+    )
     await repo.db.commit()
     
     logger.warning(f"Login con backup code exitoso para: {user.email} (código consumido)")
@@ -1,11 +1,10 @@
-from fastapi import APIRouter, Depends, status, Form, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, status, Form, File, UploadFile, HTTPException, Query
 from typing import Optional
 from uuid import UUID
-import math
 from datetime import date
 
 from app.modules.auth.domain.schemas import (
-    PaginatedUsersWithRelations,
+    CursorPaginatedUsersWithRelations,
     UserCreateSchema,
     UserUpdateSchema,
     UserResponseSchema,
@@ -22,6 +21,7 @@ from app.modules.auth.domain.enums.tipo_estamento_enum import TipoEstamentoEnum
 from app.modules.auth.domain.enums.tipo_identificacion_enum import TipoIdentificacionEnum
 from app.modules.common.services.file_service import FileService
 from app.core.logging.logger import logger
+from app.core.config.enviroment import _SETTINGS
 from app.api.schemas.api_schemas import APIResponse
 
 users_router_v1 = APIRouter()
@@ -66,7 +66,7 @@ async def create_user(
         )
 
     try:
-        password_hash = hasher.hash(user_data.password)
+        password_hash = await hasher.hash_async(user_data.password)
         user = await repo.create(password_hash=password_hash, user_data=user_data)
 
         return APIResponse(
@@ -92,50 +92,48 @@ async def create_user(
 
 @users_router_v1.get(
     "/list",
-    response_model=APIResponse[PaginatedUsersWithRelations],
+    response_model=APIResponse[CursorPaginatedUsersWithRelations],
     status_code=status.HTTP_200_OK,
     summary="Lista paginada de usuarios"
 )
 async def list_users(
-    page: int = 1,
-    page_size: int = 10,
+    limit: int = Query(_SETTINGS.pagination_default_limit, ge=1, le=_SETTINGS.pagination_max_limit),
+    cursor: Optional[str] = None,
     role: Optional[RoleEnum] = None,
+    include_total: bool = False,
     repo: AuthUsersRepository = Depends(get_users_repo),
     _: AuthUserModel = Depends(get_current_user)
 ):
     """
-    Obtiene lista paginada de usuarios con sus relaciones (perfiles).
+    Obtiene lista paginada (por cursor) de usuarios con sus relaciones (perfiles).
     
     Args:
-        page: Número de página.
-        page_size: Cantidad por página.
+        limit: Cantidad por página.
+        cursor: `next_cursor` de la página anterior (vacío para la primera).
         role: Filtro por rol (opcional).
+        include_total: Incluir el total (estimado si no se filtra por rol).
         
     Returns:
-        APIResponse: Lista paginada con metadatos.
+        APIResponse: Página de usuarios y cursor de la siguiente.
     """
-    users, total = await repo.get_paginated(
-        page=page,
-        size=page_size,
-        role=role
+    page = await repo.get_page(
+        limit=limit,
+        cursor=cursor,
+        role=role,
+        include_total=include_total,
     )
 
-    pages = math.ceil(total / page_size)
-
     return APIResponse(
         success=True,
         message="Usuarios listados correctamente",
-        data=PaginatedUsersWithRelations(
-            total=total,
-            page=page,
-            size=page_size,
-            pages=pages,
+        data=CursorPaginatedUsersWithRelations(
+            **page.meta(),
             items=[
                 UserWithRelationsSchema.model_validate(
                     user,
                     from_attributes=True
                 )
-                for user in users
+                for user in page.items
             ]
         )
     )
@@ -268,8 +266,7 @@ async def update_profile(
         saved_path = await file_service.save_profile_picture(profile_image)
         user.profile_image = saved_path
 
-    await repo.commit()
-    await repo.refresh(user)
+    user = await repo.update_profile(user)
 
     return APIResponse(
         success=True,
@@ -115,6 +115,7 @@ class AdminUserService:
 
         await self.users_repo.db.commit()
         await self.users_repo.db.refresh(user)
+        await self.users_repo.invalidate_principal(user.auth_user_id)
 
         return {
             "success": True,
@@ -203,5 +204,6 @@ class AdminUserService:
 
         await self.users_repo.db.commit()
         await self.users_repo.db.refresh(user)
+        await self.users_repo.invalidate_principal(user.auth_user_id)
 
         return user
\ No newline at end of file
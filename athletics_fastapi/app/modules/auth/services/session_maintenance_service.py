@@ -0,0 +1,59 @@
+"""
+Mantenimiento de `auth_users_sessions` (tarea `sessions_cleanup` del
+`MaintenanceScheduler`, un solo worker por intervalo).
+
+1. Desactiva las sesiones activas ya expiradas.
+2. Si `SESSION_RETENTION_DAYS` > 0, elimina las inactivas que expiraron hace
+   más de esos días, o las mueve a `auth_users_sessions_archive` con
+   `SESSION_RETENTION_ARCHIVE`.
+
+Cada lote (`SESSION_CLEANUP_BATCH_SIZE` filas) es una transacción corta con
+su propia sesión, para no retener locks sobre la tabla; entre lotes se cede
+`SESSION_CLEANUP_BATCH_PAUSE` segundos y se renueva el lock de la tarea.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from app.core.config.enviroment import _SETTINGS
+from app.core.db.database import _db
+from app.core.maintenance.scheduler import MaintenanceRun
+from app.modules.auth.repositories.sessions_repository import SessionsRepository
+
+
+JOB_NAME = "sessions_cleanup"
+
+
+async def _in_batches(
+    run: MaintenanceRun,
+    action: str,
+    step: Callable[[SessionsRepository, int], Awaitable[int]],
+) -> int:
+    batch_size = _SETTINGS.session_cleanup_batch_size
+    total = 0
+    while True:
+        await run.checkpoint()
+        async with _db.get_session_factory()() as session:
+            repo = SessionsRepository(session)
+            count = await step(repo, batch_size)
+            await repo.commit()
+        run.progress(action, count)
+        total += count
+        if count < batch_size:
+            return total
+        await asyncio.sleep(_SETTINGS.session_cleanup_batch_pause)
+
+
+async def cleanup_sessions(run: MaintenanceRun) -> None:
+    # Corte fijo al inicio: las sesiones que expiran durante la ejecución quedan para la siguiente
+    now = datetime.now(timezone.utc)
+    await _in_batches(run, "expired", lambda repo, limit: repo.expire_sessions_batch(now, limit))
+
+    if _SETTINGS.session_retention_days > 0:
+        cutoff = now - timedelta(days=_SETTINGS.session_retention_days)
+        archive = _SETTINGS.session_retention_archive
+        await _in_batches(
+            run,
+            "archived" if archive else "deleted",
+            lambda repo, limit: repo.purge_inactive_sessions_batch(cutoff, limit, archive=archive),
+        )
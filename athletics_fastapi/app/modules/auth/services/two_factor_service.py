@@ -4,7 +4,8 @@ import io
 import base64
 import json
 from typing import Optional
-from passlib.context import CryptContext
+from app.core.jwt.jwt import pwd_ctx
+from app.core.jwt.hashing_pool import _hashing_pool
 
 
 class TwoFactorService:
@@ -12,8 +13,8 @@ class TwoFactorService:
     
     def __init__(self):
         self.issuer_name = "Aplicación de Atletismo"
-        # Hasher para backup codes (mismo que contraseñas)
-        self.hasher = CryptContext(schemes=["argon2"], deprecated="auto")
+        # Hasher para backup codes (mismo contexto que las contraseñas)
+        self.hasher = pwd_ctx
     
     def generate_secret(self) -> str:
         """
@@ -197,4 +198,17 @@ class TwoFactorService:
             logger.error(f"Error eliminando código de respaldo usado: {e}")
             return backup_codes_json
 
+    # ============================
+    # Variantes async (pool Argon2)
+    # ============================
+    async def hash_backup_codes_async(self, codes: list[str]) -> str:
+        """Igual que `hash_backup_codes`, ejecutado en el pool de hashing."""
+        return await _hashing_pool.run(self.hash_backup_codes, codes)
 
+    async def verify_backup_code_async(self, backup_codes_json: Optional[str], code: str) -> bool:
+        """Igual que `verify_backup_code`, ejecutado en el pool de hashing."""
+        return await _hashing_pool.run(self.verify_backup_code, backup_codes_json, code)
+
+    async def remove_used_backup_code_async(self, backup_codes_json: str, used_code: str) -> str:
+        """Igual que `remove_used_backup_code`, ejecutado en el pool de hashing."""
+        return await _hashing_pool.run(self.remove_used_backup_code, backup_codes_json, used_code)
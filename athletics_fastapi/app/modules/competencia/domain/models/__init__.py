@@ -6,6 +6,7 @@ from .competencia_model import Competencia
 from .resultado_competencia_model import ResultadoCompetencia
 from .item_baremo_model import ItemBaremo
 from .resultado_prueba_model import ResultadoPrueba
+from .atleta_resumen_model import AtletaResumen
 
 __all__ = [
     "TipoDisciplina", 
@@ -15,5 +16,6 @@ __all__ = [
     "Competencia",
     "ResultadoCompetencia",
     "ItemBaremo",
-    "ResultadoPrueba"
+    "ResultadoPrueba",
+    "AtletaResumen"
 ]
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""Resumen agregado de resultados de competencia por atleta (dashboard)."""
+from sqlalchemy import Integer, ForeignKey, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.db.database import Base
+import datetime
+
+
+class AtletaResumen(Base):
+    """
+    Totales de competencias y medallas de un atleta, mantenidos de forma
+    incremental por `ResultadoCompetenciaRepository` al crear, actualizar o
+    eliminar resultados. Solo cuenta resultados activos (`estado = true`).
+
+    `atleta_id` referencia a `users.id`, igual que `ResultadoCompetencia.atleta_id`.
+    """
+    __tablename__ = "atleta_resumen"
+
+    atleta_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_competencias: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    oro: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    plata: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bronce: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    fecha_actualizacion: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=datetime.datetime.utcnow
+    )
@@ -1,5 +1,5 @@
 """Modelo de Resultado de Competencia corregido para usar auth_users como atleta."""
-from sqlalchemy import Integer, String, Date, Float, Boolean, ForeignKey, DateTime, Text, text
+from sqlalchemy import Integer, String, Date, Float, Boolean, ForeignKey, DateTime, Text, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.db.database import Base
 import uuid
@@ -37,6 +37,10 @@ class ResultadoCompetencia(Base):
     como la posición cualitativa obtenida.
     """
     __tablename__ = "resultado_competencia"
+    __table_args__ = (
+        # Agregados por atleta (resumen del dashboard y mejores marcas por prueba)
+        Index("ix_resultado_competencia_atleta_prueba", "atleta_id", "prueba_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     external_id: Mapped[uuid.UUID] = mapped_column(
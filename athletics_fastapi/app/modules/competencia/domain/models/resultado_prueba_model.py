@@ -1,5 +1,5 @@
 """Modelo de Resultado de Prueba (Test). Separado de Competencia."""
-from sqlalchemy import Integer, String, Float, Boolean, ForeignKey, DateTime, text
+from sqlalchemy import Integer, String, Float, Boolean, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.db.database import Base
 import uuid
@@ -30,6 +30,10 @@ class TipoPosicionPrueba(str, PyEnum):
 
 class ResultadoPrueba(Base):
     __tablename__ = "resultados_pruebas"
+    __table_args__ = (
+        # Paginación keyset del listado (más recientes primero)
+        Index("ix_resultados_pruebas_fecha_creacion_id", "fecha_creacion", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     external_id: Mapped[uuid.UUID] = mapped_column(
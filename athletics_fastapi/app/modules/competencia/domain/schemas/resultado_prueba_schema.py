@@ -1,7 +1,10 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+# Máximo de marcas aceptadas en una sola carga masiva
+MAX_RESULTADOS_POR_LOTE = 500
 
 class ResultadoPruebaBase(BaseModel):
     """
@@ -20,6 +23,45 @@ class ResultadoPruebaCreate(ResultadoPruebaBase):
     prueba_id: UUID
     # No competence_id needed
 
+class ResultadoPruebaLoteItem(BaseModel):
+    """
+    Marca individual dentro de una carga masiva (la prueba es común al lote).
+    """
+    atleta_id: UUID
+    marca_obtenida: float
+    fecha: datetime
+    estado: bool = True
+
+class ResultadoPruebaLoteCreate(BaseModel):
+    """
+    Esquema para registrar de una vez las marcas de varios atletas en una prueba.
+    """
+    prueba_id: UUID
+    resultados: List[ResultadoPruebaLoteItem] = Field(..., min_length=1, max_length=MAX_RESULTADOS_POR_LOTE)
+
+class ResultadoPruebaLoteCreado(BaseModel):
+    """
+    Fila del lote persistida correctamente. `indice` es su posición en la petición.
+    """
+    indice: int
+    external_id: UUID
+    atleta_id: UUID
+    marca_obtenida: float
+    clasificacion_final: str
+    baremo_id: int
+
+class ResultadoPruebaLoteError(BaseModel):
+    """
+    Fila del lote rechazada; el resto del lote se registra igualmente.
+    """
+    indice: int
+    atleta_id: UUID
+    detalle: str
+
+class ResultadoPruebaLoteResult(BaseModel):
+    creados: List[ResultadoPruebaLoteCreado] = []
+    errores: List[ResultadoPruebaLoteError] = []
+
 class ResultadoPruebaUpdate(BaseModel):
     """
     Esquema flexible para la edición parcial de un resultado y sus observaciones.
@@ -0,0 +1,142 @@
+"""
+Repositorio de agregados de resultados de competencia por atleta.
+
+Las medallas se calculan con el mismo criterio que usaba el dashboard:
+`posicion_final` contiene "primero"/"segundo"/"tercero" (sin distinguir
+mayúsculas) o `puesto_obtenido` es 1/2/3; si varias condiciones se cumplen
+gana la mejor medalla. `clasificar_medalla` (Python) y `MEDALLA_SQL` (SQL)
+deben mantenerse equivalentes.
+"""
+from typing import Optional
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.replica import read_only
+from app.modules.competencia.domain.enums.enum import TipoMedicion
+from app.modules.competencia.domain.models.atleta_resumen_model import AtletaResumen
+from app.modules.competencia.domain.models.prueba_model import Prueba
+from app.modules.competencia.domain.models.resultado_competencia_model import ResultadoCompetencia
+
+
+MEDALLAS = (("oro", "primero", 1), ("plata", "segundo", 2), ("bronce", "tercero", 3))
+
+
+def clasificar_medalla(posicion_final, puesto_obtenido) -> Optional[str]:
+    pos = str(getattr(posicion_final, "value", posicion_final)).lower()
+    for medalla, texto, puesto in MEDALLAS:
+        if texto in pos or puesto_obtenido == puesto:
+            return medalla
+    return None
+
+
+MEDALLA_SQL = case(
+    *[
+        (
+            func.lower(ResultadoCompetencia.posicion_final).contains(texto)
+            | (ResultadoCompetencia.puesto_obtenido == puesto),
+            literal(medalla),
+        )
+        for medalla, texto, puesto in MEDALLAS
+    ],
+    else_=None,
+)
+
+
+def contribucion(estado, posicion_final, puesto_obtenido) -> dict:
+    """Aporte de un resultado a los contadores del resumen."""
+    valores = {"total_competencias": 0, "oro": 0, "plata": 0, "bronce": 0}
+    if estado:
+        valores["total_competencias"] = 1
+        medalla = clasificar_medalla(posicion_final, puesto_obtenido)
+        if medalla:
+            valores[medalla] = 1
+    return valores
+
+
+class AtletaResumenRepository:
+    """Lectura O(1) del resumen y mantenimiento incremental de sus contadores."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, atleta_id: int) -> Optional[AtletaResumen]:
+        result = await self.session.execute(
+            select(AtletaResumen).where(AtletaResumen.atleta_id == atleta_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def aggregate(self, atleta_id: int) -> dict:
+        """Calcula los contadores directamente en SQL (`COUNT ... FILTER`)."""
+        medalla = MEDALLA_SQL
+        result = await self.session.execute(
+            select(
+                func.count().label("total_competencias"),
+                func.count().filter(medalla == "oro").label("oro"),
+                func.count().filter(medalla == "plata").label("plata"),
+                func.count().filter(medalla == "bronce").label("bronce"),
+            )
+            .where(ResultadoCompetencia.atleta_id == atleta_id)
+            .where(ResultadoCompetencia.estado == True)
+        )
+        return dict(result.one()._mapping)
+
+    async def rebuild(self, atleta_id: int) -> dict:
+        """Recalcula el resumen desde `resultado_competencia` y lo guarda (sin commit)."""
+        valores = await self.aggregate(atleta_id)
+        stmt = pg_insert(AtletaResumen).values(atleta_id=atleta_id, **valores)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AtletaResumen.atleta_id],
+                set_={**valores, "fecha_actualizacion": func.now()},
+            )
+        )
+        return valores
+
+    async def apply_delta(self, atleta_id: int, delta: dict) -> None:
+        """
+        Suma `delta` a los contadores del atleta de forma atómica (sin commit;
+        se confirma en la misma transacción que el cambio del resultado).
+        """
+        if not any(delta.values()):
+            return
+        stmt = pg_insert(AtletaResumen).values(atleta_id=atleta_id, **delta)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AtletaResumen.atleta_id],
+                set_={
+                    **{
+                        campo: getattr(AtletaResumen, campo) + getattr(stmt.excluded, campo)
+                        for campo in delta
+                    },
+                    "fecha_actualizacion": func.now(),
+                },
+            )
+        )
+
+    @read_only
+    async def mejores_marcas(self, atleta_id: int) -> list[dict]:
+        """
+        Mejor marca por prueba: mínima en pruebas de TIEMPO, máxima en el resto.
+        """
+        es_tiempo = Prueba.tipo_medicion == TipoMedicion.TIEMPO.value
+        result = await self.session.execute(
+            select(
+                Prueba.external_id.label("prueba_id"),
+                Prueba.nombre.label("prueba"),
+                Prueba.tipo_medicion,
+                case(
+                    (es_tiempo, func.min(ResultadoCompetencia.resultado)),
+                    else_=func.max(ResultadoCompetencia.resultado),
+                ).label("mejor_marca"),
+                func.max(ResultadoCompetencia.unidad_medida).label("unidad_medida"),
+                func.count().label("intentos"),
+            )
+            .join(Prueba, Prueba.id == ResultadoCompetencia.prueba_id)
+            .where(ResultadoCompetencia.atleta_id == atleta_id)
+            .where(ResultadoCompetencia.estado == True)
+            .group_by(Prueba.id, Prueba.external_id, Prueba.nombre, Prueba.tipo_medicion)
+            .order_by(Prueba.nombre)
+        )
+        return [dict(row._mapping) for row in result.all()]
@@ -0,0 +1,214 @@
+"""
+Caché versionada de baremos para la clasificación automática de resultados.
+
+Los baremos cambian muy poco, pero los resultados se registran en ráfagas
+durante los días de evaluación. En lugar de consultar `baremo` + `item_baremo`
+en cada `ResultadoPruebaService.create`, se guarda por `(prueba_id, sexo)` un
+índice con todos los baremos activos ordenados por `edad_min`; encontrar el
+baremo de una edad es una búsqueda binaria sobre intervalos en memoria.
+
+Niveles:
+
+- Diccionario en memoria del proceso.
+- Redis, compartido entre workers, bajo `baremo:v{version}:{prueba_id}:{sexo}`.
+
+La versión es un contador en Redis (`baremo:version`) que `BaremoService`
+incrementa al crear o actualizar un baremo; cada proceso lo consulta como
+mucho cada `BAREMO_CACHE_VERSION_CHECK_INTERVAL` segundos y descarta su copia
+local si cambió. Las claves de versiones anteriores simplemente expiran.
+Si Redis no responde se vuelve a cargar desde la base de datos.
+"""
+import bisect
+import json
+import time
+from typing import Awaitable, Callable, Iterable, NamedTuple, Optional
+
+from redis.exceptions import RedisError
+
+from app.core.cache.redis import _redis
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+from app.modules.competencia.services.baremo_classifier import BaremoClassifier
+
+
+BAREMO_VERSION_KEY = "baremo:version"
+BAREMO_INDEX_KEY = "baremo:v{version}:{prueba_id}:{sexo}"
+
+
+# ============================
+# Instantáneas de solo lectura
+# ============================
+class CachedItemBaremo(NamedTuple):
+    clasificacion: str
+    marca_minima: float
+    marca_maxima: float
+
+
+class CachedBaremo(NamedTuple):
+    """Vista mínima de un Baremo: lo que necesita la clasificación automática."""
+    id: int
+    edad_min: int
+    edad_max: int
+    items: tuple[CachedItemBaremo, ...]
+    # Se compila al construir el índice (no se serializa)
+    classifier: Optional[BaremoClassifier] = None
+
+
+def snapshot_baremo(baremo) -> CachedBaremo:
+    """Requiere que `items` esté cargado."""
+    return CachedBaremo(
+        id=baremo.id,
+        edad_min=baremo.edad_min,
+        edad_max=baremo.edad_max,
+        items=tuple(
+            CachedItemBaremo(item.clasificacion, item.marca_minima, item.marca_maxima)
+            for item in baremo.items or ()
+        ),
+    )
+
+
+# ============================
+# Índice por rango de edad
+# ============================
+class BaremoIndex:
+    """Baremos de una `(prueba_id, sexo)` ordenados por `edad_min`."""
+
+    def __init__(self, baremos: Iterable[CachedBaremo]):
+        self._baremos = sorted(
+            (b if b.classifier is not None else b._replace(classifier=BaremoClassifier(b.items)) for b in baremos),
+            key=lambda b: (b.edad_min, b.id),
+        )
+        self._starts = [b.edad_min for b in self._baremos]
+        self._overlapping = any(
+            prev.edad_max >= cur.edad_min for prev, cur in zip(self._baremos, self._baremos[1:])
+        )
+
+    def find(self, edad: int) -> Optional[CachedBaremo]:
+        """Primer baremo (por `edad_min`) cuyo rango `[edad_min, edad_max]` contiene `edad`."""
+        end = bisect.bisect_right(self._starts, edad)
+        if not self._overlapping:
+            # Rangos disjuntos: el único candidato es el último que empieza antes de `edad`
+            if end and self._baremos[end - 1].edad_max >= edad:
+                return self._baremos[end - 1]
+            return None
+        return next((b for b in self._baremos[:end] if b.edad_max >= edad), None)
+
+    def __len__(self) -> int:
+        return len(self._baremos)
+
+    def to_json(self) -> str:
+        return json.dumps([
+            [b.id, b.edad_min, b.edad_max, [list(item) for item in b.items]]
+            for b in self._baremos
+        ])
+
+    @classmethod
+    def from_json(cls, raw: str) -> "BaremoIndex":
+        return cls(
+            CachedBaremo(id, edad_min, edad_max, tuple(CachedItemBaremo(*item) for item in items))
+            for id, edad_min, edad_max, items in json.loads(raw)
+        )
+
+
+# ============================
+# Baremo cache
+# ============================
+class BaremoCache:
+    """
+    Caché read-through de índices de baremos por `(prueba_id, sexo)`.
+
+    Todos los errores de Redis se ignoran: en el peor caso se vuelve a
+    consultar la base de datos.
+    """
+
+    def __init__(
+        self,
+        ttl: int = _SETTINGS.baremo_cache_ttl,
+        version_check_interval: float = _SETTINGS.baremo_cache_version_check_interval,
+        enabled: bool = _SETTINGS.baremo_cache_enabled,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+        self._local: dict[tuple[int, str], BaremoIndex] = {}
+
+    def _redis(self):
+        return _redis.get_client()
+
+    async def _sync_version(self) -> None:
+        """Descarta la copia local si otro proceso invalidó los baremos."""
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_interval:
+            return
+        self._version_checked_at = now
+        try:
+            raw = await self._redis().get(BAREMO_VERSION_KEY)
+        except RedisError:
+            # Sin Redis no se puede saber si otro worker cambió los baremos
+            self._version = None
+            self._local.clear()
+            return
+
+        version = int(raw or 0)
+        if version != self._version:
+            self._version = version
+            self._local.clear()
+
+    async def get_index(
+        self,
+        prueba_id: int,
+        sexo: str,
+        loader: Callable[[], Awaitable[list[CachedBaremo]]],
+    ) -> BaremoIndex:
+        if not self.enabled:
+            return BaremoIndex(await loader())
+
+        await self._sync_version()
+        key = (prueba_id, sexo)
+        index = self._local.get(key)
+        if index is not None:
+            return index
+
+        redis_key = None
+        if self._version is not None:
+            redis_key = BAREMO_INDEX_KEY.format(version=self._version, prueba_id=prueba_id, sexo=sexo)
+            try:
+                raw = await self._redis().get(redis_key)
+            except RedisError:
+                raw = None
+            if raw:
+                index = BaremoIndex.from_json(raw)
+
+        if index is None:
+            index = BaremoIndex(await loader())
+            if redis_key is not None:
+                try:
+                    await self._redis().setex(redis_key, self.ttl, index.to_json())
+                except RedisError as e:
+                    logger.debug(f"Baremo cache: no se pudo escribir en Redis: {e}")
+
+        if self._version is not None:
+            self._local[key] = index
+        return index
+
+    async def invalidate(self) -> None:
+        """Publica una nueva versión: todos los procesos recargarán sus índices."""
+        self._local.clear()
+        try:
+            self._version = int(await self._redis().incr(BAREMO_VERSION_KEY))
+            self._version_checked_at = time.monotonic()
+        except RedisError as e:
+            logger.warning(f"Baremo cache: no se pudo invalidar en Redis: {e}")
+            self._version = None
+
+    def clear(self) -> None:
+        """Vacía la copia local (solo memoria)."""
+        self._local.clear()
+        self._version = None
+        self._version_checked_at = 0.0
+
+
+# Instancia global
+_baremo_cache = BaremoCache()
@@ -1,7 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from typing import Optional
 from uuid import UUID
+from app.core.db.pagination import Page, paginate
+from app.core.db.replica import read_only
 from app.modules.competencia.domain.models.baremo_model import Baremo
+from app.modules.competencia.repositories.baremo_cache import CachedBaremo, _baremo_cache, snapshot_baremo
 
 # Modelo de repositorio para la entidad Baremo
 class BaremoRepository:
@@ -53,6 +57,27 @@ class BaremoRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    @read_only
+    async def get_page(
+        self,
+        incluir_inactivos: bool = True,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Page[Baremo]:
+        """Página keyset de baremos (con sus `items`) ordenada por id."""
+        from sqlalchemy.orm import selectinload
+        query = select(Baremo).options(selectinload(Baremo.items))
+
+        if not incluir_inactivos:
+            query = query.where(Baremo.estado == True)
+
+        return await paginate(
+            self.session, query, Baremo.id, Baremo.id,
+            limit=limit, cursor=cursor, include_total=include_total,
+            estimate_table=Baremo.__tablename__ if incluir_inactivos else None,
+        )
+
     # Obtener un Baremo por su external_id
     async def get_by_external_id(self, external_id: UUID) -> Baremo | None:
         from sqlalchemy.orm import selectinload
@@ -68,19 +93,28 @@ class BaremoRepository:
         return await self.get_by_external_id(baremo.external_id)
 
     # Buscar Baremo por contexto (Prueba, Sexo, Edad)
-    async def find_by_context(self, prueba_id: int, sexo: str, edad: int) -> Baremo | None:
+    async def find_by_context(self, prueba_id: int, sexo: str, edad: int) -> CachedBaremo | None:
+        """
+        Devuelve una instantánea de solo lectura (`id` + `items`) del baremo
+        activo que aplica a la edad. Los baremos de la prueba y sexo se leen
+        a través de `_baremo_cache`, así que normalmente no consulta la BD.
+        """
+        index = await _baremo_cache.get_index(
+            prueba_id, sexo, lambda: self._load_context(prueba_id, sexo)
+        )
+        return index.find(edad)
+
+    async def _load_context(self, prueba_id: int, sexo: str) -> list[CachedBaremo]:
         from sqlalchemy.orm import selectinload
-        
-        # Filtro Demográfico: prueba_id, sexo, y rango de edad
+
+        # Filtro Demográfico: todos los rangos de edad de la prueba y sexo
         query = (
             select(Baremo)
             .where(Baremo.prueba_id == prueba_id)
             .where(Baremo.sexo == sexo)
-            .where(Baremo.edad_min <= edad)
-            .where(Baremo.edad_max >= edad)
             .where(Baremo.estado == True)
             .options(selectinload(Baremo.items)) # Cargar items para comparacion
         )
-        
+
         result = await self.session.execute(query)
-        return result.scalars().first()
+        return [snapshot_baremo(baremo) for baremo in result.scalars().all()]
@@ -1,9 +1,12 @@
 """Repositorio para Competencia."""
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.db.pagination import Page, paginate
+from app.core.db.replica import read_only
 from app.modules.competencia.domain.models.competencia_model import Competencia
 
 
@@ -51,6 +54,33 @@ class CompetenciaRepository:
             print(f"  - ID: {c.id}, Nombre: {c.nombre}, Estado: {c.estado}")
         return competencias
 
+    @read_only
+    async def get_page(
+        self,
+        incluir_inactivos: bool = True,
+        entrenador_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Page[Competencia]:
+        """Página keyset de competencias ordenada por id."""
+        query = select(Competencia)
+        filtrada = False
+
+        if not incluir_inactivos:
+            query = query.where(Competencia.estado == True)
+            filtrada = True
+
+        if entrenador_id:
+            query = query.where(Competencia.entrenador_id == entrenador_id)
+            filtrada = True
+
+        return await paginate(
+            self.session, query, Competencia.id, Competencia.id,
+            limit=limit, cursor=cursor, include_total=include_total,
+            estimate_table=None if filtrada else Competencia.__tablename__,
+        )
+
     async def update(self, competencia: Competencia, changes: dict) -> Competencia:
         for field, value in changes.items():
             setattr(competencia, field, value)
@@ -13,19 +13,35 @@ Métodos:
     - get_by_competencia(competencia_id: int) -> List[ResultadoCompetencia]: Obtiene los resultados activos de una competencia específica.
     - get_by_atleta_and_competencia(atleta_id: int, competencia_id: int) -> List[ResultadoCompetencia]: Obtiene los resultados de un atleta en una competencia específica.
     - get_all(incluir_inactivos: bool = True, entrenador_id: Optional[int] = None) -> List[ResultadoCompetencia]: Obtiene todos los resultados, con opciones para filtrar por estado y entrenador.
+    - get_page(incluir_inactivos, entrenador_id, limit, cursor, include_total) -> Page[ResultadoCompetencia]: Página keyset (por cursor) del listado.
     - update(resultado: ResultadoCompetencia) -> ResultadoCompetencia: Actualiza un resultado existente.
     - delete(id: int) -> bool: Elimina un resultado por su ID interno.
     - count() -> int: Cuenta el número total de resultados en la base de datos.
     - get_by_atleta(atleta_id: int) -> List[ResultadoCompetencia]: Obtiene todos los resultados de un atleta, ordenados por fecha de registro descendente.
+    - get_resumen_atleta(atleta_id: int) -> dict: Totales y medallas del atleta desde la tabla `atleta_resumen`.
+    - get_mejores_marcas(atleta_id: int) -> List[dict]: Mejor marca del atleta por prueba (agregado SQL).
+
+create/update/delete mantienen `atleta_resumen` en la misma transacción.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, inspect
 from sqlalchemy.orm import selectinload
 from uuid import UUID
 from typing import List, Optional
+from app.core.db.pagination import Page, paginate
+from app.core.db.replica import read_only
 from app.modules.competencia.domain.models.resultado_competencia_model import ResultadoCompetencia
 from app.modules.competencia.domain.models.prueba_model import Prueba
+from app.modules.competencia.repositories.atleta_resumen_repository import AtletaResumenRepository, contribucion
+
+
+def _valor_previo(resultado: ResultadoCompetencia, campo: str):
+    """Valor de `campo` antes de las modificaciones pendientes en la sesión."""
+    history = inspect(resultado).attrs[campo].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(resultado, campo)
 
 
 class ResultadoCompetenciaRepository:
@@ -33,10 +49,15 @@ class ResultadoCompetenciaRepository:
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.resumen = AtletaResumenRepository(session)
 
     async def create(self, resultado: ResultadoCompetencia) -> ResultadoCompetencia:
         """Crear un nuevo resultado."""
         self.session.add(resultado)
+        await self.resumen.apply_delta(
+            resultado.atleta_id,
+            contribucion(resultado.estado is not False, resultado.posicion_final, resultado.puesto_obtenido),
+        )
         await self.session.commit()
         await self.session.refresh(resultado)
         return resultado
@@ -89,8 +110,38 @@ class ResultadoCompetenciaRepository:
         result = await self.session.execute(query)
         return result.scalars().all() or []
 
+    @read_only
+    async def get_page(
+        self,
+        incluir_inactivos: bool = True,
+        entrenador_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Page[ResultadoCompetencia]:
+        """Página keyset de resultados ordenada por id, con los mismos filtros que `get_all`."""
+        query = select(ResultadoCompetencia).options(
+            selectinload(ResultadoCompetencia.competencia),
+            selectinload(ResultadoCompetencia.prueba),
+            selectinload(ResultadoCompetencia.atleta),
+            selectinload(ResultadoCompetencia.entrenador)
+        )
+        filtrada = False
+        if not incluir_inactivos:
+            query = query.where(ResultadoCompetencia.estado == True)
+            filtrada = True
+        if entrenador_id is not None:
+            query = query.where(ResultadoCompetencia.entrenador_id == entrenador_id)
+            filtrada = True
+        return await paginate(
+            self.session, query, ResultadoCompetencia.id, ResultadoCompetencia.id,
+            limit=limit, cursor=cursor, include_total=include_total,
+            estimate_table=None if filtrada else ResultadoCompetencia.__tablename__,
+        )
+
     async def update(self, resultado: ResultadoCompetencia) -> ResultadoCompetencia:
         """Actualizar un resultado."""
+        await self._apply_update_delta(resultado)
         await self.session.merge(resultado)
         await self.session.commit()
         await self.session.refresh(resultado)
@@ -100,6 +151,8 @@ class ResultadoCompetenciaRepository:
         """Eliminar un resultado usando ID interno."""
         resultado = await self.get_by_id(id)
         if resultado:
+            antes = contribucion(resultado.estado, resultado.posicion_final, resultado.puesto_obtenido)
+            await self.resumen.apply_delta(resultado.atleta_id, {k: -v for k, v in antes.items()})
             await self.session.delete(resultado)
             await self.session.commit()
             return True
@@ -125,3 +178,47 @@ class ResultadoCompetenciaRepository:
             )
         )
         return result.scalars().all() or []
+
+    async def get_resumen_atleta(self, atleta_id: int) -> dict:
+        """
+        Totales y medallas del atleta leyendo una sola fila de `atleta_resumen`.
+        Si aún no existe (p. ej. atleta sin resultados) se calcula con SQL y se guarda.
+        """
+        resumen = await self.resumen.get(atleta_id)
+        if resumen is not None:
+            valores = {
+                "total_competencias": resumen.total_competencias,
+                "oro": resumen.oro,
+                "plata": resumen.plata,
+                "bronce": resumen.bronce,
+            }
+        else:
+            valores = await self.resumen.rebuild(atleta_id)
+            await self.session.commit()
+        return {
+            "total_competencias": valores["total_competencias"],
+            "medallas": {k: valores[k] for k in ("oro", "plata", "bronce")},
+        }
+
+    async def get_mejores_marcas(self, atleta_id: int) -> List[dict]:
+        """Mejor marca del atleta por prueba (mínima en TIEMPO, máxima en DISTANCIA)."""
+        return await self.resumen.mejores_marcas(atleta_id)
+
+    async def _apply_update_delta(self, resultado: ResultadoCompetencia) -> None:
+        """Ajusta el resumen con la diferencia entre el estado previo y el nuevo."""
+        if inspect(resultado).transient:
+            return
+        atleta_previo = _valor_previo(resultado, "atleta_id")
+        antes = contribucion(
+            _valor_previo(resultado, "estado"),
+            _valor_previo(resultado, "posicion_final"),
+            _valor_previo(resultado, "puesto_obtenido"),
+        )
+        despues = contribucion(resultado.estado, resultado.posicion_final, resultado.puesto_obtenido)
+        if atleta_previo != resultado.atleta_id:
+            await self.resumen.apply_delta(atleta_previo, {k: -v for k, v in antes.items()})
+            await self.resumen.apply_delta(resultado.atleta_id, despues)
+        else:
+            await self.resumen.apply_delta(
+                resultado.atleta_id, {k: despues[k] - antes[k] for k in antes}
+            )
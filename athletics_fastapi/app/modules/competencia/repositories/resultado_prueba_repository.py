@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert
 from uuid import UUID
 from typing import List, Optional
 
+from app.core.db.pagination import Page, paginate
+from app.core.db.replica import read_only
 from app.modules.competencia.domain.models.resultado_prueba_model import ResultadoPrueba
 
 class ResultadoPruebaRepository:
@@ -17,6 +19,33 @@ class ResultadoPruebaRepository:
         await self.session.refresh(resultado)
         return resultado
 
+    async def create_many(self, rows: List[dict]) -> List:
+        """
+        Inserta varios resultados con un único `INSERT ... VALUES (...), (...) RETURNING`
+        y confirma la transacción (incluidos los cambios previos de la sesión,
+        p. ej. atletas creados para el lote). Si falla, se revierte todo.
+
+        Returns:
+            Filas `(id, external_id)`; para relacionarlas con `rows` conviene
+            que cada fila traiga su propio `external_id`.
+        """
+        if not rows:
+            await self.session.commit()
+            return []
+        stmt = (
+            insert(ResultadoPrueba)
+            .values(rows)
+            .returning(ResultadoPrueba.id, ResultadoPrueba.external_id)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            created = result.all()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return created
+
     async def get_all(self) -> List[ResultadoPrueba]:
         """Obtiene todos los resultados de prueba, ordenados por fecha de creación descendente."""
         # Realiza una consulta con carga anticipada de relaciones y ordena por fecha de creación
@@ -35,6 +64,30 @@ class ResultadoPruebaRepository:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    @read_only
+    async def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Page[ResultadoPrueba]:
+        """
+        Página keyset de resultados, del más reciente al más antiguo
+        (`fecha_creacion DESC, id DESC`, índice `ix_resultados_pruebas_fecha_creacion_id`).
+        """
+        from sqlalchemy.orm import selectinload
+        from app.modules.atleta.domain.models.atleta_model import Atleta
+
+        stmt = select(ResultadoPrueba).options(
+            selectinload(ResultadoPrueba.atleta).selectinload(Atleta.user),
+            selectinload(ResultadoPrueba.prueba)
+        )
+        return await paginate(
+            self.session, stmt, ResultadoPrueba.fecha_creacion, ResultadoPrueba.id,
+            limit=limit, cursor=cursor, descending=True, include_total=include_total,
+            estimate_table=ResultadoPrueba.__tablename__,
+        )
+
     async def get_by_external_id(self, external_id: UUID) -> Optional[ResultadoPrueba]:
         """Obtiene un resultado de prueba por su external_id."""
         # Busca un resultado de prueba utilizando su external_id
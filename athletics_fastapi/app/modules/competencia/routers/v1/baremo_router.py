@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from uuid import UUID
 
 from app.modules.competencia.domain.schemas.baremo_schema import (
@@ -6,6 +8,7 @@ from app.modules.competencia.domain.schemas.baremo_schema import (
 )
 from app.modules.competencia.services.baremo_service import BaremoService
 from app.modules.competencia.dependencies import get_baremo_service, get_current_admin_or_entrenador
+from app.core.config.enviroment import _SETTINGS
 from app.public.schemas.base_response import BaseResponse
 from app.utils.response_handler import ResponseHandler
 # Definición del router para el recurso 'Baremo'
@@ -38,6 +41,12 @@ async def create_baremo(
             data=BaremoRead.model_validate(nuevo_baremo).model_dump(),
             status_code=status.HTTP_201_CREATED
         )
+    except HTTPException as e:
+        return ResponseHandler.error_response(
+            summary="Error al crear baremo",
+            message=e.detail,
+            status_code=e.status_code
+        )
     except Exception as e:
         return ResponseHandler.error_response(
             summary="Error al crear baremo",
@@ -56,28 +65,32 @@ async def create_baremo(
 )
 async def list_baremos(
     incluir_inactivos: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=_SETTINGS.pagination_max_limit),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     service: BaremoService = Depends(get_baremo_service)
 ):
     """
-    Retorna la lista de todos los baremos configurados.
+    Retorna los baremos configurados, paginados por cursor (`next_cursor`)
+    si se envía `limit`; sin `limit` ni `cursor` se devuelven todos.
     Endpoint público (o según política de dependencias globales).
     """
     try:
-        baremos = await service.get_all(incluir_inactivos)
+        page = await service.get_page(incluir_inactivos, limit, cursor, include_total)
         # Manejo de lista vacía para evitar errores en el cliente
-        if not baremos:
+        if not page.items:
              return ResponseHandler.success_response(
                 summary="No hay baremos registrados",
                 message="No se encontraron baremos",
-                data={"items": []}
+                data={"items": [], **page.meta()}
             )
         
-        items = [BaremoRead.model_validate(b).model_dump() for b in baremos]
+        items = [BaremoRead.model_validate(b).model_dump() for b in page.items]
         
         return ResponseHandler.success_response(
             summary="Lista de baremos obtenida",
             message="Baremos encontrados",
-            data={"items": items}
+            data={"items": items, **page.meta()}
         )
     except Exception as e:
         return ResponseHandler.error_response(
@@ -1,6 +1,9 @@
 """Router para Competencia."""
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status, HTTPException
 from uuid import UUID
+from app.core.config.enviroment import _SETTINGS
 from app.core.jwt.jwt import get_current_user
 from app.modules.auth.domain.models.auth_user_model import AuthUserModel
 from app.modules.competencia.services.competencia_service import CompetenciaService
@@ -71,9 +74,13 @@ async def listar_competencias(
     current_user: AuthUserModel = Depends(get_current_user),
     service: CompetenciaService = Depends(get_competencia_service),
     incluir_inactivos: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=_SETTINGS.pagination_max_limit),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ):
     """
-    Lista las competencias. 
+    Lista las competencias, paginadas por cursor (`next_cursor`) si se envía
+    `limit`; sin `limit` ni `cursor` se devuelven todas.
     Los roles de gestión ven todas; otros roles podrían ver una lista filtrada.
     """
     try:
@@ -88,21 +95,21 @@ async def listar_competencias(
         if role_str in ["ADMINISTRADOR", "ENTRENADOR", "PASANTE"]:
             entrenador_id = None
             
-        competencias = await service.get_all(incluir_inactivos, entrenador_id)
-        if not competencias:
+        page = await service.get_page(incluir_inactivos, entrenador_id, limit, cursor, include_total)
+        if not page.items:
              return ResponseHandler.success_response(
                 summary="No hay competencias registradas",
                 message="No se encontraron competencias",
-                data={"items": []}
+                data={"items": [], **page.meta()}
             )
         
         # Serializar lista de objetos ORM a lista de dicts
-        items = [CompetenciaRead.model_validate(c).model_dump() for c in competencias]
+        items = [CompetenciaRead.model_validate(c).model_dump() for c in page.items]
         
         return ResponseHandler.success_response(
             summary="Lista de competencias obtenida",
             message="Competencias encontradas",
-            data={"items": items}
+            data={"items": items, **page.meta()}
         )
     except Exception as e:
         return ResponseHandler.error_response(
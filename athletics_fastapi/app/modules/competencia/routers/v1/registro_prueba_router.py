@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from uuid import UUID
 
 
 from app.modules.competencia.domain.schemas.resultado_prueba_schema import (
     ResultadoPruebaCreate,
     ResultadoPruebaUpdate,
-    ResultadoPruebaRead
+    ResultadoPruebaRead,
+    ResultadoPruebaLoteCreate,
 )
 
 from app.modules.competencia.services.resultado_prueba_service import ResultadoPruebaService
@@ -13,6 +16,7 @@ from app.modules.competencia.repositories.resultado_prueba_repository import Res
 from app.modules.atleta.repositories.atleta_repository import AtletaRepository
 from app.modules.competencia.repositories.prueba_repository import PruebaRepository
 from app.modules.competencia.repositories.baremo_repository import BaremoRepository
+from app.core.config.enviroment import _SETTINGS
 from app.core.db.database import get_session
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.public.schemas.base_response import BaseResponse
@@ -105,33 +109,77 @@ async def create_resultado_prueba(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 # -------------------------------------------------------------------------
+# ENDPOINT: POST /lote (Carga masiva de resultados)
+# -------------------------------------------------------------------------
+@router.post(
+    "/lote",
+    response_model=BaseResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Registrar resultados de prueba en lote",
+    description="Registra de una vez las marcas de varios atletas en una misma prueba. Las filas inválidas se reportan sin abortar el lote.",
+    dependencies=[Depends(get_current_admin_or_entrenador)]
+)
+async def create_resultados_prueba_lote(
+    data: ResultadoPruebaLoteCreate,
+    service: ResultadoPruebaService = Depends(get_resultado_prueba_service)
+):
+    """
+    Registra N marcas para una prueba en una sola transacción.
+
+    La respuesta separa las filas creadas (`creados`) de las rechazadas
+    (`errores`), ambas identificadas por su `indice` en la petición.
+    """
+    try:
+        resultado = await service.create_many(data)
+        return ResponseHandler.success_response(
+            summary="Lote de resultados procesado",
+            message=f"{len(resultado.creados)} resultados creados, {len(resultado.errores)} con error",
+            data=resultado.model_dump(mode="json"),
+            status_code=status.HTTP_201_CREATED
+        )
+    except HTTPException as e:
+        return ResponseHandler.error_response(
+            summary="Error al registrar lote de resultados",
+            message=e.detail,
+            status_code=e.status_code
+        )
+    except Exception as e:
+        return ResponseHandler.error_response(
+            summary="Error al registrar lote de resultados",
+            message=str(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+# -------------------------------------------------------------------------
 # ENDPOINT: GET / (Listar Resultados)
 # -------------------------------------------------------------------------
 @router.get(
     "/", 
     response_model=BaseResponse,
     summary="Listar resultados de pruebas/tests",
-    description="Obtiene el historial completo de tests físicos realizados por los atletas."
+    description="Obtiene el historial de tests físicos realizados por los atletas, del más reciente al más antiguo, paginado por cursor si se envía `limit` (sin `limit` ni `cursor`, el historial completo)."
 )
 async def get_all_resultados_prueba(
+    limit: Optional[int] = Query(None, ge=1, le=_SETTINGS.pagination_max_limit),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     service: ResultadoPruebaService = Depends(get_resultado_prueba_service)
 ):
     try:
         """
-    Recupera el listado completo de resultados registrados.
+    Recupera una página de resultados registrados (`next_cursor` para la siguiente).
     Realiza una hidratación manual para incluir datos del usuario (Nombre/ID) 
     y evitar que el frontend reciba solo UUIDs crudos.
     """
-        resultados = await service.get_all()
-        if not resultados:
+        page = await service.get_page(limit, cursor, include_total)
+        if not page.items:
              return ResponseHandler.success_response(
                 summary="No hay resultados de pruebas registrados",
                 message="No se encontraron resultados de pruebas",
-                data={"items": []}
+                data={"items": [], **page.meta()}
             )
             
         items = []
-        for r in resultados:
+        for r in page.items:
             # Serialize the result
             result_dict = ResultadoPruebaRead.model_validate(r).model_dump()
             
@@ -157,7 +205,7 @@ async def get_all_resultados_prueba(
         return ResponseHandler.success_response(
             summary="Lista de resultados de pruebas obtenida",
             message="Resultados de pruebas encontrados",
-            data={"items": items}
+            data={"items": items, **page.meta()}
         )
     except Exception as e:
         return ResponseHandler.error_response(
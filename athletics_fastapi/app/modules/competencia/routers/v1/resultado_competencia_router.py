@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status, HTTPException
 from uuid import UUID
+from app.core.config.enviroment import _SETTINGS
 from app.core.jwt.jwt import get_current_user
 from app.modules.auth.domain.models.auth_user_model import AuthUserModel
 from app.modules.competencia.services.resultado_competencia_service import ResultadoCompetenciaService
@@ -58,8 +61,15 @@ async def listar_resultados(
     current_user: AuthUserModel = Depends(get_current_user),
     service: ResultadoCompetenciaService = Depends(get_resultado_competencia_service),
     incluir_inactivos: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=_SETTINGS.pagination_max_limit),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
 ):
-    """Listar todos los resultados. Administradores ven todo, Entrenadores tambien."""
+    """
+    Listar resultados, paginados por cursor (`next_cursor`) si se envía `limit`;
+    sin `limit` ni `cursor` se devuelven todos. Administradores ven todo,
+    Entrenadores tambien. Un atleta recibe solo los suyos, sin paginar.
+    """
     try:
         entrenador_id = current_user.profile.id
         
@@ -68,18 +78,21 @@ async def listar_resultados(
         role_str = role.value if hasattr(role, 'value') else str(role)
 
         # Entrenadores, Admins y Pasantes ven todo (o filtrado por entrenador)
+        meta = {}
         if role_str == "ATLETA":
             resultados = await service.get_by_user_id(current_user.profile.id)
         else:
             if role_str in ["ADMINISTRADOR", "ENTRENADOR", "PASANTE"]:
                  entrenador_id = None
             
-            resultados = await service.get_all(incluir_inactivos, entrenador_id)
+            page = await service.get_page(incluir_inactivos, entrenador_id, limit, cursor, include_total)
+            resultados = page.items
+            meta = page.meta()
         if not resultados:
              return ResponseHandler.success_response(
                 summary="No hay resultados de competencia registrados",
                 message="No se encontraron resultados de competencia",
-                data={"items": []}
+                data={"items": [], **meta}
             )
         
         items = [ResultadoCompetenciaRead.model_validate(r).model_dump() for r in resultados]
@@ -87,7 +100,7 @@ async def listar_resultados(
         return ResponseHandler.success_response(
             summary="Lista de resultados de competencia obtenida",
             message="Resultados de competencia encontrados",
-            data={"items": items}
+            data={"items": items, **meta}
         )
     except Exception as e:
         return ResponseHandler.error_response(
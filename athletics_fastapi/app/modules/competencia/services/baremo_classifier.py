@@ -0,0 +1,125 @@
+"""
+Clasificador compilado de marcas según los rangos (`ItemBaremo`) de un baremo.
+
+Los rangos se ordenan por `marca_minima` una sola vez; clasificar una marca
+es una búsqueda binaria sobre los `marca_maxima` (el primer rango cuyo
+máximo alcanza la marca) y una comprobación de su mínimo. Los límites son
+inclusivos, así que si dos rangos comparten límite gana el inferior.
+
+`classify_many` clasifica un lote completo con `numpy.searchsorted`, pensado
+para recalcular resultados en bloque. `validate` detecta solapes y huecos
+entre rangos y se usa al guardar un baremo.
+"""
+import bisect
+from typing import Iterable, Optional, Protocol, Sequence
+
+import numpy as np
+from fastapi import HTTPException, status
+
+
+SIN_CLASIFICACION = "SIN CLASIFICACION"
+
+
+class RangoBaremo(Protocol):
+    clasificacion: str
+    marca_minima: float
+    marca_maxima: float
+
+
+class BaremoClassifier:
+    def __init__(self, items: Iterable[RangoBaremo]):
+        ordered = sorted(items or (), key=lambda i: (i.marca_minima, i.marca_maxima))
+        self.labels: tuple[str, ...] = tuple(i.clasificacion for i in ordered)
+        self.mins: tuple[float, ...] = tuple(float(i.marca_minima) for i in ordered)
+        self.maxs: tuple[float, ...] = tuple(float(i.marca_maxima) for i in ordered)
+        self.overlaps = [
+            (k - 1, k) for k in range(1, len(ordered)) if self.mins[k] < self.maxs[k - 1]
+        ]
+        # Con solapes (datos antiguos) los máximos ya no están ordenados
+        self._sorted_maxs = not any(
+            self.maxs[k] < self.maxs[k - 1] for k in range(1, len(ordered))
+        )
+        self._np_mins = np.asarray(self.mins, dtype=float)
+        self._np_maxs = np.asarray(self.maxs, dtype=float)
+        self._np_labels = np.asarray(self.labels + (SIN_CLASIFICACION,), dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    # ============================
+    # Validación
+    # ============================
+    def gaps(self) -> list[tuple[float, float]]:
+        """Intervalos abiertos `(max_i, min_j)` que no cubre ningún rango."""
+        return [
+            (self.maxs[k - 1], self.mins[k])
+            for k in range(1, len(self.labels))
+            if self.mins[k] > self.maxs[k - 1]
+        ]
+
+    def validate(self) -> list[tuple[float, float]]:
+        """
+        Raises:
+            HTTPException 400: si algún rango está invertido o dos rangos se solapan.
+
+        Returns:
+            Los huecos entre rangos consecutivos (permitidos; p. ej. 10.0 y 10.1).
+        """
+        invertidos = [
+            self.labels[k] for k in range(len(self.labels)) if self.mins[k] > self.maxs[k]
+        ]
+        if invertidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Rangos con marca_minima mayor que marca_maxima: {', '.join(invertidos)}",
+            )
+        if self.overlaps:
+            detalle = ", ".join(
+                f"{self.labels[a]} [{self.mins[a]}-{self.maxs[a]}] y {self.labels[b]} [{self.mins[b]}-{self.maxs[b]}]"
+                for a, b in self.overlaps
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Los rangos del baremo se solapan: {detalle}",
+            )
+        return self.gaps()
+
+    # ============================
+    # Clasificación
+    # ============================
+    def classify(self, marca: float) -> str:
+        if not self._sorted_maxs:
+            return next(
+                (
+                    label
+                    for label, lo, hi in zip(self.labels, self.mins, self.maxs)
+                    if lo <= marca <= hi
+                ),
+                SIN_CLASIFICACION,
+            )
+        k = bisect.bisect_left(self.maxs, marca)
+        if k < len(self.labels) and self.mins[k] <= marca:
+            return self.labels[k]
+        return SIN_CLASIFICACION
+
+    def classify_many(self, marks: Sequence[float]) -> list[str]:
+        """Clasifica un lote de marcas en una sola pasada vectorizada."""
+        if not self._sorted_maxs:
+            return [self.classify(m) for m in marks]
+        values = np.asarray(marks, dtype=float)
+        k = np.searchsorted(self._np_maxs, values, side="left")
+        inside = k < len(self.labels)
+        inside[inside] = self._np_mins[k[inside]] <= values[inside]
+        k[~inside] = len(self.labels)
+        return self._np_labels[k].tolist()
+
+
+def get_classifier(baremo) -> BaremoClassifier:
+    """
+    Clasificador de un baremo. Reutiliza el ya compilado si el baremo viene
+    de la caché (`CachedBaremo.classifier`); si no, lo compila desde `items`.
+    """
+    classifier: Optional[BaremoClassifier] = getattr(baremo, "classifier", None)
+    if isinstance(classifier, BaremoClassifier):
+        return classifier
+    return BaremoClassifier(baremo.items)
@@ -6,6 +6,9 @@ from app.modules.competencia.domain.schemas.baremo_schema import (
 )
 from app.modules.competencia.repositories.prueba_repository import PruebaRepository
 from app.modules.competencia.repositories.baremo_repository import BaremoRepository
+from app.modules.competencia.repositories.baremo_cache import _baremo_cache
+from app.modules.competencia.services.baremo_classifier import BaremoClassifier
+from app.core.logging.logger import logger
 
 # Servicio para la gestión de Baremos
 class BaremoService:
@@ -24,6 +27,7 @@ class BaremoService:
         # Convertir datos principal a dict
         baremo_data = data.model_dump()
         items_data = baremo_data.pop("items", [])
+        self._validate_items(data.items)
         
         # Reemplazar UUID por ID interno
         baremo_data['prueba_id'] = prueba.id
@@ -38,7 +42,9 @@ class BaremoService:
         if items_data:
             baremo.items = [ItemBaremo(**item) for item in items_data]
             
-        return await self.repo.create(baremo)
+        created = await self.repo.create(baremo)
+        await _baremo_cache.invalidate()
+        return created
         
     async def get(self, external_id: UUID) -> Baremo:
         return await self.repo.get_by_external_id(external_id)
@@ -46,6 +52,15 @@ class BaremoService:
     async def get_all(self, incluir_inactivos: bool = True):
         return await self.repo.get_all(incluir_inactivos)
 
+    async def get_page(
+        self,
+        incluir_inactivos: bool = True,
+        limit: int = None,
+        cursor: str = None,
+        include_total: bool = False,
+    ):
+        return await self.repo.get_page(incluir_inactivos, limit, cursor, include_total)
+
 
     async def update(self, external_id: UUID, data: BaremoUpdate) -> Baremo:
         baremo = await self.repo.get_by_external_id(external_id)
@@ -66,6 +81,7 @@ class BaremoService:
 
         # Si se enviaron items, actualizar la relación
         if items_data is not None:
+            self._validate_items(data.items)
             from app.modules.competencia.domain.models.item_baremo_model import ItemBaremo
             
             # Limpiar items existentes
@@ -75,4 +91,14 @@ class BaremoService:
             if items_data:
                 baremo.items = [ItemBaremo(**item) for item in items_data]
 
-        return await self.repo.update(baremo)
+        updated = await self.repo.update(baremo)
+        await _baremo_cache.invalidate()
+        return updated
+
+    @staticmethod
+    def _validate_items(items) -> None:
+        """Rechaza rangos invertidos o solapados; los huecos solo se registran."""
+        gaps = BaremoClassifier(items or []).validate()
+        if gaps:
+            huecos = ", ".join(f"({lo}, {hi})" for lo, hi in gaps)
+            logger.warning(f"⚠️ Baremo con marcas sin clasificación entre rangos: {huecos}")
@@ -45,6 +45,16 @@ class CompetenciaService:
     async def get_all(self, incluir_inactivos: bool = True, entrenador_id: int = None):
         return await self.repo.get_all(incluir_inactivos, entrenador_id)
 
+    async def get_page(
+        self,
+        incluir_inactivos: bool = True,
+        entrenador_id: int = None,
+        limit: int = None,
+        cursor: str = None,
+        include_total: bool = False,
+    ):
+        return await self.repo.get_page(incluir_inactivos, entrenador_id, limit, cursor, include_total)
+
     async def update(self, external_id: UUID, data: CompetenciaUpdate):
         competencia = await self.get_by_external_id(external_id)
 
@@ -103,6 +103,16 @@ class ResultadoCompetenciaService:
     async def get_all(self, incluir_inactivos: bool = True, entrenador_id: int = None):
         return await self.repo.get_all(incluir_inactivos, entrenador_id)
 
+    async def get_page(
+        self,
+        incluir_inactivos: bool = True,
+        entrenador_id: int = None,
+        limit: int = None,
+        cursor: str = None,
+        include_total: bool = False,
+    ):
+        return await self.repo.get_page(incluir_inactivos, entrenador_id, limit, cursor, include_total)
+
     async def get_by_user_id(self, user_id: int):
         atleta = await self.atleta_repo.get_by_user_id(user_id)
         if not atleta:
@@ -1,4 +1,4 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 from fastapi import HTTPException, status
 from datetime import date
 
@@ -6,13 +6,26 @@ from app.modules.competencia.domain.models.resultado_prueba_model import Resulta
 from app.modules.competencia.domain.schemas.resultado_prueba_schema import (
     ResultadoPruebaCreate,
     ResultadoPruebaUpdate,
+    ResultadoPruebaLoteCreate,
+    ResultadoPruebaLoteCreado,
+    ResultadoPruebaLoteError,
+    ResultadoPruebaLoteResult,
 )
 from app.modules.competencia.repositories.resultado_prueba_repository import ResultadoPruebaRepository
 from app.modules.atleta.repositories.atleta_repository import AtletaRepository
 from app.modules.competencia.repositories.prueba_repository import PruebaRepository
 from app.modules.competencia.repositories.baremo_repository import BaremoRepository
+from app.modules.competencia.services.baremo_classifier import SIN_CLASIFICACION, get_classifier
 from app.modules.auth.repositories.auth_users_repository import AuthUsersRepository
 
+
+def calcular_edad(fecha_nacimiento: date, today: date) -> int:
+    """Edad cumplida a la fecha `today`."""
+    return today.year - fecha_nacimiento.year - (
+        (today.month, today.day) < (fecha_nacimiento.month, fecha_nacimiento.day)
+    )
+
+
 class ResultadoPruebaService:
     """Servicio para manejar resultados de Pruebas (Test/Control) con evaluación automática."""
 
@@ -87,10 +100,7 @@ class ResultadoPruebaService:
         if not atleta.user.fecha_nacimiento:
              raise HTTPException(status_code=400, detail="El atleta no tiene fecha de nacimiento registrada")
         
-        today = date.today()
-        edad = today.year - atleta.user.fecha_nacimiento.year - (
-            (today.month, today.day) < (atleta.user.fecha_nacimiento.month, atleta.user.fecha_nacimiento.day)
-        )
+        edad = calcular_edad(atleta.user.fecha_nacimiento, date.today())
         sexo_atleta = atleta.user.sexo
         
         # Validar que el atleta tenga sexo configurado
@@ -112,28 +122,10 @@ class ResultadoPruebaService:
             )
 
         # 4. Clasificación Automática
-        clasificacion_final = "SIN CLASIFICACION"
-        
-        logger.info(f"🎯 Iniciando clasificación para marca: {data.marca_obtenida}")
-        logger.info(f"📊 Baremo encontrado ID: {baremo.id}, Items: {len(baremo.items) if baremo.items else 0}")
-        
-        match_found = False
-        if baremo.items:
-            for item in baremo.items:
-                logger.info(f"  🔍 Comparando con Item: {item.clasificacion} | Rango: {item.marca_minima} - {item.marca_maxima}")
-                # Fórmula: min <= marca <= max
-                if item.marca_minima <= data.marca_obtenida <= item.marca_maxima:
-                    clasificacion_final = item.clasificacion
-                    match_found = True
-                    logger.info(f"  ✅ ¡MATCH! Clasificación: {clasificacion_final}")
-                    break
-                else:
-                    logger.info(f"  ❌ No match: {data.marca_obtenida} no está entre {item.marca_minima} y {item.marca_maxima}")
-        
-        if not match_found:
-            logger.warning(f"⚠️ Ningún Item coincidió con la marca {data.marca_obtenida}. Clasificación: SIN CLASIFICACION")
-        
-        
+        clasificacion_final = get_classifier(baremo).classify(data.marca_obtenida)
+        if clasificacion_final == SIN_CLASIFICACION:
+            logger.warning(f"⚠️ Ningún Item del baremo {baremo.id} coincidió con la marca {data.marca_obtenida}")
+
         # 5. Persistencia
         resultado = ResultadoPrueba(
             atleta_id=atleta.id,
@@ -150,6 +142,99 @@ class ResultadoPruebaService:
 
         return await self.repo.create(resultado)
 
+    async def create_many(self, data: ResultadoPruebaLoteCreate) -> ResultadoPruebaLoteResult:
+        """
+        Registra en bloque las marcas de varios atletas para una misma prueba.
+
+        Los UUIDs se resuelven con dos consultas (prueba + atletas/usuarios), la
+        clasificación se hace en memoria y todo se persiste con un único INSERT
+        multi-fila en una sola transacción. Las filas inválidas (atleta
+        inexistente, sin sexo o fecha de nacimiento, sin baremo) se devuelven
+        en `errores` sin abortar el resto del lote.
+        """
+        from app.core.logging.logger import logger
+
+        prueba = await self.prueba_repo.get_by_external_id(data.prueba_id)
+        if not prueba:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Prueba no encontrada con ID: {data.prueba_id}")
+
+        # 1. Resolver atletas (por UUID de atleta o, si no, de usuario)
+        uuids = list({item.atleta_id for item in data.resultados})
+        by_atleta, by_user = {}, {}
+        for row in await self.atleta_repo.resolve_by_external_ids(uuids):
+            if row.atleta_external_id is not None:
+                by_atleta[row.atleta_external_id] = row
+            by_user[row.user_external_id] = row
+
+        result = ResultadoPruebaLoteResult()
+        today = date.today()
+        pendientes = []  # (indice, item, contexto, baremo, clasificacion)
+
+        # 2. Validar y clasificar en memoria
+        for indice, item in enumerate(data.resultados):
+            ctx = by_atleta.get(item.atleta_id) or by_user.get(item.atleta_id)
+            detalle = None
+            if ctx is None:
+                detalle = f"Atleta/Usuario no encontrado con ID: {item.atleta_id}"
+            elif not ctx.fecha_nacimiento:
+                detalle = "El atleta no tiene fecha de nacimiento registrada"
+            elif not ctx.sexo:
+                detalle = f"El atleta '{ctx.first_name} {ctx.last_name}' no tiene el campo 'sexo' configurado"
+
+            baremo = None
+            if detalle is None:
+                sexo_valor = ctx.sexo.value if hasattr(ctx.sexo, "value") else str(ctx.sexo)
+                edad = calcular_edad(ctx.fecha_nacimiento, today)
+                baremo = await self.baremo_repo.find_by_context(prueba.id, sexo_valor, edad)
+                if not baremo:
+                    detalle = f"No se encontró un baremo (reglas) para Sexo: {sexo_valor}, Edad: {edad} en esta prueba."
+
+            if detalle is not None:
+                result.errores.append(
+                    ResultadoPruebaLoteError(indice=indice, atleta_id=item.atleta_id, detalle=detalle)
+                )
+                continue
+
+            clasificacion = get_classifier(baremo).classify(item.marca_obtenida)
+            pendientes.append((indice, item, ctx, baremo, clasificacion))
+
+        # 3. Crear (en la misma transacción) los Atletas que falten
+        sin_atleta = list({ctx.user_id for _, _, ctx, _, _ in pendientes if ctx.atleta_id is None})
+        nuevos_atletas = await self.atleta_repo.create_many_for_users(sin_atleta)
+
+        # 4. Persistencia con un único INSERT multi-fila
+        rows = []
+        for indice, item, ctx, baremo, clasificacion in pendientes:
+            rows.append({
+                "external_id": uuid4(),
+                "atleta_id": ctx.atleta_id or nuevos_atletas[ctx.user_id],
+                "prueba_id": prueba.id,
+                "baremo_id": baremo.id,
+                "marca_obtenida": item.marca_obtenida,
+                "clasificacion_final": clasificacion,
+                "fecha": item.fecha,
+                "estado": item.estado,
+            })
+        await self.repo.create_many(rows)
+
+        for (indice, item, _, baremo, clasificacion), row in zip(pendientes, rows):
+            result.creados.append(
+                ResultadoPruebaLoteCreado(
+                    indice=indice,
+                    external_id=row["external_id"],
+                    atleta_id=item.atleta_id,
+                    marca_obtenida=item.marca_obtenida,
+                    clasificacion_final=clasificacion,
+                    baremo_id=baremo.id,
+                )
+            )
+
+        logger.info(
+            f"📥 Lote de resultados para prueba {prueba.id}: "
+            f"{len(result.creados)} creados, {len(result.errores)} con error"
+        )
+        return result
+
     async def get_by_external_id(self, external_id: UUID) -> ResultadoPrueba:
         resultado = await self.repo.get_by_external_id(external_id)
         if not resultado:
@@ -159,6 +244,9 @@ class ResultadoPruebaService:
     async def get_all(self):
         return await self.repo.get_all()
 
+    async def get_page(self, limit: int = None, cursor: str = None, include_total: bool = False):
+        return await self.repo.get_page(limit, cursor, include_total)
+
     async def update(self, external_id: UUID, data: ResultadoPruebaUpdate) -> ResultadoPrueba:
         resultado = await self.get_by_external_id(external_id)
         for field, value in data.model_dump(exclude_unset=True).items():
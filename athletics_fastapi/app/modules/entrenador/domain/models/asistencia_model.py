@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Date, Time, ForeignKey, text, Boolean, DateTime
+from sqlalchemy import Integer, String, Date, Time, ForeignKey, text, Boolean, DateTime, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.db.database import Base
 import uuid
@@ -12,6 +12,10 @@ if TYPE_CHECKING:
 
 class Asistencia(Base):
     __tablename__ = "asistencia"
+    __table_args__ = (
+        # Una asistencia por inscripción y día (destino del upsert por sesión)
+        UniqueConstraint("registro_asistencias_id", "fecha_asistencia", name="uq_asistencia_registro_fecha"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     external_id: Mapped[uuid.UUID] = mapped_column(
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 import uuid
-from typing import Optional
+from typing import List, Optional
 from datetime import date, time, datetime
 
 class AsistenciaBase(BaseModel):
@@ -24,3 +24,17 @@ class AsistenciaResponse(AsistenciaBase):
     registro_asistencias_id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class AsistenciaSesionUpdate(BaseModel):
+    """Asistencia de toda una sesión: los inscritos que no están en `presentes` quedan ausentes."""
+    fecha_asistencia: date
+    presentes: List[int] = Field(default_factory=list, description="IDs de RegistroAsistencias presentes")
+
+
+class AsistenciaSesionResponse(BaseModel):
+    horario_id: int
+    fecha_asistencia: date
+    total: int
+    presentes: int
+    asistencias: List[AsistenciaResponse]
@@ -14,7 +14,7 @@ from app.modules.atleta.domain.schemas.atleta_simple_schema import AtletaSimpleR
 
 from app.modules.entrenador.domain.schemas.asistencia_schema import AsistenciaResponse
 
-from app.modules.entrenador.domain.schemas.horario_schema import HorarioResponse
+from app.modules.entrenador.domain.schemas.horario_schema import HorarioResponse, HorarioSimpleResponse
 
 class RegistroAsistenciasResponse(RegistroAsistenciasBase):
     id: int
@@ -27,3 +27,17 @@ class RegistroAsistenciasResponse(RegistroAsistenciasBase):
     asistencias: List[AsistenciaResponse] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RegistroAsistenciasRosterResponse(RegistroAsistenciasBase):
+    """Inscripción dentro del listado de un horario: sin el entrenamiento/entrenador (es el mismo para todas)."""
+    id: int
+    external_id: uuid.UUID
+    horario_id: int
+    atleta_id: int
+
+    horario: Optional[HorarioSimpleResponse] = None
+    atleta: Optional[AtletaSimpleResponse] = None
+    asistencias: List[AsistenciaResponse] = []
+
+    model_config = ConfigDict(from_attributes=True)
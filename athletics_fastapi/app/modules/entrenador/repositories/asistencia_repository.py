@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
-from datetime import date
+from sqlalchemy import select, literal, case, and_, not_, Time
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Iterable, List, Optional
+from datetime import date, time
 from app.modules.entrenador.domain.models.asistencia_model import Asistencia
+from app.modules.entrenador.domain.models.registro_asistencias_model import RegistroAsistencias
 
 class AsistenciaRepository:
     def __init__(self, session: AsyncSession):
@@ -23,6 +25,34 @@ class AsistenciaRepository:
         await self.session.refresh(asistencia)
         return asistencia
 
+    async def upsert(self, values: dict[str, Any], update: Iterable[str]) -> Asistencia:
+        """
+        Crea la asistencia de una inscripción y fecha, o actualiza la existente
+        con `INSERT ... ON CONFLICT (uq_asistencia_registro_fecha) DO UPDATE`.
+
+        Evita el `IntegrityError` cuando dos peticiones crean la misma fila a la vez.
+
+        Args:
+            values (dict): Columnas de la fila nueva (incluye `registro_asistencias_id` y `fecha_asistencia`).
+            update (Iterable[str]): Columnas (al menos una) que se sobrescriben si la fila ya existía.
+
+        Returns:
+            Asistencia: La fila creada o actualizada.
+        """
+        stmt = insert(Asistencia).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_asistencia_registro_fecha",
+            set_={column: stmt.excluded[column] for column in update},
+        )
+        result = await self.session.execute(
+            select(Asistencia)
+            .from_statement(stmt.returning(Asistencia))
+            .execution_options(populate_existing=True)
+        )
+        asistencia = result.scalar_one()
+        await self.session.commit()
+        return asistencia
+
     async def get_by_registro_asistencias(self, registro_asistencias_id: int) -> List[Asistencia]:
         """
         Obtiene todas las asistencias asociadas a una inscripción (registro_asistencias_id).
@@ -73,6 +103,73 @@ class AsistenciaRepository:
         )
         return result.scalar_one_or_none()
     
+    async def upsert_sesion(
+        self,
+        horario_id: int,
+        fecha: date,
+        presentes: Iterable[int],
+        hora_llegada: time,
+        descripcion: str = "Registrado por entrenador",
+    ) -> List[Asistencia]:
+        """
+        Marca la asistencia de todos los inscritos de un horario para una fecha
+        en una sola sentencia `INSERT ... SELECT ... ON CONFLICT DO UPDATE`.
+
+        Cada inscripción del horario queda con `asistio = True` si su id está en
+        `presentes` y `False` en caso contrario. La hora de llegada solo se fija
+        cuando el atleta pasa de ausente a presente; la descripción y la
+        confirmación del atleta de filas existentes se conservan.
+
+        Args:
+            horario_id (int): ID del horario (sesión).
+            fecha (date): Fecha de la sesión.
+            presentes (Iterable[int]): IDs de `RegistroAsistencias` presentes.
+            hora_llegada (time): Hora registrada para los nuevos presentes.
+            descripcion (str): Descripción de las filas nuevas.
+
+        Returns:
+            List[Asistencia]: Estado de la lista (una fila por inscripción), sin confirmar la transacción.
+        """
+        presentes = list(presentes)
+        asistio = RegistroAsistencias.id.in_(presentes) if presentes else literal(False)
+        origen = select(
+            RegistroAsistencias.id,
+            literal(fecha),
+            case((asistio, literal(hora_llegada, Time)), else_=literal(time(0, 0), Time)),
+            literal(descripcion),
+            asistio,
+        ).where(RegistroAsistencias.horario_id == horario_id)
+
+        stmt = insert(Asistencia).from_select(
+            ["registro_asistencias_id", "fecha_asistencia", "hora_llegada", "descripcion", "asistio"],
+            origen,
+            # external_id lo genera el servidor (gen_random_uuid) fila por fila
+            include_defaults=False,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_asistencia_registro_fecha",
+            set_={
+                "asistio": stmt.excluded.asistio,
+                "hora_llegada": case(
+                    (and_(stmt.excluded.asistio, not_(Asistencia.asistio)), stmt.excluded.hora_llegada),
+                    else_=Asistencia.hora_llegada,
+                ),
+            },
+        ).returning(Asistencia)
+
+        result = await self.session.execute(
+            select(Asistencia)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        return sorted(result.scalars().all(), key=lambda a: a.registro_asistencias_id)
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
     async def update(self, asistencia: Asistencia) -> Asistencia:
         """
         Confirma los cambios realizados en un objeto de asistencia.
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
+from app.core.db.pagination import Page, paginate
+from app.core.db.replica import read_only
 from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
 from app.modules.entrenador.domain.models.entrenador_model import Entrenador
 
@@ -74,6 +76,31 @@ class EntrenamientoRepository:
         )
         return result.scalars().all()
 
+    @read_only
+    async def get_page(
+        self,
+        entrenador_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> Page[Entrenamiento]:
+        """
+        Página keyset de entrenamientos ordenada por id, opcionalmente
+        filtrada por entrenador. Incluye horarios y entrenador (user).
+        """
+        from sqlalchemy.orm import selectinload
+        stmt = select(Entrenamiento).options(
+            selectinload(Entrenamiento.entrenador).selectinload(Entrenador.user),
+            selectinload(Entrenamiento.horarios)
+        )
+        if entrenador_id is not None:
+            stmt = stmt.where(Entrenamiento.entrenador_id == entrenador_id)
+        return await paginate(
+            self.session, stmt, Entrenamiento.id, Entrenamiento.id,
+            limit=limit, cursor=cursor, include_total=include_total,
+            estimate_table=Entrenamiento.__tablename__ if entrenador_id is None else None,
+        )
+
     async def get_by_external_id(self, external_id: str) -> Optional[Entrenamiento]:
         """
         Obtiene un entrenamiento por su ID externo (UUID).
@@ -1,124 +1,107 @@
+from enum import Enum
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 from typing import List, Optional
 from app.modules.entrenador.domain.models.registro_asistencias_model import RegistroAsistencias
+from app.modules.entrenador.domain.models.horario_model import Horario
+from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
+from app.modules.entrenador.domain.models.entrenador_model import Entrenador
 from app.modules.atleta.domain.models.atleta_model import Atleta
+from app.modules.auth.domain.models.user_model import UserModel
+
+
+class LoaderProfile(str, Enum):
+    """
+    Qué relaciones se cargan junto a cada inscripción.
+
+    - ID: solo columnas propias; para comprobar existencia o borrar.
+    - ROSTER: atleta (con nombres), horario y asistencias; listado de un horario
+      (`RegistroAsistenciasRosterResponse`).
+    - FULL: además entrenamiento -> entrenador -> usuario del horario
+      (`RegistroAsistenciasResponse`).
+
+    Las relaciones muchos-a-uno van en el mismo SELECT (joinedload) y las
+    asistencias en una sola consulta extra (selectinload): como máximo 2 consultas.
+    """
+    ID = "id"
+    ROSTER = "roster"
+    FULL = "full"
+
+
+# Columnas de `users` que usan UserSimpleSchema / UserForEntrenador
+_USER_COLUMNS = (UserModel.id, UserModel.first_name, UserModel.last_name, UserModel.identificacion, UserModel.profile_image)
+
+_ROSTER_OPTIONS = (
+    joinedload(RegistroAsistencias.atleta).joinedload(Atleta.user).load_only(*_USER_COLUMNS),
+    joinedload(RegistroAsistencias.horario),
+    selectinload(RegistroAsistencias.asistencias),
+)
+
+_LOADER_OPTIONS = {
+    LoaderProfile.ID: (),
+    LoaderProfile.ROSTER: _ROSTER_OPTIONS,
+    LoaderProfile.FULL: _ROSTER_OPTIONS + (
+        joinedload(RegistroAsistencias.horario)
+            .joinedload(Horario.entrenamiento)
+            .joinedload(Entrenamiento.entrenador)
+            .joinedload(Entrenador.user)
+            .load_only(*_USER_COLUMNS),
+    ),
+}
+
 
 class RegistroAsistenciasRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def _select(self, profile: LoaderProfile):
+        return select(RegistroAsistencias).options(*_LOADER_OPTIONS[profile])
+
     async def create(self, registro: RegistroAsistencias) -> RegistroAsistencias:
-        from app.modules.auth.domain.models.user_model import UserModel
         self.session.add(registro)
         await self.session.commit()
-        await self.session.refresh(registro)
-        
-        # Reload with relationships to satisfy Pydantic schema
-        from sqlalchemy.orm import selectinload
-        from app.modules.entrenador.domain.models.horario_model import Horario
-        from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
-        from app.modules.entrenador.domain.models.entrenador_model import Entrenador
-
-        try:
-             result = await self.session.execute(
-                select(RegistroAsistencias)
-                .where(RegistroAsistencias.id == registro.id)
-                .options(
-                    selectinload(RegistroAsistencias.atleta).selectinload(Atleta.user).selectinload(UserModel.auth),
-                    selectinload(RegistroAsistencias.asistencias),
-                    selectinload(RegistroAsistencias.horario)
-                        .selectinload(Horario.entrenamiento)
-                        .selectinload(Entrenamiento.entrenador)
-                        .selectinload(Entrenador.user)
-                )
-             )
-             return result.scalars().first()
-        except:
-             return registro
-
-    async def get_by_horario(self, horario_id: int) -> List[RegistroAsistencias]:
-        from app.modules.auth.domain.models.user_model import UserModel
-        from sqlalchemy.orm import selectinload
-        from app.modules.entrenador.domain.models.horario_model import Horario
-        from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
-        from app.modules.entrenador.domain.models.entrenador_model import Entrenador
 
+        # Recarga con las relaciones que exige el schema de respuesta
+        return await self.get_by_id(registro.id) or registro
+
+    async def get_by_horario(self, horario_id: int, profile: LoaderProfile = LoaderProfile.ROSTER) -> List[RegistroAsistencias]:
         result = await self.session.execute(
-            select(RegistroAsistencias)
+            self._select(profile)
             .where(RegistroAsistencias.horario_id == horario_id)
-            .options(
-                selectinload(RegistroAsistencias.atleta).selectinload(Atleta.user).selectinload(UserModel.auth),
-                selectinload(RegistroAsistencias.asistencias),
-                selectinload(RegistroAsistencias.horario)
-                    .selectinload(Horario.entrenamiento)
-                    .selectinload(Entrenamiento.entrenador)
-                    .selectinload(Entrenador.user)
-            )
+            .order_by(RegistroAsistencias.id)
         )
         return result.scalars().all()
-    
-    async def get_by_id(self, registro_id: int) -> Optional[RegistroAsistencias]:
-        from app.modules.auth.domain.models.user_model import UserModel
-        from sqlalchemy.orm import selectinload
-        from app.modules.entrenador.domain.models.horario_model import Horario
-        from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
-        from app.modules.entrenador.domain.models.entrenador_model import Entrenador
 
+    async def get_by_id(self, registro_id: int, profile: LoaderProfile = LoaderProfile.FULL) -> Optional[RegistroAsistencias]:
         result = await self.session.execute(
-            select(RegistroAsistencias)
-            .where(RegistroAsistencias.id == registro_id)
-            .options(
-                selectinload(RegistroAsistencias.atleta).selectinload(Atleta.user).selectinload(UserModel.auth),
-                selectinload(RegistroAsistencias.asistencias),
-                selectinload(RegistroAsistencias.horario)
-                    .selectinload(Horario.entrenamiento)
-                    .selectinload(Entrenamiento.entrenador)
-                    .selectinload(Entrenador.user)
-            )
+            self._select(profile).where(RegistroAsistencias.id == registro_id)
         )
         return result.scalars().first()
 
-    async def get_by_atleta_and_horario(self, atleta_id: int, horario_id: int) -> Optional[RegistroAsistencias]:
-        from sqlalchemy.orm import selectinload
-        from app.modules.auth.domain.models.user_model import UserModel
-        from app.modules.entrenador.domain.models.horario_model import Horario
-        from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
-        from app.modules.entrenador.domain.models.entrenador_model import Entrenador
+    async def exists(self, registro_id: int) -> bool:
+        """Comprueba que la inscripción exista sin cargar la fila ni sus relaciones."""
+        result = await self.session.execute(
+            select(RegistroAsistencias.id).where(RegistroAsistencias.id == registro_id)
+        )
+        return result.scalar_one_or_none() is not None
 
+    async def get_by_atleta_and_horario(
+        self, atleta_id: int, horario_id: int, profile: LoaderProfile = LoaderProfile.ID
+    ) -> Optional[RegistroAsistencias]:
         result = await self.session.execute(
-            select(RegistroAsistencias).where(
+            self._select(profile).where(
                 RegistroAsistencias.atleta_id == atleta_id,
                 RegistroAsistencias.horario_id == horario_id
-            ).options(
-                selectinload(RegistroAsistencias.atleta).selectinload(Atleta.user).selectinload(UserModel.auth),
-                selectinload(RegistroAsistencias.asistencias),
-                selectinload(RegistroAsistencias.horario)
-                    .selectinload(Horario.entrenamiento)
-                    .selectinload(Entrenamiento.entrenador)
-                    .selectinload(Entrenador.user)
             )
         )
         return result.scalars().first()
 
-    async def get_by_atleta(self, atleta_id: int) -> List[RegistroAsistencias]:
-        from app.modules.auth.domain.models.user_model import UserModel
-        from sqlalchemy.orm import selectinload
-        from app.modules.entrenador.domain.models.horario_model import Horario
-        from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
-        from app.modules.entrenador.domain.models.entrenador_model import Entrenador
-
+    async def get_by_atleta(self, atleta_id: int, profile: LoaderProfile = LoaderProfile.FULL) -> List[RegistroAsistencias]:
         result = await self.session.execute(
-            select(RegistroAsistencias)
+            self._select(profile)
             .where(RegistroAsistencias.atleta_id == atleta_id)
-            .options(
-                selectinload(RegistroAsistencias.atleta).selectinload(Atleta.user).selectinload(UserModel.auth),
-                selectinload(RegistroAsistencias.asistencias),
-                selectinload(RegistroAsistencias.horario)
-                    .selectinload(Horario.entrenamiento)
-                    .selectinload(Entrenamiento.entrenador)
-                    .selectinload(Entrenador.user)
-            )
+            .order_by(RegistroAsistencias.id)
         )
         return result.scalars().all()
 
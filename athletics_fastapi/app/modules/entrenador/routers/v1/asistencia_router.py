@@ -4,8 +4,17 @@ from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db.database import get_session
 from app.modules.entrenador.domain.models.entrenador_model import Entrenador
-from app.modules.entrenador.domain.schemas.registro_asistencias_schema import RegistroAsistenciasCreate, RegistroAsistenciasResponse
-from app.modules.entrenador.domain.schemas.asistencia_schema import AsistenciaCreate, AsistenciaResponse
+from app.modules.entrenador.domain.schemas.registro_asistencias_schema import (
+    RegistroAsistenciasCreate,
+    RegistroAsistenciasResponse,
+    RegistroAsistenciasRosterResponse,
+)
+from app.modules.entrenador.domain.schemas.asistencia_schema import (
+    AsistenciaCreate,
+    AsistenciaResponse,
+    AsistenciaSesionResponse,
+    AsistenciaSesionUpdate,
+)
 from app.modules.entrenador.services.asistencia_service import AsistenciaService
 from app.modules.entrenador.repositories.registro_asistencias_repository import RegistroAsistenciasRepository
 from app.modules.entrenador.repositories.asistencia_repository import AsistenciaRepository
@@ -49,7 +58,7 @@ from app.modules.auth.domain.models.user_model import UserModel
 
 @router.get(
     "/inscripcion/horario/{horario_id}", 
-    response_model=List[RegistroAsistenciasResponse],
+    response_model=List[RegistroAsistenciasRosterResponse],
     summary="Listar atletas inscritos en un horario",
     description="Obtiene la lista de todos los atletas registrados en un horario de entrenamiento particular."
 )
@@ -97,6 +106,7 @@ async def registrar_asistencia(
 ):
     """
     Crea manualmente un registro de asistencia diaria para un atleta inscrito.
+    Si ya hay uno para esa fecha, se actualiza con los campos enviados.
     """
     return await service.registrar_asistencia_diaria(data)
 
@@ -170,6 +180,23 @@ async def marcar_ausente(
     """
     return await service.marcar_ausente(asistencia_id)
 
+@router.put(
+    "/sesion/{horario_id}",
+    response_model=AsistenciaSesionResponse,
+    summary="Marcar asistencia de toda la sesión",
+    description="Registra en una sola operación la asistencia de todos los atletas inscritos en un horario para una fecha: los indicados en 'presentes' quedan presentes y el resto ausentes."
+)
+async def marcar_asistencia_sesion(
+    horario_id: int,
+    data: AsistenciaSesionUpdate,
+    current_entrenador: Entrenador = Depends(get_current_entrenador),
+    service: AsistenciaService = Depends(get_asistencia_service)
+):
+    """
+    Pasa lista de una sesión completa y devuelve el estado de la lista.
+    """
+    return await service.marcar_asistencia_sesion(horario_id, data)
+
 @router.get(
     "/mis-registros", 
     response_model=List[RegistroAsistenciasResponse],
@@ -178,36 +205,9 @@ async def marcar_ausente(
 )
 async def obtener_mis_registros(
     atleta_id: int = Query(..., description="ID del atleta"),
-    service: AsistenciaService = Depends(get_asistencia_service),
-    session: AsyncSession = Depends(get_session)
+    service: AsistenciaService = Depends(get_asistencia_service)
 ):
     """
     Devuelve lista de entenamientos/horarios en los que está inscrito un atleta (para su vista de calendario o listado).
     """
-    from app.modules.entrenador.repositories.registro_asistencias_repository import RegistroAsistenciasRepository
-    from sqlalchemy import select
-    from app.modules.entrenador.domain.models.registro_asistencias_model import RegistroAsistencias
-    from sqlalchemy.orm import selectinload
-    from app.modules.atleta.domain.models.atleta_model import Atleta
-    from app.modules.entrenador.domain.models.horario_model import Horario
-    from app.modules.auth.domain.models.user_model import UserModel
-    
-    from app.modules.entrenador.domain.models.entrenador_model import Entrenador
-    from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
-    
-    # Using alias for clarity if needed, but direct imports work with selectinload
-    
-    repo = RegistroAsistenciasRepository(session)
-    result = await session.execute(
-        select(RegistroAsistencias)
-        .where(RegistroAsistencias.atleta_id == atleta_id)
-        .options(
-            selectinload(RegistroAsistencias.horario)
-                .selectinload(Horario.entrenamiento)
-                .selectinload(Entrenamiento.entrenador)
-                .selectinload(Entrenador.user),
-            selectinload(RegistroAsistencias.atleta).selectinload(Atleta.user).selectinload(UserModel.auth),
-            selectinload(RegistroAsistencias.asistencias)
-        )
-    )
-    return result.scalars().all()
+    return await service.get_registros_by_atleta(atleta_id)
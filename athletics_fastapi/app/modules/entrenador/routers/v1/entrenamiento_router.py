@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, status
-from typing import List
+from fastapi import APIRouter, Depends, Query, Response, status
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config.enviroment import _SETTINGS
 from app.core.db.database import get_session
 from app.modules.entrenador.domain.schemas.entrenamiento_schema import EntrenamientoResponse, EntrenamientoCreate, EntrenamientoUpdate
 from app.modules.entrenador.services.entrenamiento_service import EntrenamientoService
@@ -40,28 +41,38 @@ async def create_entrenamiento(
     "/", 
     response_model=List[EntrenamientoResponse],
     summary="Listar todos los entrenamientos",
-    description="Obtiene una lista de entrenamientos. Los administradores y pasantes ven todos, mientras que los entrenadores ven solo los suyos."
+    description=(
+        "Obtiene una lista de entrenamientos, paginada por cursor si se envía `limit` (siguiente página en la "
+        "cabecera `X-Next-Cursor`; sin `limit` ni `cursor` se devuelven todos). "
+        "Los administradores y pasantes ven todos, mientras que los entrenadores ven solo los suyos."
+    )
 )
 async def list_entrenamientos(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=_SETTINGS.pagination_max_limit),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     current_user: AuthUserModel = Depends(get_current_user),
     service: EntrenamientoService = Depends(get_entrenamiento_service),
     session: AsyncSession = Depends(get_session)
 ):
     """
-    Obtiene todos los entrenamientos. Admins y Pasantes ven todo.
+    Obtiene los entrenamientos por páginas. Admins y Pasantes ven todo.
     """
     role = current_user.profile.role
     role_str = role.value if hasattr(role, 'value') else str(role)
 
-    if role_str in ["ADMINISTRADOR", "PASANTE"]:
-        return await service.get_all_entrenamientos()
-    
-    # Only for ENTRENADOR role, force the entrenador profile
-    from app.modules.entrenador.dependencies import get_entrenador_repo, get_current_entrenador
-    repo = await get_entrenador_repo(session)
-    current_entrenador = await get_current_entrenador(current_user, repo)
-        
-    return await service.get_mis_entrenamientos(current_entrenador.id)
+    entrenador_id = None
+    if role_str not in ["ADMINISTRADOR", "PASANTE"]:
+        # Only for ENTRENADOR role, force the entrenador profile
+        from app.modules.entrenador.dependencies import get_entrenador_repo, get_current_entrenador
+        repo = await get_entrenador_repo(session)
+        current_entrenador = await get_current_entrenador(current_user, repo)
+        entrenador_id = current_entrenador.id
+
+    page = await service.get_page(entrenador_id, limit, cursor, include_total)
+    page.set_headers(response)
+    return page.items
 
 @router.get(
     "/{id}", 
@@ -1,13 +1,17 @@
 from fastapi import HTTPException, status
 from typing import List
 from datetime import date, time, datetime
-from app.modules.entrenador.repositories.registro_asistencias_repository import RegistroAsistenciasRepository
+from app.modules.entrenador.repositories.registro_asistencias_repository import LoaderProfile, RegistroAsistenciasRepository
 from app.modules.entrenador.repositories.asistencia_repository import AsistenciaRepository
 from app.modules.entrenador.repositories.horario_repository import HorarioRepository
 from app.modules.entrenador.domain.models.registro_asistencias_model import RegistroAsistencias
 from app.modules.entrenador.domain.models.asistencia_model import Asistencia
 from app.modules.entrenador.domain.schemas.registro_asistencias_schema import RegistroAsistenciasCreate
-from app.modules.entrenador.domain.schemas.asistencia_schema import AsistenciaCreate
+from app.modules.entrenador.domain.schemas.asistencia_schema import (
+    AsistenciaCreate,
+    AsistenciaSesionResponse,
+    AsistenciaSesionUpdate,
+)
 
 class AsistenciaService:
     def __init__(
@@ -80,7 +84,7 @@ class AsistenciaService:
         Raises:
             HTTPException: 404 si la inscripción no es encontrada.
         """
-        registro = await self.registro_repo.get_by_id(registro_id)
+        registro = await self.registro_repo.get_by_id(registro_id, profile=LoaderProfile.ID)
         if not registro:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inscripción no encontrada")
         
@@ -91,19 +95,22 @@ class AsistenciaService:
     async def registrar_asistencia_diaria(self, schema: AsistenciaCreate) -> Asistencia:
         """
         Crea un registro de asistencia para un día específico (uso manual o admin).
+
+        Si la inscripción ya tiene asistencia ese día, se actualizan los campos
+        enviados en `schema` (una sola fila por inscripción y fecha).
         
         Args:
             schema (AsistenciaCreate): Datos de la asistencia.
             
         Returns:
-            Asistencia: El registro de asistencia creado.
+            Asistencia: El registro de asistencia creado o actualizado.
         """
         # 1. Verify enrollment exists
         # We assume checking registro_asistencias_id implies checking if the student is valid for that schedule.
         # But `registro_asistencias_id` IS the enrollment ID.
         
-        asistencia = Asistencia(**schema.model_dump())
-        return await self.asistencia_repo.create(asistencia)
+        update = schema.model_fields_set - {"registro_asistencias_id", "fecha_asistencia"}
+        return await self.asistencia_repo.upsert(schema.model_dump(), update=sorted(update))
 
     async def get_asistencias_by_enrollment(self, registro_asistencias_id: int) -> List[Asistencia]:
         """
@@ -120,7 +127,8 @@ class AsistenciaService:
         
         Si ya existe una confirmación previa (positiva), lanza error.
         Si existe un rechazo previo, lo actualiza a confirmado.
-        Si no existe, crea un nuevo registro.
+        Si no existe, crea un nuevo registro (upsert: dos confirmaciones
+        simultáneas no chocan con `uq_asistencia_registro_fecha`).
         
         Args:
             registro_id (int): ID de inscripción del atleta en el horario.
@@ -130,8 +138,7 @@ class AsistenciaService:
             Asistencia: El objeto asistencia actualizado o creado.
         """
         # 1. Verificar que el registro existe
-        registro = await self.registro_repo.get_by_id(registro_id)
-        if not registro:
+        if not await self.registro_repo.exists(registro_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Registro no encontrado")
         
         # 2. Verificar si ya existe registro para esta fecha
@@ -145,58 +152,44 @@ class AsistenciaService:
                     detail="Ya has confirmado tu asistencia para este entrenamiento"
                 )
             
-            # Si existe pero había rechazado o estaba pendiente, actualizamos a confirmado
-            existing.atleta_confirmo = True
-            existing.fecha_confirmacion = datetime.now()
-            return await self.asistencia_repo.update(existing)
-        
-        # 3. Crear registro de confirmación
-        asistencia = Asistencia(
-            registro_asistencias_id=registro_id,
-            fecha_asistencia=fecha_entrenamiento,
-            hora_llegada=time(0, 0, 0),  # Placeholder
-            descripcion="Confirmado por atleta",
-            asistio=False,
-            atleta_confirmo=True,
-            fecha_confirmacion=datetime.now()
+        # 3. Crear registro de confirmación, o pasar a confirmado el rechazo/pendiente existente
+        return await self.asistencia_repo.upsert(
+            dict(
+                registro_asistencias_id=registro_id,
+                fecha_asistencia=fecha_entrenamiento,
+                hora_llegada=time(0, 0, 0),  # Placeholder
+                descripcion="Confirmado por atleta",
+                asistio=False,
+                atleta_confirmo=True,
+                fecha_confirmacion=datetime.now()
+            ),
+            update=["atleta_confirmo", "fecha_confirmacion"],
         )
-        
-        return await self.asistencia_repo.create(asistencia)
 
     async def rechazar_asistencia_atleta(self, registro_id: int, fecha_entrenamiento: date) -> Asistencia:
         """
         Permite al atleta notificar que NO asistirá a un entrenamiento.
         
-        Actualiza el estado 'atleta_confirmo' a False.
+        Actualiza el estado 'atleta_confirmo' a False (y 'asistio'), creando
+        el registro si no existe, en un único upsert.
         """
         # 1. Verificar que el registro existe
-        registro = await self.registro_repo.get_by_id(registro_id)
-        if not registro:
+        if not await self.registro_repo.exists(registro_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Registro no encontrado")
         
-        # 2. Verificar si ya existe registro
-        existing = await self.asistencia_repo.get_by_registro_and_date(registro_id, fecha_entrenamiento)
-        
-        if existing:
-            # Actualizamos a rechazado
-            existing.atleta_confirmo = False
-            existing.fecha_confirmacion = datetime.now()
-            # Opcional: Podríamos limpiar 'asistio' si queremos asegurar consistencia
-            existing.asistio = False 
-            return await self.asistencia_repo.update(existing)
-        
-        # 3. Crear registro de rechazo
-        asistencia = Asistencia(
-            registro_asistencias_id=registro_id,
-            fecha_asistencia=fecha_entrenamiento,
-            hora_llegada=time(0, 0, 0),
-            descripcion="Rechazado por atleta",
-            asistio=False,
-            atleta_confirmo=False,
-            fecha_confirmacion=datetime.now()
+        # 2. Crear registro de rechazo, o pasar a rechazado el existente
+        return await self.asistencia_repo.upsert(
+            dict(
+                registro_asistencias_id=registro_id,
+                fecha_asistencia=fecha_entrenamiento,
+                hora_llegada=time(0, 0, 0),
+                descripcion="Rechazado por atleta",
+                asistio=False,
+                atleta_confirmo=False,
+                fecha_confirmacion=datetime.now()
+            ),
+            update=["atleta_confirmo", "fecha_confirmacion", "asistio"],
         )
-        
-        return await self.asistencia_repo.create(asistencia)
     
     async def marcar_presente(self, asistencia_id: int) -> Asistencia:
         """
@@ -229,6 +222,44 @@ class AsistenciaService:
         
         return await self.asistencia_repo.update(asistencia)
         
+    async def marcar_asistencia_sesion(self, horario_id: int, schema: AsistenciaSesionUpdate) -> AsistenciaSesionResponse:
+        """
+        Registra la asistencia de todos los inscritos de un horario para una fecha
+        (realizada por el entrenador) con un único upsert.
+
+        Los inscritos listados en `presentes` quedan presentes y el resto ausentes;
+        se crean las filas que falten para esa fecha.
+
+        Raises:
+            HTTPException:
+                - 404 Si el horario no existe.
+                - 400 Si algún id de `presentes` no es una inscripción del horario.
+        """
+        presentes = set(schema.presentes)
+        asistencias = await self.asistencia_repo.upsert_sesion(
+            horario_id, schema.fecha_asistencia, presentes, datetime.now().time()
+        )
+
+        if not asistencias and not await self.horario_repo.get_by_id(horario_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Horario no encontrado")
+
+        desconocidos = presentes - {a.registro_asistencias_id for a in asistencias}
+        if desconocidos:
+            await self.asistencia_repo.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Inscripciones que no pertenecen al horario: {sorted(desconocidos)}"
+            )
+
+        await self.asistencia_repo.commit()
+        return AsistenciaSesionResponse(
+            horario_id=horario_id,
+            fecha_asistencia=schema.fecha_asistencia,
+            total=len(asistencias),
+            presentes=sum(1 for a in asistencias if a.asistio),
+            asistencias=asistencias,
+        )
+
     async def get_registros_by_atleta(self, atleta_id: int) -> List[RegistroAsistencias]:
         """
         Obtiene todos los registros de inscripción de un atleta.
@@ -1,5 +1,5 @@
 from fastapi import HTTPException, status
-from typing import List
+from typing import List, Optional
 from app.modules.entrenador.repositories.entrenamiento_repository import EntrenamientoRepository
 from app.modules.entrenador.domain.models.entrenamiento_model import Entrenamiento
 from app.modules.entrenador.domain.schemas.entrenamiento_schema import EntrenamientoCreate, EntrenamientoUpdate
@@ -54,6 +54,18 @@ class EntrenamientoService:
         """
         return await self.repository.get_all()
 
+    async def get_page(
+        self,
+        entrenador_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ):
+        """
+        Página de entrenamientos por cursor; todos o solo los de `entrenador_id`.
+        """
+        return await self.repository.get_page(entrenador_id, limit, cursor, include_total)
+
     async def get_entrenamiento_detalle(self, entrenamiento_id: int, entrenador_id: int) -> Entrenamiento:
         """
         Obtiene los detalles de un entrenamiento específico.
@@ -0,0 +1,78 @@
+"""
+Caché en memoria del token de autenticación de la API de usuarios.
+
+Evita consultar `external_tokens` en cada instancia de ExternalUsersApiService.
+La expiración se toma del claim `exp` si el token es un JWT; si no, se asume
+`USERS_API_TOKEN_TTL` segundos desde que se obtuvo. Cuando faltan menos de
+`USERS_API_TOKEN_REFRESH_AHEAD` segundos, el token sigue sirviéndose pero se
+marca para renovarse en segundo plano (ver `needs_refresh`).
+"""
+import asyncio
+import time
+from typing import NamedTuple, Optional
+
+import jwt
+
+from app.core.config.enviroment import _SETTINGS
+
+
+class CachedToken(NamedTuple):
+    token: str
+    external_id: str
+    expires_at: float
+
+
+def _token_expiry(token: str, default_ttl: int) -> float:
+    """Lee `exp` sin verificar la firma (el token lo emite un tercero)."""
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.PyJWTError:
+        exp = None
+    if isinstance(exp, (int, float)):
+        return float(exp)
+    return time.time() + default_ttl
+
+
+class ExternalTokenCache:
+    def __init__(
+        self,
+        default_ttl: int = _SETTINGS.users_api_token_ttl,
+        refresh_ahead: int = _SETTINGS.users_api_token_refresh_ahead,
+    ):
+        self.default_ttl = default_ttl
+        self.refresh_ahead = refresh_ahead
+        self._entry: Optional[CachedToken] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def get(self) -> Optional[CachedToken]:
+        """Token vigente o None si no hay o ya expiró."""
+        entry = self._entry
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry
+
+    def set(self, token: str, external_id: str) -> CachedToken:
+        self._entry = CachedToken(token, external_id, _token_expiry(token, self.default_ttl))
+        return self._entry
+
+    def needs_refresh(self) -> bool:
+        """True si el token vigente está dentro del margen de renovación anticipada."""
+        entry = self._entry
+        return entry is not None and entry.expires_at - time.time() <= self.refresh_ahead
+
+    def refresh_in_background(self, refresh_coro_factory) -> None:
+        """Lanza una única renovación en segundo plano (no hace nada si ya hay una en curso)."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(refresh_coro_factory())
+
+    def invalidate(self) -> None:
+        self._entry = None
+
+    def clear(self) -> None:
+        self._entry = None
+        self._refresh_task = None
+
+
+# Instancia global
+_external_token_cache = ExternalTokenCache()
@@ -1,14 +1,41 @@
 import httpx    
 from fastapi import HTTPException
 from app.core.config.enviroment import _SETTINGS
+from app.core.http.http_client import _http
+from app.core.http.circuit_breaker import CircuitBreaker
 from app.modules.external.domain.enums import ExternalClassTokenType
 from app.modules.external.repositories.external_users_api_repository import ExternalUsersApiRepository
 from app.modules.external.domain.schemas import UserExternalCreateRequest, UserExternalUpdateRequest, UserExternalUpdateAccountRequest
+from app.modules.external.services.external_token_cache import _external_token_cache
 from app.public.schemas import BaseResponse
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Breaker compartido por todas las llamadas a la API de usuarios
+_users_api_breaker = CircuitBreaker("users_api")
+
+# Presupuesto de latencia por endpoint (segundos); superarlo cuenta como fallo
+ENDPOINT_BUDGETS = {
+    "login": 3.0,
+    "save_account": 5.0,
+    "update": 5.0,
+    "search_identification": 2.0,
+    "update_account": 5.0,
+}
+
+
+async def _refresh_token_in_background() -> None:
+    """Renueva el token con su propia sesión (la de la petición ya puede estar cerrada)."""
+    from app.core.db.database import _db
+    try:
+        async with _db.get_session_factory()() as session:
+            service = ExternalUsersApiService(ExternalUsersApiRepository(session))
+            await service.fetch_and_store_token()
+    except Exception as e:
+        logger.debug(f"No se pudo renovar el token externo en segundo plano: {e}")
+
+
 class ExternalUsersApiService:
 
     def __init__(self, repo: ExternalUsersApiRepository):
@@ -26,26 +53,70 @@ class ExternalUsersApiService:
              self.headers["Authorization"] = "Bearer " + self.token
 
     async def get_auth_token(self) -> tuple[str, str]:
-        token = await self.repo.get_token_by_type(ExternalClassTokenType.AUTH_TOKEN)
-        
-        if not token:
+        cached = _external_token_cache.get()
+        stored = None
+
+        if cached is None:
+            stored = await self.repo.get_token_by_type(ExternalClassTokenType.AUTH_TOKEN)
+            if stored:
+                _external_token_cache.set(stored.token, stored.external_id)
+                # Si el token guardado ya expiró, `get` devuelve None y se pide uno nuevo
+                cached = _external_token_cache.get()
+
+        if cached is None:
             try:
-                # Si no hay token en DB, intentar obtenerlo
                 token, external_id = await self.fetch_and_store_token()
                 self.token = token
                 self.external_id = external_id
                 return token, external_id
             except Exception as e:
                 logger.debug(f"External service unavailable (expected in dev/test): {e}")
+                if stored:
+                    self.token = stored.token
+                    self.external_id = stored.external_id
+                    return self.token, self.external_id
                 # MOCK FALLBACK - Normal para desarrollo/testing sin servicio externo
                 self.token = "mock-token-123"
                 self.external_id = "mock-external-id-123"
                 return self.token, self.external_id
-        
-        self.token = token.token
-        self.external_id = token.external_id
+
+        if _external_token_cache.needs_refresh():
+            _external_token_cache.refresh_in_background(_refresh_token_in_background)
+
+        self.token = cached.token
+        self.external_id = cached.external_id
 
         return self.token, self.external_id
+
+    def _client(self) -> httpx.AsyncClient:
+        """Cliente compartido (keep-alive) para la API de usuarios."""
+        return _http.get_client(_SETTINGS.users_api_url)
+
+    async def _send(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Envía la petición a través del circuit breaker. Con el circuito abierto
+        falla de inmediato con CircuitOpenError (503) sin tocar la red.
+        """
+        async def request() -> httpx.Response:
+            return await getattr(self._client(), method)(url, **kwargs)
+
+        return await _users_api_breaker.call(
+            endpoint,
+            request,
+            budget=ENDPOINT_BUDGETS[endpoint],
+            is_failure=lambda response: response.status_code >= 500,
+        )
+
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        if response.status_code == 200:
+            return
+        if response.status_code == 401:
+            # Token revocado o expirado antes de lo previsto
+            _external_token_cache.invalidate()
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=response.json()
+        )
     
     def _build_base_response(self, response: httpx.Response) -> BaseResponse:
         """
@@ -64,14 +135,15 @@ class ExternalUsersApiService:
         )
     
     async def fetch_and_store_token(self) -> tuple[str, str]:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.post(
-                _SETTINGS.users_api_url + "/api/person/login",
-                json={
-                    "email": _SETTINGS.users_api_email,
-                    "password": _SETTINGS.users_api_password,
-                }
-            )
+        response = await self._send(
+            "login",
+            "post",
+            _SETTINGS.users_api_url + "/api/person/login",
+            json={
+                "email": _SETTINGS.users_api_email,
+                "password": _SETTINGS.users_api_password,
+            }
+        )
 
         if response.status_code != 200:
             raise HTTPException(
@@ -81,6 +153,7 @@ class ExternalUsersApiService:
 
         token = response.json().get("data").get("token")
         external_id = response.json().get("data").get("external")
+        _external_token_cache.set(token, external_id)
 
         await self.repo.update_token(
             token=token,
@@ -95,18 +168,15 @@ class ExternalUsersApiService:
         await self._ensure_token()
         
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.post(
-                    _SETTINGS.users_api_url + "/api/person/save-account",
-                    json=user.model_dump(),
-                    headers=self.headers
-                )
-
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.json()
-                )
+            response = await self._send(
+                "save_account",
+                "post",
+                _SETTINGS.users_api_url + "/api/person/save-account",
+                json=user.model_dump(),
+                headers=self.headers
+            )
+
+            self._raise_for_status(response)
             
             return self._build_base_response(response)
             
@@ -142,19 +212,15 @@ class ExternalUsersApiService:
         
         user.external = user_search.data.get("external")
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.post(
-                _SETTINGS.users_api_url + "/api/person/update",
-                json=user.model_dump(),
-                headers=self.headers
-            )
+        response = await self._send(
+            "update",
+            "post",
+            _SETTINGS.users_api_url + "/api/person/update",
+            json=user.model_dump(),
+            headers=self.headers
+        )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=response.json()
-            )
-        
+        self._raise_for_status(response)
 
         return self._build_base_response(response)
 
@@ -165,18 +231,14 @@ class ExternalUsersApiService:
             "external": self.external_id
         }
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(
-                _SETTINGS.users_api_url + "/api/person/search_identification/" + str(user_dni),
-                headers=headers
-            )
+        response = await self._send(
+            "search_identification",
+            "get",
+            _SETTINGS.users_api_url + "/api/person/search_identification/" + str(user_dni),
+            headers=headers
+        )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=response.json()
-            )
-        
+        self._raise_for_status(response)
 
         return self._build_base_response(response)
 
@@ -192,22 +254,18 @@ class ExternalUsersApiService:
                 detail="Usuario no encontrado"
             )
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.put(
-                _SETTINGS.users_api_url + "/api/person/update-account/",
-                headers=self.headers,
-                json= {
-                    "external": external_user_id,
-                    "password": user.password
-                }
-            )
+        response = await self._send(
+            "update_account",
+            "put",
+            _SETTINGS.users_api_url + "/api/person/update-account/",
+            headers=self.headers,
+            json= {
+                "external": external_user_id,
+                "password": user.password
+            }
+        )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=response.json()
-            )
-        
+        self._raise_for_status(response)
 
         return self._build_base_response(response)
 
@@ -222,20 +280,17 @@ class ExternalUsersApiService:
         """
         await self._ensure_token()
         
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.put(
-                _SETTINGS.users_api_url + "/api/person/update-account/",
-                headers=self.headers,
-                json= {
-                    "external": external_id,
-                    "password": user_data.password
-                }
-            )
+        response = await self._send(
+            "update_account",
+            "put",
+            _SETTINGS.users_api_url + "/api/person/update-account/",
+            headers=self.headers,
+            json= {
+                "external": external_id,
+                "password": user_data.password
+            }
+        )
 
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=response.json()
-            )
+        self._raise_for_status(response)
 
         return self._build_base_response(response)
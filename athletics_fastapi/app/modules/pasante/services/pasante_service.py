@@ -46,7 +46,7 @@ class PasanteService:
         
         try:
             # A. Create Auth User
-            hashed_password = self.hasher.hash(data.password)
+            hashed_password = await self.hasher.hash_async(data.password)
             auth_user = AuthUserModel(
                 email=data.email,
                 hashed_password=hashed_password,
@@ -75,7 +75,7 @@ class RepresentanteService:
         child_data.role = RoleEnum.ATLETA
 
         # 3. Crear Usuario (AuthUser)
-        pwd_hash = self.hasher.hash(child_data.password)
+        pwd_hash = await self.hasher.hash_async(child_data.password)
         
         try:
             new_user = await self.users_repo.create(password_hash=pwd_hash, user_data=child_data)
@@ -178,26 +178,15 @@ class RepresentanteService:
             return atleta_check
             
         atleta = atleta_check["data"]
-        resultados = await self.resultado_repo.get_by_atleta(atleta.user_id)
-        
-        total_competencias = len(resultados)
-        medallas = {"oro": 0, "plata": 0, "bronce": 0}
-        
-        for res in resultados:
-            pos = str(res.posicion_final).lower()
-            if "primero" in pos or res.puesto_obtenido == 1:
-                medallas["oro"] += 1
-            elif "segundo" in pos or res.puesto_obtenido == 2:
-                medallas["plata"] += 1
-            elif "tercero" in pos or res.puesto_obtenido == 3:
-                medallas["bronce"] += 1
-                
+        resumen = await self.resultado_repo.get_resumen_atleta(atleta.user_id)
+
         return {
             "success": True,
             "message": "Estadísticas obtenidas",
             "data": {
-                "total_competencias": total_competencias,
-                "medallas": medallas,
+                "total_competencias": resumen["total_competencias"],
+                "medallas": resumen["medallas"],
+                "mejores_marcas": await self.resultado_repo.get_mejores_marcas(atleta.user_id),
                 "experiencia": atleta.anios_experiencia
             },
             "status_code": 200
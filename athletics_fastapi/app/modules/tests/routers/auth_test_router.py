@@ -23,11 +23,12 @@ from app.modules.auth.dependencies import (
     get_users_repo,
     get_sessions_repo,
     get_jwt_manager,
+    get_token_issuer,
     get_password_hasher,
 )
 from app.modules.auth.repositories.auth_users_repository import AuthUsersRepository
 from app.modules.auth.repositories.sessions_repository import SessionsRepository
-from app.core.jwt.jwt import JWTManager, PasswordHasher
+from app.core.jwt.jwt import JWTManager, PasswordHasher, TokenPairIssuer
 from app.core.logging.logger import logger
 from app.api.schemas.api_schemas import APIResponse
 
@@ -44,7 +45,7 @@ router.include_router(user_management_router_v1, prefix="/users")
 router.include_router(reset_password_router_v1, prefix="/password-reset")
 
 # NOTE: We DON'T include auth_router_v1, auth_email_router_v1, auth_sessions_router_v1, 
-# or auth_twofa_router_v1 because they have @limiter.limit() decorators.
+# or auth_twofa_router_v1 because they have rate_limit() dependencies.
 # Instead, we reimplement the core routes below WITHOUT rate limiting.
 
 
@@ -97,7 +98,7 @@ async def register_test_user(
         )
     
     try:
-        password_hash = hasher.hash(data.password)
+        password_hash = await hasher.hash_async(data.password)
         
         # Para testing: bypass del validador de rol usando model_construct
         # Esto permite crear usuarios con rol ADMINISTRADOR
@@ -234,11 +235,12 @@ async def login_test(
     sessions_repo: SessionsRepository = Depends(get_sessions_repo),
     hasher: PasswordHasher = Depends(get_password_hasher),
     jwtm: JWTManager = Depends(get_jwt_manager),
+    issuer: TokenPairIssuer = Depends(get_token_issuer),
 ):
     """TEST: Login without rate limiting"""
     user = await repo.get_by_email(data.username)
 
-    if not user or not hasher.verify(data.password, user.hashed_password):
+    if not user or not await hasher.verify_async(data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales inválidas",
@@ -266,34 +268,24 @@ async def login_test(
             )
         )
 
-    access = jwtm.create_access_token(
+    pair = issuer.issue(
         str(user.id),
         user.profile.role.name,
         user.email,
         user.profile.username,
     )
-    refresh = jwtm.create_refresh_token(
-        str(user.id),
-        user.profile.role.name,
-        user.email,
-        user.profile.username,
-    )
-
-    access_payload = jwtm.decode(access)
-    refresh_payload = jwtm.decode(refresh)
-
-    await jwtm.store_refresh(
-        refresh_payload["jti"],
-        str(user.id),
-        refresh_payload["exp"],
-    )
-
-    await sessions_repo.create_or_update_session(
-        user_id=user.id,
-        access_jti=access_payload["jti"],
-        refresh_jti=refresh_payload["jti"],
-        expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc),
+    access, refresh = pair.access.token, pair.refresh.token
+
+    await issuer.persist(
+        pair,
+        sessions_repo.create_or_update_session(
+            user_id=user.id,
+            access_jti=pair.access.jti,
+            refresh_jti=pair.refresh.jti,
+            expires_at=pair.refresh.expires_at,
+        ),
     )
+    await sessions_repo.commit()
 
     response.set_cookie(
         key="refresh_token",
@@ -325,6 +317,7 @@ async def refresh_token_test(
     body: RefreshRequest,
     sessions_repo: SessionsRepository = Depends(get_sessions_repo),
     jwtm: JWTManager = Depends(get_jwt_manager),
+    issuer: TokenPairIssuer = Depends(get_token_issuer),
 ):
     """TEST: Refresh token without rate limiting"""
     try:
@@ -349,28 +342,19 @@ async def refresh_token_test(
         if await jwtm.consume_refresh(jti) != sub:
             raise HTTPException(status_code=401, detail="Refresh inválido")
 
-        access = jwtm.create_access_token(
-            sub, payload["role"], payload["email"], payload["name"]
-        )
-        refresh = jwtm.create_refresh_token(
-            sub, payload["role"], payload["email"], payload["name"]
-        )
-
-        access_payload = jwtm.decode(access)
-        refresh_payload = jwtm.decode(refresh)
-
-        await jwtm.store_refresh(
-            refresh_payload["jti"],
-            refresh_payload["sub"],
-            refresh_payload["exp"],
-        )
-
-        await sessions_repo.update_session_after_refresh(
-            old_refresh_jti=jti,
-            new_access_jti=access_payload["jti"],
-            new_refresh_jti=refresh_payload["jti"],
-            new_expires_at=datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc),
+        pair = issuer.issue(sub, payload["role"], payload["email"], payload["name"])
+        access, refresh = pair.access.token, pair.refresh.token
+
+        await issuer.persist(
+            pair,
+            sessions_repo.update_session_after_refresh(
+                old_refresh_jti=jti,
+                new_access_jti=pair.access.jti,
+                new_refresh_jti=pair.refresh.jti,
+                new_expires_at=pair.refresh.expires_at,
+            ),
         )
+        await sessions_repo.commit()
 
         response.set_cookie(
             key="refresh_token",
@@ -422,6 +406,7 @@ async def logout_test(
                 jti = payload.get("jti")
                 if jti:
                     await sessions_repo.revoke_session_by_refresh_jti(jti)
+                    await sessions_repo.commit()
             except Exception:
                 pass
 
@@ -0,0 +1,278 @@
+"""
+Despachador asíncrono de correos.
+
+Las peticiones solo encolan el mensaje (`enqueue`) y retornan; un grupo de
+workers en segundo plano vacía la cola. Cada worker mantiene su propia
+conexión SMTP autenticada (aiosmtplib) y la reutiliza entre mensajes:
+
+- Lotes: un worker toma hasta `batch_size` mensajes de la cola y los envía
+  por la misma conexión.
+- Reintentos: los fallos se reencolan con backoff exponencial hasta
+  `max_retries`; después se descartan y se registran.
+- Conexiones ociosas: se cierran tras `idle_timeout` segundos sin trabajo.
+
+Métricas expuestas en /metrics (registro por defecto de Prometheus):
+- `email_queue_depth`: mensajes esperando en la cola.
+- `email_delivery_seconds`: tiempo entre encolar y entregar al servidor SMTP.
+- `email_sent_total`, `email_retries_total`, `email_failed_total`.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Optional
+
+import aiosmtplib
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.config.enviroment import _SETTINGS
+from app.core.logging.logger import logger
+
+
+# ============================
+# Métricas
+# ============================
+EMAIL_QUEUE_DEPTH = Gauge("email_queue_depth", "Correos pendientes en la cola de envío")
+EMAIL_DELIVERY_SECONDS = Histogram(
+    "email_delivery_seconds",
+    "Tiempo desde que se encola un correo hasta que el servidor SMTP lo acepta",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+EMAIL_SENT = Counter("email_sent_total", "Correos entregados al servidor SMTP")
+EMAIL_RETRIES = Counter("email_retries_total", "Reintentos de envío de correo")
+EMAIL_FAILED = Counter("email_failed_total", "Correos descartados tras agotar reintentos")
+
+
+class EmailQueueFullError(RuntimeError):
+    """La cola de correos alcanzó su capacidad máxima."""
+
+
+@dataclass
+class EmailJob:
+    message: EmailMessage
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+class EmailDispatcher:
+    """Cola de correos con workers que reutilizan conexiones SMTP persistentes."""
+
+    def __init__(
+        self,
+        host: str = _SETTINGS.email_host,
+        port: int = _SETTINGS.email_port,
+        username: Optional[str] = _SETTINGS.email_host_user,
+        password: Optional[str] = _SETTINGS.email_host_password,
+        start_tls: bool = _SETTINGS.email_use_tls,
+        use_tls: bool = not _SETTINGS.email_use_tls,
+        workers: int = _SETTINGS.email_dispatcher_workers,
+        max_queue_size: int = _SETTINGS.email_queue_max_size,
+        batch_size: int = _SETTINGS.email_batch_size,
+        max_retries: int = _SETTINGS.email_max_retries,
+        retry_backoff: float = _SETTINGS.email_retry_backoff,
+        idle_timeout: float = _SETTINGS.email_idle_timeout,
+        timeout: float = 10,
+    ):
+        # Mismo criterio que EmailProvider: EMAIL_USE_TLS=true -> STARTTLS, false -> SSL implícito
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._retry_handles: set[asyncio.TimerHandle] = set()
+        # Reintentos programados pero aún no reencolados (cuentan para drenar)
+        self._scheduled = 0
+
+    # ============================
+    # Ciclo de vida
+    # ============================
+    @property
+    def running(self) -> bool:
+        return self._queue is not None and self._loop is not None and not self._loop.is_closed()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Arranca los workers en el event loop actual (idempotente)."""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._retry_handles.clear()
+        self._scheduled = 0
+        self._tasks = [
+            loop.create_task(self._worker(i), name=f"email-worker-{i}")
+            for i in range(self.workers)
+        ]
+        EMAIL_QUEUE_DEPTH.set(0)
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Espera a que la cola se vacíe (hasta `drain_timeout`) y detiene los workers."""
+        if self._queue is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._drain(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"📧 Cerrando con {self.queue_depth} correos sin enviar")
+
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        EMAIL_QUEUE_DEPTH.set(0)
+
+    async def _drain(self) -> None:
+        while self._scheduled:
+            await asyncio.sleep(0.05)
+        await self._queue.join()
+        # Un reintento pudo programarse mientras se vaciaba la cola
+        if self._scheduled:
+            await self._drain()
+
+    # ============================
+    # Encolado
+    # ============================
+    def enqueue(self, message: EmailMessage) -> None:
+        """
+        Encola un mensaje para envío en segundo plano y retorna de inmediato.
+
+        Raises:
+            EmailQueueFullError: si la cola está llena.
+        """
+        self.start()
+        try:
+            self._queue.put_nowait(EmailJob(message))
+        except asyncio.QueueFull:
+            raise EmailQueueFullError("Cola de correos llena")
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _schedule_retry(self, job: EmailJob) -> None:
+        delay = self.retry_backoff * (2 ** (job.attempts - 1))
+        EMAIL_RETRIES.inc()
+        self._scheduled += 1
+
+        def _requeue():
+            self._retry_handles.discard(handle)
+            self._scheduled -= 1
+            try:
+                self._queue.put_nowait(job)
+                EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+            except asyncio.QueueFull:
+                EMAIL_FAILED.inc()
+                logger.error(f"📧 Cola llena, se descarta correo a {job.message['To']}")
+
+        handle = self._loop.call_later(delay, _requeue)
+        self._retry_handles.add(handle)
+
+    # ============================
+    # Workers
+    # ============================
+    def _new_client(self) -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = self._new_client()
+        await smtp.connect()
+        if self.username and self.password:
+            await smtp.login(self.username, self.password)
+        return smtp
+
+    @staticmethod
+    async def _close(smtp: Optional[aiosmtplib.SMTP]) -> None:
+        if smtp is None or not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+    async def _next_batch(self) -> Optional[list[EmailJob]]:
+        """Espera el primer mensaje (hasta `idle_timeout`) y agrega los que ya estén en cola."""
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        EMAIL_QUEUE_DEPTH.set(self._queue.qsize())
+        return batch
+
+    async def _worker(self, worker_id: int) -> None:
+        smtp: Optional[aiosmtplib.SMTP] = None
+        try:
+            while True:
+                batch = await self._next_batch()
+                if batch is None:
+                    # Sin trabajo: liberar la conexión ociosa
+                    await self._close(smtp)
+                    smtp = None
+                    continue
+
+                for job in batch:
+                    try:
+                        if smtp is None or not smtp.is_connected:
+                            smtp = await self._connect()
+                        await smtp.send_message(job.message)
+                        EMAIL_SENT.inc()
+                        EMAIL_DELIVERY_SECONDS.observe(time.monotonic() - job.enqueued_at)
+                    except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError) as e:
+                        job.attempts += 1
+                        # Un código 5xx es un rechazo definitivo: no tiene sentido reintentar
+                        permanent = isinstance(e, aiosmtplib.SMTPResponseException) and e.code >= 500
+                        # La conexión puede haber quedado en un estado inválido
+                        await self._close(smtp)
+                        smtp = None
+                        if permanent or job.attempts > self.max_retries:
+                            EMAIL_FAILED.inc()
+                            logger.error(
+                                f"📧 Correo a {job.message['To']} descartado tras "
+                                f"{job.attempts} intentos: {e}"
+                            )
+                        else:
+                            logger.warning(
+                                f"📧 Error enviando correo a {job.message['To']} "
+                                f"(intento {job.attempts}): {e}"
+                            )
+                            self._schedule_retry(job)
+                    finally:
+                        self._queue.task_done()
+        except asyncio.CancelledError:
+            await self._close(smtp)
+            raise
+
+
+# Instancia global
+_email_dispatcher = EmailDispatcher()
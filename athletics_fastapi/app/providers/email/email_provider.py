@@ -1,6 +1,8 @@
+import asyncio
 import smtplib
 from email.message import EmailMessage
 from app.core.config.enviroment import _SETTINGS
+from app.providers.email.email_dispatcher import _email_dispatcher
 
 
 class EmailProvider:
@@ -13,14 +15,30 @@ class EmailProvider:
         if not self.username or not self.password:
             raise RuntimeError("Email creds not configured (EMAIL_HOST_USER / EMAIL_HOST_PASSWORD)")
 
-    def _send_email(self, to_email: str, subject: str, body: str) -> None:
+    def _build_message(self, to_email: str, subject: str, body: str) -> EmailMessage:
         msg = EmailMessage()
         msg["Subject"] = subject
         msg["From"] = self.username
         msg["To"] = to_email
         msg.set_content(body)
         msg.add_alternative(self.generate_html(subject, body), subtype="html")
+        return msg
+
+    def _send_email(self, to_email: str, subject: str, body: str) -> None:
+        """
+        Encola el correo en el despachador asíncrono y retorna de inmediato.
+
+        Fuera de un event loop (scripts, consola) se envía de forma síncrona.
+        """
+        msg = self._build_message(to_email, subject, body)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._send_email_sync(msg)
+            return
+        _email_dispatcher.enqueue(msg)
 
+    def _send_email_sync(self, msg: EmailMessage) -> None:
         if self.use_tls:
             with smtplib.SMTP(self.host, self.port, timeout=10) as server:
                 server.ehlo()
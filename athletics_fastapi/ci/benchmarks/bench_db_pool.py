@@ -0,0 +1,121 @@
+"""
+Benchmark de saturación del pool de conexiones para dimensionar DATABASE_POOL_SIZE.
+
+Simula `CONCURRENCY` peticiones concurrentes (hilos) que piden una conexión
+al pool, ejecutan una consulta de `QUERY_MS` ms, la devuelven y trabajan
+`APP_MS` ms más. Para cada tamaño de pool reporta la espera de checkout
+(p50/p95/p99/máx), el overflow máximo usado y los timeouts, con la misma
+`InstrumentedQueuePool` que usa la aplicación.
+
+La base de datos es un stand-in local: SQLite en memoria con una función
+`pg_sleep` registrada, así la consulta ocupa la conexión el tiempo indicado
+sin necesitar un Postgres. Lo que se mide es la cola del pool, no el motor.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_db_pool
+"""
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+from sqlalchemy import create_engine, exc, text  # noqa: E402
+
+from app.core.db.pool_metrics import InstrumentedQueuePool, register_pool_metrics  # noqa: E402
+
+CONCURRENCY = 40
+REQUESTS_PER_WORKER = 25
+QUERY_MS = 5
+APP_MS = 5  # trabajo de la petición fuera de la base de datos
+MAX_OVERFLOW = 10
+POOL_TIMEOUT = 5
+POOL_SIZES = (5, 10, 20, 30)
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.create_function("pg_sleep", 1, lambda seconds: time.sleep(seconds))
+    return conn
+
+
+def _run(pool_size: int) -> dict:
+    engine = create_engine(
+        "sqlite://",
+        creator=_connect,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=f"bench_{pool_size}",
+        pool_size=pool_size,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_use_lifo=True,
+    )
+    register_pool_metrics(engine, f"bench_{pool_size}")
+    waits: list[float] = []
+    max_overflow = 0
+    timeouts = 0
+    lock = threading.Lock()
+    query = text(f"SELECT pg_sleep({QUERY_MS / 1000})")
+
+    def worker():
+        nonlocal max_overflow, timeouts
+        for _ in range(REQUESTS_PER_WORKER):
+            start = time.perf_counter()
+            try:
+                conn = engine.connect()
+            except exc.TimeoutError:
+                with lock:
+                    timeouts += 1
+                continue
+            wait = time.perf_counter() - start
+            with conn:
+                with lock:
+                    waits.append(wait)
+                    max_overflow = max(max_overflow, engine.pool.overflow())
+                conn.execute(query)
+            time.sleep(APP_MS / 1000)
+
+    threads = [threading.Thread(target=worker) for _ in range(CONCURRENCY)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    waits.sort()
+    return {
+        "p50": statistics.median(waits) * 1000,
+        "p95": waits[int(len(waits) * 0.95) - 1] * 1000,
+        "p99": waits[int(len(waits) * 0.99) - 1] * 1000,
+        "max": waits[-1] * 1000,
+        "overflow": max_overflow,
+        "timeouts": timeouts,
+        "rps": len(waits) / elapsed,
+    }
+
+
+def main() -> None:
+    print(
+        f"{CONCURRENCY} peticiones concurrentes x {REQUESTS_PER_WORKER}, "
+        f"consulta de {QUERY_MS} ms + {APP_MS} ms de aplicación, max_overflow={MAX_OVERFLOW}"
+    )
+    print(f"{'pool_size':>9} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'máx ms':>8} | {'overflow':>8} | {'timeouts':>8} | {'req/s':>8}")
+    print("-" * 87)
+    for size in POOL_SIZES:
+        r = _run(size)
+        print(
+            f"{size:>9} | {r['p50']:8.2f} | {r['p95']:8.2f} | {r['p99']:8.2f} | {r['max']:8.2f} | "
+            f"{r['overflow']:>8} | {r['timeouts']:>8} | {r['rps']:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
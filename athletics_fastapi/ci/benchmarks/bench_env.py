@@ -0,0 +1,32 @@
+"""
+Variables de entorno mínimas para importar `app` en los benchmarks
+sin un archivo .env (mismos valores que el pipeline de CI).
+"""
+import os
+
+_DEFAULTS = {
+    "DATABASE_NAME": "test_db",
+    "DATABASE_USER": "postgres",
+    "DATABASE_PASSWORD": "postgres",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_PORT": "5432",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "CORS_ALLOW_ORIGINS": "*",
+    "CORS_ALLOW_METHODS": "*",
+    "CORS_ALLOW_HEADERS": "*",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_SECRET": "benchmark_secret",
+    "ACCESS_TOKEN_EXPIRES_MINUTES": "15",
+    "REFRESH_TOKEN_EXPIRES_DAYS": "7",
+    "EMAIL_HOST": "localhost",
+    "EMAIL_PORT": "1025",
+    "EMAIL_USE_TLS": "false",
+    "EMAIL_HOST_USER": "bench@example.com",
+    "EMAIL_HOST_PASSWORD": "bench",
+    "USERS_API_URL": "http://localhost:8081",
+    "USERS_API_EMAIL": "bench@example.com",
+    "USERS_API_PASSWORD": "bench",
+}
+
+for key, value in _DEFAULTS.items():
+    os.environ.setdefault(key, value)
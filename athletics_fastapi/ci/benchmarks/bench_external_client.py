@@ -0,0 +1,99 @@
+"""
+Benchmark del cliente HTTP compartido frente a un `httpx.AsyncClient` por llamada.
+
+Levanta un servidor mock local (uvicorn + FastAPI) que imita
+`/api/person/search_identification/{dni}` y mide la latencia por llamada:
+
+- `por llamada`: `async with httpx.AsyncClient(timeout=10)` en cada petición
+  (comportamiento anterior de ExternalUsersApiService).
+- `compartido`:  `_http.get_client(...)` con keep-alive.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_external_client
+"""
+import asyncio
+import logging
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.core.http.http_client import _http  # noqa: E402
+
+CALLS = 300
+CONCURRENCY = 20
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_mock_server(port: int) -> uvicorn.Server:
+    app = FastAPI()
+
+    @app.get("/api/person/search_identification/{dni}")
+    async def search(dni: str):
+        return {"status": "success", "data": {"external": f"ext-{dni}"}, "message": "ok"}
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def _per_call(url: str) -> None:
+    async with httpx.AsyncClient(timeout=10) as client:
+        (await client.get(url)).raise_for_status()
+
+
+async def _shared(url: str) -> None:
+    (await _http.get_client(url).get(url)).raise_for_status()
+
+
+async def _run(fn, base_url: str, concurrency: int) -> float:
+    """Devuelve el tiempo medio por llamada en ms."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await fn(f"{base_url}/api/person/search_identification/{i:010d}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(CALLS)))
+    return (time.perf_counter() - start) * 1000 / CALLS
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    port = _free_port()
+    server = _start_mock_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+
+    print(f"{CALLS} llamadas al mock local")
+    print(f"{'modo':>12} | {'secuencial ms/llamada':>22} | {f'concurrencia {CONCURRENCY} ms/llamada':>26}")
+    print("-" * 68)
+    for name, fn in (("por llamada", _per_call), ("compartido", _shared)):
+        await fn(f"{base_url}/api/person/search_identification/0")  # calentamiento
+        sequential = await _run(fn, base_url, 1)
+        concurrent = await _run(fn, base_url, CONCURRENCY)
+        print(f"{name:>12} | {sequential:22.3f} | {concurrent:26.3f}")
+
+    await _http.close()
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark de JWTManager.decode según el número de secrets retenidos.
+
+Compara la verificación por `kid` (un único HMAC) con el recorrido legacy
+(probar cada secret válido en orden de archivo) para tokens firmados con el
+secret activo (el último del archivo) y para tokens inválidos.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_jwt_decode
+"""
+import json
+import sys
+import tempfile
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+import jwt  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+
+from app.core.jwt.jwt import JWTManager  # noqa: E402
+from app.core.jwt.secret_rotation import JWTSecretRotation  # noqa: E402
+
+ITERATIONS = 5000
+
+
+def _manager(retained: int, tmp_dir: str) -> JWTManager:
+    now = datetime.now(timezone.utc)
+    secrets_list = [
+        {"secret": f"retained-secret-{i}-{uuid.uuid4()}",
+         "created_at": (now - timedelta(days=retained - i)).isoformat(),
+         "active": i == retained - 1}
+        for i in range(retained)
+    ]
+    path = Path(tmp_dir) / f"jwt_secrets_{retained}.json"
+    path.write_text(json.dumps({"secrets": secrets_list}))
+
+    manager = JWTManager()
+    manager.secret_rotation = JWTSecretRotation(str(path))
+    return manager
+
+
+def _current_token(manager: JWTManager, with_kid: bool) -> str:
+    kid, secret = manager.secret_rotation.get_current_key()
+    payload = {"sub": "1", "type": "access", "jti": str(uuid.uuid4()),
+               "exp": int((datetime.now(timezone.utc) + timedelta(minutes=15)).timestamp())}
+    headers = {"kid": kid} if with_kid else None
+    return jwt.encode(payload, secret, algorithm=manager.algorithm, headers=headers)
+
+
+def _invalid_token(manager: JWTManager, with_kid: bool) -> str:
+    headers = {"kid": "0" * 16} if with_kid else None
+    return jwt.encode({"sub": "1"}, "not-a-valid-secret", algorithm=manager.algorithm, headers=headers)
+
+
+def _time(manager: JWTManager, token: str) -> float:
+    def run():
+        try:
+            manager.decode(token)
+        except HTTPException:
+            pass
+    return min(timeit.repeat(run, number=ITERATIONS, repeat=3)) / ITERATIONS * 1e6
+
+
+def main():
+    print(f"{'secrets':>8} | {'valid kid':>10} | {'valid legacy':>12} | {'invalid kid':>11} | {'invalid legacy':>14}   (µs/decode)")
+    print("-" * 80)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for retained in (1, 3, 10):
+            manager = _manager(retained, tmp_dir)
+            row = [
+                _time(manager, _current_token(manager, with_kid=True)),
+                _time(manager, _current_token(manager, with_kid=False)),
+                _time(manager, _invalid_token(manager, with_kid=True)),
+                _time(manager, _invalid_token(manager, with_kid=False)),
+            ]
+            print(f"{retained:>8} | {row[0]:>10.1f} | {row[1]:>12.1f} | {row[2]:>11.1f} | {row[3]:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark de latencia de un endpoint ajeno durante una ráfaga de logins.
+
+Monta una app FastAPI mínima con:
+- POST /login: verifica una contraseña Argon2 con PasswordHasher.
+- GET /ping:   endpoint trivial que no toca Argon2.
+
+y mide p50/p99 de /ping durante `DURATION` segundos en los que `LOGIN_CLIENTS`
+clientes hacen logins sin pausa, con verificación síncrona (`verify`, bloquea
+el event loop) y con el pool acotado (`verify_async`).
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_login_storm
+"""
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+from fastapi import FastAPI  # noqa: E402
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+
+from app.core.jwt.hashing_pool import _hashing_pool  # noqa: E402
+from app.core.jwt.jwt import PasswordHasher  # noqa: E402
+
+LOGIN_CLIENTS = 8
+DURATION = 5.0
+PING_INTERVAL = 0.01
+PASSWORD = "Benchmark123!"
+
+
+def _build_app(mode: str, password_hash: str) -> FastAPI:
+    app = FastAPI()
+    hasher = PasswordHasher()
+
+    @app.post("/login")
+    async def login():
+        if mode == "sync":
+            ok = hasher.verify(PASSWORD, password_hash)
+        else:
+            ok = await hasher.verify_async(PASSWORD, password_hash)
+        return {"ok": ok}
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return app
+
+
+async def _measure(mode: str, password_hash: str) -> list[float]:
+    app = _build_app(mode, password_hash)
+    transport = ASGITransport(app=app)
+    latencies: list[float] = []
+
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + DURATION
+
+        async def login_loop():
+            while time.perf_counter() < deadline:
+                await client.post("/login")
+
+        async def ping_loop():
+            # La latencia se mide desde el instante en que el ping debía salir,
+            # así incluye el tiempo que el event loop estuvo bloqueado.
+            while time.perf_counter() < deadline:
+                scheduled = time.perf_counter() + PING_INTERVAL
+                await asyncio.sleep(PING_INTERVAL)
+                await client.get("/ping")
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+
+        await asyncio.gather(ping_loop(), *(login_loop() for _ in range(LOGIN_CLIENTS)))
+
+    return latencies
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    password_hash = PasswordHasher().hash(PASSWORD)
+
+    print(
+        f"/ping durante {DURATION:.0f}s con {LOGIN_CLIENTS} clientes haciendo login "
+        f"({_hashing_pool.max_workers} hilos Argon2)"
+    )
+    print(f"{'modo':>8} | {'pings':>6} | {'p50 ms':>8} | {'p99 ms':>8} | {'max ms':>8}")
+    print("-" * 51)
+    for mode in ("sync", "pool"):
+        latencies = await _measure(mode, password_hash)
+        print(
+            f"{mode:>8} | {len(latencies):>6} | {_percentile(latencies, 50):8.2f} | "
+            f"{_percentile(latencies, 99):8.2f} | {max(latencies):8.2f}"
+        )
+
+    _hashing_pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
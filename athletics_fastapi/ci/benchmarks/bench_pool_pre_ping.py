@@ -0,0 +1,105 @@
+"""
+Benchmark de latencia por petición con `pool_pre_ping` frente a la
+verificación en segundo plano (`DATABASE_POOL_HEALTH_INTERVAL`).
+
+Cada petición simulada presta una conexión y ejecuta `QUERIES` consultas.
+Con `pool_pre_ping=True` el checkout añade un `SELECT 1` (un viaje más a la
+base de datos); con la verificación en segundo plano ese ping sale del
+camino de la petición.
+
+La base de datos es un stand-in local: SQLite en memoria cuyos cursores
+esperan `RTT_MS` ms por sentencia para simular el viaje de red a Postgres.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_pool_pre_ping
+"""
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from app.core.db.pool_metrics import InstrumentedQueuePool  # noqa: E402
+
+RTT_MS = 0.5
+QUERIES = 3
+CONCURRENCY = 10
+REQUESTS_PER_WORKER = 100
+POOL_SIZE = 10
+
+
+class _LatencyCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        time.sleep(RTT_MS / 1000)
+        return super().execute(*args)
+
+
+class _LatencyConnection(sqlite3.Connection):
+    def cursor(self, factory=_LatencyCursor):
+        return super().cursor(factory)
+
+
+def _connect() -> sqlite3.Connection:
+    return sqlite3.connect(":memory:", factory=_LatencyConnection, check_same_thread=False)
+
+
+def _run(pre_ping: bool) -> dict:
+    engine = create_engine(
+        "sqlite://",
+        creator=_connect,
+        poolclass=InstrumentedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=0,
+        pool_pre_ping=pre_ping,
+    )
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(REQUESTS_PER_WORKER):
+            start = time.perf_counter()
+            with engine.connect() as conn:
+                for _ in range(QUERIES):
+                    conn.execute(text("SELECT 1"))
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    # Calentamiento: abrir la conexión antes de medir
+    with engine.connect():
+        pass
+    threads = [threading.Thread(target=worker) for _ in range(CONCURRENCY)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "mean": statistics.mean(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "rps": len(latencies) / elapsed,
+    }
+
+
+def main() -> None:
+    print(f"{CONCURRENCY} peticiones concurrentes x {REQUESTS_PER_WORKER}, {QUERIES} consultas, RTT {RTT_MS} ms")
+    print(f"{'modo':>22} | {'media ms':>9} | {'p95 ms':>9} | {'req/s':>8}")
+    print("-" * 58)
+    for name, pre_ping in (("pool_pre_ping", True), ("ping en segundo plano", False)):
+        r = _run(pre_ping)
+        print(f"{name:>22} | {r['mean']:9.3f} | {r['p95']:9.3f} | {r['rps']:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark de contención del rate limiter entre workers.
+
+Lanza `WORKERS` procesos (como workers de uvicorn) que evalúan a la vez
+`REQUESTS_PER_WORKER` peticiones cada uno contra el límite `RATE`:
+
+- `clave caliente`: todos sobre la misma clave (p. ej. un mismo email en un
+  ataque distribuido). Con Redis el total permitido debe ser exactamente la
+  ráfaga del límite, sin importar cuántos workers compitan (script atómico).
+- `claves distintas`: cada petición con su propia IP.
+
+Reporta latencia p50/p99 por evaluación y el total de peticiones permitidas.
+Requiere Redis en REDIS_URL; si no responde, mide el token bucket local
+(fallback), donde cada worker permite su propia ráfaga.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_rate_limit
+"""
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+WORKERS = 4
+REQUESTS_PER_WORKER = 500
+CONCURRENCY = 20
+RATE = "100/minute"
+
+
+async def _worker(scope: str, hot: bool, worker_id: int) -> tuple[int, list[float], int]:
+    from app.core.cache.redis import _redis
+    from app.core.rate_limit.limiter import RATE_LIMIT_FALLBACKS, RateLimiter
+
+    limiter = RateLimiter()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies: list[float] = []
+
+    async def one(i: int) -> bool:
+        identity = "hot" if hot else f"10.{worker_id}.{i // 256}.{i % 256}"
+        async with semaphore:
+            start = time.perf_counter()
+            result = await limiter.hit(scope, identity, RATE)
+            latencies.append(time.perf_counter() - start)
+            return result.allowed
+
+    allowed = await asyncio.gather(*(one(i) for i in range(REQUESTS_PER_WORKER)))
+    await _redis.close()
+    return sum(allowed), latencies, int(RATE_LIMIT_FALLBACKS._value.get())
+
+
+def _run_worker(args) -> tuple[int, list[float], int]:
+    return asyncio.run(_worker(*args))
+
+
+def main() -> None:
+    print(f"{WORKERS} workers x {REQUESTS_PER_WORKER} evaluaciones (concurrencia {CONCURRENCY}), límite {RATE}")
+    print(f"{'escenario':>16} | {'backend':>7} | {'p50 µs':>8} | {'p99 µs':>8} | {'permitidas':>10}")
+    print("-" * 62)
+    ctx = multiprocessing.get_context("spawn")
+    for name, hot in (("clave caliente", True), ("claves distintas", False)):
+        scope = f"bench:{uuid.uuid4().hex[:8]}"
+        with ctx.Pool(WORKERS) as pool:
+            results = pool.map(_run_worker, [(scope, hot, w) for w in range(WORKERS)])
+        latencies = sorted(x for _, lat, _ in results for x in lat)
+        allowed = sum(a for a, _, _ in results)
+        backend = "local" if any(fallbacks for _, _, fallbacks in results) else "redis"
+        print(
+            f"{name:>16} | {backend:>7} | {statistics.median(latencies) * 1e6:8.1f} | "
+            f"{latencies[int(len(latencies) * 0.99) - 1] * 1e6:8.1f} | {allowed:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark de `JWTManager.is_revoked` por petición autenticada: `EXISTS` en
+Redis siempre (sin filtro) frente al filtro local de revocaciones.
+
+El filtro se carga con `REVOKED` jti y se consultan `CHECKS` jti no
+revocados (el caso normal). Redis es un stand-in con latencia fija
+(`REDIS_MS`) para no depender del servicio; también se reporta cuántas
+consultas llegan a Redis (falsos positivos del filtro) y el tamaño del
+filtro.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_revocation_check
+"""
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+from app.core.jwt.jwt import JWTManager  # noqa: E402
+from app.core.jwt.revocation import RevocationFilter  # noqa: E402
+
+CHECKS = 20_000
+REVOKED = 50_000
+REDIS_MS = 0.3
+
+
+class _Redis:
+    def __init__(self):
+        self.calls = 0
+
+    async def exists(self, key: str) -> int:
+        self.calls += 1
+        await asyncio.sleep(REDIS_MS / 1000)
+        return 0
+
+
+async def _run(revocation_filter: RevocationFilter) -> tuple[float, int]:
+    jwtm = JWTManager()
+    jwtm.redis = _Redis()
+    jtis = [uuid.uuid4().hex for _ in range(CHECKS)]
+    with patch("app.core.jwt.jwt._revocation_filter", revocation_filter):
+        start = time.perf_counter()
+        for jti in jtis:
+            await jwtm.is_revoked(jti)
+        elapsed = time.perf_counter() - start
+    return elapsed * 1e6 / CHECKS, jwtm.redis.calls
+
+
+async def main() -> None:
+    disabled = RevocationFilter(enabled=False)
+    local = RevocationFilter(enabled=True, capacity=REVOKED, error_rate=0.001, max_staleness=30)
+    local.load(uuid.uuid4().hex for _ in range(REVOKED))
+    local.mark_synced()
+
+    print(f"{CHECKS} consultas, {REVOKED} jti revocados, Redis {REDIS_MS} ms (stand-in)")
+    print(f"filtro: {len(local._filter._bits) / 1024:.0f} KiB, {local._filter.hashes} hashes")
+    print(f"{'modo':>12} | {'µs/consulta':>11} | {'consultas a Redis':>17}")
+    print("-" * 46)
+    for name, revocation_filter in (("solo Redis", disabled), ("filtro local", local)):
+        us, calls = await _run(revocation_filter)
+        print(f"{name:>12} | {us:11.1f} | {calls:>17}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
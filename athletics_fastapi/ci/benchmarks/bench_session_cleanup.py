@@ -0,0 +1,95 @@
+"""
+Benchmark de la limpieza de sesiones expiradas: un UPDATE sobre toda la
+tabla frente a lotes acotados (`SESSION_CLEANUP_BATCH_SIZE`).
+
+Lo relevante para la concurrencia es la transacción de escritura más larga
+(el tiempo que los locks quedan tomados), no el tiempo total.
+
+La base de datos es un stand-in local: SQLite en un archivo temporal, con el
+mismo esquema mínimo e índice parcial `expires_at WHERE status`. SQLite no
+tiene `FOR UPDATE SKIP LOCKED`; el lote se elige con `id IN (... LIMIT n)`.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_session_cleanup
+"""
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+ROWS = 300_000
+EXPIRED_RATIO = 0.6
+BATCH_SIZE = 1000
+
+
+def _setup(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(
+        """
+        CREATE TABLE auth_users_sessions (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            status BOOLEAN NOT NULL,
+            expires_at REAL
+        );
+        CREATE INDEX ix_auth_users_sessions_expires_at_active
+            ON auth_users_sessions (expires_at) WHERE status;
+        """
+    )
+    now = time.time()
+    rows = (
+        (i, i % 5000, 1, now - random.random() * 86400 if random.random() < EXPIRED_RATIO else now + 86400)
+        for i in range(ROWS)
+    )
+    conn.execute("BEGIN")
+    conn.executemany("INSERT INTO auth_users_sessions VALUES (?, ?, ?, ?)", rows)
+    conn.execute("COMMIT")
+    return conn
+
+
+def _full(conn: sqlite3.Connection, now: float) -> list[float]:
+    start = time.perf_counter()
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("UPDATE auth_users_sessions SET status = 0 WHERE status AND expires_at < ?", (now,))
+    conn.execute("COMMIT")
+    return [time.perf_counter() - start]
+
+
+def _batched(conn: sqlite3.Connection, now: float) -> list[float]:
+    durations = []
+    while True:
+        start = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        count = conn.execute(
+            """
+            UPDATE auth_users_sessions SET status = 0
+            WHERE id IN (
+                SELECT id FROM auth_users_sessions
+                WHERE status AND expires_at < ?
+                ORDER BY expires_at LIMIT ?
+            )
+            """,
+            (now, BATCH_SIZE),
+        ).rowcount
+        conn.execute("COMMIT")
+        durations.append(time.perf_counter() - start)
+        if count < BATCH_SIZE:
+            return durations
+
+
+def main() -> None:
+    print(f"{ROWS} sesiones ({EXPIRED_RATIO:.0%} expiradas), lotes de {BATCH_SIZE}")
+    print(f"{'modo':>8} | {'transacciones':>13} | {'total ms':>9} | {'máx. lock ms':>12}")
+    print("-" * 52)
+    for name, fn in (("completo", _full), ("lotes", _batched)):
+        random.seed(42)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = _setup(Path(tmp_dir) / "sessions.db")
+            durations = fn(conn, time.time())
+            conn.close()
+        print(f"{name:>8} | {len(durations):>13} | {sum(durations) * 1000:9.1f} | {max(durations) * 1000:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark de emisión de tokens en login/refresh: flujo anterior frente a
+`TokenPairIssuer`.
+
+- `anterior`: `create_access_token` + `create_refresh_token`, luego
+  `decode` de ambos para recuperar `jti`/`exp`, y después `store_refresh`
+  (Redis) y la escritura de la sesión (BD) una tras otra.
+- `issuer`: `TokenPairIssuer.issue` (claims devueltos con los tokens) y
+  `persist` (Redis y BD a la vez con `asyncio.gather`).
+
+La firma/verificación JWT es real. Redis y la base de datos son stand-ins
+con una latencia fija (`REDIS_MS`, `DB_MS`) para no depender de servicios.
+
+Uso (desde athletics_fastapi/):
+    python -m ci.benchmarks.bench_token_issuance
+"""
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BASE_DIR))
+
+from ci.benchmarks import bench_env  # noqa: E402,F401  (variables mínimas de entorno)
+
+from app.core.jwt.jwt import JWTManager, TokenPairIssuer  # noqa: E402
+from app.core.jwt.secret_rotation import JWTSecretRotation  # noqa: E402
+
+LOGINS = 2000
+CONCURRENCY = 50
+REDIS_MS = 0.3
+DB_MS = 1.5
+
+
+async def _store_refresh(jti: str, sub: str, exp: int) -> None:
+    await asyncio.sleep(REDIS_MS / 1000)
+
+
+async def _session_write(access_jti: str, refresh_jti: str, expires_at: datetime) -> None:
+    await asyncio.sleep(DB_MS / 1000)
+
+
+async def _before(jwtm: JWTManager, issuer: TokenPairIssuer) -> None:
+    access = jwtm.create_access_token("1", "ATLETA", "bench@test.com", "bench")
+    refresh = jwtm.create_refresh_token("1", "ATLETA", "bench@test.com", "bench")
+    access_payload = jwtm.decode(access)
+    refresh_payload = jwtm.decode(refresh)
+    await jwtm.store_refresh(refresh_payload["jti"], "1", refresh_payload["exp"])
+    await _session_write(
+        access_payload["jti"],
+        refresh_payload["jti"],
+        datetime.fromtimestamp(refresh_payload["exp"], tz=timezone.utc),
+    )
+
+
+async def _after(jwtm: JWTManager, issuer: TokenPairIssuer) -> None:
+    pair = issuer.issue("1", "ATLETA", "bench@test.com", "bench")
+    await issuer.persist(pair, _session_write(pair.access.jti, pair.refresh.jti, pair.refresh.expires_at))
+
+
+async def _throughput(fn, jwtm: JWTManager, issuer: TokenPairIssuer, concurrency: int) -> tuple[float, float]:
+    """Devuelve (logins/s, ms por login)."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await fn(jwtm, issuer)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+    return LOGINS / elapsed, elapsed * 1000 / LOGINS
+
+
+def _cpu_us(fn, jwtm: JWTManager, issuer: TokenPairIssuer) -> float:
+    """Coste de CPU de la parte JWT (sin E/S) en µs."""
+    start = time.perf_counter()
+    for _ in range(LOGINS):
+        fn(jwtm, issuer)
+    return (time.perf_counter() - start) * 1e6 / LOGINS
+
+
+def _jwt_before(jwtm, issuer):
+    jwtm.decode(jwtm.create_access_token("1", "ATLETA", "bench@test.com", "bench"))
+    jwtm.decode(jwtm.create_refresh_token("1", "ATLETA", "bench@test.com", "bench"))
+
+
+def _jwt_after(jwtm, issuer):
+    issuer.issue("1", "ATLETA", "bench@test.com", "bench")
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "jwt_secrets.json"
+        path.write_text(json.dumps({"secrets": [
+            {"secret": "benchmark-secret", "created_at": datetime.now(timezone.utc).isoformat(), "active": True}
+        ]}))
+        jwtm = JWTManager()
+        jwtm.secret_rotation = JWTSecretRotation(str(path))
+        jwtm.store_refresh = _store_refresh
+        issuer = TokenPairIssuer(jwtm)
+
+        print(f"{LOGINS} logins, Redis {REDIS_MS} ms, BD {DB_MS} ms (stand-ins)")
+        print(f"{'modo':>9} | {'JWT µs':>8} | {'secuencial ms':>13} | {f'c={CONCURRENCY} logins/s':>15}")
+        print("-" * 56)
+        for name, fn, jwt_fn in (("anterior", _before, _jwt_before), ("issuer", _after, _jwt_after)):
+            cpu = _cpu_us(jwt_fn, jwtm, issuer)
+            _, sequential_ms = await _throughput(fn, jwtm, issuer, 1)
+            rps, _ = await _throughput(fn, jwtm, issuer, CONCURRENCY)
+            print(f"{name:>9} | {cpu:8.1f} | {sequential_ms:13.3f} | {rps:15.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
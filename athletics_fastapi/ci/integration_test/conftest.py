@@ -108,6 +108,18 @@ async def client() -> AsyncGenerator:
         yield c
 
 
+# Presupuesto de consultas por endpoint
+@pytest.fixture
+def query_budget():
+    """
+    Falla si el bloque ejecuta más consultas (o más repetidas) de las permitidas
+    (ver `tests.utils.query_budget`).
+    """
+    from tests.utils import query_budget as budget_de_consultas
+
+    return budget_de_consultas
+
+
 # Fixture para verificar servicios externos
 @pytest.fixture(scope="session")
 async def check_external_services():
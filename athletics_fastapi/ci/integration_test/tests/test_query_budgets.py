@@ -0,0 +1,332 @@
+"""
+Presupuestos de consultas SQL por endpoint contra PostgreSQL real.
+
+Cada prueba envuelve una petición HTTP en `query_budget`, que cuenta las
+sentencias que llegan al engine (`app.core.db.query_stats`). Los presupuestos
+son los valores actuales: si un cambio añade consultas (un N+1, una recarga
+más tras el commit) la prueba falla mostrando las sentencias repetidas.
+
+Usa las rutas de test (`ENABLE_TEST_ROUTES=true` en `.env.test`) para crear
+usuarios con cualquier rol. Antes de medir, cada usuario hace una petición
+autenticada para que `get_current_user` quede servido por el principal cache
+(Redis) y el presupuesto cuente solo el trabajo del endpoint.
+"""
+import os
+from datetime import date
+
+import pytest
+from sqlalchemy import delete
+
+from tests.utils import generar_cedula_ecuador
+
+pytestmark = pytest.mark.usefixtures("require_database", "require_redis")
+
+TESTS_API = "/api/v1/tests"
+
+ITEMS_BAREMO = [
+    {"clasificacion": "A", "marca_minima": 0, "marca_maxima": 10},
+    {"clasificacion": "B", "marca_minima": 10, "marca_maxima": 20},
+]
+
+
+async def _registrar(client, rol: str, estamento: str) -> tuple[dict, dict]:
+    """Registra y autentica un usuario; devuelve (usuario, cabeceras)."""
+    sufijo = os.urandom(4).hex()
+    datos = {
+        "email": f"{rol.lower()}_budget_{sufijo}@test.com",
+        "password": "TestPass123!",
+        "username": f"{rol.lower()}_budget_{sufijo}",
+        "first_name": "Budget",
+        "last_name": rol.title(),
+        "tipo_identificacion": "CEDULA",
+        "identificacion": generar_cedula_ecuador(),
+        "tipo_estamento": estamento,
+        "roles": [rol],
+        "is_active": True,
+    }
+    response = await client.post(f"{TESTS_API}/auth/register", json=datos)
+    assert response.status_code == 201, response.text
+    usuario = response.json()["data"]
+
+    response = await client.post(
+        f"{TESTS_API}/auth/login",
+        json={"username": datos["email"], "password": datos["password"]},
+    )
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    # Calienta el principal cache del token
+    response = await client.get(f"{TESTS_API}/auth/users/me", headers=headers)
+    assert response.status_code == 200, response.text
+    return usuario, headers
+
+
+@pytest.fixture
+async def entrenador(client) -> dict:
+    _, headers = await _registrar(client, "ENTRENADOR", "DOCENTES")
+    return headers
+
+
+@pytest.fixture
+async def administrador(client) -> dict:
+    _, headers = await _registrar(client, "ADMINISTRADOR", "ADMINISTRATIVOS")
+    return headers
+
+
+async def _atleta(client) -> dict:
+    """Usuario atleta con su perfil (lo crea el registro de test)."""
+    usuario, headers = await _registrar(client, "ATLETA", "ESTUDIANTES")
+    response = await client.get(f"{TESTS_API}/atleta/me", headers=headers)
+    assert response.status_code == 200, response.text
+    return {"user": usuario, "headers": headers, "id": response.json()["id"]}
+
+
+async def _inscribir(client, entrenador: dict, horario_id: int, atleta_id: int) -> int:
+    response = await client.post(
+        f"{TESTS_API}/entrenador/asistencias/inscripcion",
+        headers=entrenador,
+        json={"horario_id": horario_id, "atleta_id": atleta_id},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+async def _registrar_asistencia(client, entrenador: dict, registro_id: int) -> None:
+    response = await client.post(
+        f"{TESTS_API}/entrenador/asistencias/registro",
+        headers=entrenador,
+        json={
+            "registro_asistencias_id": registro_id,
+            "fecha_asistencia": date.today().isoformat(),
+            "hora_llegada": "08:00:00",
+            "asistio": True,
+        },
+    )
+    assert response.status_code == 201, response.text
+
+
+@pytest.fixture
+async def atleta(client) -> dict:
+    return await _atleta(client)
+
+
+@pytest.fixture
+async def horario_id(client, entrenador) -> int:
+    response = await client.post(
+        f"{TESTS_API}/entrenador/entrenamientos/",
+        headers=entrenador,
+        json={"tipo_entrenamiento": "BUDGET", "descripcion": "Presupuesto de consultas", "fecha_entrenamiento": date.today().isoformat()},
+    )
+    assert response.status_code == 201, response.text
+
+    response = await client.post(
+        f"{TESTS_API}/entrenador/horarios/entrenamiento/{response.json()['id']}",
+        headers=entrenador,
+        json={"name": "LUNES", "hora_inicio": "08:00:00", "hora_fin": "10:00:00"},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+@pytest.fixture
+async def registro_id(client, entrenador, horario_id, atleta) -> int:
+    return await _inscribir(client, entrenador, horario_id, atleta["id"])
+
+
+@pytest.fixture
+async def prueba_uuid(client, administrador) -> str:
+    response = await client.post(
+        f"{TESTS_API}/competencia/tipo-disciplina/",
+        headers=administrador,
+        json={"nombre": f"Budget {os.urandom(2).hex()}", "descripcion": "Presupuesto de consultas"},
+    )
+    assert response.status_code == 201, response.text
+    tipo_disciplina_id = response.json()["data"]["id"]
+
+    response = await client.post(
+        f"{TESTS_API}/competencia/pruebas/",
+        headers=administrador,
+        json={
+            "nombre": f"100m Budget {os.urandom(2).hex()}",
+            "tipo_prueba": "NORMAL",
+            "tipo_medicion": "TIEMPO",
+            "unidad_medida": "SEGUNDOS",
+            "fecha_registro": date.today().isoformat(),
+            "tipo_disciplina_id": tipo_disciplina_id,
+            "descripcion": "Presupuesto de consultas",
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["data"]["external_id"]
+
+
+class TestAtletaQueryBudgets:
+    """POST/PUT de atletas"""
+
+    @pytest.mark.asyncio
+    async def test_crear_atleta(self, client, db_session, atleta, query_budget):
+        """Usuario + rol, existencia, INSERT, refresh y recarga con usuario/auth."""
+        from app.modules.atleta.domain.models.atleta_model import Atleta
+
+        # El registro de test ya creó el perfil: se borra para crearlo por la API
+        await db_session.execute(delete(Atleta).where(Atleta.id == atleta["id"]))
+        await db_session.commit()
+
+        # La recarga tras el refresh vuelve a leer la fila del atleta
+        with query_budget(max_queries=8, max_duplicates=1) as stats:
+            response = await client.post(
+                f"{TESTS_API}/atleta/", headers=atleta["headers"], json={"anios_experiencia": 2}
+            )
+
+        assert response.status_code == 201, response.text
+        print(f"\n📊 POST /atletas: {stats.count} consultas")
+
+    @pytest.mark.asyncio
+    async def test_actualizar_atleta(self, client, atleta, query_budget):
+        """Lectura con usuario/auth, UPDATE, refresh y recarga completa."""
+        # get_by_id, refresh y la recarga leen atleta -> user -> auth tres veces
+        with query_budget(max_queries=10, max_duplicates=5) as stats:
+            response = await client.put(
+                f"{TESTS_API}/atleta/{atleta['id']}",
+                headers=atleta["headers"],
+                json={"anios_experiencia": 3},
+            )
+
+        assert response.status_code == 200, response.text
+        assert response.json()["anios_experiencia"] == 3
+        print(f"\n📊 PUT /atletas/{{id}}: {stats.count} consultas")
+
+
+class TestBaremoQueryBudgets:
+    """POST/PUT de baremos con sus items"""
+
+    @pytest.mark.asyncio
+    async def test_crear_baremo(self, client, administrador, prueba_uuid, query_budget):
+        """Prueba, solapes, INSERT del baremo, INSERT de items en bloque y recarga."""
+        with query_budget(max_queries=7) as stats:
+            response = await client.post(
+                f"{TESTS_API}/competencia/baremos/",
+                headers=administrador,
+                json={"prueba_id": prueba_uuid, "sexo": "M", "edad_min": 10, "edad_max": 20, "items": ITEMS_BAREMO},
+            )
+
+        assert response.status_code == 201, response.text
+        assert len(response.json()["data"]["items"]) == len(ITEMS_BAREMO)
+        print(f"\n📊 POST /baremos: {stats.count} consultas")
+
+    @pytest.mark.asyncio
+    async def test_actualizar_baremo_con_items(self, client, administrador, prueba_uuid, query_budget):
+        """Lectura, UPDATE, reemplazo de items (INSERT/DELETE en bloque) y recarga."""
+        response = await client.post(
+            f"{TESTS_API}/competencia/baremos/",
+            headers=administrador,
+            json={"prueba_id": prueba_uuid, "sexo": "F", "edad_min": 10, "edad_max": 20, "items": ITEMS_BAREMO},
+        )
+        assert response.status_code == 201, response.text
+        baremo_uuid = response.json()["data"]["external_id"]
+        items = ITEMS_BAREMO + [{"clasificacion": "C", "marca_minima": 20, "marca_maxima": 30}]
+
+        # Baremo + items se leen antes y después de reemplazar los items
+        with query_budget(max_queries=9, max_duplicates=2) as stats:
+            response = await client.put(
+                f"{TESTS_API}/competencia/baremos/{baremo_uuid}",
+                headers=administrador,
+                json={"edad_max": 21, "items": items},
+            )
+
+        assert response.status_code == 200, response.text
+        assert len(response.json()["data"]["items"]) == len(items)
+        print(f"\n📊 PUT /baremos/{{id}}: {stats.count} consultas")
+
+
+class TestRegistroAsistenciasQueryBudgets:
+    """Endpoints de inscripciones (RegistroAsistencias) y sus perfiles de carga"""
+
+    @pytest.mark.asyncio
+    async def test_inscribir_atleta(self, client, entrenador, horario_id, atleta, query_budget):
+        """Entrenador, horario (4), existencia por id, INSERT y recarga FULL (2)."""
+        with query_budget(max_queries=9) as stats:
+            response = await client.post(
+                f"{TESTS_API}/entrenador/asistencias/inscripcion",
+                headers=entrenador,
+                json={"horario_id": horario_id, "atleta_id": atleta["id"]},
+            )
+
+        assert response.status_code == 201, response.text
+        assert response.json()["horario"]["entrenamiento"]["entrenador"] is not None
+        print(f"\n📊 POST /inscripcion: {stats.count} consultas")
+
+    @pytest.mark.asyncio
+    async def test_listar_inscritos_no_crece_con_el_roster(self, client, entrenador, horario_id, query_budget):
+        """Perfil ROSTER: inscripciones + asistencias, sin importar cuántos inscritos haya."""
+        for _ in range(3):
+            registro = await _inscribir(client, entrenador, horario_id, (await _atleta(client))["id"])
+            await _registrar_asistencia(client, entrenador, registro)
+
+        with query_budget(max_queries=2) as stats:
+            response = await client.get(
+                f"{TESTS_API}/entrenador/asistencias/inscripcion/horario/{horario_id}", headers=entrenador
+            )
+
+        assert response.status_code == 200, response.text
+        assert len(response.json()) == 3
+        assert all(len(r["asistencias"]) == 1 for r in response.json())
+        print(f"\n📊 GET /inscripcion/horario/{{id}}: {stats.count} consultas")
+
+    @pytest.mark.asyncio
+    async def test_eliminar_inscripcion(self, client, entrenador, registro_id, query_budget):
+        """Entrenador, perfil ID, asistencias en cascada y los dos DELETE."""
+        await _registrar_asistencia(client, entrenador, registro_id)
+
+        with query_budget(max_queries=5) as stats:
+            response = await client.delete(
+                f"{TESTS_API}/entrenador/asistencias/inscripcion/{registro_id}", headers=entrenador
+            )
+
+        assert response.status_code == 204, response.text
+        print(f"\n📊 DELETE /inscripcion/{{id}}: {stats.count} consultas")
+
+    @pytest.mark.asyncio
+    async def test_confirmar_asistencia(self, client, atleta, registro_id, query_budget):
+        """Existencia (solo el id), asistencia del día y upsert."""
+        with query_budget(max_queries=3) as stats:
+            response = await client.post(
+                f"{TESTS_API}/entrenador/asistencias/confirmar/{registro_id}",
+                headers=atleta["headers"],
+                params={"fecha_entrenamiento": date.today().isoformat()},
+            )
+
+        assert response.status_code == 201, response.text
+        assert response.json()["atleta_confirmo"] is True
+        print(f"\n📊 POST /confirmar/{{id}}: {stats.count} consultas")
+
+    @pytest.mark.asyncio
+    async def test_rechazar_asistencia(self, client, atleta, registro_id, query_budget):
+        """Existencia (solo el id) y upsert."""
+        with query_budget(max_queries=2) as stats:
+            response = await client.post(
+                f"{TESTS_API}/entrenador/asistencias/rechazar/{registro_id}",
+                headers=atleta["headers"],
+                params={"fecha_entrenamiento": date.today().isoformat()},
+            )
+
+        assert response.status_code == 201, response.text
+        assert response.json()["atleta_confirmo"] is False
+        print(f"\n📊 POST /rechazar/{{id}}: {stats.count} consultas")
+
+    @pytest.mark.asyncio
+    async def test_mis_registros(self, client, entrenador, atleta, registro_id, query_budget):
+        """Perfil FULL: inscripciones con la cadena del entrenador + asistencias."""
+        await _registrar_asistencia(client, entrenador, registro_id)
+
+        with query_budget(max_queries=2) as stats:
+            response = await client.get(
+                f"{TESTS_API}/entrenador/asistencias/mis-registros",
+                headers=atleta["headers"],
+                params={"atleta_id": atleta["id"]},
+            )
+
+        assert response.status_code == 200, response.text
+        (registro,) = response.json()
+        assert registro["horario"]["entrenamiento"]["entrenador"] is not None
+        print(f"\n📊 GET /mis-registros: {stats.count} consultas")
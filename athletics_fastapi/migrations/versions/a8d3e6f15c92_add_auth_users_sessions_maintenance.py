@@ -0,0 +1,57 @@
+"""add session maintenance indexes and auth_users_sessions_archive
+
+Revision ID: a8d3e6f15c92
+Revises: f2b7c9d41e68
+Create Date: 2026-10-17 19:03:12.884210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3e6f15c92'
+down_revision: Union[str, Sequence[str], None] = 'f2b7c9d41e68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_auth_users_sessions_expires_at_active',
+        'auth_users_sessions',
+        ['expires_at'],
+        unique=False,
+        postgresql_where=sa.text('status'),
+    )
+    op.create_index(
+        'ix_auth_users_sessions_expires_at_inactive',
+        'auth_users_sessions',
+        ['expires_at'],
+        unique=False,
+        postgresql_where=sa.text('NOT status'),
+    )
+    op.create_table('auth_users_sessions_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('external_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('access_token', sa.String(length=500), nullable=False),
+    sa.Column('refresh_token', sa.String(length=500), nullable=False),
+    sa.Column('status', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auth_users_sessions_archive_user_id'), 'auth_users_sessions_archive', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_auth_users_sessions_archive_user_id'), table_name='auth_users_sessions_archive')
+    op.drop_table('auth_users_sessions_archive')
+    op.drop_index('ix_auth_users_sessions_expires_at_inactive', table_name='auth_users_sessions')
+    op.drop_index('ix_auth_users_sessions_expires_at_active', table_name='auth_users_sessions')
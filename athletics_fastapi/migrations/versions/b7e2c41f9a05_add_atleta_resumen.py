@@ -0,0 +1,61 @@
+"""add atleta_resumen summary table
+
+Revision ID: b7e2c41f9a05
+Revises: 666ac91b853e
+Create Date: 2026-10-17 10:12:44.512803
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c41f9a05'
+down_revision: Union[str, Sequence[str], None] = '666ac91b853e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('atleta_resumen',
+        sa.Column('atleta_id', sa.Integer(), nullable=False),
+        sa.Column('total_competencias', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('oro', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('plata', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('bronce', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('fecha_actualizacion', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['atleta_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('atleta_id')
+    )
+    op.create_index('ix_resultado_competencia_atleta_prueba', 'resultado_competencia', ['atleta_id', 'prueba_id'], unique=False)
+
+    # Carga inicial con el mismo criterio de medallas que AtletaResumenRepository
+    op.execute("""
+    INSERT INTO atleta_resumen (atleta_id, total_competencias, oro, plata, bronce, fecha_actualizacion)
+    SELECT atleta_id,
+           count(*),
+           count(*) FILTER (WHERE medalla = 'oro'),
+           count(*) FILTER (WHERE medalla = 'plata'),
+           count(*) FILTER (WHERE medalla = 'bronce'),
+           now()
+    FROM (
+        SELECT atleta_id,
+               CASE
+                   WHEN lower(posicion_final) LIKE '%primero%' OR puesto_obtenido = 1 THEN 'oro'
+                   WHEN lower(posicion_final) LIKE '%segundo%' OR puesto_obtenido = 2 THEN 'plata'
+                   WHEN lower(posicion_final) LIKE '%tercero%' OR puesto_obtenido = 3 THEN 'bronce'
+               END AS medalla
+        FROM resultado_competencia
+        WHERE estado = true
+    ) r
+    GROUP BY atleta_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resultado_competencia_atleta_prueba', table_name='resultado_competencia')
+    op.drop_table('atleta_resumen')
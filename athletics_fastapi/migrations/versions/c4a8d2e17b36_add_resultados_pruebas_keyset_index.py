@@ -0,0 +1,33 @@
+"""add keyset pagination index on resultados_pruebas
+
+Revision ID: c4a8d2e17b36
+Revises: b7e2c41f9a05
+Create Date: 2026-10-17 12:05:31.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8d2e17b36'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c41f9a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_resultados_pruebas_fecha_creacion_id',
+        'resultados_pruebas',
+        ['fecha_creacion', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resultados_pruebas_fecha_creacion_id', table_name='resultados_pruebas')
@@ -0,0 +1,73 @@
+"""add unique (registro_asistencias_id, fecha_asistencia) on asistencia
+
+Revision ID: e5a1f93c0d47
+Revises: c4a8d2e17b36
+Create Date: 2026-10-17 15:42:10.518903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1f93c0d47'
+down_revision: Union[str, Sequence[str], None] = 'c4a8d2e17b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicados previos (confirmaciones repetidas): se conserva el registro más
+    # reciente, con la última confirmación/rechazo del atleta del grupo y
+    # presente si alguna de las filas lo estaba
+    op.execute(
+        """
+        WITH grupos AS (
+            SELECT registro_asistencias_id, fecha_asistencia,
+                   max(id) AS keep_id, bool_or(asistio) AS asistio
+            FROM asistencia
+            GROUP BY registro_asistencias_id, fecha_asistencia
+            HAVING count(*) > 1
+        ), confirmacion AS (
+            SELECT DISTINCT ON (a.registro_asistencias_id, a.fecha_asistencia)
+                   a.registro_asistencias_id, a.fecha_asistencia,
+                   a.atleta_confirmo, a.fecha_confirmacion
+            FROM asistencia a
+            JOIN grupos g USING (registro_asistencias_id, fecha_asistencia)
+            WHERE a.atleta_confirmo IS NOT NULL
+            ORDER BY a.registro_asistencias_id, a.fecha_asistencia,
+                     a.fecha_confirmacion DESC NULLS LAST, a.id DESC
+        )
+        UPDATE asistencia k
+        SET asistio = g.asistio,
+            atleta_confirmo = COALESCE(c.atleta_confirmo, k.atleta_confirmo),
+            fecha_confirmacion = CASE WHEN c.atleta_confirmo IS NULL
+                                      THEN k.fecha_confirmacion
+                                      ELSE c.fecha_confirmacion END
+        FROM grupos g
+        LEFT JOIN confirmacion c USING (registro_asistencias_id, fecha_asistencia)
+        WHERE k.id = g.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM asistencia a
+        USING asistencia b
+        WHERE a.registro_asistencias_id = b.registro_asistencias_id
+          AND a.fecha_asistencia = b.fecha_asistencia
+          AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_asistencia_registro_fecha',
+        'asistencia',
+        ['registro_asistencias_id', 'fecha_asistencia'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_asistencia_registro_fecha', 'asistencia', type_='unique')
@@ -0,0 +1,52 @@
+"""add active-session unique index and (user_id, status, created_at) on auth_users_sessions
+
+Revision ID: f2b7c9d41e68
+Revises: e5a1f93c0d47
+Create Date: 2026-10-17 18:21:47.306512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7c9d41e68'
+down_revision: Union[str, Sequence[str], None] = 'e5a1f93c0d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sesiones activas duplicadas (logins concurrentes): se conserva la más reciente
+    op.execute(
+        """
+        UPDATE auth_users_sessions a
+        SET status = false
+        FROM auth_users_sessions b
+        WHERE a.user_id = b.user_id
+          AND a.status AND b.status
+          AND (a.created_at, a.id) < (b.created_at, b.id)
+        """
+    )
+    op.create_index(
+        'uq_auth_users_sessions_user_active',
+        'auth_users_sessions',
+        ['user_id'],
+        unique=True,
+        postgresql_where=sa.text('status'),
+    )
+    op.create_index(
+        'ix_auth_users_sessions_user_status_created',
+        'auth_users_sessions',
+        ['user_id', 'status', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_auth_users_sessions_user_status_created', table_name='auth_users_sessions')
+    op.drop_index('uq_auth_users_sessions_user_active', table_name='auth_users_sessions')
@@ -7,7 +7,7 @@ from typing import AsyncGenerator, Dict, Any
 from httpx import AsyncClient, ASGITransport
 from fastapi.exceptions import ResponseValidationError
 
-from tests.utils import generar_cedula_ecuador
+from tests.utils import generar_cedula_ecuador, query_budget as budget_de_consultas
 # ⚠️ CRITICAL: Enable test routes BEFORE importing the app
 os.environ["ENABLE_TEST_ROUTES"] = "true"
 
@@ -42,6 +42,14 @@ async def client() -> AsyncGenerator[AsyncClient, None]:
     ) as c:
         yield c
 
+# Rate limiting: cada test empieza con los contadores vacíos
+@pytest_asyncio.fixture(autouse=True)
+async def reset_rate_limits():
+    from app.core.rate_limit.limiter import _rate_limiter
+    await _rate_limiter.clear()
+    yield
+
+
 # DB session
 @pytest_asyncio.fixture(scope="function")
 async def db_session():
@@ -54,6 +62,16 @@ async def db_session():
         yield session
 
 
+# Presupuesto de consultas por endpoint
+@pytest.fixture
+def query_budget():
+    """
+    Falla si el bloque ejecuta más consultas (o más repetidas) de las permitidas
+    (ver `tests.utils.query_budget`).
+    """
+    return budget_de_consultas
+
+
 # ======================================================
 # MULTI-ROLE TEST USER FIXTURES
 # ======================================================
@@ -0,0 +1,137 @@
+"""
+Pruebas Unitarias para la paginación keyset.
+Valida cursores opacos, orden estable por (sort_key, id) y totales estimados.
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+import app.main  # noqa: F401  (configura los mappers)
+from app.core.config.enviroment import _SETTINGS
+from app.core.db.pagination import (
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from app.modules.competencia.domain.models.resultado_prueba_model import ResultadoPrueba
+
+
+def _session(rows, estimate=None, count=None):
+    """Sesión simulada: devuelve `rows` para la página y los totales indicados."""
+    session = MagicMock()
+    results = []
+    if estimate is not None:
+        results.append(MagicMock(scalar_one_or_none=MagicMock(return_value=estimate)))
+    if count is not None:
+        results.append(MagicMock(scalar_one=MagicMock(return_value=count)))
+    results.append(MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=rows)))))
+    session.execute = AsyncMock(side_effect=results)
+    return session
+
+
+def _sql(session, call=-1) -> str:
+    stmt = session.execute.await_args_list[call].args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_roundtrip_preserva_tipos():
+    fecha = datetime(2026, 5, 1, 10, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor([fecha, 42])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == [fecha, 42]
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!!", encode_cursor([1, 2]), "e30"])
+def test_cursor_invalido_responde_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, 1)
+    assert exc.value.status_code == 400
+
+
+def test_clamp_limit():
+    assert clamp_limit(None) == _SETTINGS.pagination_default_limit
+    assert clamp_limit(0) == _SETTINGS.pagination_default_limit
+    assert clamp_limit(10) == 10
+    assert clamp_limit(10_000) == _SETTINGS.pagination_max_limit
+
+
+@pytest.mark.asyncio
+async def test_paginate_devuelve_next_cursor_si_hay_mas_filas():
+    """Se piden limit + 1 filas; la sobrante solo indica que hay otra página."""
+    fecha = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    rows = [SimpleNamespace(id=i, fecha_creacion=fecha) for i in (9, 8, 7)]
+    session = _session(rows)
+
+    page = await paginate(
+        session, select(ResultadoPrueba), ResultadoPrueba.fecha_creacion, ResultadoPrueba.id,
+        limit=2, descending=True,
+    )
+
+    assert [r.id for r in page.items] == [9, 8]
+    assert decode_cursor(page.next_cursor, 2) == [fecha, 8]
+    sql = _sql(session)
+    assert "ORDER BY resultados_pruebas.fecha_creacion DESC, resultados_pruebas.id DESC" in sql
+    assert "LIMIT" in sql and "OFFSET" not in sql
+
+
+@pytest.mark.asyncio
+async def test_paginate_con_cursor_filtra_por_tupla():
+    fecha = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    session = _session([SimpleNamespace(id=3, fecha_creacion=fecha)])
+
+    page = await paginate(
+        session, select(ResultadoPrueba), ResultadoPrueba.fecha_creacion, ResultadoPrueba.id,
+        limit=2, cursor=encode_cursor([fecha, 8]), descending=True,
+    )
+
+    assert page.next_cursor is None
+    assert "(resultados_pruebas.fecha_creacion, resultados_pruebas.id) <" in _sql(session)
+
+
+@pytest.mark.asyncio
+async def test_total_aproximado_desde_pg_class():
+    session = _session([], estimate=1234)
+
+    page = await paginate(
+        session, select(ResultadoPrueba), ResultadoPrueba.id, ResultadoPrueba.id,
+        include_total=True, estimate_table="resultados_pruebas",
+    )
+
+    assert page.total == 1234
+    assert page.total_aproximado is True
+    assert "pg_class" in str(session.execute.await_args_list[0].args[0])
+
+
+@pytest.mark.asyncio
+async def test_total_exacto_si_la_tabla_no_fue_analizada():
+    """reltuples = -1 (sin ANALYZE): se cuenta con COUNT(*)."""
+    session = _session([], estimate=-1, count=7)
+
+    page = await paginate(
+        session, select(ResultadoPrueba), ResultadoPrueba.id, ResultadoPrueba.id,
+        include_total=True, estimate_table="resultados_pruebas",
+    )
+
+    assert page.total == 7
+    assert page.total_aproximado is False
+    assert "count(*)" in _sql(session, 1)
+
+
+@pytest.mark.asyncio
+async def test_sin_limit_ni_cursor_devuelve_todo():
+    """Compatibilidad con clientes que no paginan: sin LIMIT ni next_cursor."""
+    session = _session([1, 2, 3])
+
+    page = await paginate(session, select(ResultadoPrueba), ResultadoPrueba.id, ResultadoPrueba.id)
+
+    assert len(page.items) == 3
+    assert page.next_cursor is None
+    assert page.limit is None
+    assert "LIMIT" not in _sql(session)
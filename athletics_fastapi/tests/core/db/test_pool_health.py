@@ -0,0 +1,116 @@
+"""
+Pruebas Unitarias para la salud del pool sin pool_pre_ping.
+El handler de desconexiones se valida con SQLite síncrono; `check_pool`
+con un engine async simulado (no hay driver async de SQLite instalado).
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.db.pool_health import (
+    CHECKIN_KEY,
+    check_pool,
+    register_disconnect_handler,
+    register_idle_tracking,
+)
+
+
+def test_desconexion_invalida_el_pool_y_se_cuenta():
+    engine = create_engine("sqlite://")
+    register_disconnect_handler(engine, "test_disconnect")
+    with engine.connect() as conn:
+        conn.connection.dbapi_connection.close()
+        with pytest.raises(exc.DBAPIError):
+            conn.execute(text("SELECT 1"))
+
+    assert REGISTRY.get_sample_value("db_pool_disconnects_total", {"pool": "test_disconnect"}) == 1
+    assert engine.pool._invalidate_time > 0
+    engine.dispose()
+
+
+def _engine(conns, idle):
+    pool = MagicMock()
+    pool.checkedin.side_effect = lambda: idle[0]
+
+    async def connect():
+        idle[0] -= 1
+        return conns.pop(0)
+
+    return SimpleNamespace(sync_engine=SimpleNamespace(pool=pool), connect=connect)
+
+
+def _conn(fails=False, idle_for=None):
+    conn = MagicMock()
+    conn.info = {} if idle_for is None else {CHECKIN_KEY: time.monotonic() - idle_for}
+    conn.exec_driver_sql = AsyncMock(side_effect=ConnectionResetError() if fails else None)
+    conn.invalidate = AsyncMock()
+    conn.close = AsyncMock()
+    return conn
+
+
+@pytest.mark.asyncio
+async def test_check_pool_verifica_las_ociosas_e_invalida_las_rotas():
+    sana, rota = _conn(), _conn(fails=True)
+    report = await check_pool(_engine([sana, rota], [2]), "test_health", timeout=1)
+
+    assert (report.checked, report.failed) == (1, 1)
+    rota.invalidate.assert_awaited_once()
+    sana.invalidate.assert_not_awaited()
+    sana.close.assert_awaited_once()
+    rota.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_check_pool_no_abre_conexiones_si_no_hay_ociosas():
+    engine = _engine([], [0])
+    report = await check_pool(engine, "test_health", timeout=1)
+    assert (report.checked, report.failed) == (0, 0)
+
+
+def test_checkin_anota_cuando_vuelve_la_conexion():
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+    register_idle_tracking(engine)
+    with engine.connect():
+        pass
+    with engine.connect() as conn:
+        assert time.monotonic() - conn.info[CHECKIN_KEY] < 5
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_check_pool_devuelve_sin_ping_las_usadas_hace_poco():
+    reciente, ociosa = _conn(idle_for=1), _conn(idle_for=60)
+    report = await check_pool(_engine([reciente, ociosa], [2]), "test_health", timeout=1, min_idle=30)
+
+    assert (report.checked, report.failed, report.skipped) == (1, 0, 1)
+    reciente.exec_driver_sql.assert_not_awaited()
+    reciente.close.assert_awaited_once()
+    ociosa.exec_driver_sql.assert_awaited_once()
+    ociosa.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_check_pool_devuelve_cada_conexion_tras_su_ping():
+    """Una conexión que no responde no retiene a las sanas hasta el fin del barrido."""
+    colgada, sana = _conn(), _conn()
+    devuelta = asyncio.Event()
+    sana.close.side_effect = lambda: devuelta.set()
+
+    async def cuelga(_sql):
+        await asyncio.sleep(10)
+
+    colgada.exec_driver_sql = AsyncMock(side_effect=cuelga)
+    barrido = asyncio.create_task(check_pool(_engine([colgada, sana], [2]), "test_health", timeout=0.5))
+
+    await asyncio.wait_for(devuelta.wait(), 0.2)
+    colgada.close.assert_not_awaited()
+    report = await barrido
+    assert (report.checked, report.failed) == (1, 1)
+    colgada.invalidate.assert_awaited_once()
+    colgada.close.assert_awaited_once()
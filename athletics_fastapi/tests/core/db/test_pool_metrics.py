@@ -0,0 +1,51 @@
+"""
+Pruebas Unitarias para las métricas del pool de conexiones.
+Usa un engine SQLite síncrono con `InstrumentedQueuePool`.
+"""
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc
+
+from app.core.db.pool_metrics import InstrumentedQueuePool, register_pool_metrics
+
+
+def _sample(name: str, pool: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": pool}) or 0.0
+
+
+@pytest.fixture
+def engine(request):
+    name = f"test_{request.node.name}"
+    engine = create_engine(
+        "sqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    register_pool_metrics(engine, name)
+    yield engine, name
+    engine.dispose()
+
+
+def test_mide_checkouts_y_conexiones_prestadas(engine):
+    engine, name = engine
+    with engine.connect():
+        assert _sample("db_pool_checked_out", name) == 1
+        assert _sample("db_pool_size", name) == 1
+    with engine.connect():
+        pass
+
+    assert _sample("db_pool_checked_out", name) == 0
+    assert _sample("db_pool_checkout_wait_seconds_count", name) == 2
+    assert _sample("db_pool_connection_age_seconds_count", name) == 2
+
+
+def test_cuenta_timeouts_con_el_pool_lleno(engine):
+    engine, name = engine
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert _sample("db_pool_checkout_timeouts_total", name) == 1
@@ -0,0 +1,107 @@
+"""
+Pruebas Unitarias para el conteo de consultas por petición.
+Usa un engine SQLite en memoria (los eventos del engine son los mismos que
+con asyncpg) para validar conteo, duplicados, anidamiento y el middleware.
+"""
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.core.db.query_stats import (
+    DB_QUERIES_PER_REQUEST,
+    QueryStatsMiddleware,
+    instrument_engine,
+    track_queries,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotente
+    yield engine
+    engine.dispose()
+
+
+def _run(engine, *statements):
+    with engine.connect() as conn:
+        for sql in statements:
+            conn.execute(text(sql))
+
+
+def test_cuenta_consultas_y_duplicados(engine):
+    with track_queries() as stats:
+        _run(engine, "SELECT 1", "SELECT 2", "SELECT 2", "SELECT 2")
+
+    assert stats.count == 4
+    assert stats.duplicates == 2
+    assert stats.repeated() == [("SELECT 2", 3)]
+    assert stats.duration > 0
+    assert stats.server_timing().endswith('desc="4 queries, 2 duplicated"')
+
+
+def test_fuera_de_track_queries_no_cuenta(engine):
+    _run(engine, "SELECT 1")
+    with track_queries() as stats:
+        pass
+    assert stats.count == 0
+
+
+def test_contadores_anidados_ven_las_mismas_consultas(engine):
+    with track_queries() as outer:
+        _run(engine, "SELECT 1")
+        with track_queries() as inner:
+            _run(engine, "SELECT 2")
+
+    assert (outer.count, inner.count) == (2, 1)
+
+
+def test_consulta_fallida_no_desbalancea_los_tiempos(engine):
+    with track_queries() as stats:
+        with engine.connect() as conn:
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM no_existe"))
+            assert not conn.info.get("query_stats_start")
+            conn.execute(text("SELECT 1"))
+
+    assert stats.count == 1
+
+
+@pytest.mark.asyncio
+async def test_middleware_server_timing_y_metricas(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, server_timing=True)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        _run(engine, "SELECT 1", "SELECT 1")
+        return {"id": item_id}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/items/7")
+
+    assert response.headers["server-timing"].endswith('desc="2 queries, 1 duplicated"')
+    samples = DB_QUERIES_PER_REQUEST.labels("GET", "/items/{item_id}")._sum.get()
+    assert samples >= 2
+
+
+@pytest.mark.asyncio
+async def test_query_budget_incluye_las_consultas_del_endpoint(engine, query_budget):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/n-mas-uno")
+    async def n_mas_uno():
+        _run(engine, "SELECT 1", *["SELECT 2"] * 3)
+        return {}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        with pytest.raises(AssertionError, match="consultas repetidas"):
+            with query_budget(max_queries=10):
+                await client.get("/n-mas-uno")
+        with query_budget(max_queries=4, max_duplicates=2) as stats:
+            await client.get("/n-mas-uno")
+
+    assert stats.count == 4
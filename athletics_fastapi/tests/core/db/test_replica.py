@@ -0,0 +1,131 @@
+"""
+Pruebas Unitarias para el ruteo de lecturas a la réplica.
+Usa engines SQLite síncronos como primario y réplica para validar
+`RoutingSession.get_bind`, la marca de escritura y el fallback de `@read_only`.
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+
+from app.core.db.database import USE_REPLICA, WROTE, RoutingSession, _db
+from app.core.db.replica import read_only
+
+
+metadata = MetaData()
+items = Table("items", metadata, Column("id", Integer, primary_key=True))
+
+
+@pytest.fixture
+def engines():
+    primary = create_engine("sqlite://")
+    replica = create_engine("sqlite://")
+    metadata.create_all(primary)
+    with patch.object(_db, "get_replica_engine", return_value=SimpleNamespace(sync_engine=replica)):
+        yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def test_get_bind_usa_la_replica_solo_si_se_pide(engines):
+    primary, replica = engines
+    with RoutingSession(bind=primary) as session:
+        assert session.get_bind() is primary
+        session.info[USE_REPLICA] = True
+        assert session.get_bind() is replica
+
+
+def test_get_bind_sin_replica_disponible_usa_el_primario(engines):
+    primary, _ = engines
+    with patch.object(_db, "get_replica_engine", return_value=None):
+        with RoutingSession(bind=primary) as session:
+            session.info[USE_REPLICA] = True
+            assert session.get_bind() is primary
+
+
+def test_una_escritura_marca_la_sesion(engines):
+    primary, _ = engines
+    with RoutingSession(bind=primary) as session:
+        session.execute(select(items))
+        assert WROTE not in session.info
+        session.execute(insert(items).values(id=1))
+        assert session.info[WROTE] is True
+
+
+def test_replica_caida_se_retira_durante_el_intervalo(monkeypatch):
+    replica = object()
+    monkeypatch.setattr(_db, "_replica_engine", replica)
+    monkeypatch.setattr(_db, "_replica_down_until", 0.0)
+    assert _db.get_replica_engine() is replica
+
+    _db.mark_replica_down(OSError("connection refused"))
+    assert _db.get_replica_engine() is None
+
+
+# ============================
+# @read_only
+# ============================
+class _Repo:
+    def __init__(self, session):
+        self.session = session
+        self.binds = []
+
+    @read_only
+    async def listar(self):
+        replica = bool(self.session.info.get(USE_REPLICA))
+        self.binds.append("replica" if replica else "primary")
+        if replica and self.session.replica_down:
+            raise OperationalError("SELECT 1", {}, OSError("connection refused"))
+        return self.binds[-1]
+
+
+class _Session(SimpleNamespace):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+
+def _session(replica_down=False, **info):
+    return _Session(info=dict(info), rollback=AsyncMock(), replica_down=replica_down, closed=False)
+
+
+def _fake_db(replica_session):
+    fake_db = MagicMock()
+    fake_db.get_session_factory.return_value = lambda: replica_session
+    return fake_db
+
+
+@pytest.mark.asyncio
+async def test_read_only_ejecuta_en_la_replica_con_su_propia_sesion():
+    request_session, replica_session = _session(), _session()
+    repo = _Repo(request_session)
+    with patch("app.core.db.replica._db", _fake_db(replica_session)) as fake_db:
+        assert await repo.listar() == "replica"
+    assert replica_session.info[USE_REPLICA] is True and replica_session.closed
+    assert repo.session is request_session and request_session.info == {}
+    fake_db.mark_replica_down.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_read_only_repite_en_el_primario_sin_tocar_la_sesion_de_la_peticion():
+    """Un fallo de la réplica no hace rollback de la unidad de trabajo de la petición."""
+    request_session, replica_session = _session(), _session(replica_down=True)
+    repo = _Repo(request_session)
+    with patch("app.core.db.replica._db", _fake_db(replica_session)) as fake_db:
+        assert await repo.listar() == "primary"
+    assert repo.binds == ["replica", "primary"]
+    fake_db.mark_replica_down.assert_called_once()
+    assert replica_session.closed
+    request_session.rollback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_read_only_se_queda_en_el_primario_tras_escribir():
+    fake_db = MagicMock()
+    repo = _Repo(_session(**{WROTE: True}))
+    with patch("app.core.db.replica._db", fake_db):
+        assert await repo.listar() == "primary"
@@ -0,0 +1,106 @@
+"""
+Pruebas Unitarias para las exportaciones en streaming.
+Valida la codificación NDJSON/CSV, la lectura por lotes con `yield_per`
+y la respuesta de descarga.
+"""
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
+
+import pytest
+
+from app.core.db.streaming import CSV, NDJSON, encode_csv, encode_ndjson, streaming_export
+from app.modules.admin.services.export_service import usuarios_stmt
+from app.modules.auth.domain.enums import RoleEnum
+
+
+ROW = {
+    "id": 1,
+    "external_id": UUID("12345678-1234-5678-1234-567812345678"),
+    "role": RoleEnum.ATLETA,
+    "fecha_nacimiento": date(2005, 3, 1),
+    "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "phone": None,
+}
+
+
+class _AsyncPartitions:
+    def __init__(self, partitions):
+        self._partitions = iter(partitions)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._partitions)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def _session_factory(partitions):
+    """Fábrica de sesiones cuyo `stream()` entrega `partitions` lote a lote."""
+    result = MagicMock()
+    result.mappings.return_value.partitions = MagicMock(return_value=_AsyncPartitions(partitions))
+    session = MagicMock()
+    session.stream = AsyncMock(return_value=result)
+
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory, session
+
+
+async def _body(response) -> str:
+    return "".join([chunk async for chunk in response.body_iterator])
+
+
+def test_encode_ndjson_serializa_tipos_de_bd():
+    line = json.loads(encode_ndjson([ROW]))
+
+    assert line["external_id"] == "12345678-1234-5678-1234-567812345678"
+    assert line["role"] == "ATLETA"
+    assert line["fecha_nacimiento"] == "2005-03-01"
+    assert line["phone"] is None
+
+
+def test_encode_csv_usa_valores_planos():
+    columns = list(ROW)
+    text = encode_csv([ROW], columns, header=True)
+
+    header, row = text.strip().splitlines()
+    assert header.split(",") == columns
+    assert row.split(",")[2] == "ATLETA"
+    assert row.endswith(",")  # None -> celda vacía
+
+
+@pytest.mark.asyncio
+async def test_streaming_export_emite_un_bloque_por_lote():
+    """Cada lote del cursor se codifica y envía por separado."""
+    factory, session = _session_factory([[ROW, ROW], [ROW]])
+
+    with patch("app.core.db.streaming._db") as db:
+        db.get_session_factory.return_value = factory
+        response = streaming_export(usuarios_stmt(), NDJSON, "usuarios", yield_per=2)
+        chunks = [chunk async for chunk in response.body_iterator]
+
+    assert response.media_type == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="usuarios.ndjson"'
+    assert [chunk.count("\n") for chunk in chunks] == [2, 1]
+    stmt = session.stream.await_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] == 2
+
+
+@pytest.mark.asyncio
+async def test_streaming_export_csv_incluye_cabecera_con_columnas_del_select():
+    factory, _ = _session_factory([])
+
+    with patch("app.core.db.streaming._db") as db:
+        db.get_session_factory.return_value = factory
+        body = await _body(streaming_export(usuarios_stmt(), CSV, "usuarios"))
+
+    assert body.strip().split(",")[:3] == ["id", "external_id", "email"]
+    assert "hashed_password" not in body
@@ -0,0 +1,203 @@
+"""
+Pruebas Unitarias para el CircuitBreaker de APIs externas.
+Valida apertura tras fallos, fallo rápido, half-open y estado compartido por Redis.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.core.http.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@pytest.fixture
+def redis_down():
+    """Redis no disponible: el breaker funciona solo con estado local."""
+    client = MagicMock()
+    client.hgetall = AsyncMock(side_effect=RedisError("down"))
+    client.set = AsyncMock(side_effect=RedisError("down"))
+    client.delete = AsyncMock(side_effect=RedisError("down"))
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=RedisError("down"))
+    client.pipeline = MagicMock(return_value=pipe)
+    with patch("app.core.http.circuit_breaker._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        yield client
+
+
+async def _fail():
+    raise ConnectionError("servicio caído")
+
+
+async def _ok():
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_opens_after_threshold_and_fails_fast(redis_down):
+    """Tras N fallos el circuito se abre y no vuelve a llamar al servicio."""
+    breaker = CircuitBreaker("test", failure_threshold=3, failure_window=60, recovery_timeout=30, sync_interval=0)
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await breaker.call("ep", _fail, budget=1)
+    assert breaker.state == OPEN
+
+    fn = AsyncMock()
+    with pytest.raises(CircuitOpenError) as exc:
+        await breaker.call("ep", fn, budget=1)
+    assert exc.value.status_code == 503
+    fn.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_timeout_budget_counts_as_failure(redis_down):
+    """Superar el presupuesto de latencia del endpoint cuenta como fallo."""
+    breaker = CircuitBreaker("test", failure_threshold=1, failure_window=60, recovery_timeout=30, sync_interval=0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await breaker.call("lento", lambda: asyncio.sleep(1), budget=0.01)
+
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_on_success(redis_down):
+    """Pasado el recovery_timeout una llamada de prueba exitosa cierra el circuito."""
+    breaker = CircuitBreaker("test", failure_threshold=1, failure_window=60, recovery_timeout=30, sync_interval=0)
+    with pytest.raises(ConnectionError):
+        await breaker.call("ep", _fail, budget=1)
+
+    breaker._opened_at = time.time() - 31
+
+    assert await breaker.call("ep", _ok, budget=1) == "ok"
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_failure_reopens(redis_down):
+    """Si la llamada de prueba falla el circuito vuelve a abrirse."""
+    breaker = CircuitBreaker("test", failure_threshold=1, failure_window=60, recovery_timeout=30, sync_interval=0)
+    breaker._set_state(OPEN, time.time() - 31)
+
+    await breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    # Mientras la prueba está en curso el resto de llamadas falla rápido
+    with pytest.raises(CircuitOpenError):
+        await breaker.before_call()
+
+    await breaker.record_failure("ep")
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_open_state_is_read_from_redis():
+    """Un circuito abierto por otro worker se respeta en este proceso."""
+    client = MagicMock()
+    client.hgetall = AsyncMock(return_value={"state": "open", "opened_at": str(time.time())})
+    with patch("app.core.http.circuit_breaker._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        breaker = CircuitBreaker("shared", recovery_timeout=30, sync_interval=0)
+
+        with pytest.raises(CircuitOpenError):
+            await breaker.call("ep", _ok, budget=1)
+
+    assert breaker.state == OPEN
+
+
+class _FakeFailuresPipeline:
+    """ZSET en memoria con las operaciones que usa `_count_failure`."""
+
+    def __init__(self, zsets: dict):
+        self._zsets = zsets
+        self._ops = []
+
+    def zadd(self, key, mapping):
+        self._ops.append(lambda: self._zsets.setdefault(key, {}).update(mapping) or len(mapping))
+
+    def zremrangebyscore(self, key, _min, max_score):
+        def op():
+            zset = self._zsets.get(key, {})
+            old = [m for m, score in zset.items() if score <= max_score]
+            for member in old:
+                del zset[member]
+            return len(old)
+        self._ops.append(op)
+
+    def zcard(self, key):
+        self._ops.append(lambda: len(self._zsets.get(key, {})))
+
+    def expire(self, key, ttl):
+        self._ops.append(lambda: True)
+
+    async def execute(self):
+        return [op() for op in self._ops]
+
+
+@pytest.mark.asyncio
+async def test_spaced_failures_do_not_open_with_redis():
+    """Fallos separados casi `failure_window` no se acumulan en Redis."""
+    zsets: dict = {}
+    client = MagicMock()
+    client.hgetall = AsyncMock(return_value={})
+    client.set = AsyncMock()
+    client.pipeline = MagicMock(side_effect=lambda: _FakeFailuresPipeline(zsets))
+    breaker = CircuitBreaker("test", failure_threshold=3, failure_window=60, recovery_timeout=30, sync_interval=0)
+
+    with patch("app.core.http.circuit_breaker._redis") as redis_singleton, \
+            patch("app.core.http.circuit_breaker.time.time") as clock:
+        redis_singleton.get_client.return_value = client
+        for i in range(6):
+            clock.return_value = 1_000 + i * 59
+            await breaker.record_failure("ep")
+
+    assert breaker.state == CLOSED
+    assert len(zsets["circuit:test:failure_times"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_spaced_failures_do_not_open_without_redis(redis_down):
+    """Sin Redis la ventana local también descarta los fallos antiguos."""
+    breaker = CircuitBreaker("test", failure_threshold=3, failure_window=60, recovery_timeout=30, sync_interval=0)
+
+    with patch("app.core.http.circuit_breaker.time.time") as clock:
+        for i in range(6):
+            clock.return_value = 1_000 + i * 59
+            await breaker.record_failure("ep")
+
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_reopens_and_allows_next_probe(redis_down):
+    """Una prueba cancelada devuelve el circuito a OPEN; la siguiente llamada vuelve a probar."""
+    breaker = CircuitBreaker("test", failure_threshold=1, failure_window=60, recovery_timeout=30, sync_interval=0)
+    with pytest.raises(ConnectionError):
+        await breaker.call("ep", _fail, budget=1)
+    breaker._opened_at = time.time() - 31
+
+    started = asyncio.Event()
+
+    async def _hang():
+        started.set()
+        await asyncio.sleep(10)
+
+    probe = asyncio.create_task(breaker.call("ep", _hang, budget=5))
+    await started.wait()
+    assert breaker.state == HALF_OPEN
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    assert breaker.state == OPEN
+    redis_down.delete.assert_awaited_once_with("circuit:test:probe")
+    assert await breaker.call("ep", _ok, budget=1) == "ok"
+    assert breaker.state == CLOSED
@@ -0,0 +1,60 @@
+"""
+Pruebas Unitarias para el HashingPool (Argon2 fuera del event loop).
+Valida ejecución en hilos del pool, límite de cola y contadores.
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.jwt.hashing_pool import HashingPool
+from app.core.jwt.jwt import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_run_executes_outside_event_loop_thread():
+    """La función se ejecuta en un hilo del pool, no en el del event loop."""
+    pool = HashingPool(max_workers=1, max_pending=4)
+
+    thread_name = await pool.run(lambda: threading.current_thread().name)
+
+    assert thread_name.startswith("argon2")
+    assert pool.queue_depth == 0
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_when_queue_is_full():
+    """Con la cola llena se responde 503 en lugar de encolar sin límite."""
+    pool = HashingPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    blocked = asyncio.create_task(pool.run(release.wait))
+    await asyncio.sleep(0.05)  # el primer trabajo ocupa el único hilo
+    queued = asyncio.create_task(pool.run(lambda: "ok"))
+    await asyncio.sleep(0)
+
+    assert pool.queue_depth == 1
+    with pytest.raises(HTTPException) as exc:
+        await pool.run(lambda: "rechazado")
+    assert exc.value.status_code == 503
+
+    release.set()
+    assert await blocked is True
+    assert await queued == "ok"
+    assert pool.queue_depth == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_async_roundtrip():
+    """hash_async / verify_async producen el mismo resultado que las variantes síncronas."""
+    hasher = PasswordHasher()
+
+    hashed = await hasher.hash_async("Secret123!")
+
+    assert await hasher.verify_async("Secret123!", hashed) is True
+    assert await hasher.verify_async("otra", hashed) is False
+    assert hasher.verify("Secret123!", hashed) is True
@@ -0,0 +1,89 @@
+"""
+Pruebas Unitarias para el header `kid` de los JWT.
+Valida que decode verifique contra un único secret y acepte tokens legacy.
+"""
+import json
+import uuid
+import jwt
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from fastapi import HTTPException
+
+from app.core.jwt.jwt import JWTManager
+from app.core.jwt.secret_rotation import JWTSecretRotation, secret_kid
+
+
+@pytest.fixture
+def jwtm(tmp_path):
+    secrets_file = tmp_path / "jwt_secrets.json"
+    now = datetime.now(timezone.utc)
+    secrets_file.write_text(json.dumps({"secrets": [
+        {"secret": f"old-{i}", "created_at": (now - timedelta(days=10 + i)).isoformat(), "active": False}
+        for i in range(5)
+    ] + [
+        {"secret": "current", "created_at": now.isoformat(), "active": True}
+    ]}))
+    manager = JWTManager()
+    manager.secret_rotation = JWTSecretRotation(str(secrets_file))
+    return manager
+
+
+def test_encode_stamps_kid(jwtm):
+    """Los tokens nuevos llevan el kid del secret activo."""
+    token = jwtm.create_access_token("1", "ATLETA", "a@test.com", "a")
+
+    assert jwt.get_unverified_header(token)["kid"] == secret_kid("current")
+    assert jwtm.decode(token)["sub"] == "1"
+
+
+def test_decode_verifies_single_secret(jwtm):
+    """Con kid, decode hace exactamente una verificación."""
+    token = jwtm.create_access_token("1", "ATLETA", "a@test.com", "a")
+
+    with patch("app.core.jwt.jwt.jwt.decode", wraps=jwt.decode) as spy:
+        jwtm.decode(token)
+
+    assert spy.call_count == 1
+
+
+def test_decode_legacy_token_without_kid(jwtm):
+    """Tokens sin kid firmados con un secret en gracia siguen siendo válidos."""
+    token = jwt.encode(
+        {"sub": "2", "type": "access", "jti": str(uuid.uuid4()),
+         "exp": int((datetime.now(timezone.utc) + timedelta(minutes=5)).timestamp())},
+        "old-3",
+        algorithm=jwtm.algorithm,
+    )
+
+    assert jwtm.decode(token)["sub"] == "2"
+
+
+def test_decode_rejects_unknown_kid(jwtm):
+    """Un kid que no corresponde a ningún secret válido se rechaza sin probar los demás."""
+    token = jwt.encode({"sub": "3"}, "attacker", algorithm=jwtm.algorithm, headers={"kid": "deadbeef"})
+
+    with patch("app.core.jwt.jwt.jwt.decode", wraps=jwt.decode) as spy:
+        with pytest.raises(HTTPException) as exc:
+            jwtm.decode(token)
+
+    assert exc.value.status_code == 401
+    assert spy.call_count == 0
+
+
+def test_unknown_kid_does_not_reread_unchanged_file(jwtm):
+    """Un kid desconocido solo consulta el mtime; no relee el archivo si no cambió."""
+    token = jwt.encode({"sub": "3"}, "attacker", algorithm=jwtm.algorithm, headers={"kid": "deadbeef"})
+
+    with patch("builtins.open", side_effect=AssertionError("no debe leer el archivo")):
+        for _ in range(5):
+            with pytest.raises(HTTPException):
+                jwtm.decode(token)
+
+
+def test_decode_rejects_malformed_token(jwtm):
+    """Un token mal formado responde 401."""
+    with pytest.raises(HTTPException) as exc:
+        jwtm.decode("no-es-un-jwt")
+
+    assert exc.value.status_code == 401
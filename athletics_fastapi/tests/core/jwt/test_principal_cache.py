@@ -0,0 +1,259 @@
+"""
+Pruebas Unitarias para el PrincipalCache (caché de usuarios autenticados).
+Valida serialización, reconstrucción sin consultas, LRU local e invalidación.
+"""
+import asyncio
+import json
+import time
+import uuid
+import datetime
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.db.database import _db
+from prometheus_client import REGISTRY
+from redis.exceptions import RedisError
+
+from app.core.jwt.principal_cache import (
+    PrincipalCache,
+    listen_principal_invalidations,
+    snapshot_principal,
+    restore_principal,
+    PRINCIPAL_INVALIDATION_CHANNEL,
+    PRINCIPAL_KEY,
+)
+from app.modules.auth.domain.models import AuthUserModel, UserModel
+from app.modules.atleta.domain.models.atleta_model import Atleta
+from app.modules.auth.domain.enums import RoleEnum, TipoEstamentoEnum, TipoIdentificacionEnum
+
+
+def _build_user() -> AuthUserModel:
+    user = AuthUserModel(
+        id=10,
+        email="cache@test.com",
+        hashed_password="argon2-hash",
+        totp_secret="SECRET",
+        is_active=True,
+        two_factor_enabled=False,
+        created_at=datetime.datetime.now(datetime.timezone.utc),
+    )
+    profile = UserModel(
+        id=20,
+        auth_user_id=10,
+        external_id=uuid.uuid4(),
+        username="cache_user",
+        role=RoleEnum.ATLETA,
+        tipo_identificacion=TipoIdentificacionEnum.CEDULA,
+        identificacion="1100000000",
+        tipo_estamento=TipoEstamentoEnum.ESTUDIANTES,
+        fecha_nacimiento=datetime.date(2005, 5, 5),
+    )
+    profile.atleta = Atleta(id=30, user_id=20, anios_experiencia=3, external_id=uuid.uuid4())
+    profile.entrenador = None
+    profile.representante = None
+    user.profile = profile
+    return user
+
+
+@pytest.fixture
+def mock_redis():
+    client = MagicMock()
+    client.get = AsyncMock(return_value=None)
+    client.delete = AsyncMock()
+    client.smembers = AsyncMock(return_value={"jti-1", "jti-2"})
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    client.pipeline = MagicMock(return_value=pipe)
+    with patch("app.core.jwt.principal_cache._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        yield client
+
+
+def test_snapshot_excludes_credentials():
+    """La instantánea nunca contiene hash de contraseña ni datos TOTP."""
+    snapshot = snapshot_principal(_build_user())
+
+    assert "hashed_password" not in snapshot["user"]
+    assert "totp_secret" not in snapshot["user"]
+    assert snapshot["profile"]["role"] == "ATLETA"
+    assert snapshot["atleta"]["id"] == 30
+    assert snapshot["entrenador"] is None
+    # Debe ser serializable a JSON (Redis)
+    json.dumps(snapshot)
+
+
+@pytest.mark.asyncio
+async def test_restore_principal_attaches_without_queries():
+    """El usuario reconstruido queda persistente en la sesión con sus relaciones."""
+    snapshot = json.loads(json.dumps(snapshot_principal(_build_user())))
+
+    async with _db.get_session_factory()() as session:
+        user = await restore_principal(session, snapshot)
+
+        assert user in session
+        assert user.id == 10
+        assert user.profile.role == RoleEnum.ATLETA
+        assert user.profile.email == "cache@test.com"
+        assert user.profile.fecha_nacimiento == datetime.date(2005, 5, 5)
+        assert user.profile.atleta.id == 30
+        assert user.profile.entrenador is None
+        assert not session.dirty
+
+
+def _synced_cache(**kwargs) -> PrincipalCache:
+    """Caché con la suscripción de invalidaciones activa (LRU local en uso)."""
+    cache = PrincipalCache(**{"max_entries": 10, "local_ttl": 30, "enabled": True, **kwargs})
+    cache.mark_synced()
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_set_then_get_served_from_local(mock_redis):
+    """Tras `set`, `get` se sirve desde memoria sin ir a Redis."""
+    cache = _synced_cache()
+
+    await cache.set("jti-1", _build_user(), int(time.time()) + 600)
+    snapshot = await cache.get("jti-1")
+
+    assert snapshot["user"]["id"] == 10
+    mock_redis.get.assert_not_awaited()
+    mock_redis.pipeline.return_value.setex.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_falls_back_to_redis(mock_redis):
+    """Un fallo local consulta Redis y repuebla la memoria."""
+    cache = _synced_cache()
+    snapshot = snapshot_principal(_build_user())
+    mock_redis.get.return_value = json.dumps(
+        {"user_id": 10, "exp": int(time.time()) + 600, "snapshot": snapshot}
+    )
+
+    assert (await cache.get("jti-9"))["user"]["email"] == "cache@test.com"
+    assert (await cache.get("jti-9"))["user"]["email"] == "cache@test.com"
+    mock_redis.get.assert_awaited_once_with(PRINCIPAL_KEY.format(jti="jti-9"))
+
+
+@pytest.mark.asyncio
+async def test_invalidate_user_clears_all_tokens(mock_redis):
+    """Invalidar un usuario elimina todas sus entradas locales y en Redis, y lo publica."""
+    cache = _synced_cache()
+    exp = int(time.time()) + 600
+    await cache.set("jti-1", _build_user(), exp)
+    await cache.set("jti-2", _build_user(), exp)
+
+    await cache.invalidate_user(10)
+
+    assert await cache.get("jti-1") is None
+    pipe = mock_redis.pipeline.return_value
+    deleted = pipe.delete.call_args.args
+    assert PRINCIPAL_KEY.format(jti="jti-1") in deleted
+    assert PRINCIPAL_KEY.format(jti="jti-2") in deleted
+    pipe.publish.assert_called_once_with(PRINCIPAL_INVALIDATION_CHANNEL, json.dumps({"user_id": 10}))
+
+
+@pytest.mark.asyncio
+async def test_invalidacion_publicada_limpia_el_lru_de_otro_worker(mock_redis):
+    """Lo que publica un worker se aplica al LRU de los demás."""
+    origen, otro = _synced_cache(), _synced_cache()
+    exp = int(time.time()) + 600
+    await otro.set("jti-1", _build_user(), exp)
+    await otro.set("jti-2", _build_user(), exp)
+
+    await origen.invalidate_jti("jti-1")
+    pipe = mock_redis.pipeline.return_value
+    channel, data = pipe.publish.call_args.args
+    assert channel == PRINCIPAL_INVALIDATION_CHANNEL
+    otro.apply_invalidation(data)
+    assert otro._local.get("jti-1") is None
+    assert otro._local.get("jti-2") is not None
+
+    otro.apply_invalidation(json.dumps({"user_id": 10}))
+    assert len(otro._local) == 0
+
+
+@pytest.mark.asyncio
+async def test_sin_suscripcion_no_usa_el_lru_local(mock_redis):
+    """Sin recibir invalidaciones el LRU local no se usa: cada lectura va a Redis."""
+    cache = _synced_cache()
+    await cache.set("jti-1", _build_user(), int(time.time()) + 600)
+
+    cache.mark_disconnected()
+
+    assert len(cache._local) == 0
+    assert await cache.get("jti-1") is None
+    mock_redis.get.assert_awaited_once_with(PRINCIPAL_KEY.format(jti="jti-1"))
+
+
+@pytest.mark.asyncio
+async def test_invalidacion_fallida_se_registra_como_warning(mock_redis):
+    cache = _synced_cache()
+    mock_redis.pipeline.return_value.execute = AsyncMock(side_effect=RedisError("down"))
+    before = REGISTRY.get_sample_value("principal_cache_invalidation_failures_total") or 0
+
+    with patch("app.core.jwt.principal_cache.logger") as logger:
+        await cache.invalidate_jti("jti-1")
+
+    logger.warning.assert_called_once()
+    assert REGISTRY.get_sample_value("principal_cache_invalidation_failures_total") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_listener_aplica_invalidaciones_y_se_desincroniza_al_caer():
+    cache = _synced_cache()
+    cache._local.set("jti-1", 10, {"v": 1}, 30)
+    cache._local.set("jti-2", 11, {"v": 2}, 30)
+    cache._local_synced = False
+    messages = [
+        {"type": "message", "data": json.dumps({"jti": "jti-1"})},
+        ConnectionError("redis caído"),
+    ]
+    seen = []
+
+    async def get_message(**kwargs):
+        await asyncio.sleep(0)
+        if not messages:
+            return None
+        item = messages.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        seen.append(cache._local_synced)
+        return item
+
+    pubsub = MagicMock()
+    pubsub.subscribe = AsyncMock()
+    pubsub.get_message = get_message
+    pubsub.aclose = AsyncMock()
+    client = MagicMock()
+    client.pubsub.return_value = pubsub
+
+    with patch("app.core.jwt.principal_cache._principal_cache", cache), \
+            patch("app.core.jwt.principal_cache._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        task = asyncio.create_task(listen_principal_invalidations(MagicMock(), retry_seconds=60))
+        for _ in range(50):
+            await asyncio.sleep(0)
+            if not messages:
+                break
+        await asyncio.sleep(0)
+
+        pubsub.subscribe.assert_awaited_once_with(PRINCIPAL_INVALIDATION_CHANNEL)
+        # Suscrito al leer el primer mensaje; tras la caída se vacía y deja de usarse
+        assert seen[0] is True
+        assert cache._local_synced is False and len(cache._local) == 0
+
+        task.cancel()
+        await task
+
+
+def test_local_lru_evicts_oldest():
+    """El LRU local respeta el máximo de entradas."""
+    cache = PrincipalCache(max_entries=2, local_ttl=30, enabled=True)
+    cache._local.set("a", 1, {"v": 1}, 30)
+    cache._local.set("b", 2, {"v": 2}, 30)
+    cache._local.get("a")
+    cache._local.set("c", 3, {"v": 3}, 30)
+
+    assert cache._local.get("b") is None
+    assert cache._local.get("a") == {"v": 1}
+    assert len(cache._local) == 2
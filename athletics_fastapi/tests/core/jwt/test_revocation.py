@@ -0,0 +1,150 @@
+"""
+Pruebas Unitarias para el filtro local de tokens revocados.
+Valida el filtro de Bloom, la consulta sin red, la staleness acotada ante
+caídas de Redis y la carga por SCAN + pub/sub.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError
+
+from app.core.jwt.jwt import JWTManager
+from app.core.jwt.revocation import (
+    REVOCATION_CHANNEL,
+    BloomFilter,
+    RevocationFilter,
+    listen_revocations,
+)
+
+
+@pytest.fixture
+def revocations():
+    """Filtro cargado y suscrito, en lugar del global."""
+    revocation_filter = RevocationFilter(enabled=True, capacity=1000, error_rate=0.001, max_staleness=30)
+    revocation_filter.load(["revocado"])
+    revocation_filter.mark_synced()
+    with patch("app.core.jwt.jwt._revocation_filter", revocation_filter):
+        yield revocation_filter
+
+
+@pytest.fixture
+def jwtm():
+    manager = JWTManager()
+    manager.redis = MagicMock()
+    manager.redis.exists = AsyncMock(return_value=0)
+    return manager
+
+
+def test_bloom_sin_falsos_negativos_y_tasa_de_falsos_positivos():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"jti-{i}")
+    assert all(f"jti-{i}" in bloom for i in range(10_000))
+    false_positives = sum(f"otro-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300  # ~1% esperado
+
+
+@pytest.mark.asyncio
+async def test_jti_no_revocado_no_consulta_redis(revocations, jwtm):
+    assert await jwtm.is_revoked("sano") is False
+    jwtm.redis.exists.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_positivo_del_filtro_se_confirma_en_redis(revocations, jwtm):
+    jwtm.redis.exists.return_value = 1
+    assert await jwtm.is_revoked("revocado") is True
+    jwtm.redis.exists.assert_awaited_once_with("bl:revocado")
+
+
+@pytest.mark.asyncio
+async def test_caida_corta_de_redis_no_cierra_sesiones(revocations, jwtm):
+    jwtm.redis.exists.side_effect = RedisError("down")
+    revocations.mark_disconnected()
+
+    assert await jwtm.is_revoked("sano") is False
+    assert await jwtm.is_revoked("revocado") is True
+
+    # Pasada la staleness máxima se vuelve a Redis y se falla cerrado
+    revocations._disconnected_at = time.monotonic() - 31
+    assert await jwtm.is_revoked("sano") is True
+
+
+@pytest.mark.asyncio
+async def test_sin_filtro_cargado_consulta_redis(jwtm):
+    with patch("app.core.jwt.jwt._revocation_filter", RevocationFilter(enabled=True)):
+        assert await jwtm.is_revoked("sano") is False
+        jwtm.redis.exists.assert_awaited_once()
+        jwtm.redis.exists.side_effect = RedisError("down")
+        assert await jwtm.is_revoked("sano") is True
+
+
+@pytest.mark.asyncio
+async def test_revoke_until_escribe_publica_y_actualiza_el_filtro(revocations, jwtm):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    jwtm.redis.pipeline.return_value = pipe
+
+    await jwtm.revoke_until("nuevo", int(time.time()) + 60)
+
+    pipe.setex.assert_called_once()
+    assert pipe.setex.call_args.args[0] == "bl:nuevo"
+    pipe.publish.assert_called_once_with(REVOCATION_CHANNEL, "nuevo")
+    assert revocations.check("nuevo") is None
+
+    # Token ya expirado: nada que revocar
+    pipe.reset_mock()
+    await jwtm.revoke_until("viejo", int(time.time()) - 1)
+    pipe.setex.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_listener_carga_por_scan_y_aplica_mensajes():
+    revocation_filter = RevocationFilter(enabled=True, capacity=1000, error_rate=0.001, max_staleness=30)
+    messages = [
+        {"type": "message", "data": "publicado"},
+        RedisConnectionError("conexión perdida"),
+    ]
+
+    async def get_message(**kwargs):
+        await asyncio.sleep(0)
+        if not messages:
+            return None
+        item = messages.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def scan_iter(**kwargs):
+        for key in ("bl:existente",):
+            yield key
+
+    pubsub = MagicMock()
+    pubsub.subscribe = AsyncMock()
+    pubsub.get_message = get_message
+    pubsub.aclose = AsyncMock()
+    client = MagicMock()
+    client.pubsub.return_value = pubsub
+    client.scan_iter = scan_iter
+
+    with patch("app.core.jwt.revocation._revocation_filter", revocation_filter), \
+            patch("app.core.jwt.revocation._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        task = asyncio.create_task(listen_revocations(MagicMock(), retry_seconds=60))
+        for _ in range(50):
+            await asyncio.sleep(0)
+            if not messages:
+                break
+        await asyncio.sleep(0)
+
+        pubsub.subscribe.assert_awaited_once_with(REVOCATION_CHANNEL)
+        assert revocation_filter.check("existente") is None
+        assert revocation_filter.check("publicado") is None
+        # Desconectado, pero dentro de la staleness: sigue respondiendo en local
+        assert revocation_filter._synced is False
+        assert revocation_filter.check("sano") is False
+
+        task.cancel()
+        await task
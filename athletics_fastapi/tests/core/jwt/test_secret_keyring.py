@@ -0,0 +1,84 @@
+"""
+Pruebas Unitarias para el keyring en memoria de JWTSecretRotation.
+Valida que el archivo se lea una sola vez y se recargue al cambiar.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.core.jwt.secret_rotation import JWTSecretRotation, invalidate_keyrings
+
+
+def _write_secrets(path, secrets_list):
+    path.write_text(json.dumps({"secrets": secrets_list}))
+
+
+def _secret(value, days_old, active):
+    created = datetime.now(timezone.utc) - timedelta(days=days_old)
+    return {"secret": value, "created_at": created.isoformat(), "active": active}
+
+
+def test_secrets_are_read_once(tmp_path):
+    """Llamadas repetidas no vuelven a abrir el archivo."""
+    secrets_file = tmp_path / "jwt_secrets.json"
+    _write_secrets(secrets_file, [_secret("current", 1, True)])
+    rotation = JWTSecretRotation(str(secrets_file))
+
+    assert rotation.get_current_secret() == "current"
+
+    with patch("builtins.open", side_effect=AssertionError("no debe leer el archivo")):
+        for _ in range(100):
+            assert rotation.get_current_secret() == "current"
+            assert rotation.get_all_valid_secrets() == ["current"]
+
+
+def test_keyring_is_shared_between_instances(tmp_path):
+    """Todas las instancias del proceso comparten el mismo keyring por archivo."""
+    secrets_file = tmp_path / "jwt_secrets.json"
+    _write_secrets(secrets_file, [_secret("current", 1, True)])
+
+    assert JWTSecretRotation(str(secrets_file)).keyring is JWTSecretRotation(str(secrets_file)).keyring
+
+
+def test_reload_when_file_changes(tmp_path):
+    """Un cambio de mtime (rotación en otro worker) se detecta con refresh()."""
+    secrets_file = tmp_path / "jwt_secrets.json"
+    _write_secrets(secrets_file, [_secret("old", 1, True)])
+    rotation = JWTSecretRotation(str(secrets_file))
+    assert rotation.get_current_secret() == "old"
+
+    _write_secrets(secrets_file, [_secret("old", 1, False), _secret("new", 0, True)])
+    stat = os.stat(secrets_file)
+    os.utime(secrets_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert rotation.refresh() is True
+    assert rotation.get_current_secret() == "new"
+    assert set(rotation.get_all_valid_secrets()) == {"old", "new"}
+
+
+def test_rotate_updates_memory_immediately(tmp_path):
+    """rotate() deja el nuevo secret disponible sin esperar al intervalo de chequeo."""
+    secrets_file = tmp_path / "jwt_secrets.json"
+    rotation = JWTSecretRotation(str(secrets_file))
+    first = rotation.initialize()
+
+    result = rotation.rotate()
+
+    assert result["old_secret"] == first
+    assert rotation.get_current_secret() == result["new_secret"]
+    assert first in rotation.get_all_valid_secrets()
+
+
+def test_expired_grace_secrets_are_excluded(tmp_path):
+    """Secrets inactivos fuera del período de gracia no se usan para verificar."""
+    secrets_file = tmp_path / "jwt_secrets.json"
+    _write_secrets(secrets_file, [
+        _secret("expired", 130, False),
+        _secret("grace", 100, False),
+        _secret("current", 10, True),
+    ])
+    invalidate_keyrings()
+    rotation = JWTSecretRotation(str(secrets_file))
+
+    assert set(rotation.get_all_valid_secrets()) == {"grace", "current"}
@@ -0,0 +1,84 @@
+"""
+Pruebas Unitarias para TokenPairIssuer.
+Valida que los claims devueltos coincidan con los tokens firmados (sin
+decodificar en la emisión) y que Redis y la sesión en BD se escriban a la vez.
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from app.core.jwt.jwt import JWTManager, TokenPairIssuer
+from app.core.jwt.secret_rotation import JWTSecretRotation
+
+
+@pytest.fixture
+def jwtm(tmp_path):
+    secrets_file = tmp_path / "jwt_secrets.json"
+    secrets_file.write_text(json.dumps({"secrets": [
+        {"secret": "current", "created_at": datetime.now(timezone.utc).isoformat(), "active": True}
+    ]}))
+    manager = JWTManager()
+    manager.secret_rotation = JWTSecretRotation(str(secrets_file))
+    return manager
+
+
+def test_issue_devuelve_los_claims_firmados(jwtm):
+    with patch("app.core.jwt.jwt.jwt.decode", wraps=jwt.decode) as spy:
+        pair = TokenPairIssuer(jwtm).issue("7", "ATLETA", "a@test.com", "a")
+    assert spy.call_count == 0
+
+    assert jwtm.decode(pair.access.token) == pair.access.claims
+    assert jwtm.decode(pair.refresh.token) == pair.refresh.claims
+    assert pair.access.claims["type"] == "access"
+    assert pair.refresh.claims["type"] == "refresh"
+    assert pair.access.claims["iat"] == pair.refresh.claims["iat"]
+    assert pair.access.jti != pair.refresh.jti
+    assert pair.refresh.expires_at == datetime.fromtimestamp(pair.refresh.exp, tz=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_persist_escribe_redis_y_sesion_en_paralelo(jwtm):
+    issuer = TokenPairIssuer(jwtm)
+    pair = issuer.issue("7", "ATLETA", "a@test.com", "a")
+    started = []
+
+    async def store_refresh(jti, sub, exp):
+        started.append("redis")
+        await asyncio.sleep(0.05)
+        assert (jti, sub, exp) == (pair.refresh.jti, "7", pair.refresh.exp)
+
+    async def session_write():
+        started.append("db")
+        await asyncio.sleep(0.05)
+
+    with patch.object(jwtm, "store_refresh", side_effect=store_refresh):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await issuer.persist(pair, session_write())
+        elapsed = loop.time() - start
+
+    assert sorted(started) == ["db", "redis"]
+    assert elapsed < 0.09
+
+
+@pytest.mark.asyncio
+async def test_persist_propaga_el_error_tras_esperar_ambas(jwtm):
+    issuer = TokenPairIssuer(jwtm)
+    pair = issuer.issue("7", "ATLETA", "a@test.com", "a")
+    finished = []
+
+    async def session_write():
+        await asyncio.sleep(0.01)
+        finished.append("db")
+
+    store = HTTPException(status_code=401, detail="Sesión expirada")
+    with patch.object(jwtm, "store_refresh", side_effect=store):
+        with pytest.raises(HTTPException):
+            await issuer.persist(pair, session_write())
+
+    assert finished == ["db"]
@@ -0,0 +1,140 @@
+"""
+Pruebas Unitarias para el MaintenanceScheduler.
+Redis se simula con un almacén de locks en memoria compartido entre
+"workers" (instancias del scheduler).
+"""
+import asyncio
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import LockNotOwnedError, RedisError
+
+from app.core.maintenance.scheduler import (
+    MAINTENANCE_ROWS,
+    MAINTENANCE_RUNS,
+    MaintenanceScheduler,
+)
+
+
+class FakeLock:
+    def __init__(self, store: dict, name: str):
+        self.store, self.name, self.token = store, name, uuid.uuid4().hex
+
+    async def acquire(self) -> bool:
+        await asyncio.sleep(0)
+        if self.name in self.store:
+            return False
+        self.store[self.name] = self.token
+        return True
+
+    async def reacquire(self) -> bool:
+        if self.store.get(self.name) != self.token:
+            raise LockNotOwnedError("lock perdido")
+        return True
+
+
+@pytest.fixture
+def locks():
+    store: dict = {}
+    client = MagicMock()
+    client.lock.side_effect = lambda name, **kwargs: FakeLock(store, name)
+    with patch("app.core.maintenance.scheduler._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        yield store
+
+
+def _runs(job: str, result: str) -> float:
+    return MAINTENANCE_RUNS.labels(job, result)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_un_solo_worker_ejecuta_la_tarea(locks):
+    calls = []
+
+    async def job(run):
+        calls.append(run)
+        run.progress("expired", 3)
+
+    workers = [MaintenanceScheduler(poll_interval=1) for _ in range(4)]
+    for worker in workers:
+        worker.register("test_once", 3600, job)
+
+    ran = await asyncio.gather(*(worker.run_pending() for worker in workers))
+
+    assert sum(len(r) for r in ran) == 1
+    assert len(calls) == 1
+    # El lock sigue tomado hasta que venza el intervalo: la siguiente vuelta no repite
+    assert await workers[0].run_pending() == []
+    assert MAINTENANCE_ROWS.labels("test_once", "expired")._value.get() == 3
+
+
+@pytest.mark.asyncio
+async def test_sin_redis_no_se_ejecuta(locks):
+    client = MagicMock()
+    lock = MagicMock()
+    lock.acquire.side_effect = RedisError("down")
+    client.lock.return_value = lock
+    called = False
+
+    async def job(run):
+        nonlocal called
+        called = True
+
+    scheduler = MaintenanceScheduler(poll_interval=1)
+    scheduler.register("test_redis_down", 60, job)
+    with patch("app.core.maintenance.scheduler._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        assert await scheduler.run_job("test_redis_down") is False
+    assert not called
+
+
+@pytest.mark.asyncio
+async def test_lock_perdido_interrumpe_los_lotes(locks):
+    batches = 0
+
+    async def job(run):
+        nonlocal batches
+        for _ in range(10):
+            await run.checkpoint()
+            batches += 1
+            run.progress("expired", 1)
+            if batches == 2:
+                # Otro worker se queda el lock (p. ej. expiró durante una caída de Redis)
+                locks["maintenance:test_lost"] = "otro"
+
+    scheduler = MaintenanceScheduler(poll_interval=1)
+    scheduler.register("test_lost", 0, job)  # intervalo 0: renueva en cada checkpoint
+    before = _runs("test_lost", "lock_lost")
+
+    assert await scheduler.run_job("test_lost") is True
+    assert batches == 2
+    assert _runs("test_lost", "lock_lost") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_error_en_la_tarea_se_cuenta(locks):
+    async def job(run):
+        raise RuntimeError("boom")
+
+    scheduler = MaintenanceScheduler(poll_interval=1)
+    scheduler.register("test_error", 60, job)
+    before = _runs("test_error", "error")
+
+    assert await scheduler.run_job("test_error") is True
+    assert _runs("test_error", "error") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_start_y_stop(locks):
+    ran = asyncio.Event()
+
+    async def job(run):
+        ran.set()
+
+    scheduler = MaintenanceScheduler(poll_interval=60)
+    scheduler.register("test_loop", 60, job)
+    scheduler.start()
+    await asyncio.wait_for(ran.wait(), 1)
+    await scheduler.stop()
+    assert scheduler._task is None
@@ -0,0 +1,97 @@
+"""
+Pruebas Unitarias para el rate limiter distribuido.
+Redis se simula: el script GCRA es un AsyncMock y los fallos de conexión
+fuerzan el token bucket local.
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.rate_limit.limiter import (
+    LocalTokenBucket,
+    Rate,
+    RateLimiter,
+    by_email,
+    rate_limit,
+)
+
+
+def test_parse_rate():
+    assert Rate.parse("5/minute") == Rate(5, 60)
+    assert Rate.parse("3/hours") == Rate(3, 3600)
+    assert Rate.parse("10/minute").emission_ms == 6000
+    with pytest.raises(ValueError):
+        Rate.parse("0/minute")
+    with pytest.raises(ValueError):
+        Rate.parse("cinco por minuto")
+
+
+def test_token_bucket_local_rafaga_y_lru():
+    bucket = LocalTokenBucket(max_keys=2)
+    rate = Rate(2, 60)
+    assert bucket.hit("a", rate).allowed
+    assert bucket.hit("a", rate).allowed
+    denied = bucket.hit("a", rate)
+    assert not denied.allowed
+    assert 0 < denied.retry_after <= 30
+
+    bucket.hit("b", rate)
+    bucket.hit("c", rate)  # expulsa "a"
+    assert bucket.hit("a", rate).allowed
+
+
+@pytest.mark.asyncio
+async def test_usa_el_resultado_del_script_de_redis():
+    limiter = RateLimiter()
+    script = AsyncMock(return_value=[0, 0, 4500])
+    with patch.object(limiter, "_get_script", return_value=script):
+        result = await limiter.hit("login", "1.2.3.4", "5/minute")
+
+    assert (result.allowed, result.retry_after) == (False, 4.5)
+    script.assert_awaited_once_with(keys=["rl:login:1.2.3.4"], args=[12000, 5])
+
+
+@pytest.mark.asyncio
+async def test_sin_redis_degrada_al_bucket_local():
+    limiter = RateLimiter()
+    script = AsyncMock(side_effect=RedisConnectionError("refused"))
+    with patch.object(limiter, "_get_script", return_value=script):
+        results = [await limiter.hit("login", "1.2.3.4", "2/minute") for _ in range(3)]
+
+    assert [r.allowed for r in results] == [True, True, False]
+    # Redis no se reintenta hasta RATE_LIMIT_RETRY_INTERVAL
+    script.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_dependencia_responde_429_con_retry_after():
+    app = FastAPI()
+
+    @app.exception_handler(HTTPException)
+    async def handler(request, exc):
+        return JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+
+    @app.post("/login", dependencies=[Depends(rate_limit("2/minute", key_func=by_email))])
+    async def login():
+        return {"ok": True}
+
+    limiter = RateLimiter()
+    script = AsyncMock(side_effect=RedisConnectionError("refused"))
+    with patch("app.core.rate_limit.limiter._rate_limiter", limiter), \
+            patch.object(limiter, "_get_script", return_value=script):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            codes = [
+                (await client.post("/login", json={"email": "Ana@test.com"})).status_code
+                for _ in range(2)
+            ]
+            limited = await client.post("/login", json={"email": "ana@test.com"})
+            otro = await client.post("/login", json={"email": "otro@test.com"})
+
+    assert codes == [200, 200]
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert otro.status_code == 200
@@ -0,0 +1,196 @@
+"""
+Pruebas Unitarias para las trazas por petición.
+Valida los spans de cada dependencia (db, redis, argon2, http), el desglose
+por ruta en Prometheus, la propagación de `traceparent` y el formato OTLP/JSON
+del exportador de archivo, todo sin red ni servicios externos.
+"""
+import builtins
+import json
+import threading
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.core.cache.redis import TracedRedis
+from app.core.http.http_client import TracedTransport
+from app.core.jwt.hashing_pool import HashingPool
+from app.core.tracing import tracer as tracing
+from app.core.tracing.tracer import (
+    ARGON2,
+    DB,
+    DEPENDENCY_SECONDS,
+    HTTP,
+    KIND_SERVER,
+    REDIS,
+    STATUS_ERROR,
+    InMemorySpanExporter,
+    OtlpJsonFileExporter,
+    Tracer,
+    TracingMiddleware,
+    to_otlp,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    tracing.instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def _app(exporter, route):
+    app = FastAPI()
+    tracer = Tracer()
+    tracer.set_exporter(exporter)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    app.get("/items/{item_id}")(route)
+    return app
+
+
+async def _get(app, url, **kwargs):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(url, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_spans_por_dependencia_dentro_de_la_peticion(exporter, engine):
+    pool = HashingPool(max_workers=1, max_pending=4)
+    redis = TracedRedis()
+
+    async def route(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        with patch("redis.asyncio.client.Redis.execute_command", AsyncMock(return_value="v")):
+            await redis.get("clave")
+        await pool.run(lambda: "hash")
+        return {"id": item_id}
+
+    response = await _get(_app(exporter, route), "/items/3")
+    pool.shutdown()
+
+    assert response.status_code == 200
+    root, *children = exporter.spans
+    assert root.kind == KIND_SERVER
+    assert root.name == "GET /items/{item_id}"
+    assert root.attributes["http.response.status_code"] == 200
+    assert [s.dependency for s in children] == [DB, REDIS, ARGON2]
+    assert {s.trace_id for s in children} == {root.trace_id}
+    assert {s.parent_span_id for s in children} == {root.span_id}
+    assert children[0].attributes["db.statement"] == "SELECT 1"
+    assert children[1].name == "GET"
+
+    observed = DEPENDENCY_SECONDS.labels("GET", "/items/{item_id}", DB)._sum.get()
+    assert observed > 0
+
+
+@pytest.mark.asyncio
+async def test_traceparent_entrante_y_saliente(exporter):
+    async def route(item_id: int):
+        transport = TracedTransport()
+        ok = httpx.Response(200, request=httpx.Request("GET", "http://users.local/x"))
+        with patch("httpx.AsyncHTTPTransport.handle_async_request", AsyncMock(return_value=ok)) as handle:
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.get("http://users.local/api/users")
+        return {"traceparent": handle.await_args.args[0].headers["traceparent"]}
+
+    response = await _get(
+        _app(exporter, route), "/items/1",
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+
+    root, http_span = exporter.spans
+    assert root.trace_id == TRACE_ID
+    assert root.parent_span_id == PARENT_ID
+    assert http_span.dependency == HTTP
+    assert http_span.attributes["http.response.status_code"] == 200
+    # El servicio llamado recibe como padre el span http
+    assert response.json()["traceparent"] == f"00-{TRACE_ID}-{http_span.span_id}-01"
+
+
+@pytest.mark.asyncio
+async def test_span_con_error(exporter, engine):
+    async def route(item_id: int):
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("SELECT * FROM no_existe"))
+            except Exception:
+                pass
+        return {}
+
+    await _get(_app(exporter, route), "/items/1")
+
+    _, db_span = exporter.spans
+    assert db_span.status == STATUS_ERROR
+    assert db_span.attributes["error.type"] == "OperationalError"
+
+
+def test_sin_peticion_activa_no_hay_spans(engine):
+    with tracing.span(REDIS, "GET") as s:
+        pass
+    assert s is None
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert not conn.info.get("trace_spans")
+
+
+@pytest.mark.asyncio
+async def test_exportador_archivo_otlp_json(tmp_path, exporter):
+    async def route(item_id: int):
+        return {}
+
+    await _get(_app(exporter, route), "/items/1")
+    path = tmp_path / "traces.jsonl"
+    file_exporter = OtlpJsonFileExporter(str(path), service_name="svc")
+    file_exporter.export(exporter.spans)
+    file_exporter.export(exporter.spans)
+    file_exporter.shutdown()
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    payload = json.loads(lines[0])
+    assert payload == to_otlp(exporter.spans, "svc")
+    resource = payload["resourceSpans"][0]
+    assert resource["resource"]["attributes"][0] == {"key": "service.name", "value": {"stringValue": "svc"}}
+    span = resource["scopeSpans"][0]["spans"][0]
+    assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+    assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+    assert {"key": "http.response.status_code", "value": {"intValue": "200"}} in span["attributes"]
+
+
+@pytest.mark.asyncio
+async def test_exportador_archivo_escribe_fuera_del_event_loop(tmp_path, exporter):
+    """`export` solo encola: el archivo se abre una vez en el hilo escritor y `shutdown` vacía la cola."""
+    async def route(item_id: int):
+        return {}
+
+    await _get(_app(exporter, route), "/items/1")
+    path = tmp_path / "traces.jsonl"
+    real_open = builtins.open
+    opened_in = []
+
+    def tracking_open(*args, **kwargs):
+        if args and args[0] == str(path):
+            opened_in.append(threading.current_thread().name)
+        return real_open(*args, **kwargs)
+
+    file_exporter = OtlpJsonFileExporter(str(path), service_name="svc")
+    with patch("builtins.open", side_effect=tracking_open):
+        for _ in range(200):
+            file_exporter.export(exporter.spans)
+        file_exporter.shutdown()
+
+    assert opened_in == ["otlp-json-exporter"]
+    assert len(path.read_text().splitlines()) == 200
@@ -141,3 +141,91 @@ async def test_admin_update_role(client: AsyncClient, mock_admin_service):
     assert response.status_code == 200
     json_response = response.json()
     assert json_response["role"] == "ENTRENADOR"
+
+
+@pytest.mark.asyncio
+async def test_admin_export_resultados_csv(client: AsyncClient):
+    """
+    Prueba la exportación en streaming (/api/v1/admin/export/resultados-competencia).
+    Verifica formato CSV, nombre de descarga y filtro por fechas.
+    """
+    from unittest.mock import patch
+    from fastapi.responses import StreamingResponse
+    from app.main import _APP
+
+    _APP.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
+
+    async def body():
+        yield "id,external_id\n"
+
+    with patch("app.modules.admin.routers.v1.admin_routes.streaming_export") as export:
+        export.return_value = StreamingResponse(body(), media_type="text/csv; charset=utf-8")
+        response = await client.get(
+            "/api/v1/admin/export/resultados-competencia?formato=csv&desde=2026-01-01"
+        )
+
+    _APP.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.text == "id,external_id\n"
+    stmt, formato, filename = export.call_args.args
+    assert (formato, filename) == ("csv", "resultados_competencia")
+    assert "fecha_registro >=" in str(stmt)
+
+
+@pytest.mark.asyncio
+async def test_admin_export_formato_invalido(client: AsyncClient):
+    """Un formato distinto de ndjson/csv se rechaza con 422."""
+    from app.main import _APP
+
+    _APP.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
+    response = await client.get("/api/v1/admin/export/usuarios?formato=xlsx")
+    _APP.dependency_overrides = {}
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_admin_create_report_job(client: AsyncClient):
+    """Encolar un reporte responde 202 con el id del job."""
+    from unittest.mock import patch
+    from app.main import _APP
+
+    _APP.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
+    atleta_id = "12345678-1234-5678-1234-567812345678"
+    with patch("app.modules.admin.routers.v1.admin_routes._report_jobs") as jobs:
+        jobs.enqueue = AsyncMock(return_value={"id": "abc", "status": "queued", "tipo": "historial_atleta"})
+        response = await client.post(
+            "/api/v1/admin/reports", json={"tipo": "historial_atleta", "atleta_id": atleta_id}
+        )
+    _APP.dependency_overrides = {}
+
+    assert response.status_code == 202
+    assert response.json()["data"]["id"] == "abc"
+    jobs.enqueue.assert_awaited_once_with("historial_atleta", {"atleta_id": atleta_id}, "admin@example.com")
+
+
+@pytest.mark.asyncio
+async def test_admin_create_report_job_sin_parametros(client: AsyncClient):
+    """El historial de atleta sin `atleta_id` se rechaza con 422."""
+    from app.main import _APP
+
+    _APP.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
+    response = await client.post("/api/v1/admin/reports", json={"tipo": "historial_atleta"})
+    _APP.dependency_overrides = {}
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_admin_get_report_job_inexistente(client: AsyncClient):
+    from unittest.mock import patch
+    from app.main import _APP
+
+    _APP.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
+    with patch("app.modules.admin.routers.v1.admin_routes._report_jobs") as jobs:
+        jobs.get = AsyncMock(return_value=None)
+        response = await client.get("/api/v1/admin/reports/desconocido")
+    _APP.dependency_overrides = {}
+
+    assert response.status_code == 404
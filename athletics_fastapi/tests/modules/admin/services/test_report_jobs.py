@@ -0,0 +1,103 @@
+"""
+Pruebas Unitarias para los jobs de reportes PDF.
+Valida el límite de jobs pendientes, la cancelación de jobs en cola,
+la publicación del estado final y el dibujo paginado del PDF.
+"""
+import asyncio
+from concurrent.futures import Future
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.admin.services.report_jobs import CANCELLED, DONE, QUEUED, ReportJobRunner
+from app.modules.admin.services.report_renderer import USUARIOS, _PdfTable, secciones
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    client.pipeline.return_value = pipe
+    client.hgetall = AsyncMock(return_value={})
+    client.set = AsyncMock()
+    with patch("app.modules.admin.services.report_jobs._redis") as redis:
+        redis.get_client.return_value = client
+        yield client
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = ReportJobRunner(max_workers=1, max_pending=1, ttl=60, output_dir=tmp_path)
+    runner._executor = MagicMock()
+    runner._executor.submit.return_value = Future()
+    return runner
+
+
+@pytest.mark.asyncio
+async def test_enqueue_registra_el_job_y_lo_envia_al_pool(runner, redis_client, tmp_path):
+    job = await runner.enqueue(USUARIOS, {}, "admin@example.com")
+
+    assert job["status"] == QUEUED
+    assert runner.pending == 1
+    args = runner._executor.submit.call_args.args
+    assert args[1:4] == (job["id"], USUARIOS, {})
+    assert args[4] == str(tmp_path / f"{job['id']}.pdf")
+    saved = redis_client.pipeline.return_value.hset.call_args.kwargs["mapping"]
+    assert saved["status"] == QUEUED
+    assert saved["requested_by"] == "admin@example.com"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rechaza_por_encima_del_limite(runner, redis_client):
+    await runner.enqueue(USUARIOS, {}, "admin@example.com")
+
+    with pytest.raises(HTTPException) as exc:
+        await runner.enqueue(USUARIOS, {}, "admin@example.com")
+
+    assert exc.value.status_code == 429
+    assert runner._executor.submit.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_retira_un_job_en_cola(runner, redis_client):
+    job = await runner.enqueue(USUARIOS, {}, "admin@example.com")
+    redis_client.hgetall.return_value = {"status": QUEUED, "tipo": USUARIOS}
+
+    cancelled = await runner.cancel(job["id"])
+    await asyncio.gather(*runner._tasks)
+
+    assert cancelled["status"] == CANCELLED
+    assert runner.pending == 0
+    final = redis_client.pipeline.return_value.hset.call_args.kwargs["mapping"]
+    assert final["status"] == CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_watch_publica_resultado_y_url(runner, redis_client):
+    job = await runner.enqueue(USUARIOS, {}, "admin@example.com")
+    future = runner._futures[job["id"]]
+
+    future.set_result({"status": DONE, "rows": 120, "pages": 3})
+    await asyncio.gather(*runner._tasks)
+
+    final = redis_client.pipeline.return_value.hset.call_args.kwargs["mapping"]
+    assert final["status"] == DONE
+    assert final["progress"] == 100
+    assert final["url"] == f"/data/reports/{job['id']}.pdf"
+    assert runner.pending == 0
+
+
+def test_pdf_table_dibuja_una_pagina_por_lote(tmp_path):
+    path = tmp_path / "reporte.pdf"
+    seccion = secciones(USUARIOS, {})[0]
+    row = {columna: "x" * 80 for columna, _, _ in seccion.columnas}
+
+    pdf = _PdfTable(str(path), "Usuarios")
+    pdf.page(seccion, [row] * pdf.rows_per_page)
+    pdf.page(seccion, [row])
+    pdf.save()
+
+    assert pdf.pages == 2
+    assert path.read_bytes().startswith(b"%PDF")
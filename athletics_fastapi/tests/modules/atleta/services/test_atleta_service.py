@@ -439,20 +439,14 @@ async def test_get_estadisticas_success(atleta_service, mock_atleta_repo, mock_r
         atleta.id = 1
         atleta.anios_experiencia = 5
 
-        resultado1 = MagicMock()
-        resultado1.posicion_final = "primero"
-        resultado1.puesto_obtenido = 1
-
-        resultado2 = MagicMock()
-        resultado2.posicion_final = "segundo"
-        resultado2.puesto_obtenido = 2
-
-        resultado3 = MagicMock()
-        resultado3.posicion_final = "tercero"
-        resultado3.puesto_obtenido = 3
-
         mock_atleta_repo.get_by_user_id.return_value = atleta
-        mock_resultado_repo.get_by_atleta.return_value = [resultado1, resultado2, resultado3]
+        mock_resultado_repo.get_resumen_atleta.return_value = {
+            "total_competencias": 3,
+            "medallas": {"oro": 1, "plata": 1, "bronce": 1},
+        }
+        mock_resultado_repo.get_mejores_marcas.return_value = [
+            {"prueba": "100m", "tipo_medicion": "TIEMPO", "mejor_marca": 10.8, "unidad_medida": "s", "intentos": 3}
+        ]
 
         # Act
         result = await atleta_service.get_estadisticas(user_id=10)
@@ -462,7 +456,10 @@ async def test_get_estadisticas_success(atleta_service, mock_atleta_repo, mock_r
         assert result["medallas"]["oro"] == 1
         assert result["medallas"]["plata"] == 1
         assert result["medallas"]["bronce"] == 1
+        assert result["mejores_marcas"][0]["mejor_marca"] == 10.8
         assert result["experiencia"] == 5
+        mock_resultado_repo.get_resumen_atleta.assert_awaited_once_with(10)
+        mock_resultado_repo.get_by_atleta.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -474,7 +471,11 @@ async def test_get_estadisticas_empty(atleta_service, mock_atleta_repo, mock_res
         atleta.anios_experiencia = 0
 
         mock_atleta_repo.get_by_user_id.return_value = atleta
-        mock_resultado_repo.get_by_atleta.return_value = []
+        mock_resultado_repo.get_resumen_atleta.return_value = {
+            "total_competencias": 0,
+            "medallas": {"oro": 0, "plata": 0, "bronce": 0},
+        }
+        mock_resultado_repo.get_mejores_marcas.return_value = []
 
         # Act
         result = await atleta_service.get_estadisticas(user_id=10)
@@ -2,10 +2,12 @@
 Pruebas Unitarias para SessionsRepository (Auth).
 Valida la gestión de sesiones (crear, revocar, limpiar).
 """
+import asyncio
 import pytest
 import uuid
 from datetime import datetime, timedelta, UTC
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
 from app.modules.auth.repositories.sessions_repository import SessionsRepository
 from app.modules.auth.domain.models.auth_users_sessions_model import AuthUsersSessionsModel
 
@@ -54,24 +56,114 @@ async def test_get_session_by_refresh_jti(repo, mock_session):
 
 @pytest.mark.asyncio
 async def test_revoke_session_by_refresh_jti(repo, mock_session):
-    """Prueba revocar sesión."""
+    """Prueba revocar sesión: sin commit propio; la caché se invalida tras `commit()`."""
     mock_result = MagicMock()
-    mock_result.rowcount = 1
+    mock_result.scalars.return_value.all.return_value = ["acc_123"]
     mock_session.execute.return_value = mock_result
 
-    result = await repo.revoke_session_by_refresh_jti("ref_123")
+    with patch(
+        "app.modules.auth.repositories.sessions_repository._principal_cache"
+    ) as cache:
+        cache.invalidate_jti = AsyncMock()
+        result = await repo.revoke_session_by_refresh_jti("ref_123")
+
+        assert result is True
+        mock_session.commit.assert_not_awaited()
+        cache.invalidate_jti.assert_not_awaited()
+
+        await repo.commit()
 
-    assert result is True
     mock_session.commit.assert_awaited_once()
+    cache.invalidate_jti.assert_awaited_once_with("acc_123")
 
 @pytest.mark.asyncio
 async def test_revoke_all_user_sessions(repo, mock_session):
     """Prueba revocar todas las sesiones de un usuario."""
     mock_result = MagicMock()
-    mock_result.rowcount = 5
+    mock_result.scalars.return_value.all.return_value = [1, 2, 3, 4, 5]
     mock_session.execute.return_value = mock_result
 
     count = await repo.revoke_all_user_sessions(uuid.uuid4())
 
     assert count == 5
-    mock_session.commit.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_create_or_update_session_es_un_upsert(repo, mock_session):
+    """El login es una sola sentencia INSERT ... ON CONFLICT sobre la sesión activa."""
+    mock_result = MagicMock()
+    mock_session.execute.return_value = mock_result
+
+    await repo.create_or_update_session(7, "acc", "ref", datetime.now(UTC))
+
+    mock_session.execute.assert_awaited_once()
+    sql = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO auth_users_sessions")
+    assert "ON CONFLICT (user_id) WHERE status DO UPDATE SET" in sql
+    assert "RETURNING" in sql
+    mock_session.commit.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_logins_concurrentes_del_mismo_usuario(repo, mock_session):
+    """
+    Muchos logins simultáneos de un usuario: cada uno es un único viaje a la
+    base de datos (sin SELECT previo que pueda quedar obsoleto) y todos apuntan
+    a la misma fila activa vía el índice único parcial.
+    """
+    logins = 50
+    in_flight = 0
+    max_in_flight = 0
+
+    async def execute(stmt):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return MagicMock()
+
+    mock_session.execute.side_effect = execute
+    expires = datetime.now(UTC) + timedelta(days=7)
+
+    await asyncio.gather(*(
+        repo.create_or_update_session(7, f"acc_{i}", f"ref_{i}", expires)
+        for i in range(logins)
+    ))
+
+    assert max_in_flight == logins
+    statements = [call.args[0] for call in mock_session.execute.await_args_list]
+    assert len(statements) == logins
+    for stmt in statements:
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("INSERT") and "ON CONFLICT (user_id) WHERE status" in sql
+    mock_session.add.assert_not_called()
+
+def test_indice_unico_de_sesion_activa():
+    """El destino del ON CONFLICT existe en el modelo: único y parcial sobre `status`."""
+    indexes = {i.name: i for i in AuthUsersSessionsModel.__table__.indexes}
+    active = indexes["uq_auth_users_sessions_user_active"]
+    assert active.unique and [c.name for c in active.columns] == ["user_id"]
+    assert str(active.dialect_options["postgresql"]["where"]) == "status"
+    composite = indexes["ix_auth_users_sessions_user_status_created"]
+    assert [c.name for c in composite.columns] == ["user_id", "status", "created_at"]
+
+@pytest.mark.asyncio
+async def test_lotes_de_mantenimiento_acotados(repo, mock_session):
+    """Expirar/purgar usan subconsultas con LIMIT y SKIP LOCKED; archivar es una sola sentencia."""
+    mock_session.execute.return_value = MagicMock(rowcount=10)
+    now = datetime.now(UTC)
+
+    assert await repo.expire_sessions_batch(now, 10) == 10
+    sql = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE auth_users_sessions SET status")
+    assert "LIMIT" in sql and "FOR UPDATE SKIP LOCKED" in sql
+
+    await repo.purge_inactive_sessions_batch(now, 10)
+    sql = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM auth_users_sessions")
+
+    await repo.purge_inactive_sessions_batch(now, 10, archive=True)
+    sql = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH moved AS")
+    assert "INSERT INTO auth_users_sessions_archive" in sql
+    mock_session.commit.assert_not_awaited()
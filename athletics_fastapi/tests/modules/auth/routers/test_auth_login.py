@@ -9,6 +9,7 @@ from app.main import _APP
 from app.modules.auth.dependencies import (
     get_users_repo, get_password_hasher, get_jwt_manager, get_sessions_repo
 )
+from app.core.jwt.jwt import IssuedToken
 from uuid import uuid4
 
 # --------------------------
@@ -31,7 +32,7 @@ def mock_sessions_repo():
 @pytest.fixture
 def mock_hasher():
     hasher = MagicMock()
-    hasher.verify.return_value = True # Default pass
+    hasher.verify_async = AsyncMock(return_value=True) # Default pass
     return hasher
 
 @pytest.fixture
@@ -39,6 +40,8 @@ def mock_jwtm():
     jwtm = MagicMock()
     jwtm.create_access_token.return_value = "access_token_mock"
     jwtm.create_refresh_token.return_value = "refresh_token_mock"
+    jwtm.issue_access_token.return_value = IssuedToken("access_token_mock", {"jti": "access_jti", "exp": 1234567890})
+    jwtm.issue_refresh_token.return_value = IssuedToken("refresh_token_mock", {"sub": "1", "jti": "refresh_jti", "exp": 1234567890})
     jwtm.decode.return_value = {"jti": "mock_jti", "exp": 1234567890}
     jwtm.store_refresh = AsyncMock()
     return jwtm
@@ -80,7 +83,7 @@ async def test_tc_l01_login_exitoso(client: AsyncClient, override_deps, mock_rep
     """TC-L01: Login Exitoso."""
     user = _create_mock_user()
     mock_repo.get_by_email.return_value = user
-    mock_hasher.verify.return_value = True
+    mock_hasher.verify_async.return_value = True
 
     payload = {"username": "juan@test.com", "password": "Abc123$%"}
     response = await client.post("/api/v1/auth/login", json=payload)
@@ -99,7 +102,7 @@ async def test_tc_l02_password_incorrecto(client: AsyncClient, override_deps, mo
     """TC-L02: Password incorrecto."""
     user = _create_mock_user()
     mock_repo.get_by_email.return_value = user
-    mock_hasher.verify.return_value = False # Password incorrecto
+    mock_hasher.verify_async.return_value = False # Password incorrecto
 
     payload = {"username": "juan@test.com", "password": "WrongPassword"}
     response = await client.post("/api/v1/auth/login", json=payload)
@@ -129,7 +132,7 @@ async def test_tc_l04_usuario_inactivo(client: AsyncClient, override_deps, mock_
     """TC-L04: Usuario inactivo."""
     user = _create_mock_user(active=False)
     mock_repo.get_by_email.return_value = user
-    mock_hasher.verify.return_value = True
+    mock_hasher.verify_async.return_value = True
 
     payload = {"username": "inactive@test.com", "password": "Abc123$%"}
     response = await client.post("/api/v1/auth/login", json=payload)
@@ -145,7 +148,7 @@ async def test_tc_l05_2fa_requerido(client: AsyncClient, override_deps, mock_rep
     """TC-L05: 2FA Requerido."""
     user = _create_mock_user(two_factor=True)
     mock_repo.get_by_email.return_value = user
-    mock_hasher.verify.return_value = True
+    mock_hasher.verify_async.return_value = True
 
     payload = {"username": "2fa@test.com", "password": "Abc123$%"}
     response = await client.post("/api/v1/auth/login", json=payload)
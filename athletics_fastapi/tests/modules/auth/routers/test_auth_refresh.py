@@ -9,6 +9,7 @@ from app.main import _APP
 from app.modules.auth.dependencies import (
     get_sessions_repo, get_jwt_manager
 )
+from app.core.jwt.jwt import IssuedToken
 
 # --------------------------
 # FIXTURES Y MOCKS
@@ -25,6 +26,8 @@ def mock_jwtm():
     jwtm = MagicMock()
     jwtm.create_access_token.return_value = "new_access_token"
     jwtm.create_refresh_token.return_value = "new_refresh_token"
+    jwtm.issue_access_token.return_value = IssuedToken("new_access_token", {"jti": "new_access_jti", "exp": 1234567890})
+    jwtm.issue_refresh_token.return_value = IssuedToken("new_refresh_token", {"sub": "user_id", "jti": "new_refresh_jti", "exp": 1234567890})
     jwtm.decode.return_value = {
         "jti": "old_jti", 
         "sub": "user_id", 
@@ -32,7 +32,7 @@ def mock_repo():
 @pytest.fixture
 def mock_hasher():
     hasher = MagicMock()
-    hasher.hash.return_value = "hashed_secret"
+    hasher.hash_async = AsyncMock(return_value="hashed_secret")
     return hasher
 
 @pytest.fixture
@@ -38,14 +38,14 @@ def mock_twofa_service():
     service.generate_secret = MagicMock(return_value="JBSWY3DPEHPK3PXP")
     service.generate_qr_code = MagicMock(return_value="data:image/png;base64,...")
     service.get_backup_codes = MagicMock(return_value=["ABCD-1234", "EFGH-5678", "IJKL-9012", "MNOP-3456", "QRST-7890"])
-    service.hash_backup_codes = MagicMock(return_value='["hashed1", "hashed2"]')
+    service.hash_backup_codes_async = AsyncMock(return_value='["hashed1", "hashed2"]')
     service.verify_totp_code = MagicMock(return_value=True)
     return service
 
 @pytest.fixture
 def mock_hasher():
     hasher = MagicMock()
-    hasher.verify = MagicMock(return_value=True) # Password verify by default
+    hasher.verify_async = AsyncMock(return_value=True) # Password verify by default
     return hasher
 
 @pytest.fixture
@@ -178,7 +178,7 @@ async def test_tc_2fa_06_disable_success(client: AsyncClient, override_deps, moc
     _, user, twofa_service, _ = override_deps
     user.two_factor_enabled = True
     user.totp_secret = "JBSWY3DPEHPK3PXP"
-    mock_hasher.verify.return_value = True
+    mock_hasher.verify_async.return_value = True
     twofa_service.verify_totp_code.return_value = True
     
     payload = {"password": "Abc123!", "code": "123456"}
@@ -201,7 +201,7 @@ async def test_tc_2fa_07_disable_wrong_password(client: AsyncClient, override_de
     _, user, _, _ = override_deps
     user.two_factor_enabled = True
     user.totp_secret = "JBSWY3DPEHPK3PXP"
-    mock_hasher.verify.return_value = False # Wrong password
+    mock_hasher.verify_async.return_value = False # Wrong password
     
     payload = {"password": "WrongPass", "code": "123456"}
     response = await client.post("/api/v1/auth/2fa/disable", json=payload)
@@ -223,7 +223,7 @@ async def test_tc_2fa_08_disable_wrong_code(client: AsyncClient, override_deps,
     _, user, twofa_service, _ = override_deps
     user.two_factor_enabled = True
     user.totp_secret = "JBSWY3DPEHPK3PXP"
-    mock_hasher.verify.return_value = True
+    mock_hasher.verify_async.return_value = True
     twofa_service.verify_totp_code.return_value = False
     
     payload = {"password": "Abc123!", "code": "999999"}
@@ -0,0 +1,88 @@
+"""
+Pruebas Unitarias para el mantenimiento de sesiones por lotes.
+La base de datos se simula: cada lote abre una sesión (AsyncMock) propia.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.config.enviroment import _SETTINGS
+from app.core.maintenance.scheduler import MaintenanceJob, MaintenanceRun
+from app.modules.auth.services import session_maintenance_service
+from app.modules.auth.services.session_maintenance_service import cleanup_sessions
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setattr(_SETTINGS, "session_cleanup_batch_size", 100)
+    monkeypatch.setattr(_SETTINGS, "session_cleanup_batch_pause", 0)
+    monkeypatch.setattr(_SETTINGS, "session_retention_days", 30)
+    monkeypatch.setattr(_SETTINGS, "session_retention_archive", False)
+    return _SETTINGS
+
+
+@pytest.fixture
+def sessions():
+    """Sesiones abiertas (una por lote)."""
+    opened = []
+
+    def factory():
+        session = AsyncMock()
+        session.__aenter__.return_value = session
+        opened.append(session)
+        return session
+
+    db = MagicMock()
+    db.get_session_factory.return_value = factory
+    with patch.object(session_maintenance_service, "_db", db):
+        yield opened
+
+
+def _run() -> MaintenanceRun:
+    run = MaintenanceRun(MaintenanceJob("sessions_cleanup_test", 3600, cleanup_sessions), lock=MagicMock())
+    run.checkpoint = AsyncMock()
+    return run
+
+
+def _repo(expired: list[int], purged: list[int]):
+    repo = MagicMock()
+    repo.expire_sessions_batch = AsyncMock(side_effect=expired)
+    repo.purge_inactive_sessions_batch = AsyncMock(side_effect=purged)
+    repo.commit = AsyncMock()
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_procesa_por_lotes_hasta_un_lote_incompleto(settings, sessions):
+    repo = _repo(expired=[100, 100, 7], purged=[100, 0])
+    run = _run()
+    with patch.object(session_maintenance_service, "SessionsRepository", return_value=repo):
+        await cleanup_sessions(run)
+
+    assert run.rows == {"expired": 207, "deleted": 100}
+    assert repo.expire_sessions_batch.await_count == 3
+    assert repo.purge_inactive_sessions_batch.await_count == 2
+    # Una transacción (y sesión) por lote, con checkpoint del lock antes de cada una
+    assert repo.commit.await_count == 5
+    assert len(sessions) == 5
+    assert run.checkpoint.await_count == 5
+    # Todos los lotes usan el mismo corte
+    nows = {call.args[0] for call in repo.expire_sessions_batch.await_args_list}
+    assert len(nows) == 1 and all(call.args[1] == 100 for call in repo.expire_sessions_batch.await_args_list)
+
+
+@pytest.mark.asyncio
+async def test_archivo_y_retencion_desactivada(settings, sessions):
+    settings.session_retention_archive = True
+    repo = _repo(expired=[0], purged=[3])
+    run = _run()
+    with patch.object(session_maintenance_service, "SessionsRepository", return_value=repo):
+        await cleanup_sessions(run)
+    assert run.rows == {"expired": 0, "archived": 3}
+    assert repo.purge_inactive_sessions_batch.await_args.kwargs == {"archive": True}
+
+    settings.session_retention_days = 0
+    repo = _repo(expired=[0], purged=[])
+    with patch.object(session_maintenance_service, "SessionsRepository", return_value=repo):
+        await cleanup_sessions(_run())
+    repo.purge_inactive_sessions_batch.assert_not_awaited()
@@ -0,0 +1,122 @@
+"""
+Pruebas Unitarias para la caché versionada de baremos.
+Valida la búsqueda por rango de edad, el read-through y la invalidación por versión.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.modules.competencia.repositories.baremo_cache import (
+    BaremoCache,
+    BaremoIndex,
+    CachedBaremo,
+    CachedItemBaremo,
+)
+
+
+def _baremo(id, edad_min, edad_max):
+    return CachedBaremo(id, edad_min, edad_max, (CachedItemBaremo("A", 0.0, 10.0),))
+
+
+@pytest.fixture
+def redis_client():
+    """Redis en memoria mínimo (get/setex/incr) para la caché."""
+    store = {}
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=lambda key: store.get(key))
+    client.setex = AsyncMock(side_effect=lambda key, ttl, value: store.__setitem__(key, value))
+
+    async def incr(key):
+        store[key] = int(store.get(key, 0)) + 1
+        return store[key]
+
+    client.incr = AsyncMock(side_effect=incr)
+    with patch("app.modules.competencia.repositories.baremo_cache._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        yield client
+
+
+def test_index_finds_age_range():
+    """La búsqueda binaria devuelve el baremo cuyo rango contiene la edad."""
+    index = BaremoIndex([_baremo(3, 30, 39), _baremo(1, 10, 17), _baremo(2, 18, 29)])
+
+    assert index.find(10).id == 1
+    assert index.find(18).id == 2
+    assert index.find(39).id == 3
+    assert index.find(9) is None
+    assert index.find(40) is None
+
+
+def test_index_with_gaps_and_overlaps():
+    """Con huecos no hay baremo; con solapes gana el de menor edad_min."""
+    gaps = BaremoIndex([_baremo(1, 10, 12), _baremo(2, 20, 25)])
+    assert gaps.find(15) is None
+
+    overlapping = BaremoIndex([_baremo(1, 10, 30), _baremo(2, 15, 20)])
+    assert overlapping.find(17).id == 1
+    assert overlapping.find(30).id == 1
+
+
+def test_index_json_roundtrip():
+    index = BaremoIndex([_baremo(1, 10, 17)])
+    restored = BaremoIndex.from_json(index.to_json())
+
+    assert restored.find(12)[:4] == index.find(12)[:4]
+
+
+@pytest.mark.asyncio
+async def test_read_through_loads_once(redis_client):
+    """Tras la primera carga las búsquedas no vuelven a llamar al loader."""
+    cache = BaremoCache(ttl=60, version_check_interval=60)
+    loader = AsyncMock(return_value=[_baremo(1, 10, 17)])
+
+    for _ in range(5):
+        index = await cache.get_index(1, "M", loader)
+        assert index.find(12).id == 1
+
+    loader.assert_awaited_once()
+    redis_client.setex.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_other_worker_reads_from_redis(redis_client):
+    """Un segundo proceso reutiliza el índice guardado en Redis."""
+    await BaremoCache(ttl=60).get_index(1, "M", AsyncMock(return_value=[_baremo(1, 10, 17)]))
+
+    loader = AsyncMock()
+    index = await BaremoCache(ttl=60).get_index(1, "M", loader)
+
+    assert index.find(12).id == 1
+    loader.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_version_for_all_workers(redis_client):
+    """Una invalidación en un proceso obliga a recargar en los demás."""
+    writer = BaremoCache(ttl=60, version_check_interval=0)
+    reader = BaremoCache(ttl=60, version_check_interval=0)
+    await reader.get_index(1, "M", AsyncMock(return_value=[_baremo(1, 10, 17)]))
+
+    await writer.invalidate()
+
+    loader = AsyncMock(return_value=[_baremo(2, 10, 17)])
+    index = await reader.get_index(1, "M", loader)
+    assert index.find(12).id == 2
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_without_redis_always_uses_loader():
+    """Si Redis no responde la caché no retiene datos posiblemente obsoletos."""
+    client = MagicMock()
+    client.get = AsyncMock(side_effect=RedisError("down"))
+    with patch("app.modules.competencia.repositories.baremo_cache._redis") as redis_singleton:
+        redis_singleton.get_client.return_value = client
+        cache = BaremoCache(ttl=60, version_check_interval=0)
+        loader = AsyncMock(return_value=[_baremo(1, 10, 17)])
+
+        await cache.get_index(1, "M", loader)
+        await cache.get_index(1, "M", loader)
+
+    assert loader.await_count == 2
@@ -146,3 +146,36 @@ async def test_update_baremo_ok(db):
     baremo = Baremo(estado=True)
     
 
+
+
+# -----------------------------------
+# find_by_context()
+# -----------------------------------
+@pytest.mark.asyncio
+async def test_find_by_context_uses_age_index(db):
+    """
+    Verifica que se carguen los baremos de la prueba/sexo y se elija por rango de edad.
+    """
+    from app.modules.competencia.domain.models.item_baremo_model import ItemBaremo
+    from app.modules.competencia.repositories.baremo_cache import BaremoCache
+    from unittest.mock import patch
+
+    repo = BaremoRepository(db)
+    baremos = [
+        Baremo(id=1, edad_min=10, edad_max=17, items=[ItemBaremo(clasificacion="A", marca_minima=0, marca_maxima=5)]),
+        Baremo(id=2, edad_min=18, edad_max=30, items=[]),
+    ]
+    db.execute.return_value = MagicMock(
+        scalars=lambda: MagicMock(all=lambda: baremos)
+    )
+
+    with patch(
+        "app.modules.competencia.repositories.baremo_repository._baremo_cache",
+        BaremoCache(enabled=False),
+    ):
+        result = await repo.find_by_context(1, "M", 12)
+        sin_baremo = await repo.find_by_context(1, "M", 40)
+
+    assert result.id == 1
+    assert result.items[0].clasificacion == "A"
+    assert sin_baremo is None
@@ -45,3 +45,73 @@ async def test_count(repo, mock_session):
     
     result = await repo.count()
     assert result == 10
+
+
+# -----------------------------------
+# Resumen por atleta (atleta_resumen)
+# -----------------------------------
+def test_clasificar_medalla():
+    from app.modules.competencia.repositories.atleta_resumen_repository import clasificar_medalla
+
+    assert clasificar_medalla("Primero", None) == "oro"
+    assert clasificar_medalla("participante", 2) == "plata"
+    assert clasificar_medalla("tercero", None) == "bronce"
+    assert clasificar_medalla("participante", 4) is None
+
+
+@pytest.mark.asyncio
+async def test_create_suma_al_resumen(repo):
+    repo.resumen.apply_delta = AsyncMock()
+    model = ResultadoCompetencia(atleta_id=5, posicion_final="primero", puesto_obtenido=1, estado=True)
+
+    await repo.create(model)
+
+    repo.resumen.apply_delta.assert_awaited_once_with(
+        5, {"total_competencias": 1, "oro": 1, "plata": 0, "bronce": 0}
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_aplica_diferencia_al_resumen(repo):
+    from sqlalchemy.orm import make_transient_to_detached
+
+    repo.resumen.apply_delta = AsyncMock()
+    model = ResultadoCompetencia(id=1, atleta_id=5, posicion_final="segundo", puesto_obtenido=2, estado=True)
+    make_transient_to_detached(model)
+
+    model.posicion_final = "primero"
+    model.puesto_obtenido = 1
+    await repo.update(model)
+
+    repo.resumen.apply_delta.assert_awaited_once_with(
+        5, {"total_competencias": 0, "oro": 1, "plata": -1, "bronce": 0}
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_resta_del_resumen(repo):
+    repo.resumen.apply_delta = AsyncMock()
+    repo.get_by_id = AsyncMock(return_value=ResultadoCompetencia(
+        id=1, atleta_id=5, posicion_final="tercero", puesto_obtenido=3, estado=True
+    ))
+
+    assert await repo.delete(1) is True
+
+    repo.resumen.apply_delta.assert_awaited_once_with(
+        5, {"total_competencias": -1, "oro": 0, "plata": 0, "bronce": -1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_resumen_atleta_lee_una_fila(repo):
+    from app.modules.competencia.domain.models.atleta_resumen_model import AtletaResumen
+
+    repo.resumen.get = AsyncMock(return_value=AtletaResumen(
+        atleta_id=5, total_competencias=4, oro=2, plata=1, bronce=0
+    ))
+    repo.resumen.rebuild = AsyncMock()
+
+    result = await repo.get_resumen_atleta(5)
+
+    assert result == {"total_competencias": 4, "medallas": {"oro": 2, "plata": 1, "bronce": 0}}
+    repo.resumen.rebuild.assert_not_awaited()
@@ -9,6 +9,7 @@ from unittest.mock import MagicMock
 from uuid import uuid4
 from datetime import datetime
 
+from app.core.db.pagination import Page
 from app.modules.competencia.dependencies import get_competencia_service
 from app.modules.competencia.services.competencia_service import CompetenciaService
 from app.modules.auth.dependencies import get_current_user
@@ -47,6 +48,9 @@ class FakeCompetenciaService:
     async def get_all(self, *args, **kwargs):
         return [self.return_value] if self.return_value else []
 
+    async def get_page(self, *args, **kwargs):
+        return Page(items=[self.return_value] if self.return_value else [], next_cursor="c2", limit=1)
+
 FAKE_SERVICE_INSTANCE = None
 
 @pytest.fixture
@@ -167,3 +171,35 @@ async def test_delete_competencia(client: AsyncClient, mock_competencia_service)
     print(f"DEBUG_TEST: Response text: {response.text}", file=sys.stderr)
     
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_competencias_devuelve_cursor(client: AsyncClient):
+    """El listado incluye `next_cursor` junto a los items."""
+    from app.main import _APP
+
+    mock_response = MockORM(
+        id=1,
+        external_id=uuid4(),
+        nombre="Competencia Test",
+        fecha=datetime.now().date(),
+        lugar="Estadio",
+        descripcion="Desc",
+        organizador="Org",
+        estado=True,
+        entrenador_id=1,
+        fecha_creacion=datetime.now(),
+        fecha_actualizacion=None
+    )
+    fake = FakeCompetenciaService(return_value=mock_response)
+    _APP.dependency_overrides[get_competencia_service] = lambda: fake
+    _APP.dependency_overrides[get_current_user] = override_get_current_entrenador
+
+    response = await client.get("/api/v1/competencia/competencias?limit=1")
+    _APP.dependency_overrides = {}
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert len(data["items"]) == 1
+    assert data["next_cursor"] == "c2"
+    assert data["limit"] == 1
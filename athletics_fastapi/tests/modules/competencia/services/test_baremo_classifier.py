@@ -0,0 +1,76 @@
+"""
+Pruebas Unitarias para el clasificador compilado de baremos.
+Valida la búsqueda binaria, la clasificación vectorizada y la detección de solapes y huecos.
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.competencia.services.baremo_classifier import (
+    SIN_CLASIFICACION,
+    BaremoClassifier,
+    get_classifier,
+)
+
+
+def _item(clasificacion, minima, maxima):
+    return SimpleNamespace(clasificacion=clasificacion, marca_minima=minima, marca_maxima=maxima)
+
+
+@pytest.fixture
+def classifier():
+    # Desordenados a propósito: el clasificador los ordena por marca_minima
+    return BaremoClassifier([
+        _item("REGULAR", 12.1, 13.0),
+        _item("EXCELENTE", 10.0, 11.0),
+        _item("BUENO", 11.1, 12.0),
+    ])
+
+
+def test_classify_binary_search(classifier):
+    assert classifier.classify(10.0) == "EXCELENTE"
+    assert classifier.classify(11.0) == "EXCELENTE"
+    assert classifier.classify(11.5) == "BUENO"
+    assert classifier.classify(13.0) == "REGULAR"
+    assert classifier.classify(9.9) == SIN_CLASIFICACION
+    assert classifier.classify(11.05) == SIN_CLASIFICACION  # hueco
+    assert classifier.classify(15.0) == SIN_CLASIFICACION
+
+
+def test_classify_many_matches_classify(classifier):
+    marks = [9.9, 10.0, 10.5, 11.0, 11.05, 11.1, 12.05, 12.1, 13.0, 13.1]
+    assert classifier.classify_many(marks) == [classifier.classify(m) for m in marks]
+
+
+def test_shared_boundary_goes_to_lower_range():
+    classifier = BaremoClassifier([_item("B", 10, 20), _item("A", 0, 10)])
+    assert classifier.classify(10) == "A"
+    assert classifier.classify_many([10]) == ["A"]
+
+
+def test_validate_reports_gaps(classifier):
+    assert classifier.validate() == [(11.0, 11.1), (12.0, 12.1)]
+
+
+def test_validate_rejects_overlaps_and_inverted_ranges():
+    with pytest.raises(HTTPException) as exc:
+        BaremoClassifier([_item("A", 0, 10), _item("B", 5, 15)]).validate()
+    assert exc.value.status_code == 400
+    assert "solapan" in exc.value.detail
+
+    with pytest.raises(HTTPException):
+        BaremoClassifier([_item("A", 10, 0)]).validate()
+
+
+def test_legacy_overlapping_baremo_still_classifies():
+    """Baremos guardados antes de la validación: gana el primer rango por marca_minima."""
+    classifier = BaremoClassifier([_item("B", 5, 8), _item("A", 0, 10)])
+    assert classifier.classify(6) == "A"
+    assert classifier.classify_many([6, 9, 11]) == ["A", "A", SIN_CLASIFICACION]
+
+
+def test_empty_baremo():
+    classifier = get_classifier(SimpleNamespace(items=[]))
+    assert classifier.classify(1.0) == SIN_CLASIFICACION
+    assert classifier.classify_many([1.0, 2.0]) == [SIN_CLASIFICACION, SIN_CLASIFICACION]
@@ -112,3 +112,31 @@ async def test_update_baremo_not_found():
         await service.update(uuid4(), BaremoUpdate(valor_baremo=10))
 
     assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_baremo_rangos_solapados():
+    """
+    Verifica que se rechace un baremo cuyos rangos de marcas se solapan.
+    """
+    baremo_repo = AsyncMock()
+    prueba_repo = AsyncMock()
+    prueba_repo.get_by_external_id.return_value = MagicMock(id=1)
+    service = BaremoService(baremo_repo, prueba_repo)
+
+    data = BaremoCreate(
+        sexo=Sexo.M,
+        edad_min=18,
+        edad_max=25,
+        prueba_id=uuid4(),
+        items=[
+            ItemBaremoCreate(clasificacion="A", marca_minima=10.0, marca_maxima=12.0),
+            ItemBaremoCreate(clasificacion="B", marca_minima=11.0, marca_maxima=14.0),
+        ]
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await service.create(data)
+
+    assert exc.value.status_code == 400
+    baremo_repo.create.assert_not_awaited()
@@ -9,6 +9,7 @@ from app.modules.competencia.services.resultado_prueba_service import ResultadoP
 from app.modules.competencia.domain.schemas.resultado_prueba_schema import (
     ResultadoPruebaCreate,
     ResultadoPruebaUpdate,
+    ResultadoPruebaLoteCreate,
 )
 from app.modules.competencia.domain.models.resultado_prueba_model import ResultadoPrueba
 from app.modules.competencia.domain.models.prueba_model import Prueba
@@ -310,3 +311,75 @@ class TestResultadoPruebaServiceUpdate:
         # Assert
         assert math.isclose(result.marca_obtenida, 11.0, rel_tol=1e-9)
         mock_repos["repo"].update.assert_called_once()
+
+
+class TestResultadoPruebaServiceCreateMany:
+    """Tests para la carga masiva (create_many)"""
+
+    @staticmethod
+    def _ctx(atleta_id=None, sexo="M", fecha_nacimiento=date(2000, 1, 1), user_id=1):
+        return MagicMock(
+            user_id=user_id,
+            user_external_id=uuid4(),
+            first_name="Ana",
+            last_name="Ruiz",
+            sexo=sexo,
+            fecha_nacimiento=fecha_nacimiento,
+            atleta_id=atleta_id,
+            atleta_external_id=uuid4() if atleta_id else None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_many_reports_row_errors_without_aborting(
+        self, service, mock_repos, mock_prueba, mock_baremo
+    ):
+        """Las filas válidas se insertan en un solo INSERT y las inválidas se reportan"""
+        con_atleta = self._ctx(atleta_id=7, user_id=1)
+        sin_atleta = self._ctx(atleta_id=None, user_id=2)
+        sin_sexo = self._ctx(atleta_id=9, sexo=None, user_id=3)
+        desconocido = uuid4()
+
+        mock_repos["prueba_repo"].get_by_external_id.return_value = mock_prueba
+        mock_repos["atleta_repo"].resolve_by_external_ids = AsyncMock(
+            return_value=[con_atleta, sin_atleta, sin_sexo]
+        )
+        mock_repos["atleta_repo"].create_many_for_users = AsyncMock(return_value={2: 8})
+        mock_repos["baremo_repo"].find_by_context.return_value = mock_baremo
+
+        data = ResultadoPruebaLoteCreate(
+            prueba_id=mock_prueba.external_id,
+            resultados=[
+                {"atleta_id": con_atleta.atleta_external_id, "marca_obtenida": 10.5, "fecha": date.today()},
+                {"atleta_id": desconocido, "marca_obtenida": 10.5, "fecha": date.today()},
+                {"atleta_id": sin_atleta.user_external_id, "marca_obtenida": 11.5, "fecha": date.today()},
+                {"atleta_id": sin_sexo.atleta_external_id, "marca_obtenida": 11.5, "fecha": date.today()},
+            ],
+        )
+
+        result = await service.create_many(data)
+
+        assert [c.indice for c in result.creados] == [0, 2]
+        assert [c.clasificacion_final for c in result.creados] == ["EXCELENTE", "BUENO"]
+        assert [e.indice for e in result.errores] == [1, 3]
+
+        mock_repos["atleta_repo"].resolve_by_external_ids.assert_awaited_once()
+        mock_repos["atleta_repo"].create_many_for_users.assert_awaited_once_with([2])
+        rows = mock_repos["repo"].create_many.await_args.args[0]
+        assert [r["atleta_id"] for r in rows] == [7, 8]
+        assert rows[0]["baremo_id"] == mock_baremo.id
+        mock_repos["repo"].create_many.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_create_many_prueba_not_found(self, service, mock_repos):
+        """Sin prueba no se procesa el lote"""
+        mock_repos["prueba_repo"].get_by_external_id.return_value = None
+        data = ResultadoPruebaLoteCreate(
+            prueba_id=uuid4(),
+            resultados=[{"atleta_id": uuid4(), "marca_obtenida": 1.0, "fecha": date.today()}],
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await service.create_many(data)
+
+        assert exc_info.value.status_code == 404
+        mock_repos["repo"].create_many.assert_not_awaited()
@@ -0,0 +1,52 @@
+"""
+Pruebas Unitarias para AsistenciaRepository.
+Valida que crear la asistencia de una inscripción y fecha sea un upsert sobre
+`uq_asistencia_registro_fecha` (sin IntegrityError por duplicados).
+"""
+from datetime import date, datetime, time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.entrenador.repositories.asistencia_repository import AsistenciaRepository
+
+
+@pytest.fixture
+def session():
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    return session
+
+
+def _sql(session) -> str:
+    stmt = session.execute.call_args.args[0]
+    return str(stmt.element.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_upsert_on_conflict_actualiza_solo_las_columnas_indicadas(session):
+    repo = AsistenciaRepository(session)
+
+    result = await repo.upsert(
+        dict(
+            registro_asistencias_id=1,
+            fecha_asistencia=date(2026, 3, 2),
+            hora_llegada=time(0, 0),
+            descripcion="Confirmado por atleta",
+            asistio=False,
+            atleta_confirmo=True,
+            fecha_confirmacion=datetime(2026, 3, 1, 10, 0),
+        ),
+        update=["atleta_confirmo", "fecha_confirmacion"],
+    )
+
+    assert result is session.execute.return_value.scalar_one.return_value
+    sql = _sql(session)
+    assert "ON CONFLICT ON CONSTRAINT uq_asistencia_registro_fecha DO UPDATE" in sql
+    set_clause = sql.split("DO UPDATE SET", 1)[1]
+    assert "atleta_confirmo = excluded.atleta_confirmo" in set_clause
+    assert "fecha_confirmacion = excluded.fecha_confirmacion" in set_clause
+    assert "descripcion" not in set_clause.split("RETURNING")[0]
+    assert "RETURNING" in sql
+    session.commit.assert_awaited_once()
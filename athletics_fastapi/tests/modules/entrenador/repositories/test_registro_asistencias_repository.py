@@ -0,0 +1,100 @@
+"""
+Forma del SQL de cada perfil de carga de RegistroAsistenciasRepository.
+
+Aquí se comprueba qué tablas y columnas toca cada endpoint de inscripciones;
+el número de consultas que emiten contra PostgreSQL se fija en
+`ci/integration_test/tests/test_query_budgets.py`.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.entrenador.repositories.registro_asistencias_repository import RegistroAsistenciasRepository
+from app.modules.entrenador.services.asistencia_service import AsistenciaService
+from app.modules.entrenador.domain.schemas.registro_asistencias_schema import RegistroAsistenciasCreate
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = 1
+    result.scalars.return_value.first.return_value = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+    session.delete = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def service(session):
+    horario_repo = AsyncMock()
+    horario_repo.get_by_id.return_value = MagicMock()
+    return AsistenciaService(RegistroAsistenciasRepository(session), AsyncMock(), horario_repo)
+
+
+def _statements(session):
+    return [call.args[0] for call in session.execute.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_listar_inscritos_sin_cadena_del_entrenador(service, session):
+    """GET /inscripcion/horario/{id}: atleta y horario, sin entrenamiento -> entrenador."""
+    await service.get_atletas_by_horario(1)
+
+    (stmt,) = _statements(session)
+    sql = _sql(stmt)
+    assert "JOIN entrenamiento" not in sql
+    assert "auth_users" not in sql
+
+
+@pytest.mark.asyncio
+async def test_inscribir_atleta(service, session):
+    """POST /inscripcion: la existencia no carga relaciones; la recarga trae la cadena completa."""
+    session.execute.return_value.scalars.return_value.first.side_effect = [None, MagicMock()]
+
+    await service.registrar_atleta_horario(RegistroAsistenciasCreate(atleta_id=1, horario_id=2), 1)
+
+    existencia, recarga = _statements(session)
+    assert "JOIN" not in _sql(existencia)
+    assert "entrenador" in _sql(recarga)
+
+
+@pytest.mark.asyncio
+async def test_eliminar_inscripcion_sin_relaciones(service, session):
+    """DELETE /inscripcion/{id}: la inscripción se lee sin relaciones antes de borrar."""
+    await service.remove_atleta_horario(1)
+
+    (stmt,) = _statements(session)
+    assert "JOIN" not in _sql(stmt)
+
+
+@pytest.mark.asyncio
+async def test_confirmar_y_rechazar_solo_verifican_el_id(service, session):
+    """POST /confirmar|/rechazar/{id}: la existencia se comprueba leyendo solo el id."""
+    service.asistencia_repo.get_by_registro_and_date.return_value = None
+
+    await service.confirmar_asistencia_atleta(1, MagicMock())
+    await service.rechazar_asistencia_atleta(1, MagicMock())
+
+    for stmt in _statements(session):
+        assert [c.key for c in stmt.selected_columns] == ["id"]
+
+
+@pytest.mark.asyncio
+async def test_mis_registros_perfil_completo(service, session):
+    """GET /mis-registros: perfil completo, solo columnas usadas de `users`."""
+    await service.get_registros_by_atleta(1)
+
+    (stmt,) = _statements(session)
+    sql = _sql(stmt)
+    assert "entrenador" in sql
+    assert "hashed_password" not in sql
+    assert "users_1.fecha_nacimiento" not in sql
+
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from datetime import datetime, date, time
 
 from app.modules.entrenador.services.asistencia_service import AsistenciaService
+from app.modules.entrenador.repositories.registro_asistencias_repository import LoaderProfile
 from app.modules.entrenador.domain.schemas.registro_asistencias_schema import RegistroAsistenciasCreate
 from app.modules.entrenador.domain.schemas.asistencia_schema import AsistenciaCreate
 
@@ -186,7 +187,7 @@ class TestAsistenciaServiceRegistroAsistencia:
         mock_asistencia.hora_llegada = time(8, 30)
         mock_asistencia.registro_asistencias_id = 1
         
-        mock_asistencia_repository.create.return_value = mock_asistencia
+        mock_asistencia_repository.upsert.return_value = mock_asistencia
         
         # Act
         result = await asistencia_service.registrar_asistencia_diaria(schema)
@@ -195,7 +196,10 @@ class TestAsistenciaServiceRegistroAsistencia:
         assert result.fecha_asistencia == date.today()
         assert result.hora_llegada == time(8, 30)
         assert result.registro_asistencias_id == 1
-        mock_asistencia_repository.create.assert_called_once()
+        values = mock_asistencia_repository.upsert.call_args.args[0]
+        assert values["registro_asistencias_id"] == 1
+        # Solo se sobrescriben los campos enviados
+        assert mock_asistencia_repository.upsert.call_args.kwargs["update"] == ["descripcion", "hora_llegada"]
 
     @pytest.mark.asyncio
     async def test_registrar_asistencia_ausente(self, asistencia_service, mock_asistencia_repository):
@@ -214,7 +218,7 @@ class TestAsistenciaServiceRegistroAsistencia:
         mock_asistencia.hora_llegada = time(8, 0)
         mock_asistencia.descripcion = "Justificado"
         
-        mock_asistencia_repository.create.return_value = mock_asistencia
+        mock_asistencia_repository.upsert.return_value = mock_asistencia
         
         # Act
         result = await asistencia_service.registrar_asistencia_diaria(schema)
@@ -222,7 +226,7 @@ class TestAsistenciaServiceRegistroAsistencia:
         # Assert
         assert result.fecha_asistencia == date.today()
         assert result.descripcion == "Justificado"
-        mock_asistencia_repository.create.assert_called_once()
+        mock_asistencia_repository.upsert.assert_called_once()
 
 
 class TestAsistenciaServiceGetHistorial:
@@ -288,7 +292,7 @@ class TestAsistenciaServiceRemoveAtleta:
         await asistencia_service.remove_atleta_horario(registro_id)
         
         # Assert
-        mock_registro_asistencias_repository.get_by_id.assert_called_once_with(registro_id)
+        mock_registro_asistencias_repository.get_by_id.assert_called_once_with(registro_id, profile=LoaderProfile.ID)
         mock_registro_asistencias_repository.delete.assert_called_once_with(mock_registro)
 
     @pytest.mark.asyncio
@@ -315,20 +319,22 @@ class TestAsistenciaServiceConfirmarAsistencia:
         # Arrange
         registro_id = 1
         fecha = date.today()
-        mock_registro = MagicMock()
-        mock_registro_asistencias_repository.get_by_id.return_value = mock_registro
+        mock_registro_asistencias_repository.exists.return_value = True
         mock_asistencia_repository.get_by_registro_and_date.return_value = None
         mock_created = MagicMock()
-        mock_asistencia_repository.create.return_value = mock_created
+        mock_asistencia_repository.upsert.return_value = mock_created
         
         # Act
         result = await asistencia_service.confirmar_asistencia_atleta(registro_id, fecha)
         
         # Assert
         assert result == mock_created
-        mock_registro_asistencias_repository.get_by_id.assert_called_once_with(registro_id)
+        mock_registro_asistencias_repository.exists.assert_called_once_with(registro_id)
         mock_asistencia_repository.get_by_registro_and_date.assert_called_once_with(registro_id, fecha)
-        mock_asistencia_repository.create.assert_called_once()
+        values = mock_asistencia_repository.upsert.call_args.args[0]
+        assert values["atleta_confirmo"] is True and values["fecha_asistencia"] == fecha
+        assert mock_asistencia_repository.upsert.call_args.kwargs["update"] == ["atleta_confirmo", "fecha_confirmacion"]
+        mock_asistencia_repository.create.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_confirmar_asistencia_atleta_update_reject_to_confirm(self, asistencia_service, mock_registro_asistencias_repository, mock_asistencia_repository):
@@ -336,22 +342,20 @@ class TestAsistenciaServiceConfirmarAsistencia:
         # Arrange
         registro_id = 1
         fecha = date.today()
-        mock_registro = MagicMock()
-        mock_registro_asistencias_repository.get_by_id.return_value = mock_registro
+        mock_registro_asistencias_repository.exists.return_value = True
         mock_existing = MagicMock()
         mock_existing.fecha_confirmacion = None
         mock_existing.atleta_confirmo = False
         mock_asistencia_repository.get_by_registro_and_date.return_value = mock_existing
         mock_updated = MagicMock()
-        mock_asistencia_repository.update.return_value = mock_updated
+        mock_asistencia_repository.upsert.return_value = mock_updated
         
         # Act
         result = await asistencia_service.confirmar_asistencia_atleta(registro_id, fecha)
         
         # Assert
         assert result == mock_updated
-        assert mock_existing.atleta_confirmo == True
-        mock_asistencia_repository.update.assert_called_once_with(mock_existing)
+        assert mock_asistencia_repository.upsert.call_args.args[0]["atleta_confirmo"] is True
 
     @pytest.mark.asyncio
     async def test_confirmar_asistencia_atleta_already_confirmed(self, asistencia_service, mock_registro_asistencias_repository, mock_asistencia_repository):
@@ -359,8 +363,7 @@ class TestAsistenciaServiceConfirmarAsistencia:
         # Arrange
         registro_id = 1
         fecha = date.today()
-        mock_registro = MagicMock()
-        mock_registro_asistencias_repository.get_by_id.return_value = mock_registro
+        mock_registro_asistencias_repository.exists.return_value = True
         mock_existing = MagicMock()
         mock_existing.fecha_confirmacion = datetime.now()
         mock_existing.atleta_confirmo = True
@@ -379,7 +382,7 @@ class TestAsistenciaServiceConfirmarAsistencia:
         # Arrange
         registro_id = 1
         fecha = date.today()
-        mock_registro_asistencias_repository.get_by_id.return_value = None
+        mock_registro_asistencias_repository.exists.return_value = False
         
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
@@ -398,18 +401,19 @@ class TestAsistenciaServiceRechazarAsistencia:
         # Arrange
         registro_id = 1
         fecha = date.today()
-        mock_registro = MagicMock()
-        mock_registro_asistencias_repository.get_by_id.return_value = mock_registro
+        mock_registro_asistencias_repository.exists.return_value = True
         mock_asistencia_repository.get_by_registro_and_date.return_value = None
         mock_created = MagicMock()
-        mock_asistencia_repository.create.return_value = mock_created
+        mock_asistencia_repository.upsert.return_value = mock_created
         
         # Act
         result = await asistencia_service.rechazar_asistencia_atleta(registro_id, fecha)
         
         # Assert
         assert result == mock_created
-        mock_asistencia_repository.create.assert_called_once()
+        values = mock_asistencia_repository.upsert.call_args.args[0]
+        assert values["atleta_confirmo"] is False and values["asistio"] is False
+        mock_asistencia_repository.create.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_rechazar_asistencia_atleta_update_existing(self, asistencia_service, mock_registro_asistencias_repository, mock_asistencia_repository):
@@ -417,22 +421,20 @@ class TestAsistenciaServiceRechazarAsistencia:
         # Arrange
         registro_id = 1
         fecha = date.today()
-        mock_registro = MagicMock()
-        mock_registro_asistencias_repository.get_by_id.return_value = mock_registro
+        mock_registro_asistencias_repository.exists.return_value = True
         mock_existing = MagicMock()
         mock_existing.atleta_confirmo = True
         mock_asistencia_repository.get_by_registro_and_date.return_value = mock_existing
         mock_updated = MagicMock()
-        mock_asistencia_repository.update.return_value = mock_updated
+        mock_asistencia_repository.upsert.return_value = mock_updated
         
         # Act
         result = await asistencia_service.rechazar_asistencia_atleta(registro_id, fecha)
         
         # Assert
         assert result == mock_updated
-        assert mock_existing.atleta_confirmo == False
-        assert mock_existing.asistio == False
-        mock_asistencia_repository.update.assert_called_once_with(mock_existing)
+        assert mock_asistencia_repository.upsert.call_args.kwargs["update"] == ["atleta_confirmo", "fecha_confirmacion", "asistio"]
+        mock_asistencia_repository.update.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_rechazar_asistencia_atleta_registro_not_found(self, asistencia_service, mock_registro_asistencias_repository):
@@ -440,7 +442,7 @@ class TestAsistenciaServiceRechazarAsistencia:
         # Arrange
         registro_id = 1
         fecha = date.today()
-        mock_registro_asistencias_repository.get_by_id.return_value = None
+        mock_registro_asistencias_repository.exists.return_value = False
         
         # Act & Assert
         with pytest.raises(HTTPException) as exc_info:
@@ -524,3 +526,66 @@ class TestAsistenciaServiceMarcarAusente:
         
         assert exc_info.value.status_code == 404
         assert "Asistencia no encontrada" in exc_info.value.detail
+
+
+class TestAsistenciaServiceMarcarSesion:
+    """Tests para pasar lista de una sesión completa"""
+
+    @staticmethod
+    def _asistencia(registro_id, asistio):
+        import uuid
+        asistencia = MagicMock()
+        asistencia.id = registro_id * 10
+        asistencia.external_id = uuid.uuid4()
+        asistencia.registro_asistencias_id = registro_id
+        asistencia.fecha_asistencia = date(2026, 3, 2)
+        asistencia.hora_llegada = time(8, 0)
+        asistencia.descripcion = "Registrado por entrenador"
+        asistencia.asistio = asistio
+        asistencia.atleta_confirmo = None
+        asistencia.fecha_confirmacion = None
+        return asistencia
+
+    @pytest.mark.asyncio
+    async def test_marcar_asistencia_sesion_success(self, asistencia_service, mock_asistencia_repository):
+        """TC-AS-28: Un solo upsert para toda la sesión y un commit"""
+        from app.modules.entrenador.domain.schemas.asistencia_schema import AsistenciaSesionUpdate
+        schema = AsistenciaSesionUpdate(fecha_asistencia=date(2026, 3, 2), presentes=[1, 3])
+        mock_asistencia_repository.upsert_sesion.return_value = [
+            self._asistencia(1, True), self._asistencia(2, False), self._asistencia(3, True)
+        ]
+
+        result = await asistencia_service.marcar_asistencia_sesion(5, schema)
+
+        assert (result.total, result.presentes) == (3, 2)
+        args = mock_asistencia_repository.upsert_sesion.await_args.args
+        assert args[:3] == (5, date(2026, 3, 2), {1, 3})
+        mock_asistencia_repository.commit.assert_awaited_once()
+        mock_asistencia_repository.get_by_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_marcar_asistencia_sesion_inscripcion_ajena(self, asistencia_service, mock_asistencia_repository):
+        """TC-AS-29: Un presente que no pertenece al horario revierte el upsert"""
+        from app.modules.entrenador.domain.schemas.asistencia_schema import AsistenciaSesionUpdate
+        schema = AsistenciaSesionUpdate(fecha_asistencia=date(2026, 3, 2), presentes=[1, 99])
+        mock_asistencia_repository.upsert_sesion.return_value = [self._asistencia(1, True)]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await asistencia_service.marcar_asistencia_sesion(5, schema)
+
+        assert exc_info.value.status_code == 400
+        mock_asistencia_repository.rollback.assert_awaited_once()
+        mock_asistencia_repository.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_marcar_asistencia_sesion_horario_not_found(self, asistencia_service, mock_asistencia_repository, mock_horario_repository):
+        """TC-AS-30: Horario inexistente"""
+        from app.modules.entrenador.domain.schemas.asistencia_schema import AsistenciaSesionUpdate
+        schema = AsistenciaSesionUpdate(fecha_asistencia=date(2026, 3, 2))
+        mock_asistencia_repository.upsert_sesion.return_value = []
+        mock_horario_repository.get_by_id.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await asistencia_service.marcar_asistencia_sesion(5, schema)
+
+        assert exc_info.value.status_code == 404
@@ -2,11 +2,21 @@
 Pruebas Unitarias para ExternalUsersApiService.
 Mocks de httpx para simular respuestas de la API externa.
 """
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from app.modules.external.services.external_users_api_service import ExternalUsersApiService
+from app.modules.external.services.external_users_api_service import ExternalUsersApiService, _users_api_breaker
+from app.modules.external.services.external_token_cache import _external_token_cache
 from app.modules.external.domain.schemas import UserExternalCreateRequest
 
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    _external_token_cache.clear()
+    _users_api_breaker.reset()
+    yield
+    _external_token_cache.clear()
+    _users_api_breaker.reset()
+
 @pytest.fixture
 def mock_repo():
     return AsyncMock()
@@ -271,3 +281,60 @@ async def test_create_user_error(service, mock_repo):
         assert "MOCKED" in response.message
     else:
         assert response.message == "User created (MOCKED)"
+
+
+@pytest.mark.asyncio
+async def test_get_auth_token_served_from_memory(service, mock_repo):
+    """Tras el primer acceso el token se sirve desde memoria sin consultar la DB."""
+    mock_token = MagicMock()
+    mock_token.token = "db_token"
+    mock_token.external_id = "db_ext_id"
+    mock_repo.get_token_by_type.return_value = mock_token
+
+    await service.get_auth_token()
+    other = ExternalUsersApiService(mock_repo)
+    token, ext_id = await other.get_auth_token()
+
+    assert (token, ext_id) == ("db_token", "db_ext_id")
+    mock_repo.get_token_by_type.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_auth_token_refreshes_ahead_of_expiry(service, mock_repo):
+    """Un token a punto de expirar se sigue usando y se renueva en segundo plano."""
+    import jwt as pyjwt
+    import time
+
+    near_expiry = pyjwt.encode({"exp": int(time.time()) + 30}, "k", algorithm="HS256")
+    _external_token_cache.set(near_expiry, "ext_id")
+
+    with patch(
+        "app.modules.external.services.external_users_api_service._refresh_token_in_background",
+        new_callable=AsyncMock,
+    ) as mock_refresh:
+        token, _ = await service.get_auth_token()
+        await asyncio.sleep(0)
+
+    assert token == near_expiry
+    mock_refresh.assert_awaited_once()
+    mock_repo.get_token_by_type.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_user_short_circuits_when_breaker_open(service, mock_repo):
+    """Con el circuito abierto se usa el fallback sin llamar a la API externa."""
+    import time
+    from app.core.http.circuit_breaker import OPEN
+
+    _users_api_breaker._set_state(OPEN, time.time())
+    _users_api_breaker._synced_at = time.time()
+    service.token = "token"
+
+    user_create = MagicMock()
+    user_create.email = "email@example.com"
+
+    with patch("httpx.AsyncClient.post", new_callable=AsyncMock) as mock_post:
+        response = await service.create_user(user_create)
+
+    mock_post.assert_not_awaited()
+    assert response.message == "User created (MOCKED)"
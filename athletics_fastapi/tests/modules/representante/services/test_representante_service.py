@@ -28,7 +28,9 @@ def service(mock_session):
          patch('app.modules.representante.services.representante_service.AtletaRepository'), \
          patch('app.modules.representante.services.representante_service.ResultadoCompetenciaRepository'), \
          patch('app.modules.representante.services.representante_service.PasswordHasher'):
-        yield RepresentanteService(mock_session)
+        service = RepresentanteService(mock_session)
+        service.hasher.hash_async = AsyncMock(return_value="hashed_password")
+        yield service
 
 
 @pytest.fixture
@@ -307,20 +309,12 @@ class TestRepresentanteServiceGet:
             "status_code": 200
         })
         
-        # Mock resultados con medallas
-        resultado1 = MagicMock()
-        resultado1.posicion_final = "Primero"
-        resultado1.puesto_obtenido = 1
-        
-        resultado2 = MagicMock()
-        resultado2.posicion_final = "Segundo"
-        resultado2.puesto_obtenido = 2
-        
-        resultado3 = MagicMock()
-        resultado3.posicion_final = "Tercero"
-        resultado3.puesto_obtenido = 3
-        
-        service.resultado_repo.get_by_atleta = AsyncMock(return_value=[resultado1, resultado2, resultado3])
+        # Mock resumen agregado con medallas
+        service.resultado_repo.get_resumen_atleta = AsyncMock(return_value={
+            "total_competencias": 3,
+            "medallas": {"oro": 1, "plata": 1, "bronce": 1},
+        })
+        service.resultado_repo.get_mejores_marcas = AsyncMock(return_value=[])
         
         # Act
         result = await service.get_athlete_stats(10, 1)
@@ -331,7 +325,9 @@ class TestRepresentanteServiceGet:
         assert result["data"]["medallas"]["oro"] == 1
         assert result["data"]["medallas"]["plata"] == 1
         assert result["data"]["medallas"]["bronce"] == 1
+        assert result["data"]["mejores_marcas"] == []
         assert result["status_code"] == 200
+        service.resultado_repo.get_resumen_atleta.assert_awaited_once_with(mock_atleta.user_id)
 
 
 class TestRepresentanteServiceValidation:
@@ -0,0 +1,131 @@
+"""
+Pruebas del EmailDispatcher contra un servidor SMTP local (aiosmtpd).
+Valida entrega en segundo plano, reutilización de conexión y reintentos.
+"""
+import socket
+from email.message import EmailMessage
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.providers.email.email_dispatcher import EmailDispatcher, EmailQueueFullError
+
+
+class _RecordingHandler:
+    """Handler de aiosmtpd que guarda los mensajes y cuenta las conexiones."""
+
+    def __init__(self, fail_first: int = 0):
+        self.messages = []
+        self.connections = 0
+        self.fail_first = fail_first
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.fail_first > 0:
+            self.fail_first -= 1
+            return "451 Error temporal"
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = _RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def _dispatcher(controller, **kwargs) -> EmailDispatcher:
+    options = dict(
+        host=controller.hostname,
+        port=controller.port,
+        username=None,
+        password=None,
+        start_tls=False,
+        use_tls=False,
+        workers=1,
+        max_queue_size=100,
+        batch_size=10,
+        max_retries=2,
+        retry_backoff=0.01,
+        idle_timeout=5,
+    )
+    options.update(kwargs)
+    return EmailDispatcher(**options)
+
+
+def _message(to: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = "Prueba"
+    msg["From"] = "noreply@test.com"
+    msg["To"] = to
+    msg.set_content("Hola")
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_and_batch_reuses_connection(smtp_server):
+    """Los mensajes se entregan en segundo plano usando una sola conexión."""
+    controller, handler = smtp_server
+    dispatcher = _dispatcher(controller)
+
+    for i in range(5):
+        dispatcher.enqueue(_message(f"user{i}@test.com"))
+    assert handler.messages == []
+
+    await dispatcher.stop()
+
+    assert sorted(m.rcpt_tos[0] for m in handler.messages) == [f"user{i}@test.com" for i in range(5)]
+    assert handler.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried(smtp_server):
+    """Un rechazo temporal del servidor se reintenta con backoff."""
+    controller, handler = smtp_server
+    handler.fail_first = 1
+    dispatcher = _dispatcher(controller)
+
+    dispatcher.enqueue(_message("retry@test.com"))
+    await dispatcher.stop()
+
+    assert [m.rcpt_tos[0] for m in handler.messages] == ["retry@test.com"]
+
+
+@pytest.mark.asyncio
+async def test_message_dropped_after_max_retries(smtp_server):
+    """Tras agotar los reintentos el mensaje se descarta sin bloquear la cola."""
+    controller, handler = smtp_server
+    handler.fail_first = 10
+    dispatcher = _dispatcher(controller, max_retries=1)
+
+    dispatcher.enqueue(_message("lost@test.com"))
+    await dispatcher.stop()
+
+    assert handler.messages == []
+    assert dispatcher.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_raises_when_queue_full(smtp_server):
+    """Con la cola llena `enqueue` falla en vez de bloquear la petición."""
+    controller, _ = smtp_server
+    dispatcher = _dispatcher(controller, workers=0, max_queue_size=1)
+
+    dispatcher.enqueue(_message("a@test.com"))
+    with pytest.raises(EmailQueueFullError):
+        dispatcher.enqueue(_message("b@test.com"))
+
+    await dispatcher.stop(drain_timeout=0)
@@ -1,4 +1,5 @@
 import random
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import string
@@ -511,3 +512,28 @@ def generar_lote_entrenamientos(cantidad: int) -> List[Dict]:
 def generar_lote_competencias(cantidad: int) -> List[Dict]:
     """Genera múltiples competencias."""
     return [generar_competencia() for _ in range(cantidad)]
+
+
+# ============================================================================
+# PRESUPUESTO DE CONSULTAS
+# ============================================================================
+
+@contextmanager
+def query_budget(max_queries: int, max_duplicates: int = 0):
+    """
+    Falla si el bloque ejecuta más consultas (o más repetidas) de las permitidas.
+
+        with query_budget(max_queries=2) as stats:
+            await client.get("/api/v1/...")
+    """
+    from app.core.db.query_stats import track_queries
+
+    with track_queries() as stats:
+        yield stats
+    repetidas = "\n".join(f"  {n}x {sql}" for sql, n in stats.repeated())
+    assert stats.count <= max_queries, (
+        f"{stats.count} consultas (presupuesto {max_queries})\n{repetidas}"
+    )
+    assert stats.duplicates <= max_duplicates, (
+        f"{stats.duplicates} consultas repetidas (máximo {max_duplicates})\n{repetidas}"
+    )